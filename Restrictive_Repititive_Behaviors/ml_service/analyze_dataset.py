@@ -4,6 +4,7 @@ Analyzes the video dataset and generates statistics
 """
 import os
 import cv2
+import argparse
 import numpy as np
 from pathlib import Path
 import json
@@ -11,6 +12,8 @@ from collections import defaultdict
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from utils.video_index import VideoIndex
+
 def analyze_video(video_path):
     """Analyze a single video file"""
     try:
@@ -40,8 +43,31 @@ def analyze_video(video_path):
             'error': str(e)
         }
 
-def scan_dataset(dataset_root):
-    """Scan entire dataset and collect statistics"""
+def index_record_to_info(record, video_path):
+    """Convert a VideoIndex record to the analyze_video format"""
+    if 'error' in record:
+        return {'path': str(video_path), 'filename': video_path.name, 'error': record['error']}
+    
+    return {
+        'path': str(video_path),
+        'filename': video_path.name,
+        'fps': record['fps'],
+        'frame_count': record['frame_count'],
+        'width': record['width'],
+        'height': record['height'],
+        'duration': record['duration'],
+        'file_size_mb': record['size'] / (1024 * 1024)
+    }
+
+def scan_dataset(dataset_root, video_index=None):
+    """
+    Scan entire dataset and collect statistics
+    
+    Args:
+        dataset_root: Root directory of dataset
+        video_index: Optional VideoIndex; all videos are probed in parallel up front
+            and unchanged videos are read from the index
+    """
     
     category_mapping = {
         'Atypical Children Hand Movements': 'atypical_hand_movements',
@@ -61,23 +87,33 @@ def scan_dataset(dataset_root):
         'videos': []
     }
     
-    for folder_path, label in category_mapping.items():
+    # Find all video files first so they can be probed in one parallel pass
+    category_files = {}
+    for folder_path in category_mapping:
         full_path = Path(dataset_root) / folder_path
         
         if not full_path.exists():
             print(f"Warning: Path not found: {full_path}")
             continue
         
-        print(f"\nAnalyzing: {folder_path}")
-        print("-" * 80)
-        
-        # Find all video files
         video_files = []
         for ext in ['*.mp4', '*.avi', '*.mov', '*.MP4']:
             video_files.extend(full_path.glob(ext))
         
         # Filter out hidden files
-        video_files = [f for f in video_files if not f.name.startswith('.')]
+        category_files[folder_path] = [f for f in video_files if not f.name.startswith('.')]
+    
+    records = {}
+    if video_index is not None:
+        all_files = [str(f) for files in category_files.values() for f in files]
+        records = video_index.update(all_files)
+        print(f"\nProbed {video_index.probed} videos, reused {video_index.reused} from index")
+    
+    for folder_path, video_files in category_files.items():
+        label = category_mapping[folder_path]
+        
+        print(f"\nAnalyzing: {folder_path}")
+        print("-" * 80)
         
         category_info = {
             'label': label,
@@ -92,7 +128,11 @@ def scan_dataset(dataset_root):
         
         # Analyze each video
         for video_path in video_files:
-            video_info = analyze_video(video_path)
+            if video_index is not None:
+                record = records.get(str(video_path), {'error': 'could not be probed'})
+                video_info = index_record_to_info(record, video_path)
+            else:
+                video_info = analyze_video(video_path)
             video_info['category'] = label
             
             if 'error' not in video_info:
@@ -222,9 +262,9 @@ def print_summary(dataset_stats):
             count = resolutions.count(res)
             print(f"  {res[0]}x{res[1]}: {count} videos")
 
-def main():
+def main(args):
     """Main analysis function"""
-    dataset_root = '../Dataset'
+    dataset_root = args.dataset_root
     
     print("=" * 80)
     print("RRB Dataset Analysis")
@@ -236,7 +276,10 @@ def main():
     
     # Scan dataset
     print(f"\nScanning dataset at: {dataset_root}")
-    dataset_stats = scan_dataset(dataset_root)
+    video_index = None
+    if args.index_path:
+        video_index = VideoIndex(args.index_path, max_workers=args.workers)
+    dataset_stats = scan_dataset(dataset_root, video_index)
     
     # Print summary
     print_summary(dataset_stats)
@@ -265,5 +308,15 @@ def main():
     print("=" * 80)
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='Analyze the RRB video dataset')
+    
+    parser.add_argument('--dataset_root', type=str, default='../Dataset',
+                       help='Root directory of dataset')
+    parser.add_argument('--index_path', type=str, default='cache/video_index.jsonl',
+                       help="Resumable video metadata index ('' probes every video sequentially)")
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Processes used to probe videos (defaults to the CPU count)')
+    
+    args = parser.parse_args()
+    main(args)
 
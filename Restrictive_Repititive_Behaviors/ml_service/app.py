@@ -11,10 +11,13 @@ from datetime import datetime
 import traceback
 import logging
 import sys
+import time
+import threading
 
 from config import Config
 from utils.inference import RRBInference
 from utils.video_validator import VideoValidator
+from utils.job_manager import DetectionJobManager, JobQueueFull
 
 # Configure logging
 logging.basicConfig(
@@ -33,46 +36,173 @@ Config.init_app(app)
 
 # Initialize inference engine (lazy loading)
 inference_engine = None
-video_validator = VideoValidator()
+inference_engine_lock = threading.Lock()
+
+# Model readiness reported by /health (per worker process)
+engine_state = {
+    'status': 'not_loaded',  # not_loaded, loading, warming_up, ready, failed
+    'pid': os.getpid(),
+    'load_seconds': None,
+    'warmup_seconds': None,
+    'error': None
+}
+video_validator = VideoValidator(
+    repair_cache_dir=Config.REPAIR_CACHE_DIR or None,
+    repair_cache_max_bytes=Config.REPAIR_CACHE_MAX_MB * 1024 * 1024,
+    repair_cache_ttl=Config.REPAIR_CACHE_TTL,
+    target_fps=Config.TARGET_FPS,
+    max_repair_dim=Config.REPAIR_MAX_DIM
+)
+
+# Background detection jobs (/api/v1/jobs)
+job_manager = DetectionJobManager(
+    num_workers=Config.JOB_WORKERS,
+    max_pending=Config.MAX_PENDING_JOBS,
+    result_ttl=Config.JOB_RESULT_TTL
+)
 
 def get_inference_engine():
     """Get or initialize inference engine"""
     global inference_engine
 
-    if inference_engine is None:
-        model_path = Config.MODEL_PATH
-        label_encoder_path = Config.LABEL_ENCODER_PATH
+    # Job workers and request threads may ask for the engine at the same time
+    with inference_engine_lock:
+        if inference_engine is None:
+            engine_state.update({'status': 'loading', 'pid': os.getpid(), 'error': None})
+            start = time.perf_counter()
 
-        if not os.path.exists(model_path):
-            raise FileNotFoundError(f"Model not found at {model_path}")
+            try:
+                inference_engine = _build_inference_engine()
+            except Exception as e:
+                engine_state.update({'status': 'failed', 'error': str(e)})
+                raise
 
-        if not os.path.exists(label_encoder_path):
-            raise FileNotFoundError(f"Label encoder not found at {label_encoder_path}")
-
-        inference_engine = RRBInference(
-            model_path=model_path,
-            label_encoder_path=label_encoder_path,
-            sequence_length=Config.SEQUENCE_LENGTH,
-            img_size=Config.IMG_SIZE,
-            confidence_threshold=Config.CONFIDENCE_THRESHOLD,
-            min_duration=Config.MIN_DETECTION_DURATION
-        )
+            engine_state['load_seconds'] = time.perf_counter() - start
+            # Preloaded engines are ready once preload_inference_engine has warmed them up
+            engine_state['status'] = 'warming_up' if Config.PRELOAD_MODEL else 'ready'
 
     return inference_engine
 
+def _build_inference_engine():
+    """Build RRBInference from Config"""
+    model_path = Config.MODEL_PATH
+    label_encoder_path = Config.LABEL_ENCODER_PATH
+
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Model not found at {model_path}")
+
+    if not os.path.exists(label_encoder_path):
+        raise FileNotFoundError(f"Label encoder not found at {label_encoder_path}")
+
+    return RRBInference(
+        model_path=model_path,
+        label_encoder_path=label_encoder_path,
+        sequence_length=Config.SEQUENCE_LENGTH,
+        img_size=Config.IMG_SIZE,
+        confidence_threshold=Config.CONFIDENCE_THRESHOLD,
+        min_duration=Config.MIN_DETECTION_DURATION,
+        off_threshold=Config.DETECTION_OFF_THRESHOLD,
+        max_gap=Config.DETECTION_MAX_GAP,
+        pose_mode=Config.POSE_MODE,
+        landmark_cache_dir=Config.LANDMARK_CACHE_DIR or None,
+        backend=Config.INFERENCE_BACKEND,
+        num_threads=Config.INFERENCE_THREADS,
+        embedding_cache_dir=Config.EMBEDDING_CACHE_DIR or None
+    )
+
+def prefork_preload():
+    """
+    Preload what can safely be shared with forked workers
+
+    Imports the model runtime and reads the model file into the OS page
+    cache. The model itself is not built here: TensorFlow, TFLite and ONNX
+    Runtime start thread pools on first use that do not survive fork(), so
+    each worker loads the model after forking (see preload_inference_engine).
+    The imported modules are shared copy-on-write and every worker's model
+    load reads from memory instead of disk.
+    """
+    start = time.perf_counter()
+    extension = os.path.splitext(Config.MODEL_PATH)[1].lower()
+
+    if extension == '.onnx':
+        import onnxruntime  # noqa: F401
+    elif extension == '.tflite':
+        try:
+            import tflite_runtime.interpreter  # noqa: F401
+        except ImportError:
+            import tensorflow  # noqa: F401
+    else:
+        import tensorflow  # noqa: F401
+        from tensorflow import keras  # noqa: F401
+
+    if os.path.isfile(Config.MODEL_PATH):
+        with open(Config.MODEL_PATH, 'rb') as f:
+            while f.read(1 << 24):
+                pass
+
+    logger.info(f"Pre-fork preload finished in {time.perf_counter() - start:.2f}s")
+
+def preload_inference_engine():
+    """
+    Load the inference engine and warm it up before serving requests
+
+    Runs a dummy prediction for every batch size in WARMUP_BATCH_SIZES so
+    graph tracing happens now rather than on the first request. Failures are
+    logged and reported by /health instead of stopping the server.
+    """
+    try:
+        engine = get_inference_engine()
+
+        start = time.perf_counter()
+        timings = engine.warm_up(batch_sizes=Config.WARMUP_BATCH_SIZES)
+        engine_state['warmup_seconds'] = time.perf_counter() - start
+        engine_state['status'] = 'ready'
+
+        logger.info(f"Inference engine ready in process {os.getpid()}: load "
+                    f"{engine_state['load_seconds']:.2f}s, warm-up "
+                    + ', '.join(f"batch {size} {seconds:.2f}s" for size, seconds in timings.items()))
+    except Exception as e:
+        logger.error(f"Failed to preload inference engine: {str(e)}", exc_info=True)
+        engine_state.update({'status': 'failed', 'error': str(e)})
+
+if Config.PRELOAD_MODEL:
+    # With gunicorn's preload_app this runs once in the master, before workers fork
+    prefork_preload()
+
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in Config.ALLOWED_EXTENSIONS
 
+# Per-video size limit (100MB max to prevent memory issues)
+MAX_FILE_SIZE_MB = 100
+
+def file_size_error(upload_path):
+    """Error message if a saved upload exceeds MAX_FILE_SIZE_MB, else None"""
+    file_size_mb = os.path.getsize(upload_path) / (1024 * 1024)
+    if file_size_mb > MAX_FILE_SIZE_MB:
+        return f'Video file too large ({file_size_mb:.1f}MB). Maximum size is {MAX_FILE_SIZE_MB}MB.'
+    return None
+
 @app.route('/health', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
+    """
+    Health check endpoint
+
+    With PRELOAD_MODEL the worker reports 503 until its model is loaded and
+    warmed up, so load balancers and container health checks wait for it.
+    """
+    ready = engine_state['status'] == 'ready'
+    status_code = 503 if Config.PRELOAD_MODEL and not ready else 200
+
     return jsonify({
-        'status': 'healthy',
+        'status': 'healthy' if status_code == 200 else 'starting',
         'service': 'RRB Detection ML Service',
-        'timestamp': datetime.now().isoformat()
-    })
+        'timestamp': datetime.now().isoformat(),
+        'ready': ready,
+        'model': engine_state,
+        'jobs': job_manager.get_stats()
+    }), status_code
 
 @app.route('/api/v1/detect', methods=['POST'])
 def detect_rrb():
@@ -119,14 +249,14 @@ def detect_rrb():
         file_size_mb = file_size_bytes / (1024 * 1024)
         logger.info(f"Video uploaded: {filename} ({file_size_mb:.2f} MB)")
 
-        # Check file size limit (100MB max to prevent memory issues)
-        MAX_FILE_SIZE_MB = 100
-        if file_size_mb > MAX_FILE_SIZE_MB:
+        # Check file size limit
+        size_error = file_size_error(upload_path)
+        if size_error:
             if os.path.exists(upload_path):
                 os.remove(upload_path)
             return jsonify({
                 'success': False,
-                'error': f'Video file too large ({file_size_mb:.1f}MB). Maximum size is {MAX_FILE_SIZE_MB}MB.',
+                'error': size_error,
                 'details': 'Please use a shorter video or reduce the video quality/resolution.'
             }), 400
 
@@ -227,7 +357,8 @@ def detect_rrb():
                 'detected': result['detected'],
                 'primary_behavior': result['primary_behavior'],
                 'confidence': result['confidence'],
-                'behaviors': result['behaviors']
+                'behaviors': result['behaviors'],
+                'events': result.get('events', [])
             },
             'metadata': {
                 'video_duration': result['video_info'].get('duration', 0),
@@ -261,6 +392,7 @@ def detect_rrb_enhanced():
     Enhanced RRB detection with pose analysis
 
     Expected: multipart/form-data with 'video' file
+              optional 'include_pose' field (default 'true')
     Returns: JSON with detection results including pose features
     """
     upload_path = None
@@ -320,9 +452,12 @@ def detect_rrb_enhanced():
         # Get inference engine
         engine = get_inference_engine()
 
+        # Pose analysis can be switched off per request ('include_pose=false')
+        include_pose = request.form.get('include_pose', 'true').lower() not in ('false', '0', 'no')
+
         # Perform enhanced detection
         logger.info("Starting enhanced RRB detection with pose analysis...")
-        result = engine.detect_with_pose_analysis(processing_path)
+        result = engine.detect_with_pose_analysis(processing_path, include_pose=include_pose)
         logger.info("Enhanced detection completed")
 
         # Clean up
@@ -340,7 +475,8 @@ def detect_rrb_enhanced():
                 'detected': result['detected'],
                 'primary_behavior': result['primary_behavior'],
                 'confidence': result['confidence'],
-                'behaviors': result['behaviors']
+                'behaviors': result['behaviors'],
+                'events': result.get('events', [])
             },
             'pose_analysis': result.get('pose_analysis', {}),
             'metadata': {
@@ -367,6 +503,311 @@ def detect_rrb_enhanced():
             'traceback': traceback.format_exc() if Config.DEBUG else None
         }), 500
 
+@app.route('/api/v1/detect/batch', methods=['POST'])
+def detect_rrb_batch():
+    """
+    Batch RRB detection for several videos
+
+    Expected: multipart/form-data with one or more 'videos' files
+    Returns: JSON with one result per file and throughput metrics
+    """
+    saved_paths = []
+    file_results = []  # (filename, processing path or None, error or None)
+
+    try:
+        files = request.files.getlist('videos')
+
+        if not files:
+            return jsonify({
+                'success': False,
+                'error': 'No video files provided'
+            }), 400
+
+        if len(files) > Config.MAX_BATCH_VIDEOS:
+            return jsonify({
+                'success': False,
+                'error': f'Too many videos ({len(files)}). Maximum is {Config.MAX_BATCH_VIDEOS} per request.'
+            }), 400
+
+        # Save and validate every file; bad files are reported, not fatal
+        for file in files:
+            filename = secure_filename(file.filename or '')
+
+            if file.filename == '' or not allowed_file(file.filename):
+                file_results.append((filename, None, 'Invalid file'))
+                continue
+
+            upload_path = os.path.join(Config.UPLOAD_FOLDER, f"{uuid.uuid4()}_{filename}")
+            file.save(upload_path)
+            saved_paths.append(upload_path)
+
+            size_error = file_size_error(upload_path)
+            if size_error:
+                file_results.append((filename, None, size_error))
+                continue
+
+            is_valid, error_msg, _ = video_validator.validate_video(upload_path)
+            if is_valid:
+                file_results.append((filename, upload_path, None))
+                continue
+
+            # Repairs can take minutes per file, so they are left to the job API
+            logger.warning(f"Video validation failed for {filename}: {error_msg}")
+            file_results.append((filename, None, f'Video validation failed: {error_msg}. '
+                                                 'Submit it to /api/v1/jobs to have it repaired.'))
+
+        logger.info(f"Batch upload: {len(files)} videos, "
+                    f"{sum(1 for _, path, _ in file_results if path)} valid")
+
+        # Get inference engine
+        engine = get_inference_engine()
+
+        processing_paths = [path for _, path, _ in file_results if path]
+        detections = {}
+        metrics = {}
+        if processing_paths:
+            logger.info("Starting batch RRB detection...")
+            results, metrics = engine.batch_detect(
+                processing_paths,
+                batch_size=Config.BATCH_INFERENCE_SIZE,
+                num_workers=Config.BATCH_DECODE_WORKERS,
+                return_metrics=True
+            )
+            detections = {result['video_path']: result for result in results}
+            logger.info(f"Batch detection completed: {metrics['videos_per_second']:.2f} videos/s, "
+                        f"batch fill {metrics['batch_fill']:.0%}")
+
+        # Format response in upload order
+        response_results = []
+        for filename, path, error in file_results:
+            result = detections.get(path)
+            if result is not None and 'error' in result:
+                error = f"Detection failed: {result['error']}"
+
+            if error is not None:
+                response_results.append({'filename': filename, 'success': False, 'error': error})
+                continue
+
+            response_results.append({
+                'filename': filename,
+                'success': True,
+                'detection': {
+                    'detected': result['detected'],
+                    'primary_behavior': result['primary_behavior'],
+                    'confidence': result['confidence'],
+                    'behaviors': result['behaviors'],
+                    'events': result.get('events', [])
+                },
+                'metadata': {
+                    'video_duration': result['video_info'].get('duration', 0),
+                    'video_fps': result['video_info'].get('fps', 0),
+                    'sequences_analyzed': result.get('total_sequences_analyzed', 0),
+                    'sequences_with_detections': result.get('sequences_with_detections', 0)
+                }
+            })
+
+        return jsonify({
+            'success': True,
+            'timestamp': datetime.now().isoformat(),
+            'results': response_results,
+            'throughput': metrics
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error during batch detection: {str(e)}", exc_info=True)
+
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'details': 'An error occurred while processing the videos.',
+            'traceback': traceback.format_exc() if Config.DEBUG else None
+        }), 500
+
+    finally:
+        for path in saved_paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+def run_detection_job(report_stage, report_event, upload_path, filename, enhanced=False, include_pose=True):
+    """
+    Job body for /api/v1/jobs: validate, repair if needed, decode and predict
+
+    Args:
+        report_stage: Progress callback from DetectionJobManager
+        report_event: Called with each detection event as it closes (standard jobs)
+        upload_path: Saved upload (deleted when the job ends)
+        filename: Original file name for the result
+        enhanced: Run detect_with_pose_analysis instead of detect_rrb
+        include_pose: Pose analysis switch for enhanced jobs
+
+    Returns:
+        Result in the same format as /api/v1/detect (/detect/enhanced)
+    """
+    repaired_path = None
+    repair_report = None
+
+    try:
+        report_stage('validate')
+        is_valid, error_msg, _ = video_validator.validate_video(upload_path)
+        processing_path = upload_path
+
+        if not is_valid:
+            logger.warning(f"Video validation failed for {filename}: {error_msg}")
+            report_stage('repair')
+            repair_success, repair_msg, repaired_path, repair_report = video_validator.repair_video(
+                upload_path, return_report=True
+            )
+
+            if not (repair_success and repaired_path):
+                raise ValueError(f'Video validation failed: {error_msg} (repair: {repair_msg})')
+            processing_path = repaired_path
+
+        engine = get_inference_engine()
+
+        if enhanced:
+            result = engine.detect_with_pose_analysis(processing_path, include_pose=include_pose,
+                                                      progress_callback=report_stage)
+        else:
+            # Predict while decoding, so events show up in the job status before it finishes
+            result = engine.detect_rrb_streaming(processing_path, batch_size=Config.BATCH_INFERENCE_SIZE,
+                                                 on_event=report_event, progress_callback=report_stage)
+
+        if 'error' in result and result.get('detected') == False:
+            raise ValueError(f"Detection failed: {result['error']}")
+
+        response = {
+            'filename': filename,
+            'detection': {
+                'detected': result['detected'],
+                'primary_behavior': result['primary_behavior'],
+                'confidence': result['confidence'],
+                'behaviors': result['behaviors'],
+                'events': result.get('events', [])
+            },
+            'metadata': {
+                'video_duration': result['video_info'].get('duration', 0),
+                'video_fps': result['video_info'].get('fps', 0),
+                'sequences_analyzed': result.get('total_sequences_analyzed', 0),
+                'sequences_with_detections': result.get('sequences_with_detections', 0)
+            }
+        }
+        if enhanced:
+            response['pose_analysis'] = result.get('pose_analysis', {})
+        if repair_report is not None:
+            response['metadata']['repair'] = {
+                'tier_used': repair_report['tier_used'],
+                'cache_hit': repair_report['cache_hit'],
+                'tiers': repair_report['tiers'],
+                'total_seconds': repair_report['total_seconds']
+            }
+
+        return response
+
+    finally:
+        for path in (upload_path, repaired_path):
+            if path and os.path.exists(path):
+                os.remove(path)
+
+@app.route('/api/v1/jobs', methods=['POST'])
+def create_detection_job():
+    """
+    Queue an RRB detection job and return immediately
+
+    Expected: multipart/form-data with 'video' file
+              optional 'mode' field ('standard' or 'enhanced', default 'standard')
+              optional 'include_pose' field for enhanced jobs (default 'true')
+    Returns: 202 with the job id; poll GET /api/v1/jobs/<job_id> for progress and result
+    """
+    try:
+        if 'video' not in request.files:
+            return jsonify({
+                'success': False,
+                'error': 'No video file provided'
+            }), 400
+
+        file = request.files['video']
+
+        if file.filename == '' or not allowed_file(file.filename):
+            return jsonify({
+                'success': False,
+                'error': f'Invalid file. Allowed types: {Config.ALLOWED_EXTENSIONS}'
+            }), 400
+
+        mode = request.form.get('mode', 'standard').lower()
+        if mode not in ('standard', 'enhanced'):
+            return jsonify({
+                'success': False,
+                'error': f"Invalid mode '{mode}'. Use 'standard' or 'enhanced'"
+            }), 400
+        include_pose = request.form.get('include_pose', 'true').lower() not in ('false', '0', 'no')
+
+        filename = secure_filename(file.filename)
+        upload_path = os.path.join(Config.UPLOAD_FOLDER, f"{uuid.uuid4()}_{filename}")
+        file.save(upload_path)
+
+        def discard_upload():
+            if os.path.exists(upload_path):
+                os.remove(upload_path)
+
+        size_error = file_size_error(upload_path)
+        if size_error:
+            discard_upload()
+            return jsonify({
+                'success': False,
+                'error': size_error,
+                'details': 'Please use a shorter video or reduce the video quality/resolution.'
+            }), 400
+
+        try:
+            job_id = job_manager.submit(
+                run_detection_job, upload_path, filename,
+                enhanced=(mode == 'enhanced'), include_pose=include_pose,
+                on_discard=discard_upload
+            )
+        except JobQueueFull as e:
+            logger.warning(f"Rejected detection job for {filename}: {e}")
+            return jsonify({
+                'success': False,
+                'error': 'Too many detection jobs in progress',
+                'details': 'Please retry in a few minutes.'
+            }), 503
+
+        logger.info(f"Queued detection job {job_id} for {filename} ({mode})")
+
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'status': 'queued',
+            'status_url': f'/api/v1/jobs/{job_id}'
+        }), 202
+
+    except Exception as e:
+        logger.error(f"Error creating detection job: {str(e)}", exc_info=True)
+
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'traceback': traceback.format_exc() if Config.DEBUG else None
+        }), 500
+
+@app.route('/api/v1/jobs/<job_id>', methods=['GET'])
+def get_detection_job(job_id):
+    """
+    Get status, stage progress and (once finished) the result of a detection job
+
+    Returns: JSON job status; 404 if the job is unknown or its result has expired
+    """
+    job = job_manager.get(job_id)
+
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found',
+            'details': f'Results are kept for {Config.JOB_RESULT_TTL} seconds after a job finishes.'
+        }), 404
+
+    return jsonify(dict(job, success=job['status'] != 'failed')), 200
+
 @app.route('/api/v1/model/info', methods=['GET'])
 def model_info():
     """Get model information"""
@@ -440,8 +881,12 @@ if __name__ == '__main__':
     print(f"Model path: {Config.MODEL_PATH}")
     print(f"Confidence threshold: {Config.CONFIDENCE_THRESHOLD}")
     print(f"Min detection duration: {Config.MIN_DETECTION_DURATION}s")
+    print(f"Preload model: {Config.PRELOAD_MODEL}")
     print("=" * 80)
     
+    if Config.PRELOAD_MODEL:
+        preload_inference_engine()
+    
     app.run(
         host='0.0.0.0',
         port=Config.PORT,
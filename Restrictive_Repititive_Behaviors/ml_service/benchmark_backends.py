@@ -0,0 +1,188 @@
+"""
+Benchmark inference backends (Keras / TFLite / ONNX Runtime)
+
+Every model runs in a fresh subprocess so cold-start time and memory are
+measured in isolation: import + load time, time to the first prediction,
+peak RSS, per-window latency (batch of 1) and throughput on a larger batch.
+All backends see the same uint8 windows; the first model listed is the
+reference for prediction agreement.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import tempfile
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1024 ** 2 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def run_worker(args):
+    """Subprocess body: load one model, time it and save its predictions"""
+    start = time.perf_counter()
+    os.environ['TF_USE_LEGACY_KERAS'] = '1'
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+    from utils.inference_backends import load_backend
+
+    backend = load_backend(args.model, backend=args.backend, num_threads=args.threads)
+    load_seconds = time.perf_counter() - start
+
+    windows = np.load(args.windows_file)
+    windows = windows.astype(backend.input_dtype, copy=False)
+    if backend.input_dtype != np.uint8:
+        windows = windows / np.float32(255.0)
+
+    backend.predict(windows[:1])
+    first_prediction_seconds = time.perf_counter() - start
+
+    latencies = []
+    for _ in range(args.repeats):
+        for window in windows:
+            window_start = time.perf_counter()
+            backend.predict(window[np.newaxis])
+            latencies.append(time.perf_counter() - window_start)
+
+    # Untimed pass so graph tracing for the larger batch shape is not counted
+    backend.predict(windows)
+    batch_start = time.perf_counter()
+    probabilities = backend.predict(windows)
+    batch_seconds = time.perf_counter() - batch_start
+
+    np.save(args.output_file, np.asarray(probabilities, dtype=np.float32))
+    print(json.dumps({
+        'backend': backend.name,
+        'load_seconds': load_seconds,
+        'first_prediction_seconds': first_prediction_seconds,
+        'peak_rss_mb': peak_rss_mb(),
+        'latency_ms_median': float(np.median(latencies) * 1000),
+        'latency_ms_p95': float(np.percentile(latencies, 95) * 1000),
+        'batch_windows_per_second': len(windows) / batch_seconds
+    }))
+
+
+def load_windows(args, sequence_length, img_size):
+    """uint8 windows from a video, or synthetic frames"""
+    if args.video_path:
+        from utils.video_processor import VideoProcessor
+
+        processor = VideoProcessor(img_size=img_size)
+        frames = processor.extract_frames(args.video_path)
+        sequences = processor.create_sequences(frames, sequence_length, overlap=0.5)
+        return np.stack(sequences[:args.num_windows]).astype(np.uint8)
+
+    rng = np.random.default_rng(42)
+    return rng.integers(0, 256, size=(args.num_windows, sequence_length, img_size[1], img_size[0], 3),
+                        dtype=np.uint8)
+
+
+def main(args):
+    print("=" * 80)
+    print("Inference Backend Benchmark")
+    print("=" * 80)
+
+    models = []
+    for spec in args.models:
+        name, _, path = spec.partition('=')
+        if not path:
+            name, path = os.path.splitext(os.path.basename(spec))[0], spec
+        if not os.path.exists(path):
+            print(f"Error: model not found: {path}")
+            return
+        models.append((name, path))
+
+    windows = load_windows(args, args.sequence_length, (args.img_size, args.img_size))
+    print(f"\nWindows: {len(windows)} x {windows.shape[1]} frames "
+          f"({'video ' + args.video_path if args.video_path else 'synthetic'})")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        windows_file = os.path.join(tmp_dir, 'windows.npy')
+        np.save(windows_file, windows)
+
+        for name, path in models:
+            print(f"Running {name} ({path})...")
+            output_file = os.path.join(tmp_dir, f'{len(results)}_probabilities.npy')
+            command = [sys.executable, os.path.abspath(__file__), '--worker',
+                       '--model', path, '--backend', args.backend,
+                       '--windows_file', windows_file, '--output_file', output_file,
+                       '--repeats', str(args.repeats)]
+            if args.threads:
+                command += ['--threads', str(args.threads)]
+
+            completed = subprocess.run(command, capture_output=True, text=True)
+            if completed.returncode != 0:
+                print(f"  Failed:\n{completed.stderr[-2000:]}")
+                continue
+
+            stats = json.loads(completed.stdout.strip().splitlines()[-1])
+            stats.update({'name': name, 'size_mb': os.path.getsize(path) / 1024 ** 2,
+                          'probabilities': np.load(output_file)})
+            results.append(stats)
+
+    if not results:
+        return
+
+    reference = results[0]
+    print(f"\n{'model':<14}{'size MB':>9}{'load s':>9}{'1st pred s':>12}{'peak RSS MB':>13}"
+          f"{'ms/window':>11}{'p95 ms':>9}{'win/s':>8}{'agree':>8}{'max |dp|':>10}")
+    print("-" * 103)
+    for stats in results:
+        probs = stats['probabilities']
+        agreement = float(np.mean(probs.argmax(axis=1) == reference['probabilities'].argmax(axis=1)))
+        max_diff = float(np.max(np.abs(probs - reference['probabilities'])))
+        rss = f"{stats['peak_rss_mb']:.0f}" if stats['peak_rss_mb'] is not None else 'n/a'
+        print(f"{stats['name']:<14}{stats['size_mb']:>9.1f}{stats['load_seconds']:>9.2f}"
+              f"{stats['first_prediction_seconds']:>12.2f}{rss:>13}"
+              f"{stats['latency_ms_median']:>11.1f}{stats['latency_ms_p95']:>9.1f}"
+              f"{stats['batch_windows_per_second']:>8.1f}{agreement:>8.1%}{max_diff:>10.2e}")
+
+    print("\n" + "=" * 80)
+    print(f"Agreement and probability differences are relative to '{reference['name']}'")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark Keras / TFLite / ONNX inference backends')
+
+    parser.add_argument('--models', type=str, nargs='+', default=['models/rrb_classifier.h5'],
+                       help='Models as name=path (the first one is the reference)')
+    parser.add_argument('--backend', type=str, default='auto',
+                       choices=['auto', 'keras', 'tflite', 'onnx'],
+                       help='Backend for every model (auto picks by file extension)')
+    parser.add_argument('--video_path', type=str,
+                       help='Video to take windows from (synthetic frames if omitted)')
+    parser.add_argument('--num_windows', type=int, default=16,
+                       help='Number of windows to predict')
+    parser.add_argument('--sequence_length', type=int, default=30,
+                       help='Number of frames per sequence')
+    parser.add_argument('--img_size', type=int, default=224,
+                       help='Image size (height and width)')
+    parser.add_argument('--repeats', type=int, default=3,
+                       help='Timed passes over the windows for per-window latency')
+    parser.add_argument('--threads', type=int, default=None,
+                       help='Threads for TFLite / ONNX Runtime')
+
+    # Internal: one backend per subprocess
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--model', type=str, help=argparse.SUPPRESS)
+    parser.add_argument('--windows_file', type=str, help=argparse.SUPPRESS)
+    parser.add_argument('--output_file', type=str, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+    if args.worker:
+        run_worker(args)
+    else:
+        main(args)
@@ -0,0 +1,121 @@
+"""
+Benchmark batched multi-video detection against per-video detection
+
+Runs detect_rrb on each video in turn (one model.predict per video, sized
+by its sequence count) and then batch_detect (parallel decode, fixed-size
+batches packed across videos), and reports throughput and whether both
+paths agree on every video.
+"""
+import os
+os.environ['TF_USE_LEGACY_KERAS'] = '1'
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from utils.inference import RRBInference
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv')
+
+
+def find_videos(args):
+    """Collect the videos to benchmark"""
+    if args.video_paths:
+        return args.video_paths[:args.max_videos]
+
+    videos = []
+    for root, _, files in os.walk(args.dataset_root):
+        for name in sorted(files):
+            if name.lower().endswith(VIDEO_EXTENSIONS):
+                videos.append(os.path.join(root, name))
+    return sorted(videos)[:args.max_videos]
+
+
+def main(args):
+    print("=" * 80)
+    print("Batch Detection Benchmark: per-video vs scheduled batches")
+    print("=" * 80)
+
+    videos = find_videos(args)
+    if not videos:
+        print(f"Error: no videos found (dataset_root={args.dataset_root})")
+        return
+
+    engine = RRBInference(
+        model_path=args.model_path,
+        label_encoder_path=args.label_encoder_path,
+        sequence_length=Config.SEQUENCE_LENGTH,
+        img_size=Config.IMG_SIZE,
+        confidence_threshold=Config.CONFIDENCE_THRESHOLD,
+        min_duration=Config.MIN_DETECTION_DURATION
+    )
+
+    # Warm up both code paths so graph tracing is not timed
+    engine.detect_rrb(videos[0])
+    engine.batch_detect(videos[:1], batch_size=args.batch_size, num_workers=args.workers)
+
+    print(f"\nVideos: {len(videos)}")
+
+    start = time.perf_counter()
+    sequential = [engine.detect_rrb(path) for path in videos]
+    sequential_seconds = time.perf_counter() - start
+
+    batched, metrics = engine.batch_detect(videos, batch_size=args.batch_size,
+                                           num_workers=args.workers, return_metrics=True)
+    batched_seconds = metrics['wall_seconds']
+
+    mismatches = []
+    max_confidence_diff = 0.0
+    for path, seq_result, batch_result in zip(videos, sequential, batched):
+        if seq_result['primary_behavior'] != batch_result['primary_behavior']:
+            mismatches.append(path)
+        max_confidence_diff = max(max_confidence_diff,
+                                  abs(seq_result['confidence'] - batch_result['confidence']))
+
+    print(f"\n{'path':<12}{'seconds':>10}{'videos/s':>10}{'model calls':>13}")
+    print("-" * 45)
+    print(f"{'per-video':<12}{sequential_seconds:>10.2f}{len(videos) / sequential_seconds:>10.2f}"
+          f"{len(videos):>13}")
+    print(f"{'batched':<12}{batched_seconds:>10.2f}{metrics['videos_per_second']:>10.2f}"
+          f"{metrics['batches']:>13}")
+
+    print(f"\nScheduler: batch size {metrics['batch_size']}, {metrics['num_workers']} decode workers")
+    print(f"  Windows: {metrics['windows']} (padding {metrics['padded_windows']}, "
+          f"batch fill {metrics['batch_fill']:.1%})")
+    print(f"  Decode time (sum over workers): {metrics['decode_seconds']:.2f}s")
+    print(f"  Predict time: {metrics['predict_seconds']:.2f}s")
+    print(f"  Failed videos: {metrics['failed_videos']}")
+
+    print("\n" + "=" * 80)
+    print(f"Speed-up: {sequential_seconds / batched_seconds:.2f}x")
+    print(f"Primary behavior agrees on {len(videos) - len(mismatches)}/{len(videos)} videos "
+          f"(max confidence difference {max_confidence_diff:.2e})")
+    for path in mismatches:
+        print(f"  Mismatch: {path}")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark batched multi-video detection')
+
+    parser.add_argument('--video_paths', type=str, nargs='+',
+                       help='Videos to benchmark (overrides --dataset_root)')
+    parser.add_argument('--dataset_root', type=str, default='../Dataset',
+                       help='Dataset root to take videos from')
+    parser.add_argument('--max_videos', type=int, default=20,
+                       help='Maximum number of videos')
+    parser.add_argument('--model_path', type=str, default=Config.MODEL_PATH,
+                       help='Trained model')
+    parser.add_argument('--label_encoder_path', type=str, default=Config.LABEL_ENCODER_PATH,
+                       help='Label encoder of the model')
+    parser.add_argument('--batch_size', type=int, default=Config.BATCH_INFERENCE_SIZE,
+                       help='Sequences per model call')
+    parser.add_argument('--workers', type=int, default=Config.BATCH_DECODE_WORKERS,
+                       help='Threads decoding videos')
+
+    args = parser.parse_args()
+    main(args)
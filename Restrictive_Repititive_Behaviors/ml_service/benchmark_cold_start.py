@@ -0,0 +1,163 @@
+"""
+Benchmark cold vs warm first-request latency of the RRB inference engine
+
+Each scenario runs in a fresh subprocess, like a newly started worker:
+    cold  lazy loading: the first request imports the runtime, loads the
+          model and traces the graph before predicting
+    warm  preloading: runtime import, model load and warm_up() happen at
+          startup, so the first request only predicts
+Steady-state latency (later requests) is reported for both.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_windows(args):
+    """uint8 windows from a video, or synthetic frames"""
+    if args.video_path:
+        from utils.video_processor import VideoProcessor
+
+        processor = VideoProcessor(img_size=(args.img_size, args.img_size))
+        frames = processor.extract_frames(args.video_path)
+        sequences = processor.create_sequences(frames, args.sequence_length, overlap=0.5)
+        return np.stack(sequences[:args.num_windows]).astype(np.uint8)
+
+    rng = np.random.default_rng(42)
+    return rng.integers(0, 256, size=(args.num_windows, args.sequence_length, args.img_size, args.img_size, 3),
+                        dtype=np.uint8)
+
+
+def run_worker(args):
+    """Subprocess body: start an engine the lazy or the preloaded way and time requests"""
+    process_start = time.perf_counter()
+    os.environ['TF_USE_LEGACY_KERAS'] = '1'
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+
+    windows = load_windows(args)
+
+    def make_engine():
+        from utils.inference import RRBInference
+
+        return RRBInference(
+            model_path=args.model_path,
+            label_encoder_path=args.label_encoder_path,
+            sequence_length=args.sequence_length,
+            img_size=(args.img_size, args.img_size),
+            backend=args.backend
+        )
+
+    def request(engine):
+        start = time.perf_counter()
+        engine.predict_sequences(windows)
+        return time.perf_counter() - start
+
+    startup_seconds = 0.0
+    if args.scenario == 'warm':
+        start = time.perf_counter()
+        engine = make_engine()
+        engine.warm_up(batch_sizes=(len(windows),))
+        startup_seconds = time.perf_counter() - start
+
+        first_request = request(engine)
+    else:
+        # The first request pays for the import, the model load and tracing
+        start = time.perf_counter()
+        engine = make_engine()
+        engine.predict_sequences(windows)
+        first_request = time.perf_counter() - start
+
+    steady = [request(engine) for _ in range(args.repeats)]
+
+    print(json.dumps({
+        'scenario': args.scenario,
+        'startup_seconds': startup_seconds,
+        'first_request_seconds': first_request,
+        'steady_request_seconds': float(np.median(steady)),
+        'process_seconds': time.perf_counter() - process_start
+    }))
+
+
+def main(args):
+    print("=" * 80)
+    print("Inference Engine Cold vs Warm Start Benchmark")
+    print("=" * 80)
+
+    for path in (args.model_path, args.label_encoder_path):
+        if not os.path.exists(path):
+            print(f"Error: not found: {path}")
+            return
+
+    print(f"\nModel: {args.model_path} (backend: {args.backend})")
+    print(f"Request: {args.num_windows} windows "
+          f"({'video ' + args.video_path if args.video_path else 'synthetic frames'})")
+
+    results = {}
+    for scenario in ('cold', 'warm'):
+        print(f"Running {scenario} start...")
+        command = [sys.executable, os.path.abspath(__file__), '--worker', '--scenario', scenario,
+                   '--model_path', args.model_path, '--label_encoder_path', args.label_encoder_path,
+                   '--backend', args.backend, '--num_windows', str(args.num_windows),
+                   '--sequence_length', str(args.sequence_length), '--img_size', str(args.img_size),
+                   '--repeats', str(args.repeats)]
+        if args.video_path:
+            command += ['--video_path', args.video_path]
+
+        completed = subprocess.run(command, capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(f"  Failed:\n{completed.stderr[-2000:]}")
+            return
+        results[scenario] = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    cold, warm = results['cold'], results['warm']
+
+    print("\n" + "-" * 80)
+    print(f"{'':<28}{'cold (lazy)':>16}{'warm (preload)':>18}")
+    print("-" * 80)
+    print(f"{'Startup before serving':<28}{cold['startup_seconds']:>15.2f}s{warm['startup_seconds']:>17.2f}s")
+    print(f"{'First request':<28}{cold['first_request_seconds']:>15.2f}s{warm['first_request_seconds']:>17.2f}s")
+    print(f"{'Later requests (median)':<28}{cold['steady_request_seconds']:>15.2f}s"
+          f"{warm['steady_request_seconds']:>17.2f}s")
+
+    print("\n" + "=" * 80)
+    print(f"First-request speed-up with preloading: "
+          f"{cold['first_request_seconds'] / warm['first_request_seconds']:.1f}x")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark cold vs warm start of the inference engine')
+
+    parser.add_argument('--model_path', type=str, default='models/rrb_classifier.h5',
+                       help='Trained model')
+    parser.add_argument('--label_encoder_path', type=str, default='models/label_encoder.pkl',
+                       help='Label encoder')
+    parser.add_argument('--backend', type=str, default='auto',
+                       choices=['auto', 'keras', 'tflite', 'onnx'],
+                       help='Inference backend (requests are frame windows)')
+    parser.add_argument('--video_path', type=str,
+                       help='Video to take request windows from (synthetic frames if omitted)')
+    parser.add_argument('--num_windows', type=int, default=8,
+                       help='Windows per request')
+    parser.add_argument('--sequence_length', type=int, default=30,
+                       help='Number of frames per sequence')
+    parser.add_argument('--img_size', type=int, default=224,
+                       help='Image size (height and width)')
+    parser.add_argument('--repeats', type=int, default=5,
+                       help='Requests timed after the first one')
+
+    # Internal: one scenario per subprocess
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--scenario', type=str, choices=['cold', 'warm'], help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+    if args.worker:
+        run_worker(args)
+    else:
+        main(args)
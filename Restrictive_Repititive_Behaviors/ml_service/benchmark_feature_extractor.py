@@ -0,0 +1,113 @@
+"""
+Benchmark the batched FeatureExtractor against the per-body-part loop
+
+Checks that features_to_vector gives identical vectors for both paths and
+reports the speed-up for different video lengths. Landmarks come from a
+cached video (--video_path, runs pose once through the landmark cache) or
+are synthetic random walks.
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.feature_extractor import FeatureExtractor
+
+
+def synthetic_landmarks(num_frames, rng):
+    """Smooth random-walk landmarks with some undetected (zero) frames"""
+    steps = rng.normal(0, 0.005, size=(num_frames, 33, 4))
+    landmarks = np.clip(0.5 + np.cumsum(steps, axis=0), 0, 1)
+    landmarks[rng.random(num_frames) < 0.05] = 0.0
+    return list(landmarks.reshape(num_frames, 132))
+
+
+def video_landmarks(args):
+    """Landmarks of a real video, extracted once and kept in the landmark cache"""
+    from utils.pose_estimator import PoseEstimator
+    from utils.landmark_cache import LandmarkCache
+
+    cache = LandmarkCache(args.landmark_cache_dir)
+    landmarks, _, fps = cache.get_or_compute(video_path=args.video_path,
+                                             pose_estimator=PoseEstimator.from_mode(args.pose_mode))
+    return LandmarkCache.to_sequence(landmarks), fps
+
+
+def time_call(fn, landmarks, repeats):
+    """Best-of-N wall time of fn(landmarks)"""
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(landmarks)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(args):
+    print("=" * 80)
+    print("FeatureExtractor Benchmark: per-part loop vs batched")
+    print("=" * 80)
+
+    rng = np.random.default_rng(42)
+
+    if args.video_path:
+        full_landmarks, fps = video_landmarks(args)
+        lengths = [n for n in args.frames if n <= len(full_landmarks)] or [len(full_landmarks)]
+        print(f"\nVideo: {args.video_path} ({len(full_landmarks)} frames @ {fps} fps)")
+    else:
+        fps = args.fps
+        full_landmarks = synthetic_landmarks(max(args.frames), rng)
+        lengths = args.frames
+        print(f"\nSynthetic landmarks @ {fps} fps")
+
+    extractor = FeatureExtractor(fps=fps)
+
+    print(f"\n{'frames':>8}{'loop (ms)':>12}{'batched (ms)':>14}{'speed-up':>10}{'identical':>11}")
+    print("-" * 55)
+
+    all_identical = True
+    for num_frames in lengths:
+        landmarks = full_landmarks[:num_frames]
+
+        loop_time, loop_features = time_call(extractor.extract_all_features_loop, landmarks, args.repeats)
+        batched_time, batched_features = time_call(extractor.extract_all_features, landmarks, args.repeats)
+
+        identical = (list(loop_features) == list(batched_features) and
+                     np.array_equal(extractor.features_to_vector(loop_features),
+                                    extractor.features_to_vector(batched_features)))
+        all_identical = all_identical and identical
+
+        print(f"{num_frames:>8}{loop_time * 1000:>12.2f}{batched_time * 1000:>14.2f}"
+              f"{loop_time / batched_time:>9.1f}x{str(identical):>11}")
+
+    print("\n" + "=" * 80)
+    print(f"Feature vectors identical: {all_identical}")
+    print("=" * 80)
+
+    if not all_identical:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the batched FeatureExtractor')
+
+    parser.add_argument('--video_path', type=str,
+                       help='Video to extract landmarks from (synthetic landmarks if omitted)')
+    parser.add_argument('--pose_mode', type=str, default='accurate',
+                       choices=['accurate', 'balanced', 'fast'],
+                       help='Pose estimation preset for --video_path')
+    parser.add_argument('--landmark_cache_dir', type=str, default='cache/landmarks',
+                       help='Landmark cache used for --video_path')
+    parser.add_argument('--frames', type=int, nargs='+', default=[90, 300, 900, 1800, 9000],
+                       help='Sequence lengths to benchmark')
+    parser.add_argument('--fps', type=int, default=30,
+                       help='Frame rate for synthetic landmarks')
+    parser.add_argument('--repeats', type=int, default=5,
+                       help='Timed repetitions per length (best is reported)')
+
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,157 @@
+"""
+Benchmark pose estimation modes (accurate / balanced / fast)
+
+Each video is decoded once and every mode runs on the same frames. The
+'accurate' mode (model_complexity=2, every frame, full resolution) is the
+reference for the accuracy numbers.
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.pose_estimator import PoseEstimator, POSE_MODES
+from utils.feature_extractor import FeatureExtractor
+from utils.video_processor import VideoProcessor
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv')
+
+
+def find_videos(args):
+    """Collect the videos to benchmark"""
+    if args.video_paths:
+        return args.video_paths[:args.max_videos]
+
+    videos = []
+    for root, _, files in os.walk(args.dataset_root):
+        for name in sorted(files):
+            if name.lower().endswith(VIDEO_EXTENSIONS):
+                videos.append(os.path.join(root, name))
+    return sorted(videos)[:args.max_videos]
+
+
+def run_mode(mode, frames, fps):
+    """Run one pose mode over decoded frames"""
+    estimator = PoseEstimator.from_mode(mode)
+
+    start = time.perf_counter()
+    landmarks, pose_mask = estimator.process_frames(frames, return_mask=True)
+    elapsed = time.perf_counter() - start
+
+    feature_extractor = FeatureExtractor(fps=fps)
+    features = feature_extractor.extract_all_features(landmarks)
+    return {
+        'seconds': elapsed,
+        'landmarks': np.stack(landmarks),
+        'pose_mask': pose_mask,
+        'feature_vector': feature_extractor.features_to_vector(features)
+    }
+
+
+def compare_to_reference(result, reference, key_landmarks):
+    """Landmark and feature error of a mode against the accurate mode"""
+    valid = reference['pose_mask']
+    if not valid.any():
+        return np.nan, np.nan
+
+    ref = reference['landmarks'][valid].reshape(-1, 33, 4)[:, key_landmarks, :2]
+    out = result['landmarks'][valid].reshape(-1, 33, 4)[:, key_landmarks, :2]
+    landmark_error = float(np.mean(np.linalg.norm(ref - out, axis=-1)))
+
+    ref_vec = reference['feature_vector']
+    feature_error = float(np.linalg.norm(result['feature_vector'] - ref_vec) /
+                          (np.linalg.norm(ref_vec) + 1e-10))
+    return landmark_error, feature_error
+
+
+def main(args):
+    print("=" * 80)
+    print("Pose Estimation Mode Benchmark")
+    print("=" * 80)
+
+    videos = find_videos(args)
+    if not videos:
+        print(f"Error: no videos found (dataset_root={args.dataset_root})")
+        return
+
+    # 'accurate' runs first: it is the reference the other modes are compared to
+    modes = ['accurate'] + [m for m in args.modes if m != 'accurate']
+
+    video_processor = VideoProcessor()
+    key_landmarks = [0, 2, 5, 7, 8, 11, 12, 13, 14, 15, 16, 23, 24]
+    totals = {mode: {'seconds': 0.0, 'frames': 0, 'observed': 0,
+                     'landmark_error': [], 'feature_error': []} for mode in modes}
+
+    for i, video_path in enumerate(videos):
+        info = video_processor.get_video_info(video_path)
+        fps = info['fps'] or 30
+        frames = list(video_processor.iter_frames(video_path, max_frames=args.max_frames))
+        if not frames:
+            print(f"Skipping {video_path}: no frames decoded")
+            continue
+
+        print(f"\n[{i+1}/{len(videos)}] {os.path.basename(video_path)} "
+              f"({len(frames)} frames, {info['width']}x{info['height']} @ {fps} fps)")
+
+        reference = None
+        for mode in modes:
+            result = run_mode(mode, frames, fps)
+            if mode == 'accurate':
+                reference = result
+
+            stats = totals[mode]
+            stats['seconds'] += result['seconds']
+            stats['frames'] += len(frames)
+            stats['observed'] += int(result['pose_mask'].sum())
+
+            landmark_error, feature_error = compare_to_reference(result, reference, key_landmarks)
+            if mode != 'accurate' and not np.isnan(landmark_error):
+                stats['landmark_error'].append(landmark_error)
+                stats['feature_error'].append(feature_error)
+
+            print(f"  {mode:<9} {result['seconds'] / len(frames) * 1000:7.1f} ms/frame   "
+                  f"detected {result['pose_mask'].mean() * 100:5.1f}%   "
+                  f"landmark err {landmark_error:.4f}")
+
+    print("\n" + "=" * 80)
+    print("SUMMARY")
+    print("=" * 80)
+    print(f"{'mode':<10}{'complexity':>11}{'stride':>8}{'max dim':>9}"
+          f"{'ms/frame':>10}{'speed-up':>10}{'detected':>10}{'lm err':>9}{'feat err':>10}")
+
+    ref_ms = totals['accurate']['seconds'] / max(totals['accurate']['frames'], 1) * 1000
+    for mode in modes:
+        stats = totals[mode]
+        settings = POSE_MODES[mode]
+        ms = stats['seconds'] / max(stats['frames'], 1) * 1000
+        landmark_error = np.mean(stats['landmark_error']) if stats['landmark_error'] else 0.0
+        feature_error = np.mean(stats['feature_error']) if stats['feature_error'] else 0.0
+        print(f"{mode:<10}{settings['model_complexity']:>11}{settings['frame_stride']:>8}"
+              f"{str(settings['max_input_dim']):>9}{ms:>10.1f}{ref_ms / ms:>9.2f}x"
+              f"{stats['observed'] / max(stats['frames'], 1) * 100:>9.1f}%"
+              f"{landmark_error:>9.4f}{feature_error * 100:>9.1f}%")
+
+    print("\nlm err: mean 2D distance of key landmarks vs accurate (normalized image units)")
+    print("feat err: relative L2 difference of the kinematic feature vector vs accurate")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark pose estimation modes')
+
+    parser.add_argument('--video_paths', type=str, nargs='+',
+                       help='Videos to benchmark (overrides --dataset_root)')
+    parser.add_argument('--dataset_root', type=str, default='../Dataset',
+                       help='Directory searched for videos')
+    parser.add_argument('--max_videos', type=int, default=5,
+                       help='Maximum number of videos to benchmark')
+    parser.add_argument('--max_frames', type=int, default=300,
+                       help='Maximum frames decoded per video')
+    parser.add_argument('--modes', type=str, nargs='+', default=list(POSE_MODES),
+                       choices=list(POSE_MODES),
+                       help='Pose modes to compare')
+
+    args = parser.parse_args()
+    main(args)
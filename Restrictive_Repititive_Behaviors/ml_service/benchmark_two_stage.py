@@ -0,0 +1,127 @@
+"""
+Benchmark end-to-end vs two-stage inference for the RRB CNN+LSTM model
+
+End-to-end: every window runs MobileNetV2 on all of its frames, so with
+50% overlap each frame is embedded twice
+Two-stage: each frame is embedded once, windows of embeddings go to the
+LSTM head (split_two_stage_model shares the weights of the same model)
+"""
+import os
+os.environ['TF_USE_LEGACY_KERAS'] = '1'
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from tensorflow import keras
+from models.rrb_model import RRBClassifier, build_uint8_serving_model, split_two_stage_model
+from utils.embedding_cache import embed_frames, embedding_windows
+from utils.video_processor import VideoProcessor
+
+
+def load_frames(args, video_processor):
+    """Decode frames from a video or generate synthetic ones"""
+    if args.video_path:
+        frames = video_processor.extract_frames(args.video_path, max_frames=args.num_frames)
+        if len(frames) == 0:
+            raise ValueError(f"No frames extracted from {args.video_path}")
+        return frames
+
+    rng = np.random.default_rng(42)
+    return [rng.integers(0, 256, (args.img_size, args.img_size, 3), dtype=np.uint8)
+            for _ in range(args.num_frames)]
+
+
+def time_path(name, run, repeats):
+    """Time a prediction function after one warm-up call"""
+    predictions = run()
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predictions = run()
+        timings.append(time.perf_counter() - start)
+
+    mean_time = float(np.mean(timings))
+    print(f"\n{name}")
+    print("-" * 80)
+    print(f"  Mean time per video:    {mean_time:.3f}s")
+    print(f"  Throughput:             {len(predictions) / mean_time:.2f} windows/s")
+
+    return mean_time, predictions
+
+
+def main(args):
+    print("=" * 80)
+    print("RRB Inference Benchmark: end-to-end vs two-stage")
+    print("=" * 80)
+
+    img_size = (args.img_size, args.img_size)
+    video_processor = VideoProcessor(img_size=img_size)
+
+    if args.model_path:
+        model = keras.models.load_model(args.model_path)
+    else:
+        classifier = RRBClassifier(sequence_length=args.sequence_length, img_size=img_size)
+        model = classifier.build_cnn_lstm_model(use_pretrained=args.use_pretrained)
+
+    encoder, head = split_two_stage_model(model)
+    model = build_uint8_serving_model(model)
+    encoder = build_uint8_serving_model(encoder)
+    sequence_length = model.inputs[0].shape[1]
+
+    frames = load_frames(args, video_processor)
+    sequences = np.stack(video_processor.create_sequences(frames, sequence_length, overlap=0.5))
+    print(f"\nFrames: {len(frames)} at {img_size[0]}x{img_size[1]}, windows: {len(sequences)}")
+    print(f"Backbone passes: {sequences.shape[0] * sequences.shape[1]} end-to-end, {len(frames)} two-stage")
+
+    def end_to_end():
+        return model.predict(sequences.astype(np.uint8, copy=False), batch_size=args.batch_size, verbose=0)
+
+    def two_stage():
+        embeddings = embed_frames(encoder, frames, batch_size=args.batch_size * sequence_length)
+        windows = embedding_windows(embeddings, sequence_length, overlap=0.5)
+        return head.predict(windows, batch_size=args.batch_size, verbose=0)
+
+    end_to_end_time, end_to_end_predictions = time_path('End-to-end (frames per window)', end_to_end, args.repeats)
+    two_stage_time, two_stage_predictions = time_path('Two-stage (frames embedded once)', two_stage, args.repeats)
+
+    max_diff = float(np.max(np.abs(end_to_end_predictions - two_stage_predictions)))
+    agreement = float(np.mean(
+        np.argmax(end_to_end_predictions, axis=1) == np.argmax(two_stage_predictions, axis=1)
+    ))
+
+    print("\n" + "=" * 80)
+    print("SUMMARY")
+    print("=" * 80)
+    print(f"Speed-up:                  {end_to_end_time / two_stage_time:.2f}x")
+    print(f"Max probability diff:      {max_diff:.2e}")
+    print(f"Top-1 agreement:           {agreement * 100:.1f}%")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark end-to-end vs two-stage inference')
+
+    parser.add_argument('--video_path', type=str,
+                       help='Video to decode (synthetic frames are used if omitted)')
+    parser.add_argument('--model_path', type=str,
+                       help='Trained CNN-LSTM model (a fresh model is built if omitted)')
+    parser.add_argument('--use_pretrained', action='store_true',
+                       help='Use ImageNet weights when building a fresh model')
+    parser.add_argument('--num_frames', type=int, default=300,
+                       help='Number of frames to benchmark')
+    parser.add_argument('--sequence_length', type=int, default=30,
+                       help='Number of frames per sequence')
+    parser.add_argument('--img_size', type=int, default=224,
+                       help='Image size (height and width)')
+    parser.add_argument('--batch_size', type=int, default=8,
+                       help='Windows per model call')
+    parser.add_argument('--repeats', type=int, default=3,
+                       help='Timed repetitions per path')
+
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,153 @@
+"""
+Benchmark float32 vs uint8 input paths for the RRB CNN+LSTM model
+
+Float path: frames are normalized to [0, 1] in NumPy before model.predict
+uint8 path: frames stay uint8 and are scaled by the model's first layer
+"""
+import os
+os.environ['TF_USE_LEGACY_KERAS'] = '1'
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+
+import sys
+import time
+import argparse
+import tracemalloc
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from tensorflow import keras
+from models.rrb_model import RRBClassifier, build_uint8_serving_model
+from utils.video_processor import VideoProcessor
+
+
+def load_frames(args, video_processor):
+    """Decode frames from a video or generate synthetic ones"""
+    if args.video_path:
+        frames = video_processor.extract_frames(args.video_path, max_frames=args.num_frames)
+        if len(frames) == 0:
+            raise ValueError(f"No frames extracted from {args.video_path}")
+        return frames
+
+    rng = np.random.default_rng(42)
+    return [rng.integers(0, 256, (args.img_size, args.img_size, 3), dtype=np.uint8)
+            for _ in range(args.num_frames)]
+
+
+def float_path(video_processor, frames, sequence_length):
+    """Original preprocessing: per-sequence float32 normalization"""
+    sequences = video_processor.create_sequences(frames, sequence_length, overlap=0.5)
+    sequences = [video_processor.normalize_frames(seq) for seq in sequences]
+    return np.array(sequences)
+
+
+def uint8_path(video_processor, frames, sequence_length):
+    """uint8 preprocessing: scaling is left to the model graph"""
+    sequences = video_processor.create_sequences(frames, sequence_length, overlap=0.5)
+    return np.stack(sequences).astype(np.uint8, copy=False)
+
+
+def run_path(name, preprocess, model, video_processor, frames, args):
+    """Measure peak preprocessing memory and end-to-end throughput"""
+    tracemalloc.start()
+    batch = preprocess(video_processor, frames, args.sequence_length)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Warm-up to exclude graph tracing from timings
+    model.predict(batch[:args.batch_size], batch_size=args.batch_size, verbose=0)
+
+    timings = []
+    predictions = None
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        batch = preprocess(video_processor, frames, args.sequence_length)
+        predictions = model.predict(batch, batch_size=args.batch_size, verbose=0)
+        timings.append(time.perf_counter() - start)
+
+    mean_time = float(np.mean(timings))
+    result = {
+        'name': name,
+        'dtype': str(batch.dtype),
+        'input_mb': batch.nbytes / (1024 * 1024),
+        'peak_preprocess_mb': peak_bytes / (1024 * 1024),
+        'seconds': mean_time,
+        'windows_per_sec': len(batch) / mean_time,
+        'predictions': predictions
+    }
+
+    print(f"\n{name}")
+    print("-" * 80)
+    print(f"  Input dtype:            {result['dtype']}")
+    print(f"  Input batch size:       {result['input_mb']:.1f} MB ({len(batch)} windows)")
+    print(f"  Peak preprocess memory: {result['peak_preprocess_mb']:.1f} MB")
+    print(f"  Mean time per video:    {result['seconds']:.3f}s")
+    print(f"  Throughput:             {result['windows_per_sec']:.2f} windows/s")
+
+    return result
+
+
+def main(args):
+    print("=" * 80)
+    print("RRB Model Input Benchmark: float32 vs uint8")
+    print("=" * 80)
+
+    img_size = (args.img_size, args.img_size)
+    video_processor = VideoProcessor(img_size=img_size)
+
+    if args.model_path:
+        model = keras.models.load_model(args.model_path)
+    else:
+        classifier = RRBClassifier(sequence_length=args.sequence_length, img_size=img_size)
+        model = classifier.build_cnn_lstm_model(use_pretrained=args.use_pretrained)
+
+    if model.inputs[0].dtype != 'float32':
+        print("Error: benchmark needs a float-input model to compare both paths")
+        return
+
+    uint8_model = build_uint8_serving_model(model)
+    frames = load_frames(args, video_processor)
+    print(f"\nFrames: {len(frames)} at {img_size[0]}x{img_size[1]}")
+
+    float_result = run_path('float32 (NumPy normalization)', float_path, model,
+                            video_processor, frames, args)
+    uint8_result = run_path('uint8 (in-graph normalization)', uint8_path, uint8_model,
+                            video_processor, frames, args)
+
+    max_diff = float(np.max(np.abs(float_result['predictions'] - uint8_result['predictions'])))
+    agreement = float(np.mean(
+        np.argmax(float_result['predictions'], axis=1) == np.argmax(uint8_result['predictions'], axis=1)
+    ))
+
+    print("\n" + "=" * 80)
+    print("SUMMARY")
+    print("=" * 80)
+    print(f"Input memory reduction:    {float_result['input_mb'] / uint8_result['input_mb']:.1f}x")
+    print(f"Peak memory reduction:     {float_result['peak_preprocess_mb'] / uint8_result['peak_preprocess_mb']:.1f}x")
+    print(f"Throughput speed-up:       {uint8_result['windows_per_sec'] / float_result['windows_per_sec']:.2f}x")
+    print(f"Max probability diff:      {max_diff:.2e}")
+    print(f"Top-1 agreement:           {agreement * 100:.1f}%")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark float32 vs uint8 model input')
+
+    parser.add_argument('--video_path', type=str,
+                       help='Video to decode (synthetic frames are used if omitted)')
+    parser.add_argument('--model_path', type=str,
+                       help='Trained float-input model (a fresh model is built if omitted)')
+    parser.add_argument('--use_pretrained', action='store_true',
+                       help='Use ImageNet weights when building a fresh model')
+    parser.add_argument('--num_frames', type=int, default=300,
+                       help='Number of frames to benchmark')
+    parser.add_argument('--sequence_length', type=int, default=30,
+                       help='Number of frames per sequence')
+    parser.add_argument('--img_size', type=int, default=224,
+                       help='Image size (height and width)')
+    parser.add_argument('--batch_size', type=int, default=8,
+                       help='Batch size for model.predict')
+    parser.add_argument('--repeats', type=int, default=3,
+                       help='Timed repetitions per path')
+
+    args = parser.parse_args()
+    main(args)
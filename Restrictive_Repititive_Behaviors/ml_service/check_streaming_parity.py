@@ -0,0 +1,153 @@
+"""
+Parity check: streaming detection vs whole-video detection
+
+Feeds one synthetic probability stream (bursts of each behavior with dips
+and gaps) through detect_rrb_streaming at several batch sizes, and through
+detect_rrb, and requires the same result as _detect_from_predictions on the
+full stream. Events reported through on_event must be the result's events.
+
+No model or video is needed: frames carry their own index in their pixel
+values and a stand-in backend returns each window's row of the stream.
+"""
+import os
+import sys
+import argparse
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from utils.inference import RRBInference
+from utils.video_processor import VideoProcessor
+
+
+class SyntheticVideo(VideoProcessor):
+    """Frames whose first two channels encode the frame index"""
+
+    def __init__(self, n_frames, fps=30, img_size=(8, 8)):
+        super().__init__(img_size=img_size)
+        self.n_frames = n_frames
+        self.fps = fps
+
+    def get_video_info(self, video_path):
+        return {
+            'fps': self.fps,
+            'frame_count': self.n_frames,
+            'width': 16,
+            'height': 16,
+            'duration': self.n_frames / self.fps
+        }
+
+    def iter_frames(self, video_path, max_frames=None):
+        count = self.n_frames if not max_frames else min(self.n_frames, max_frames)
+        for i in range(count):
+            frame = np.zeros((16, 16, 3), dtype=np.uint8)
+            frame[..., 0] = i % 256
+            frame[..., 1] = i // 256
+            yield frame
+
+
+class StreamBackend:
+    """Returns the stream row of each window, found from its first frame's index"""
+
+    name = 'synthetic'
+    input_dtype = np.uint8
+
+    def __init__(self, probabilities, step):
+        self.probabilities = probabilities
+        self.step = step
+
+    def predict(self, batch):
+        first_frames = batch[:, 0, 0, 0, 0].astype(int) + 256 * batch[:, 0, 0, 0, 1].astype(int)
+        return self.probabilities[first_frames // self.step]
+
+
+class SyntheticEngine(RRBInference):
+    """RRBInference over a synthetic video and probability stream (no model loaded)"""
+
+    def __init__(self, probabilities, n_frames):
+        self.sequence_length = Config.SEQUENCE_LENGTH
+        self.step = int(self.sequence_length * 0.5)
+        self.img_size = (8, 8)
+        self.confidence_threshold = Config.CONFIDENCE_THRESHOLD
+        self.min_duration = Config.MIN_DETECTION_DURATION
+        self.off_threshold = Config.DETECTION_OFF_THRESHOLD
+        self.max_gap = Config.DETECTION_MAX_GAP
+        self.uint8_input = True
+        self.two_stage = False
+        self.embedding_cache = None
+        self.landmark_cache = None
+        self.label_encoder = SimpleNamespace(classes_=np.array(Config.RRB_CATEGORIES))
+        self.video_processor = SyntheticVideo(n_frames, img_size=self.img_size)
+        self.backend = StreamBackend(probabilities, self.step)
+        self._model_lock = threading.RLock()
+        self._pose_lock = threading.Lock()
+
+
+def synthetic_stream(n_windows, n_classes, rng):
+    """Low background with bursts per class, including dips and gaps inside bursts"""
+    probabilities = rng.uniform(0.0, 0.3, size=(n_windows, n_classes))
+    for class_idx in range(n_classes):
+        for _ in range(max(1, n_windows // 20)):
+            start = int(rng.integers(0, n_windows))
+            length = int(rng.integers(1, 15))
+            burst = rng.uniform(0.72, 0.95, size=min(length, n_windows - start))
+            burst[rng.random(len(burst)) < 0.15] = 0.55  # keeps an event open
+            burst[rng.random(len(burst)) < 0.1] = 0.2    # gap, bridged up to max_gap
+            probabilities[start:start + len(burst), class_idx] = burst
+    return probabilities
+
+
+def main(args):
+    print("=" * 80)
+    print("Streaming Detection Parity: detect_rrb_streaming vs _detect_from_predictions")
+    print("=" * 80)
+
+    rng = np.random.default_rng(args.seed)
+    n_classes = len(Config.RRB_CATEGORIES)
+    sequence_length = Config.SEQUENCE_LENGTH
+    step = int(sequence_length * 0.5)
+    failures = 0
+
+    for n_frames in args.frames:
+        n_windows = 1 if n_frames < sequence_length else (n_frames - sequence_length) // step + 1
+        probabilities = synthetic_stream(n_windows, n_classes, rng)
+        engine = SyntheticEngine(probabilities, n_frames)
+
+        video_info = engine.video_processor.get_video_info('synthetic')
+        reference = engine._detect_from_predictions(probabilities, video_info)
+        checks = {'detect_rrb': engine.detect_rrb('synthetic') == reference}
+
+        for batch_size in args.batch_sizes:
+            streamed = []
+            result = engine.detect_rrb_streaming('synthetic', batch_size=batch_size, on_event=streamed.append)
+            checks[f'streaming batch {batch_size}'] = result == reference
+            reported = sorted(streamed, key=lambda e: (e['start_time'], e['class']))
+            checks[f'on_event batch {batch_size}'] = reported == reference['events']
+
+        print(f"\n{n_frames} frames, {n_windows} windows, {len(reference['events'])} events")
+        for name, ok in checks.items():
+            failures += not ok
+            print(f"  {name:24} {'OK' if ok else 'MISMATCH'}")
+
+    print("\n" + "=" * 80)
+    if failures:
+        print(f"FAILED: {failures} mismatches")
+        sys.exit(1)
+    print("Streaming detection matches the whole-video result")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Check streaming detection against whole-video detection')
+
+    parser.add_argument('--frames', type=int, nargs='+', default=[20, 30, 1237, 9000],
+                       help='Synthetic video lengths in frames')
+    parser.add_argument('--batch_sizes', type=int, nargs='+', default=[1, 4, 16, 64],
+                       help='Windows per model call for the streaming path')
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    main(args)
@@ -16,10 +16,27 @@ class Config:
     MODEL_PATH = os.getenv('MODEL_PATH', 'models/rrb_classifier.h5')
     SCALER_PATH = os.getenv('SCALER_PATH', 'models/scaler.pkl')
     LABEL_ENCODER_PATH = os.getenv('LABEL_ENCODER_PATH', 'models/label_encoder.pkl')
+    INFERENCE_BACKEND = os.getenv('INFERENCE_BACKEND', 'auto')  # keras, two_stage, tflite, onnx or auto (by extension)
+    INFERENCE_THREADS = int(os.getenv('INFERENCE_THREADS', 0)) or None  # tflite/onnx threads, 0 = runtime default
+    EMBEDDING_CACHE_DIR = os.getenv('EMBEDDING_CACHE_DIR', 'cache/embeddings')  # two_stage only, empty disables
+    PRELOAD_MODEL = os.getenv('PRELOAD_MODEL', '0') == '1'  # load + warm up at startup instead of first request
+    WARMUP_BATCH_SIZES = tuple(int(size) for size in os.getenv('WARMUP_BATCH_SIZES', '1,16').split(','))
     
     # Detection Configuration
     CONFIDENCE_THRESHOLD = float(os.getenv('CONFIDENCE_THRESHOLD', 0.70))
     MIN_DETECTION_DURATION = float(os.getenv('MIN_DETECTION_DURATION', 3.0))
+    DETECTION_OFF_THRESHOLD = float(os.getenv('DETECTION_OFF_THRESHOLD', 0.50))  # keeps a started detection going
+    DETECTION_MAX_GAP = int(os.getenv('DETECTION_MAX_GAP', 1))  # weaker windows bridged inside one detection
+    
+    # Batch Detection Configuration
+    BATCH_INFERENCE_SIZE = int(os.getenv('BATCH_INFERENCE_SIZE', 16))  # sequences per model call
+    BATCH_DECODE_WORKERS = int(os.getenv('BATCH_DECODE_WORKERS', 2))
+    MAX_BATCH_VIDEOS = int(os.getenv('MAX_BATCH_VIDEOS', 10))  # videos per /detect/batch request
+    
+    # Detection Job Configuration (/api/v1/jobs)
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))  # jobs processed concurrently
+    MAX_PENDING_JOBS = int(os.getenv('MAX_PENDING_JOBS', 20))  # queued + running jobs before 503
+    JOB_RESULT_TTL = int(os.getenv('JOB_RESULT_TTL', 3600))  # seconds finished results are kept
     
     # File Upload Configuration
     UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', 'uploads')
@@ -27,6 +44,12 @@ class Config:
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 104857600))  # 100MB
     ALLOWED_EXTENSIONS = {'mp4', 'avi', 'mov', 'mkv'}
     
+    # Video Repair Configuration
+    REPAIR_CACHE_DIR = os.getenv('REPAIR_CACHE_DIR', '')  # repaired videos by input hash, empty (default) disables
+    REPAIR_CACHE_MAX_MB = int(os.getenv('REPAIR_CACHE_MAX_MB', 1024))  # least recently used repairs deleted beyond it
+    REPAIR_CACHE_TTL = int(os.getenv('REPAIR_CACHE_TTL', 86400))  # seconds a repair is kept after its last use
+    REPAIR_MAX_DIM = int(os.getenv('REPAIR_MAX_DIM', 640))  # longest side of re-encoded videos
+    
     # Video Processing Configuration
     TARGET_FPS = 30
     SEQUENCE_LENGTH = 30  # Number of frames per sequence
@@ -35,6 +58,8 @@ class Config:
     # Pose Estimation Configuration
     POSE_CONFIDENCE = 0.5
     POSE_TRACKING_CONFIDENCE = 0.5
+    POSE_MODE = os.getenv('POSE_MODE', 'accurate')  # accurate, balanced or fast
+    LANDMARK_CACHE_DIR = os.getenv('LANDMARK_CACHE_DIR', '')  # empty (default) disables; entries are never evicted
     
     # RRB Categories
     RRB_CATEGORIES = [
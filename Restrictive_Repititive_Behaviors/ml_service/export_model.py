@@ -0,0 +1,270 @@
+"""
+Export the trained RRB classifier for lightweight serving
+
+Formats:
+    tflite_fp16  TFLite with float16 weights
+    tflite_int8  TFLite with int8 weights and activations, calibrated on
+                 windows from real videos (representative dataset)
+    onnx         ONNX model for ONNX Runtime (requires tf2onnx)
+
+All exports take uint8 frames, like the Keras serving path, so the
+inference engine feeds every backend the same windows. Serve an export by
+pointing MODEL_PATH at it and setting INFERENCE_BACKEND (or leave it on
+'auto' to pick the backend from the file extension).
+"""
+import os
+os.environ['TF_USE_LEGACY_KERAS'] = '1'  # Use tf-keras instead of keras 3.x
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+
+import sys
+import argparse
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.rrb_model import build_uint8_serving_model
+from utils.video_processor import VideoProcessor
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv')
+
+
+def find_videos(args):
+    """Collect calibration videos"""
+    if args.calibration_videos:
+        return args.calibration_videos
+
+    videos = []
+    for root, _, files in os.walk(args.dataset_root):
+        for name in sorted(files):
+            if name.lower().endswith(VIDEO_EXTENSIONS):
+                videos.append(os.path.join(root, name))
+    return sorted(videos)
+
+
+def load_calibration_windows(video_paths, sequence_length, img_size, max_windows):
+    """
+    Decode uint8 windows for int8 calibration, spread across videos
+
+    Args:
+        video_paths: Videos to sample from
+        sequence_length: Frames per window
+        img_size: Model input size
+        max_windows: Number of windows to collect
+
+    Returns:
+        Array of windows [windows, frames, height, width, 3] uint8
+    """
+    processor = VideoProcessor(img_size=img_size)
+    rng = np.random.default_rng(42)
+    per_video = max(1, max_windows // max(1, len(video_paths)))
+    windows = []
+
+    for video_path in video_paths:
+        try:
+            frames = processor.extract_frames(video_path)
+        except Exception as e:
+            print(f"  Skipping {video_path}: {e}")
+            continue
+        if len(frames) == 0:
+            continue
+
+        sequences = processor.create_sequences(frames, sequence_length, overlap=0.5)
+        picks = rng.choice(len(sequences), size=min(per_video, len(sequences)), replace=False)
+        windows.extend(sequences[i].astype(np.uint8) for i in sorted(picks))
+
+        if len(windows) >= max_windows:
+            break
+
+    return np.stack(windows[:max_windows]) if windows else None
+
+
+def without_recurrent_dropout(model):
+    """
+    Rebuild a model with recurrent_dropout=0 in its LSTM layers
+
+    Recurrent dropout is inactive at inference, so predictions are unchanged,
+    but LSTMs that use it cannot be lowered to the fused TFLite LSTM op (and
+    int8 calibration of the unfused loop crashes the converter).
+
+    Args:
+        model: Trained Keras model
+
+    Returns:
+        Equivalent model with the same weights
+    """
+    def clone_layer(layer):
+        config = layer.get_config()
+        if isinstance(layer, keras.layers.LSTM) and config.get('recurrent_dropout'):
+            config['recurrent_dropout'] = 0.0
+        return layer.__class__.from_config(config)
+
+    if not any(isinstance(layer, keras.layers.LSTM) and layer.recurrent_dropout for layer in model.layers):
+        return model
+
+    clone = keras.models.clone_model(model, clone_function=clone_layer)
+    clone.set_weights(model.get_weights())
+    return clone
+
+
+def serving_function(model, batch_size):
+    """Concrete function of the uint8 serving model with a fixed batch size"""
+    input_shape = [batch_size] + list(model.inputs[0].shape[1:])
+    function = tf.function(lambda frames: model(frames, training=False))
+    return function.get_concrete_function(tf.TensorSpec(input_shape, tf.uint8, name='frames'))
+
+
+def export_tflite(model, output_path, quantization, batch_size=1, calibration_windows=None,
+                  allow_select_ops=False):
+    """
+    Convert the serving model to TFLite
+
+    The LSTM layers only lower to TFLite builtins with a static batch size,
+    so the model is exported for batch_size windows per invoke; the TFLite
+    backend feeds larger batches in chunks.
+
+    Args:
+        model: uint8-input Keras model
+        output_path: Destination .tflite file
+        quantization: 'fp16' or 'int8'
+        batch_size: Windows per interpreter invoke
+        calibration_windows: uint8 windows for int8 calibration
+        allow_select_ops: Fall back to TensorFlow ops for unsupported layers
+            (needs the full TensorFlow interpreter at serving time)
+
+    Returns:
+        Size of the exported model in bytes
+    """
+    converter = tf.lite.TFLiteConverter.from_concrete_functions(
+        [serving_function(model, batch_size)], model
+    )
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+    if quantization == 'fp16':
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantization == 'int8':
+        if calibration_windows is None or len(calibration_windows) == 0:
+            raise ValueError("int8 export needs calibration windows (--calibration_videos or --dataset_root)")
+
+        def representative_dataset():
+            for start in range(0, len(calibration_windows) - batch_size + 1, batch_size):
+                yield [calibration_windows[start:start + batch_size]]
+
+        converter.representative_dataset = representative_dataset
+    else:
+        raise ValueError(f"Unknown TFLite quantization '{quantization}'")
+
+    if allow_select_ops:
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS, tf.lite.OpsSet.SELECT_TF_OPS]
+
+    tflite_model = converter.convert()
+
+    with open(output_path, 'wb') as f:
+        f.write(tflite_model)
+
+    return len(tflite_model)
+
+
+def export_onnx(model, output_path, opset=13):
+    """
+    Convert the serving model to ONNX
+
+    Args:
+        model: uint8-input Keras model
+        output_path: Destination .onnx file
+        opset: ONNX opset version
+
+    Returns:
+        Size of the exported model in bytes
+    """
+    try:
+        import tf2onnx
+    except ImportError:
+        raise ImportError("ONNX export requires tf2onnx (pip install tf2onnx)")
+
+    input_signature = [tf.TensorSpec([None] + list(model.inputs[0].shape[1:]), tf.uint8, name='frames')]
+    tf2onnx.convert.from_keras(model, input_signature=input_signature, opset=opset, output_path=output_path)
+
+    return os.path.getsize(output_path)
+
+
+def main(args):
+    print("=" * 80)
+    print("RRB Model Export")
+    print("=" * 80)
+
+    print(f"\nLoading model from {args.model_path}...")
+    model = keras.models.load_model(args.model_path)
+    model = build_uint8_serving_model(without_recurrent_dropout(model))
+    sequence_length, height, width = model.inputs[0].shape[1:4]
+    print(f"Input: {sequence_length} frames of {height}x{width} (uint8)")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    base_name = os.path.splitext(os.path.basename(args.model_path))[0]
+
+    calibration_windows = None
+    if 'tflite_int8' in args.formats:
+        videos = find_videos(args)
+        print(f"\nCollecting {args.num_calibration_windows} calibration windows from {len(videos)} videos...")
+        calibration_windows = load_calibration_windows(videos, sequence_length, (width, height),
+                                                       args.num_calibration_windows)
+        if calibration_windows is not None:
+            print(f"Calibration windows: {len(calibration_windows)}")
+
+    exported = []
+    for export_format in args.formats:
+        print(f"\nExporting {export_format}...")
+        try:
+            if export_format == 'onnx':
+                output_path = os.path.join(args.output_dir, f"{base_name}.onnx")
+                size = export_onnx(model, output_path, opset=args.opset)
+            else:
+                quantization = export_format.split('_')[1]
+                output_path = os.path.join(args.output_dir, f"{base_name}_{quantization}.tflite")
+                size = export_tflite(model, output_path, quantization,
+                                     batch_size=args.tflite_batch_size,
+                                     calibration_windows=calibration_windows,
+                                     allow_select_ops=args.allow_select_ops)
+        except Exception as e:
+            print(f"  Failed: {e}")
+            continue
+
+        exported.append((export_format, output_path, size))
+        print(f"  Saved to {output_path} ({size / 1024 ** 2:.1f} MB)")
+
+    print("\n" + "=" * 80)
+    print(f"Source model: {os.path.getsize(args.model_path) / 1024 ** 2:.1f} MB")
+    for export_format, output_path, size in exported:
+        print(f"{export_format:<12} {size / 1024 ** 2:>8.1f} MB  {output_path}")
+    print("=" * 80)
+
+    if len(exported) < len(args.formats):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export the RRB classifier to TFLite / ONNX')
+
+    parser.add_argument('--model_path', type=str, default='models/rrb_classifier.h5',
+                       help='Trained Keras model')
+    parser.add_argument('--output_dir', type=str, default='models',
+                       help='Directory for exported models')
+    parser.add_argument('--formats', type=str, nargs='+', default=['tflite_fp16', 'tflite_int8'],
+                       choices=['tflite_fp16', 'tflite_int8', 'onnx'],
+                       help='Export formats')
+    parser.add_argument('--calibration_videos', type=str, nargs='+',
+                       help='Videos for int8 calibration (overrides --dataset_root)')
+    parser.add_argument('--dataset_root', type=str, default='../Dataset',
+                       help='Dataset root to take calibration videos from')
+    parser.add_argument('--num_calibration_windows', type=int, default=200,
+                       help='Windows used to calibrate int8 activation ranges')
+    parser.add_argument('--tflite_batch_size', type=int, default=1,
+                       help='Windows per TFLite invoke (the LSTM needs a static batch size)')
+    parser.add_argument('--allow_select_ops', action='store_true',
+                       help='Allow TensorFlow fallback ops in TFLite exports')
+    parser.add_argument('--opset', type=int, default=13,
+                       help='ONNX opset version')
+
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,26 @@
+"""
+Gunicorn settings for the RRB ML service
+
+With PRELOAD_MODEL=1 the app is imported in the master before forking
+(preload_app), which imports the model runtime and reads the model file
+once (app.prefork_preload). Each worker then builds and warms up its own
+inference engine in post_worker_init, before it accepts requests, so no
+client pays the model load or graph tracing cost. /health answers 503
+until the worker is ready.
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+# One process with threads by default: detection jobs and the loaded model live in process memory
+workers = int(os.getenv('GUNICORN_WORKERS', 1))
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 300))
+
+preload_app = os.getenv('PRELOAD_MODEL', '0') == '1'
+
+
+def post_worker_init(worker):
+    """Load and warm up the model in each worker before it serves requests"""
+    if preload_app:
+        from app import preload_inference_engine
+        preload_inference_engine()
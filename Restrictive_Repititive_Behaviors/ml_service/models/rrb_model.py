@@ -28,19 +28,27 @@ class RRBClassifier:
         self.feature_dim = feature_dim
         self.model = None
     
-    def build_cnn_lstm_model(self, use_pretrained: bool = True) -> keras.Model:
+    def build_cnn_lstm_model(self, use_pretrained: bool = True, uint8_input: bool = False) -> keras.Model:
         """
         Build CNN+LSTM architecture for video classification
         
         Args:
             use_pretrained: Whether to use pretrained CNN backbone
+            uint8_input: Accept raw uint8 frames and rescale to [0, 1] inside the graph
             
         Returns:
             Compiled Keras model
         """
         # Input layer: (batch, sequence_length, height, width, channels)
         input_shape = (self.sequence_length, self.img_size[0], self.img_size[1], 3)
-        inputs = layers.Input(shape=input_shape)
+        
+        if uint8_input:
+            # Frames stay uint8 up to the model; cast + scale is the first graph op
+            inputs = layers.Input(shape=input_shape, dtype='uint8')
+            x = layers.Rescaling(1.0 / 255.0, name='uint8_rescaling')(inputs)
+        else:
+            inputs = layers.Input(shape=input_shape)
+            x = inputs
         
         # CNN Feature Extractor (applied to each frame)
         if use_pretrained:
@@ -57,8 +65,25 @@ class RRBClassifier:
             base_model = self._build_custom_cnn()
         
         # Apply CNN to each frame using TimeDistributed
-        x = layers.TimeDistributed(base_model)(inputs)
+        x = layers.TimeDistributed(base_model)(x)
+        
+        outputs = self._temporal_head(x)
+        
+        # Create model
+        model = keras.Model(inputs=inputs, outputs=outputs, name='RRB_CNN_LSTM')
+        
+        return model
+    
+    def _temporal_head(self, x):
+        """
+        Apply the per-frame projection, LSTM and classification layers
         
+        Args:
+            x: Per-frame CNN features (batch, sequence_length, embedding_dim)
+            
+        Returns:
+            Class probabilities tensor
+        """
         # Additional dense layer for feature transformation
         x = layers.TimeDistributed(layers.Dense(self.feature_dim, activation='relu'))(x)
         x = layers.TimeDistributed(layers.Dropout(0.3))(x)
@@ -74,12 +99,57 @@ class RRBClassifier:
         x = layers.Dropout(0.3)(x)
         
         # Output layer with softmax for multi-class classification
-        outputs = layers.Dense(self.num_classes, activation='softmax')(x)
+        return layers.Dense(self.num_classes, activation='softmax')(x)
+    
+    def build_frame_encoder(self, use_pretrained: bool = True) -> keras.Model:
+        """
+        Build the frozen per-frame CNN of the two-stage model
         
-        # Create model
-        model = keras.Model(inputs=inputs, outputs=outputs, name='RRB_CNN_LSTM')
+        Takes single uint8 frames and returns the pooled backbone embedding.
+        Embeddings are computed once per video (see FrameEmbeddingCache) and
+        the temporal head is trained on them.
         
-        return model
+        Args:
+            use_pretrained: Whether to use pretrained MobileNetV2 weights
+            
+        Returns:
+            Encoder model (height, width, 3) uint8 -> (embedding_dim,)
+        """
+        inputs = layers.Input(shape=(self.img_size[0], self.img_size[1], 3), dtype='uint8')
+        x = layers.Rescaling(1.0 / 255.0, name='uint8_rescaling')(inputs)
+        
+        if use_pretrained:
+            base_model = MobileNetV2(
+                include_top=False,
+                weights='imagenet',
+                input_shape=(self.img_size[0], self.img_size[1], 3),
+                pooling='avg'
+            )
+        else:
+            base_model = self._build_custom_cnn()
+        base_model.trainable = False
+        
+        outputs = base_model(x, training=False)
+        
+        return keras.Model(inputs=inputs, outputs=outputs, name='RRB_Frame_Encoder')
+    
+    def build_embedding_lstm_model(self, embedding_dim: int = 1280) -> keras.Model:
+        """
+        Build the temporal head of the two-stage model
+        
+        Same layers as the head of build_cnn_lstm_model, applied to cached
+        per-frame embeddings instead of frames.
+        
+        Args:
+            embedding_dim: Size of the frame encoder output (1280 for MobileNetV2)
+            
+        Returns:
+            Keras model (sequence_length, embedding_dim) -> class probabilities
+        """
+        inputs = layers.Input(shape=(self.sequence_length, embedding_dim), name='frame_embeddings')
+        outputs = self._temporal_head(inputs)
+        
+        return keras.Model(inputs=inputs, outputs=outputs, name='RRB_Embedding_LSTM')
     
     def build_pose_lstm_model(self, pose_feature_dim: int = 132) -> keras.Model:
         """
@@ -285,10 +355,11 @@ class RRBClassifier:
 
 # Standalone functions for easy import
 
-def build_cnn_lstm_model(sequence_length=30, img_size=(224, 224), num_classes=6, use_pretrained=True, dropout_rate=0.4):
+def build_cnn_lstm_model(sequence_length=30, img_size=(224, 224), num_classes=6, use_pretrained=True, dropout_rate=0.4,
+                         uint8_input=False):
     """Build CNN+LSTM model (standalone function)"""
     classifier = RRBClassifier(sequence_length=sequence_length, img_size=img_size, num_classes=num_classes)
-    return classifier.build_cnn_lstm_model(use_pretrained=use_pretrained)
+    return classifier.build_cnn_lstm_model(use_pretrained=use_pretrained, uint8_input=uint8_input)
 
 def build_pose_lstm_model(sequence_length=30, num_classes=6, pose_feature_dim=132):
     """Build Pose-LSTM model (standalone function)"""
@@ -299,3 +370,80 @@ def build_hybrid_model(sequence_length=30, img_size=(224, 224), num_classes=6, p
     """Build Hybrid model (standalone function)"""
     classifier = RRBClassifier(sequence_length=sequence_length, img_size=img_size, num_classes=num_classes)
     return classifier.build_hybrid_model(pose_feature_dim=pose_feature_dim, use_pretrained=use_pretrained)
+
+def build_uint8_serving_model(model):
+    """
+    Wrap a model trained on [0, 1] float frames so it accepts uint8 frames.
+    
+    Casting and scaling run as the first layer of the wrapper graph, so callers
+    can keep decoded frames as uint8 all the way to predict(). Models that
+    already take uint8 input are returned unchanged.
+    """
+    if model.inputs[0].dtype == tf.uint8:
+        return model
+    
+    inputs = layers.Input(shape=model.inputs[0].shape[1:], dtype='uint8')
+    x = layers.Rescaling(1.0 / 255.0, name='uint8_rescaling')(inputs)
+    outputs = model(x)
+    
+    return keras.Model(inputs=inputs, outputs=outputs, name=f'{model.name}_uint8')
+
+def build_frame_encoder(img_size=(224, 224), use_pretrained=True):
+    """Build the two-stage frame encoder (standalone function)"""
+    classifier = RRBClassifier(img_size=img_size)
+    return classifier.build_frame_encoder(use_pretrained=use_pretrained)
+
+def build_embedding_lstm_model(sequence_length=30, embedding_dim=1280, num_classes=6):
+    """Build the two-stage temporal head (standalone function)"""
+    classifier = RRBClassifier(sequence_length=sequence_length, num_classes=num_classes)
+    return classifier.build_embedding_lstm_model(embedding_dim=embedding_dim)
+
+def compose_two_stage_model(encoder, head):
+    """
+    Join a frame encoder and temporal head into one end-to-end uint8 model
+    
+    The result takes uint8 windows like the CNN-LSTM serving model, so a
+    head trained on cached embeddings can be served by every backend.
+    """
+    sequence_length = head.inputs[0].shape[1]
+    inputs = layers.Input(shape=(sequence_length,) + tuple(encoder.inputs[0].shape[1:]),
+                          dtype=encoder.inputs[0].dtype)
+    x = layers.TimeDistributed(encoder, name='frame_encoder')(inputs)
+    outputs = head(x)
+    
+    return keras.Model(inputs=inputs, outputs=outputs, name='RRB_Two_Stage')
+
+def split_two_stage_model(model):
+    """
+    Split an end-to-end CNN-LSTM model into frame encoder and temporal head
+    
+    Works for models from build_cnn_lstm_model (with or without the uint8
+    front end) and compose_two_stage_model. Layers in front of the
+    TimeDistributed backbone (input rescaling) go into the encoder, every
+    layer after it into the head; weights are shared with the source model.
+    
+    Returns:
+        Tuple of (encoder: frame -> embedding, head: embeddings -> probabilities)
+    """
+    backbone_index = next(
+        (i for i, layer in enumerate(model.layers)
+         if isinstance(layer, layers.TimeDistributed) and isinstance(layer.layer, keras.Model)),
+        None
+    )
+    if backbone_index is None:
+        raise ValueError(f"Model '{model.name}' has no TimeDistributed CNN backbone to split")
+    
+    frame_input = layers.Input(shape=model.inputs[0].shape[2:], dtype=model.inputs[0].dtype)
+    x = frame_input
+    for layer in model.layers[1:backbone_index]:
+        x = layer(x)
+    x = model.layers[backbone_index].layer(x, training=False)
+    encoder = keras.Model(inputs=frame_input, outputs=x, name=f'{model.name}_encoder')
+    
+    embedding_input = layers.Input(shape=(model.inputs[0].shape[1], x.shape[-1]), name='frame_embeddings')
+    x = embedding_input
+    for layer in model.layers[backbone_index + 1:]:
+        x = layer(x)
+    head = keras.Model(inputs=embedding_input, outputs=x, name=f'{model.name}_head')
+    
+    return encoder, head
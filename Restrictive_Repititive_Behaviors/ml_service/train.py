@@ -134,7 +134,8 @@ def main(args):
     data_loader = RRBDataLoader(
         dataset_root=args.dataset_path,
         sequence_length=args.sequence_length,
-        img_size=tuple(args.img_size)
+        img_size=tuple(args.img_size),
+        uint8_frames=args.uint8_input
     )
     
     # Check if preprocessed data exists
@@ -156,6 +157,12 @@ def main(args):
         
         label_encoder = data_loader.label_encoder
     
+    if args.uint8_input and X_train.dtype != np.uint8:
+        raise ValueError(
+            "Preprocessed data is not uint8. Re-run without --use_preprocessed "
+            "to regenerate it for --uint8_input training."
+        )
+    
     # Convert labels to categorical
     num_classes = len(label_encoder.classes_)
     y_train_cat = keras.utils.to_categorical(y_train, num_classes)
@@ -184,7 +191,10 @@ def main(args):
     )
     
     if args.model_type == 'cnn_lstm':
-        model = classifier.build_cnn_lstm_model(use_pretrained=args.use_pretrained)
+        model = classifier.build_cnn_lstm_model(
+            use_pretrained=args.use_pretrained,
+            uint8_input=args.uint8_input
+        )
     elif args.model_type == 'pose_lstm':
         model = classifier.build_pose_lstm_model()
     elif args.model_type == 'hybrid':
@@ -264,6 +274,8 @@ if __name__ == '__main__':
                        help='Image size (height width)')
     parser.add_argument('--feature_dim', type=int, default=256,
                        help='Feature dimension')
+    parser.add_argument('--uint8_input', action='store_true',
+                       help='Keep frames as uint8 and normalize inside the model graph')
     
     # Training arguments
     parser.add_argument('--epochs', type=int, default=50,
@@ -19,8 +19,9 @@ from tensorflow import keras
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.data_loader_efficient import RRBDataLoaderEfficient
-from utils.data_generator import create_generators
-from models.rrb_model import build_cnn_lstm_model
+from utils.data_generator import create_generators, create_pose_generators, create_embedding_generators
+from models.rrb_model import (build_cnn_lstm_model, build_pose_lstm_model, build_frame_encoder,
+                              build_embedding_lstm_model, compose_two_stage_model)
 
 # Setup logging
 logging.basicConfig(
@@ -51,10 +52,52 @@ def parse_args():
                         help='Initial learning rate')
     
     # Model parameters
+    parser.add_argument('--model_type', type=str, default='cnn_lstm',
+                        choices=['cnn_lstm', 'embedding_lstm', 'pose_lstm'],
+                        help='Frame-based CNN-LSTM, two-stage LSTM on cached frame embeddings, '
+                             'or landmark-based Pose-LSTM')
     parser.add_argument('--use_pretrained', action='store_true', default=True,
                         help='Use pretrained MobileNetV2 weights')
     parser.add_argument('--dropout_rate', type=float, default=0.4,
                         help='Dropout rate')
+    parser.add_argument('--uint8_input', action='store_true',
+                        help='Keep frames as uint8 and normalize inside the model graph')
+    
+    # Input pipeline (cnn_lstm only)
+    parser.add_argument('--input_pipeline', type=str, default='sequence',
+                        choices=['sequence', 'tf_data'],
+                        help='keras Sequence generators or a tf.data pipeline with parallel decode')
+    parser.add_argument('--tf_data_cache_dir', type=str, default=None,
+                        help='Cache decoded tf.data windows on disk here (tf_data only)')
+    parser.add_argument('--num_shards', type=int, default=1,
+                        help='Number of workers splitting the training videos (tf_data only)')
+    parser.add_argument('--shard_index', type=int, default=0,
+                        help='Index of this worker (tf_data only)')
+    
+    # Decoded video cache (cnn_lstm only)
+    parser.add_argument('--video_cache_dir', type=str, default=None,
+                        help='Decode each video once into uint8 memory-mapped files here (disabled if omitted)')
+    parser.add_argument('--video_cache_max_gb', type=float, default=2.0,
+                        help='Budget for memory-mapped videos kept open at once')
+    parser.add_argument('--predecode', action='store_true',
+                        help='Fill the video cache for all videos before training starts')
+    
+    # Frame embeddings (embedding_lstm only)
+    parser.add_argument('--embedding_cache_dir', type=str, default='cache/embeddings',
+                        help='Per-frame backbone embeddings; the CNN runs once per video and epochs read the cache')
+    
+    # Pose parameters (pose_lstm only)
+    parser.add_argument('--pose_mode', type=str, default='accurate',
+                        choices=['accurate', 'balanced', 'fast'],
+                        help='Pose estimation preset used to extract landmarks')
+    parser.add_argument('--landmark_cache_dir', type=str, default='cache/landmarks',
+                        help='Landmark cache; pose runs once per video and later epochs read the cache')
+    
+    # Dataset indexing
+    parser.add_argument('--video_index', type=str, default='cache/video_index.jsonl',
+                        help='Resumable video metadata index; only new or changed videos are re-probed')
+    parser.add_argument('--index_workers', type=int, default=None,
+                        help='Processes used to probe videos (defaults to the CPU count)')
     
     # Data split parameters
     parser.add_argument('--test_size', type=float, default=0.15,
@@ -108,11 +151,11 @@ def evaluate_model(model, test_gen, class_names, output_dir):
     y_true = []
     y_pred = []
     
-    for i in range(len(test_gen)):
-        X_batch, y_batch = test_gen[i]
+    # Works for keras Sequences and tf.data datasets alike
+    for X_batch, y_batch in test_gen:
         predictions = model.predict(X_batch, verbose=0)
         y_pred.extend(np.argmax(predictions, axis=1))
-        y_true.extend(y_batch)
+        y_true.extend(np.asarray(y_batch))
     
     y_true = np.array(y_true)
     y_pred = np.array(y_pred)
@@ -173,7 +216,9 @@ def main(args):
     data_loader = RRBDataLoaderEfficient(
         dataset_root=args.dataset_root,
         sequence_length=args.sequence_length,
-        img_size=(args.img_size, args.img_size)
+        img_size=(args.img_size, args.img_size),
+        index_path=args.video_index or None,
+        num_workers=args.index_workers
     )
     
     data_loader.prepare_dataset(test_size=args.test_size, val_size=args.val_size)
@@ -194,11 +239,81 @@ def main(args):
     
     # Step 2: Create data generators
     print("\n[2/5] Creating data generators...")
-    train_gen, val_gen, test_gen = create_generators(
-        data_loader,
-        batch_size=args.batch_size,
-        augment_train=True
-    )
+    if args.model_type == 'pose_lstm':
+        from utils.pose_estimator import PoseEstimator
+        from utils.landmark_cache import LandmarkCache
+        
+        landmark_cache = LandmarkCache(args.landmark_cache_dir)
+        pose_estimator = PoseEstimator.from_mode(args.pose_mode)
+        train_gen, val_gen, test_gen = create_pose_generators(
+            data_loader,
+            landmark_cache,
+            pose_estimator,
+            batch_size=args.batch_size,
+            augment_train=True
+        )
+        logger.info(f"Landmark cache: {args.landmark_cache_dir} (pose mode: {args.pose_mode})")
+    elif args.model_type == 'embedding_lstm':
+        from utils.embedding_cache import FrameEmbeddingCache
+        
+        # Frozen backbone: embed every frame once, then train only the temporal head
+        encoder = build_frame_encoder(
+            img_size=(args.img_size, args.img_size),
+            use_pretrained=args.use_pretrained
+        )
+        embedding_cache = FrameEmbeddingCache(
+            args.embedding_cache_dir,
+            encoder,
+            img_size=(args.img_size, args.img_size)
+        )
+        all_metadata = data_loader.train_metadata + data_loader.val_metadata + data_loader.test_metadata
+        embedded = embedding_cache.warm([m['video_path'] for m in all_metadata])
+        logger.info(f"Embedding cache: {args.embedding_cache_dir} ({embedded} videos embedded)")
+        
+        train_gen, val_gen, test_gen = create_embedding_generators(
+            data_loader,
+            embedding_cache,
+            batch_size=args.batch_size
+        )
+    else:
+        video_cache = None
+        if args.video_cache_dir:
+            from utils.video_cache import DecodedVideoCache
+            
+            video_cache = DecodedVideoCache(
+                args.video_cache_dir,
+                img_size=(args.img_size, args.img_size),
+                max_bytes=int(args.video_cache_max_gb * 1024 ** 3)
+            )
+            logger.info(f"Decoded video cache: {args.video_cache_dir}")
+            
+            if args.predecode:
+                all_metadata = data_loader.train_metadata + data_loader.val_metadata + data_loader.test_metadata
+                decoded = video_cache.warm([m['video_path'] for m in all_metadata])
+                logger.info(f"Pre-decoded {decoded} videos")
+        
+        if args.input_pipeline == 'tf_data':
+            from utils.tf_data_pipeline import create_tf_datasets
+            
+            train_gen, val_gen, test_gen = create_tf_datasets(
+                data_loader,
+                batch_size=args.batch_size,
+                augment_train=True,
+                uint8_input=args.uint8_input,
+                video_cache=video_cache,
+                cache_dir=args.tf_data_cache_dir,
+                num_shards=args.num_shards,
+                shard_index=args.shard_index
+            )
+            logger.info("Input pipeline: tf.data (parallel interleaved decode, prefetch)")
+        else:
+            train_gen, val_gen, test_gen = create_generators(
+                data_loader,
+                batch_size=args.batch_size,
+                augment_train=True,
+                uint8_input=args.uint8_input,
+                video_cache=video_cache
+            )
     
     logger.info(f"Train batches: {len(train_gen)}")
     logger.info(f"Validation batches: {len(val_gen)}")
@@ -206,13 +321,26 @@ def main(args):
     
     # Step 3: Build model
     print("\n[3/5] Building model...")
-    model = build_cnn_lstm_model(
-        sequence_length=args.sequence_length,
-        img_size=(args.img_size, args.img_size),
-        num_classes=num_classes,
-        use_pretrained=args.use_pretrained,
-        dropout_rate=args.dropout_rate
-    )
+    if args.model_type == 'pose_lstm':
+        model = build_pose_lstm_model(
+            sequence_length=args.sequence_length,
+            num_classes=num_classes
+        )
+    elif args.model_type == 'embedding_lstm':
+        model = build_embedding_lstm_model(
+            sequence_length=args.sequence_length,
+            embedding_dim=embedding_cache.embedding_dim,
+            num_classes=num_classes
+        )
+    else:
+        model = build_cnn_lstm_model(
+            sequence_length=args.sequence_length,
+            img_size=(args.img_size, args.img_size),
+            num_classes=num_classes,
+            use_pretrained=args.use_pretrained,
+            dropout_rate=args.dropout_rate,
+            uint8_input=args.uint8_input
+        )
     
     # Compile model
     optimizer = keras.optimizers.Adam(learning_rate=args.learning_rate)
@@ -273,6 +401,10 @@ def main(args):
     
     # Save final model
     final_model_path = os.path.join(output_dir, 'final_model.h5')
+    if args.model_type == 'embedding_lstm':
+        # Serve encoder + head as one uint8 model; checkpoints hold the head only
+        model.save(os.path.join(output_dir, 'final_head.h5'))
+        model = compose_two_stage_model(encoder, model)
     model.save(final_model_path)
     logger.info(f"Saved final model to {final_model_path}")
     
@@ -0,0 +1,175 @@
+"""
+Multi-video inference scheduler: parallel decode with fixed-size cross-video model batches
+"""
+
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+from typing import Callable, List, Dict, Tuple, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BatchInferenceScheduler:
+    """
+    Run a sequence model over many videos with full, evenly sized batches
+
+    Videos are decoded into windows by worker threads (OpenCV releases the
+    GIL while decoding). Windows from all decoded videos go into one queue;
+    whenever it holds batch_size windows the model runs on them, and each
+    prediction is written back to the row of its source video. The last,
+    partial batch is zero-padded to batch_size so the model always sees the
+    same input shape. At most max_pending_videos videos are decoded but not
+    yet fully predicted, which bounds memory.
+    """
+
+    def __init__(self,
+                 prepare_fn: Callable[[str], Tuple[np.ndarray, Dict]],
+                 predict_fn: Callable[[np.ndarray], np.ndarray],
+                 batch_size: int = 16,
+                 num_workers: int = 2,
+                 max_pending_videos: Optional[int] = None,
+                 pad_batches: bool = True):
+        """
+        Initialize scheduler
+
+        Args:
+            prepare_fn: Decodes a video path into (windows, video_info)
+            predict_fn: Maps a batch of windows to class probabilities
+            batch_size: Number of windows per model call
+            num_workers: Threads decoding videos concurrently
+            max_pending_videos: Decoded videos waiting for predictions
+                (defaults to twice num_workers)
+            pad_batches: Zero-pad the final batch to batch_size
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+        if num_workers < 1:
+            raise ValueError(f"num_workers must be >= 1, got {num_workers}")
+
+        self.prepare_fn = prepare_fn
+        self.predict_fn = predict_fn
+        self.batch_size = batch_size
+        self.num_workers = num_workers
+        self.max_pending_videos = max_pending_videos or 2 * num_workers
+        self.pad_batches = pad_batches
+
+    def _prepare(self, video_path: str) -> Tuple[np.ndarray, Dict, float]:
+        """Worker body: decode one video and time it"""
+        start = time.perf_counter()
+        windows, video_info = self.prepare_fn(video_path)
+        return windows, video_info, time.perf_counter() - start
+
+    def run(self, video_paths: List[str]) -> Tuple[List[Dict], Dict]:
+        """
+        Predict every window of every video
+
+        Args:
+            video_paths: Videos to process
+
+        Returns:
+            Tuple of (one entry per video in input order with 'video_path',
+            'video_info', 'probabilities' [windows, classes] and 'error',
+            throughput metrics)
+        """
+        start = time.perf_counter()
+
+        entries = [{'video_path': p, 'video_info': None, 'probabilities': None, 'error': None}
+                   for p in video_paths]
+        queue = deque()     # (entry index, window row, window)
+        remaining = {}      # entry index -> windows still waiting for a prediction
+        in_flight = {}      # future -> entry index
+        next_video = 0
+
+        metrics = {
+            'videos': len(video_paths),
+            'failed_videos': 0,
+            'windows': 0,
+            'batches': 0,
+            'padded_windows': 0,
+            'decode_seconds': 0.0,
+            'predict_seconds': 0.0
+        }
+
+        def run_batch():
+            count = min(self.batch_size, len(queue))
+            items = [queue.popleft() for _ in range(count)]
+            batch = np.stack([window for _, _, window in items])
+
+            padding = self.batch_size - count if self.pad_batches else 0
+            if padding:
+                batch = np.concatenate([batch, np.zeros((padding,) + batch.shape[1:], dtype=batch.dtype)])
+
+            predict_start = time.perf_counter()
+            probabilities = np.asarray(self.predict_fn(batch))[:count]
+            metrics['predict_seconds'] += time.perf_counter() - predict_start
+            metrics['batches'] += 1
+            metrics['padded_windows'] += padding
+
+            # Route each prediction back to its video
+            for (index, row, _), probs in zip(items, probabilities):
+                entry = entries[index]
+                if entry['probabilities'] is None:
+                    entry['probabilities'] = np.empty((entry['num_windows'], len(probs)), dtype=np.float32)
+                entry['probabilities'][row] = probs
+                remaining[index] -= 1
+                if remaining[index] == 0:
+                    del remaining[index]
+
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            while True:
+                # Keep the decoders busy without holding too many videos
+                while (next_video < len(video_paths) and
+                       len(in_flight) + len(remaining) < self.max_pending_videos):
+                    future = executor.submit(self._prepare, video_paths[next_video])
+                    in_flight[future] = next_video
+                    next_video += 1
+
+                if len(queue) >= self.batch_size:
+                    run_batch()
+                elif in_flight:
+                    done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index = in_flight.pop(future)
+                        entry = entries[index]
+                        try:
+                            windows, video_info, decode_time = future.result()
+                        except Exception as e:
+                            logger.error(f"Error preparing {entry['video_path']}: {e}")
+                            entry['error'] = str(e)
+                            metrics['failed_videos'] += 1
+                            continue
+
+                        metrics['decode_seconds'] += decode_time
+                        metrics['windows'] += len(windows)
+                        entry['video_info'] = video_info
+                        entry['num_windows'] = len(windows)
+                        if len(windows) == 0:
+                            entry['probabilities'] = np.empty((0, 0), dtype=np.float32)
+                            continue
+
+                        remaining[index] = len(windows)
+                        queue.extend((index, row, window) for row, window in enumerate(windows))
+                elif queue:
+                    # Nothing left to decode (or too many videos waiting): flush
+                    run_batch()
+                else:
+                    break
+
+        for entry in entries:
+            entry.pop('num_windows', None)
+
+        wall_seconds = time.perf_counter() - start
+        capacity = metrics['batches'] * self.batch_size
+        metrics.update({
+            'batch_size': self.batch_size,
+            'num_workers': self.num_workers,
+            'batch_fill': metrics['windows'] / capacity if capacity else 0.0,
+            'wall_seconds': wall_seconds,
+            'videos_per_second': len(video_paths) / wall_seconds if wall_seconds > 0 else 0.0,
+            'windows_per_second': metrics['windows'] / wall_seconds if wall_seconds > 0 else 0.0
+        })
+
+        return entries, metrics
@@ -0,0 +1,104 @@
+"""
+Shared helpers for the on-disk caches (content hashing, atomic writes)
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+import numpy as np
+from typing import Dict, Tuple
+
+# (absolute path, size, mtime_ns) -> content digest, so unchanged files are hashed once per process.
+# LRU bounded to DIGEST_MEMO_SIZE entries: every server upload has its own temp path.
+DIGEST_MEMO_SIZE = 4096
+_digest_memo: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_digest_lock = threading.Lock()
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 digest of a file's contents
+
+    Args:
+        path: Path to file
+        chunk_size: Read size in bytes
+
+    Returns:
+        Hex digest string
+    """
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+    with _digest_lock:
+        if memo_key in _digest_memo:
+            _digest_memo.move_to_end(memo_key)
+            return _digest_memo[memo_key]
+
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha.update(chunk)
+    digest = sha.hexdigest()
+
+    with _digest_lock:
+        _digest_memo[memo_key] = digest
+        _digest_memo.move_to_end(memo_key)
+        while len(_digest_memo) > DIGEST_MEMO_SIZE:
+            _digest_memo.popitem(last=False)
+
+    return digest
+
+
+def settings_digest(settings: Dict) -> str:
+    """
+    Short stable digest of a settings dictionary
+
+    Args:
+        settings: JSON-serializable settings
+
+    Returns:
+        First 12 hex characters of the SHA-256 of the canonical JSON
+    """
+    canonical = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:12]
+
+
+def _atomic_write(path: str, write_fn):
+    """Write through a temporary file in the same directory, then rename into place"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write_fn(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_save_npy(path: str, array: np.ndarray):
+    """
+    Save an array as .npy so concurrent readers never see a partial file
+
+    Args:
+        path: Destination .npy path
+        array: Array to save
+    """
+    _atomic_write(path, lambda f: np.save(f, array))
+
+
+def atomic_save_json(path: str, data: Dict):
+    """
+    Save a dictionary as JSON so concurrent readers never see a partial file
+
+    Args:
+        path: Destination .json path
+        data: JSON-serializable dictionary
+    """
+    _atomic_write(path, lambda f: f.write(json.dumps(data, indent=2, default=str).encode('utf-8')))
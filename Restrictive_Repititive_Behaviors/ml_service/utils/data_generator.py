@@ -24,7 +24,9 @@ class RRBDataGenerator(tf.keras.utils.Sequence):
                  sequence_length: int = 30,
                  img_size: Tuple[int, int] = (224, 224),
                  shuffle: bool = True,
-                 augment: bool = False):
+                 augment: bool = False,
+                 uint8_input: bool = False,
+                 video_cache=None):
         """
         Initialize data generator
         
@@ -35,6 +37,9 @@ class RRBDataGenerator(tf.keras.utils.Sequence):
             img_size: Target image size (height, width)
             shuffle: Whether to shuffle data after each epoch
             augment: Whether to apply data augmentation
+            uint8_input: Yield raw uint8 frames for models that normalize in-graph
+            video_cache: Optional DecodedVideoCache; videos are then decoded once and
+                read from memory-mapped files in every later epoch
         """
         self.metadata = metadata
         self.batch_size = batch_size
@@ -42,12 +47,17 @@ class RRBDataGenerator(tf.keras.utils.Sequence):
         self.img_size = img_size
         self.shuffle = shuffle
         self.augment = augment
+        self.uint8_input = uint8_input
+        self.frame_dtype = np.uint8 if uint8_input else np.float32
         
         self.indexes = np.arange(len(self.metadata))
         if self.shuffle:
             np.random.shuffle(self.indexes)
         
-        # Cache for loaded videos to avoid reloading
+        # Persistent decoded-video cache shared across epochs (and generators)
+        self.decoded_cache = video_cache
+        
+        # Fallback in-memory cache for loaded videos to avoid reloading
         self.video_cache = {}
         self.max_cache_size = 10  # Keep max 10 videos in memory
     
@@ -83,6 +93,10 @@ class RRBDataGenerator(tf.keras.utils.Sequence):
         Returns:
             Array of frames (num_frames, height, width, 3)
         """
+        if self.decoded_cache is not None:
+            # uint8 memmap; windows are converted to frame_dtype in _extract_sequence
+            return self.decoded_cache.get(video_path)
+        
         # Check cache first
         if video_path in self.video_cache:
             return self.video_cache[video_path]
@@ -106,7 +120,7 @@ class RRBDataGenerator(tf.keras.utils.Sequence):
         if len(frames) == 0:
             raise ValueError(f"No frames loaded from {video_path}")
         
-        frames = np.array(frames, dtype=np.float32)
+        frames = np.array(frames, dtype=self.frame_dtype)
         
         # Cache if not too many videos cached
         if len(self.video_cache) < self.max_cache_size:
@@ -138,11 +152,12 @@ class RRBDataGenerator(tf.keras.utils.Sequence):
             start_frame = max(0, total_frames - self.sequence_length)
             end_frame = total_frames
         
-        sequence = frames[start_frame:end_frame]
+        # Copy the window out of the (possibly memory-mapped) video
+        sequence = np.asarray(frames[start_frame:end_frame], dtype=self.frame_dtype)
         
         # Pad if necessary
         if len(sequence) < self.sequence_length:
-            padding = np.zeros((self.sequence_length - len(sequence), *self.img_size, 3), dtype=np.float32)
+            padding = np.zeros((self.sequence_length - len(sequence), *self.img_size, 3), dtype=sequence.dtype)
             sequence = np.concatenate([sequence, padding], axis=0)
         
         return sequence
@@ -164,7 +179,7 @@ class RRBDataGenerator(tf.keras.utils.Sequence):
         # Random brightness adjustment
         if np.random.random() > 0.5:
             brightness_factor = np.random.uniform(0.8, 1.2)
-            sequence = np.clip(sequence * brightness_factor, 0, 255)
+            sequence = np.clip(sequence * brightness_factor, 0, 255).astype(self.frame_dtype)
         
         # Random rotation (small angle)
         if np.random.random() > 0.5:
@@ -223,8 +238,9 @@ class RRBDataGenerator(tf.keras.utils.Sequence):
                 if self.augment:
                     sequence = self._augment_sequence(sequence)
                 
-                # Normalize
-                sequence = self._normalize_sequence(sequence)
+                # Normalize (uint8 models scale inside the graph)
+                if not self.uint8_input:
+                    sequence = self._normalize_sequence(sequence)
                 
                 X_batch.append(sequence)
                 y_batch.append(label)
@@ -232,14 +248,231 @@ class RRBDataGenerator(tf.keras.utils.Sequence):
             except Exception as e:
                 logger.warning(f"Error loading sequence from {video_path}: {e}")
                 # Use zero sequence as fallback
-                zero_sequence = np.zeros((self.sequence_length, *self.img_size, 3), dtype=np.float32)
+                zero_sequence = np.zeros((self.sequence_length, *self.img_size, 3), dtype=self.frame_dtype)
                 X_batch.append(zero_sequence)
                 y_batch.append(label)
         
+        return np.array(X_batch, dtype=self.frame_dtype), np.array(y_batch, dtype=np.int32)
+
+
+class PoseSequenceGenerator(tf.keras.utils.Sequence):
+    """
+    Data generator of pose landmark sequences for the Pose-LSTM model
+    Landmarks come from a LandmarkCache, so MediaPipe only runs the first
+    time a video is seen; later epochs read the memory-mapped cache entries.
+    """
+    
+    def __init__(self,
+                 metadata: List[Dict],
+                 landmark_cache,
+                 pose_estimator,
+                 batch_size: int = 32,
+                 sequence_length: int = 30,
+                 shuffle: bool = True,
+                 augment: bool = False):
+        """
+        Initialize pose sequence generator
+        
+        Args:
+            metadata: List of sequence metadata dicts with 'video_path', 'label', 'seq_idx'
+            landmark_cache: LandmarkCache holding per-video landmarks
+            pose_estimator: PoseEstimator used for videos not in the cache yet
+            batch_size: Number of sequences per batch
+            sequence_length: Number of frames per sequence
+            shuffle: Whether to shuffle data after each epoch
+            augment: Whether to apply horizontal-flip augmentation
+        """
+        self.metadata = metadata
+        self.landmark_cache = landmark_cache
+        self.pose_estimator = pose_estimator
+        self.batch_size = batch_size
+        self.sequence_length = sequence_length
+        self.shuffle = shuffle
+        self.augment = augment
+        
+        self.indexes = np.arange(len(self.metadata))
+        if self.shuffle:
+            np.random.shuffle(self.indexes)
+    
+    def __len__(self):
+        """Number of batches per epoch"""
+        return int(np.ceil(len(self.metadata) / self.batch_size))
+    
+    def __getitem__(self, index):
+        """Generate one batch of data"""
+        batch_indexes = self.indexes[index * self.batch_size:(index + 1) * self.batch_size]
+        
+        X_batch = []
+        y_batch = []
+        
+        for idx in batch_indexes:
+            metadata = self.metadata[idx]
+            video_path = metadata['video_path']
+            
+            try:
+                landmarks, _, _ = self.landmark_cache.get_or_compute(video_path, self.pose_estimator)
+                sequence = self._extract_sequence(landmarks, metadata['seq_idx'])
+                
+                if self.augment and np.random.random() > 0.5:
+                    sequence = self._flip_sequence(sequence)
+                
+            except Exception as e:
+                logger.warning(f"Error loading landmarks from {video_path}: {e}")
+                sequence = np.zeros((self.sequence_length, 33, 4), dtype=np.float32)
+            
+            X_batch.append(sequence.reshape(self.sequence_length, 132))
+            y_batch.append(metadata['label'])
+        
+        return np.array(X_batch, dtype=np.float32), np.array(y_batch, dtype=np.int32)
+    
+    def on_epoch_end(self):
+        """Updates indexes after each epoch"""
+        if self.shuffle:
+            np.random.shuffle(self.indexes)
+    
+    def _extract_sequence(self, landmarks: np.ndarray, seq_idx: int) -> np.ndarray:
+        """
+        Extract a window of landmarks using the same 50% overlap as RRBDataGenerator
+        
+        Args:
+            landmarks: All landmarks from video [frames, 33, 4]
+            seq_idx: Sequence index
+            
+        Returns:
+            Landmark window [sequence_length, 33, 4] as float32
+        """
+        total_frames = len(landmarks)
+        
+        stride = self.sequence_length // 2
+        start_frame = seq_idx * stride
+        end_frame = start_frame + self.sequence_length
+        
+        if end_frame > total_frames:
+            start_frame = max(0, total_frames - self.sequence_length)
+            end_frame = total_frames
+        
+        sequence = np.asarray(landmarks[start_frame:end_frame], dtype=np.float32)
+        
+        if len(sequence) < self.sequence_length:
+            padding = np.zeros((self.sequence_length - len(sequence), 33, 4), dtype=np.float32)
+            sequence = np.concatenate([sequence, padding], axis=0)
+        
+        return sequence
+    
+    @staticmethod
+    def _flip_sequence(sequence: np.ndarray) -> np.ndarray:
+        """Mirror landmarks horizontally (x -> 1 - x) and swap left/right body parts"""
+        flipped = sequence.copy()
+        flipped[:, :, 0] = np.where(np.any(sequence != 0, axis=2), 1.0 - sequence[:, :, 0], 0.0)
+        
+        # MediaPipe pose landmark pairs (left, right)
+        pairs = [(1, 4), (2, 5), (3, 6), (7, 8), (9, 10), (11, 12), (13, 14), (15, 16),
+                 (17, 18), (19, 20), (21, 22), (23, 24), (25, 26), (27, 28), (29, 30), (31, 32)]
+        for left, right in pairs:
+            flipped[:, [left, right]] = flipped[:, [right, left]]
+        
+        return flipped
+
+
+class EmbeddingSequenceGenerator(tf.keras.utils.Sequence):
+    """
+    Data generator of cached frame-embedding windows for the two-stage model
+    Embeddings come from a FrameEmbeddingCache, so the frozen backbone only
+    runs the first time a video is seen; every epoch afterwards reads small
+    memory-mapped float16 arrays instead of decoding and embedding frames.
+    """
+    
+    def __init__(self,
+                 metadata: List[Dict],
+                 embedding_cache,
+                 batch_size: int = 32,
+                 sequence_length: int = 30,
+                 shuffle: bool = True):
+        """
+        Initialize embedding sequence generator
+        
+        Args:
+            metadata: List of sequence metadata dicts with 'video_path', 'label', 'seq_idx'
+            embedding_cache: FrameEmbeddingCache holding per-video embeddings
+            batch_size: Number of sequences per batch
+            sequence_length: Number of frames per sequence
+            shuffle: Whether to shuffle data after each epoch
+        """
+        self.metadata = metadata
+        self.embedding_cache = embedding_cache
+        self.batch_size = batch_size
+        self.sequence_length = sequence_length
+        self.shuffle = shuffle
+        
+        self.indexes = np.arange(len(self.metadata))
+        if self.shuffle:
+            np.random.shuffle(self.indexes)
+    
+    def __len__(self):
+        """Number of batches per epoch"""
+        return int(np.ceil(len(self.metadata) / self.batch_size))
+    
+    def __getitem__(self, index):
+        """Generate one batch of data"""
+        batch_indexes = self.indexes[index * self.batch_size:(index + 1) * self.batch_size]
+        embedding_dim = self.embedding_cache.embedding_dim
+        
+        X_batch = []
+        y_batch = []
+        
+        for idx in batch_indexes:
+            metadata = self.metadata[idx]
+            video_path = metadata['video_path']
+            
+            try:
+                embeddings = self.embedding_cache.get_or_compute(video_path)
+                sequence = self._extract_sequence(embeddings, metadata['seq_idx'])
+            except Exception as e:
+                logger.warning(f"Error loading embeddings from {video_path}: {e}")
+                sequence = np.zeros((self.sequence_length, embedding_dim), dtype=np.float32)
+            
+            X_batch.append(sequence)
+            y_batch.append(metadata['label'])
+        
         return np.array(X_batch, dtype=np.float32), np.array(y_batch, dtype=np.int32)
+    
+    def on_epoch_end(self):
+        """Updates indexes after each epoch"""
+        if self.shuffle:
+            np.random.shuffle(self.indexes)
+    
+    def _extract_sequence(self, embeddings: np.ndarray, seq_idx: int) -> np.ndarray:
+        """
+        Extract a window of embeddings using the same 50% overlap as RRBDataGenerator
+        
+        Args:
+            embeddings: All frame embeddings from video [frames, embedding_dim]
+            seq_idx: Sequence index
+            
+        Returns:
+            Embedding window [sequence_length, embedding_dim] as float32
+        """
+        total_frames = len(embeddings)
+        
+        stride = self.sequence_length // 2
+        start_frame = seq_idx * stride
+        end_frame = start_frame + self.sequence_length
+        
+        if end_frame > total_frames:
+            start_frame = max(0, total_frames - self.sequence_length)
+            end_frame = total_frames
+        
+        sequence = np.asarray(embeddings[start_frame:end_frame], dtype=np.float32)
+        
+        if len(sequence) < self.sequence_length:
+            padding = np.zeros((self.sequence_length - len(sequence), sequence.shape[1]), dtype=np.float32)
+            sequence = np.concatenate([sequence, padding], axis=0)
+        
+        return sequence
 
 
-def create_generators(data_loader, batch_size=8, augment_train=True):
+def create_generators(data_loader, batch_size=8, augment_train=True, uint8_input=False,
+                      video_cache=None):
     """
     Create train, validation, and test generators
     
@@ -247,6 +480,8 @@ def create_generators(data_loader, batch_size=8, augment_train=True):
         data_loader: RRBDataLoader instance with prepared metadata
         batch_size: Batch size for generators
         augment_train: Whether to augment training data
+        uint8_input: Yield uint8 frames for models built with uint8_input=True
+        video_cache: Optional DecodedVideoCache shared by the three generators
         
     Returns:
         Tuple of (train_gen, val_gen, test_gen)
@@ -257,7 +492,9 @@ def create_generators(data_loader, batch_size=8, augment_train=True):
         sequence_length=data_loader.sequence_length,
         img_size=data_loader.img_size,
         shuffle=True,
-        augment=augment_train
+        augment=augment_train,
+        uint8_input=uint8_input,
+        video_cache=video_cache
     )
     
     val_gen = RRBDataGenerator(
@@ -266,7 +503,9 @@ def create_generators(data_loader, batch_size=8, augment_train=True):
         sequence_length=data_loader.sequence_length,
         img_size=data_loader.img_size,
         shuffle=False,
-        augment=False
+        augment=False,
+        uint8_input=uint8_input,
+        video_cache=video_cache
     )
     
     test_gen = RRBDataGenerator(
@@ -275,8 +514,96 @@ def create_generators(data_loader, batch_size=8, augment_train=True):
         sequence_length=data_loader.sequence_length,
         img_size=data_loader.img_size,
         shuffle=False,
+        augment=False,
+        uint8_input=uint8_input,
+        video_cache=video_cache
+    )
+    
+    return train_gen, val_gen, test_gen
+
+
+
+def create_pose_generators(data_loader, landmark_cache, pose_estimator, batch_size=32, augment_train=True):
+    """
+    Create train, validation, and test generators of pose landmark sequences
+    
+    Args:
+        data_loader: RRBDataLoader instance with prepared metadata
+        landmark_cache: LandmarkCache shared by the three generators
+        pose_estimator: PoseEstimator used for videos not in the cache yet
+        batch_size: Batch size for generators
+        augment_train: Whether to augment training data
+        
+    Returns:
+        Tuple of (train_gen, val_gen, test_gen)
+    """
+    train_gen = PoseSequenceGenerator(
+        metadata=data_loader.train_metadata,
+        landmark_cache=landmark_cache,
+        pose_estimator=pose_estimator,
+        batch_size=batch_size,
+        sequence_length=data_loader.sequence_length,
+        shuffle=True,
+        augment=augment_train
+    )
+    
+    val_gen = PoseSequenceGenerator(
+        metadata=data_loader.val_metadata,
+        landmark_cache=landmark_cache,
+        pose_estimator=pose_estimator,
+        batch_size=batch_size,
+        sequence_length=data_loader.sequence_length,
+        shuffle=False,
+        augment=False
+    )
+    
+    test_gen = PoseSequenceGenerator(
+        metadata=data_loader.test_metadata,
+        landmark_cache=landmark_cache,
+        pose_estimator=pose_estimator,
+        batch_size=batch_size,
+        sequence_length=data_loader.sequence_length,
+        shuffle=False,
         augment=False
     )
     
     return train_gen, val_gen, test_gen
 
+
+def create_embedding_generators(data_loader, embedding_cache, batch_size=32):
+    """
+    Create train, validation, and test generators of frame-embedding windows
+    
+    Args:
+        data_loader: RRBDataLoader instance with prepared metadata
+        embedding_cache: FrameEmbeddingCache shared by the three generators
+        batch_size: Batch size for generators
+        
+    Returns:
+        Tuple of (train_gen, val_gen, test_gen)
+    """
+    train_gen = EmbeddingSequenceGenerator(
+        metadata=data_loader.train_metadata,
+        embedding_cache=embedding_cache,
+        batch_size=batch_size,
+        sequence_length=data_loader.sequence_length,
+        shuffle=True
+    )
+    
+    val_gen = EmbeddingSequenceGenerator(
+        metadata=data_loader.val_metadata,
+        embedding_cache=embedding_cache,
+        batch_size=batch_size,
+        sequence_length=data_loader.sequence_length,
+        shuffle=False
+    )
+    
+    test_gen = EmbeddingSequenceGenerator(
+        metadata=data_loader.test_metadata,
+        embedding_cache=embedding_cache,
+        batch_size=batch_size,
+        sequence_length=data_loader.sequence_length,
+        shuffle=False
+    )
+    
+    return train_gen, val_gen, test_gen
@@ -11,7 +11,8 @@ import pickle
 class RRBDataLoader:
     """Data loader for RRB video dataset"""
     
-    def __init__(self, dataset_root: str, sequence_length: int = 30, img_size: Tuple[int, int] = (224, 224)):
+    def __init__(self, dataset_root: str, sequence_length: int = 30, img_size: Tuple[int, int] = (224, 224),
+                 uint8_frames: bool = False):
         """
         Initialize data loader
         
@@ -19,10 +20,12 @@ class RRBDataLoader:
             dataset_root: Root directory of dataset
             sequence_length: Number of frames per sequence
             img_size: Target image size
+            uint8_frames: Keep frames as uint8 (for models that normalize in-graph)
         """
         self.dataset_root = dataset_root
         self.sequence_length = sequence_length
         self.img_size = img_size
+        self.uint8_frames = uint8_frames
         self.label_encoder = LabelEncoder()
         
         # Define dataset structure based on folder organization
@@ -86,10 +89,12 @@ class RRBDataLoader:
             if not ret:
                 break
             
-            # Resize and normalize
+            # Resize and normalize (uint8 frames are scaled inside the model)
             frame_resized = cv2.resize(frame, self.img_size)
-            frame_normalized = frame_resized.astype(np.float32) / 255.0
-            frames.append(frame_normalized)
+            if self.uint8_frames:
+                frames.append(frame_resized)
+            else:
+                frames.append(frame_resized.astype(np.float32) / 255.0)
             
             frame_count += 1
             if max_frames and frame_count >= max_frames:
@@ -117,7 +122,8 @@ class RRBDataLoader:
                 frames = np.concatenate([frames, padding], axis=0)
             else:
                 # Empty video, return zeros
-                return [np.zeros((self.sequence_length, *self.img_size, 3), dtype=np.float32)]
+                frame_dtype = np.uint8 if self.uint8_frames else np.float32
+                return [np.zeros((self.sequence_length, *self.img_size, 3), dtype=frame_dtype)]
         
         step = max(1, int(self.sequence_length * (1 - overlap)))
         sequences = []
@@ -3,7 +3,6 @@ Memory-efficient data loader for RRB video dataset
 """
 
 import os
-import cv2
 import numpy as np
 import pandas as pd
 from typing import List, Tuple, Dict
@@ -13,13 +12,16 @@ import json
 import pickle
 import logging
 
+from .video_index import VideoIndex
+
 logger = logging.getLogger(__name__)
 
 
 class RRBDataLoaderEfficient:
     """Memory-efficient data loader for RRB video dataset"""
     
-    def __init__(self, dataset_root: str, sequence_length: int = 30, img_size: Tuple[int, int] = (224, 224)):
+    def __init__(self, dataset_root: str, sequence_length: int = 30, img_size: Tuple[int, int] = (224, 224),
+                 index_path: str = None, num_workers: int = None):
         """
         Initialize data loader
         
@@ -27,10 +29,14 @@ class RRBDataLoaderEfficient:
             dataset_root: Root directory of dataset
             sequence_length: Number of frames per sequence
             img_size: Target image size
+            index_path: Resumable video metadata index; only new or changed videos
+                are probed again (None probes every video)
+            num_workers: Processes used to probe videos (defaults to the CPU count)
         """
         self.dataset_root = dataset_root
         self.sequence_length = sequence_length
         self.img_size = img_size
+        self.video_index = VideoIndex(index_path, max_workers=num_workers)
         self.label_encoder = LabelEncoder()
         
         # Define dataset structure based on folder organization
@@ -97,23 +103,21 @@ class RRBDataLoaderEfficient:
         self.label_encoder = LabelEncoder()
         y_encoded = self.label_encoder.fit_transform(labels)
         
-        # Create metadata for sequences (without loading all data)
+        # Probe video headers in parallel (unchanged videos come from the index)
         logger.info("Creating sequence metadata...")
+        video_records = self.video_index.update(video_paths)
+        logger.info(f"Probed {self.video_index.probed} videos, reused {self.video_index.reused} from index")
+        
         sequence_metadata = []
         
-        for i, (video_path, label) in enumerate(zip(video_paths, y_encoded)):
-            if i % 10 == 0:
-                logger.info(f"Processing {i}/{len(video_paths)}...")
-            
+        for video_path, label in zip(video_paths, y_encoded):
             try:
-                # Get video info without loading all frames
-                cap = cv2.VideoCapture(video_path)
-                if not cap.isOpened():
+                record = video_records.get(video_path)
+                if record is None or not record['opened']:
                     logger.warning(f"Cannot open video: {video_path}")
                     continue
                 
-                frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-                cap.release()
+                frame_count = record['frame_count']
                 
                 if frame_count < self.sequence_length:
                     logger.warning(f"Video {video_path} has only {frame_count} frames, skipping")
@@ -141,9 +145,11 @@ class RRBDataLoaderEfficient:
         # Convert to DataFrame for easier splitting
         df = pd.DataFrame(sequence_metadata)
         
-        # Split by video (not by sequence) to avoid data leakage
-        unique_videos = df['video_path'].unique()
-        video_labels = [df[df['video_path'] == v]['label'].iloc[0] for v in unique_videos]
+        # Split by video (not by sequence) to avoid data leakage.
+        # One groupby gives each video's label in first-appearance order.
+        video_label_series = df.groupby('video_path', sort=False)['label'].first()
+        unique_videos = video_label_series.index.values
+        video_labels = video_label_series.tolist()
         
         logger.info(f"Unique videos: {len(unique_videos)}")
         logger.info(f"Label distribution: {pd.Series(video_labels).value_counts().to_dict()}")
@@ -154,15 +160,21 @@ class RRBDataLoaderEfficient:
         )
         
         # Split train videos into train/val
-        train_val_labels = [df[df['video_path'] == v]['label'].iloc[0] for v in videos_train_val]
+        train_val_labels = video_label_series.loc[videos_train_val].tolist()
         videos_train, videos_val = train_test_split(
             videos_train_val, test_size=val_size, random_state=42, stratify=train_val_labels
         )
 
+        # Assign every sequence to its video's split with one hash lookup
+        video_split = {}
+        for split_name, split_videos in (('train', videos_train), ('val', videos_val), ('test', videos_test)):
+            video_split.update(dict.fromkeys(split_videos, split_name))
+        sequence_split = df['video_path'].map(video_split)
+        
         # Create metadata splits
-        self.train_metadata = df[df['video_path'].isin(videos_train)].to_dict('records')
-        self.val_metadata = df[df['video_path'].isin(videos_val)].to_dict('records')
-        self.test_metadata = df[df['video_path'].isin(videos_test)].to_dict('records')
+        self.train_metadata = df[sequence_split == 'train'].to_dict('records')
+        self.val_metadata = df[sequence_split == 'val'].to_dict('records')
+        self.test_metadata = df[sequence_split == 'test'].to_dict('records')
         
         logger.info(f"Train set: {len(self.train_metadata)} sequences from {len(videos_train)} videos")
         logger.info(f"Validation set: {len(self.val_metadata)} sequences from {len(videos_val)} videos")
@@ -0,0 +1,268 @@
+"""
+On-disk cache of per-frame CNN embeddings keyed by video content and frame encoder
+"""
+
+import os
+import hashlib
+import cv2
+import numpy as np
+from typing import List, Dict, Tuple, Optional
+import logging
+
+from .cache_utils import file_digest, settings_digest, atomic_save_npy, atomic_save_json
+from .video_processor import VideoProcessor
+
+logger = logging.getLogger(__name__)
+
+
+def encoder_fingerprint(encoder) -> str:
+    """
+    Digest of a frame encoder's weights, so retrained encoders never reuse stale embeddings
+
+    Args:
+        encoder: Keras frame encoder
+
+    Returns:
+        Hex digest string
+    """
+    sha = hashlib.sha256(encoder.name.encode('utf-8'))
+    for weights in encoder.get_weights():
+        sha.update(np.ascontiguousarray(weights).tobytes())
+    return sha.hexdigest()
+
+
+def embed_frames(encoder, frames, batch_size: int = 64) -> np.ndarray:
+    """
+    Run the frame encoder over every frame of a video
+
+    Args:
+        encoder: Keras frame encoder (uint8 or [0, 1] float input)
+        frames: Frames resized to the encoder input size
+        batch_size: Frames per encoder call
+
+    Returns:
+        Embeddings [frames, embedding_dim] as float32
+    """
+    frames = np.asarray(frames, dtype=np.uint8)
+    uint8_input = encoder.inputs[0].dtype == 'uint8'
+
+    embeddings = []
+    for start in range(0, len(frames), batch_size):
+        batch = frames[start:start + batch_size]
+        if not uint8_input:
+            batch = batch.astype(np.float32) / 255.0
+        embeddings.append(np.asarray(encoder.predict_on_batch(batch), dtype=np.float32))
+
+    return np.concatenate(embeddings)
+
+
+def embedding_windows(embeddings: np.ndarray, sequence_length: int, overlap: float = 0.5) -> np.ndarray:
+    """
+    Slice per-frame embeddings into the windows VideoProcessor.create_sequences builds from frames
+
+    Args:
+        embeddings: Embeddings [frames, embedding_dim]
+        sequence_length: Frames per window
+        overlap: Overlap ratio between windows
+
+    Returns:
+        Windows [windows, sequence_length, embedding_dim] as float32
+    """
+    total_frames = len(embeddings)
+
+    if total_frames < sequence_length:
+        # Pad with the last frame, like create_sequences
+        indices = np.minimum(np.arange(sequence_length), total_frames - 1)[np.newaxis]
+    else:
+        step = int(sequence_length * (1 - overlap))
+        starts = np.arange(0, total_frames - sequence_length + 1, step)
+        indices = starts[:, np.newaxis] + np.arange(sequence_length)
+
+    return np.asarray(embeddings, dtype=np.float32)[indices]
+
+
+class FrameEmbeddingCache:
+    """
+    Store per-frame backbone embeddings so the frozen CNN runs once per video
+
+    Overlapping windows share frames, so embedding frames instead of windows
+    halves backbone compute at 50% overlap, and training epochs of the
+    temporal head only read the cache. Each entry is two files named after
+    the SHA-256 of the video bytes and a digest of the encoder weights and
+    decode settings:
+        <key>_embeddings.npy  (frames, embedding_dim), float16 by default
+        <key>.json            metadata, written last so it marks a complete entry
+    The .npy file is opened with mmap_mode='r'.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, cache_dir: str, encoder, img_size: Tuple[int, int] = (224, 224),
+                 color: str = 'rgb', batch_size: int = 64, dtype=np.float16):
+        """
+        Initialize frame embedding cache
+
+        Args:
+            cache_dir: Directory for cache entries
+            encoder: Keras frame encoder (see build_frame_encoder / split_two_stage_model)
+            img_size: Frame size passed to cv2.resize
+            color: Channel order the encoder is fed, 'rgb' (training data) or 'bgr'
+                (the inference frame path)
+            batch_size: Frames per encoder call
+            dtype: Storage dtype for embeddings
+        """
+        if color not in ('rgb', 'bgr'):
+            raise ValueError(f"Unknown color order '{color}'. Choose from: rgb, bgr")
+
+        self.cache_dir = cache_dir
+        self.encoder = encoder
+        self.img_size = tuple(img_size)
+        self.color = color
+        self.batch_size = batch_size
+        self.dtype = np.dtype(dtype)
+        self.hits = 0
+        self.misses = 0
+
+        self._settings_key = settings_digest({
+            'encoder': encoder_fingerprint(encoder),
+            'img_size': list(self.img_size),
+            'color': color,
+            'dtype': self.dtype.name,
+            'format_version': self.FORMAT_VERSION
+        })
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @property
+    def embedding_dim(self) -> int:
+        """Size of one frame embedding"""
+        return int(self.encoder.outputs[0].shape[-1])
+
+    def _entry_paths(self, video_path: str) -> Dict[str, str]:
+        """Build the file paths of the cache entry for a video"""
+        key = f"{file_digest(video_path)}_{self._settings_key}"
+        base = os.path.join(self.cache_dir, key[:2], key)
+
+        return {
+            'embeddings': f"{base}_embeddings.npy",
+            'meta': f"{base}.json"
+        }
+
+    def _decode(self, video_path: str) -> List[np.ndarray]:
+        """Decode and resize all frames of a video in the cache's channel order"""
+        processor = VideoProcessor(img_size=self.img_size)
+        frames = processor.extract_frames(video_path)
+
+        if self.color == 'rgb':
+            frames = [cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) for frame in frames]
+
+        return frames
+
+    def load(self, video_path: str) -> Optional[np.ndarray]:
+        """
+        Load cached embeddings for a video
+
+        Args:
+            video_path: Path to video file
+
+        Returns:
+            Embeddings [frames, embedding_dim], or None on a cache miss
+        """
+        paths = self._entry_paths(video_path)
+
+        if not os.path.exists(paths['meta']):
+            self.misses += 1
+            return None
+
+        try:
+            embeddings = np.load(paths['embeddings'], mmap_mode='r')
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable embedding cache entry for {video_path}: {e}")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return embeddings
+
+    def save(self, video_path: str, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Store embeddings for a video
+
+        Args:
+            video_path: Path to video file
+            embeddings: Embeddings [frames, embedding_dim]
+
+        Returns:
+            The embeddings as stored, so fresh and cached results go through
+            the same dtype
+        """
+        paths = self._entry_paths(video_path)
+        embeddings = np.asarray(embeddings).astype(self.dtype)
+
+        atomic_save_npy(paths['embeddings'], embeddings)
+        atomic_save_json(paths['meta'], {
+            'format_version': self.FORMAT_VERSION,
+            'source': os.path.basename(video_path),
+            'frames': int(len(embeddings)),
+            'embedding_dim': int(embeddings.shape[1]),
+            'encoder': self.encoder.name,
+            'color': self.color,
+            'dtype': self.dtype.name
+        })
+
+        return embeddings
+
+    def get_or_compute(self, video_path: str, frames: Optional[List[np.ndarray]] = None) -> np.ndarray:
+        """
+        Return cached embeddings, running the encoder only on a miss
+
+        Args:
+            video_path: Path to video file
+            frames: Already decoded and resized frames in the cache's channel
+                order (decoded from video_path if omitted)
+
+        Returns:
+            Embeddings [frames, embedding_dim]
+        """
+        cached = self.load(video_path)
+        if cached is not None:
+            return cached
+
+        if frames is None:
+            frames = self._decode(video_path)
+        if len(frames) == 0:
+            raise ValueError(f"No frames decoded from {video_path}")
+
+        return self.save(video_path, embed_frames(self.encoder, frames, self.batch_size))
+
+    def warm(self, video_paths: List[str]) -> int:
+        """
+        Embed every video that is not cached yet
+
+        Args:
+            video_paths: Videos to embed
+
+        Returns:
+            Number of videos that had to be embedded
+        """
+        unique_paths = list(dict.fromkeys(video_paths))
+        embedded = 0
+
+        for i, video_path in enumerate(unique_paths):
+            if os.path.exists(self._entry_paths(video_path)['meta']):
+                continue
+
+            try:
+                self.get_or_compute(video_path)
+                embedded += 1
+            except Exception as e:
+                logger.warning(f"Could not embed {video_path}: {e}")
+
+            if (i + 1) % 10 == 0:
+                logger.info(f"Embedded {i + 1}/{len(unique_paths)} videos...")
+
+        return embedded
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache hit/miss counters"""
+        return {'hits': self.hits, 'misses': self.misses}
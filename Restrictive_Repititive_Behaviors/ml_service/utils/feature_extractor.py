@@ -216,6 +216,178 @@ class FeatureExtractor:
         """
         Extract all kinematic features from landmark sequence
         
+        Works on the whole [frames, 33, 4] tensor at once: body-part positions
+        come from one padded index gather, velocity/acceleration/jerk from one
+        diff chain and the frequency features from one FFT along the time
+        axis. features_to_vector gives the same vector as for
+        extract_all_features_loop. (NumPy's SIMD arctan2 can move the last
+        float64 bit of angular velocity with buffer alignment, so the loop
+        path is not bit-reproducible there either; it vanishes in float32.)
+        
+        Args:
+            landmarks_sequence: List of landmark arrays (or a [frames, 33, 4] array)
+            
+        Returns:
+            Dictionary containing all extracted features
+        """
+        landmarks = np.asarray(landmarks_sequence)
+        
+        # Very short sequences and low-precision inputs (np.mean accumulates
+        # float16 in float32) keep the reference path so results stay identical
+        if len(landmarks) < 2 or landmarks.dtype not in (np.float32, np.float64):
+            return self.extract_all_features_loop(landmarks_sequence)
+        
+        landmarks = landmarks.reshape(len(landmarks), 33, 4)
+        part_names = list(self.body_parts)
+        
+        # Padded gather: [frames, parts, max_landmarks, 3]; padding adds exact zeros
+        gather_idx, gather_weight, counts = self._body_part_gather()
+        dtype = landmarks.dtype
+        coords = landmarks[:, gather_idx, :3] * gather_weight.astype(dtype)[None, :, :, None]
+        positions = np.sum(coords, axis=2) / counts.astype(dtype)[None, :, None]  # [frames, parts, 3]
+        
+        velocity = self._batched_diff(positions)
+        acceleration = self._batched_diff(velocity)
+        jerk = self._batched_diff(acceleration)
+        
+        # Magnitudes and angular velocity, laid out [parts, time] for row-wise statistics
+        velocity_mag = np.ascontiguousarray(np.linalg.norm(velocity, axis=2).T)
+        acceleration_mag = np.ascontiguousarray(np.linalg.norm(acceleration, axis=2).T)
+        jerk_mag = np.ascontiguousarray(np.linalg.norm(jerk, axis=2).T)
+        angles = np.arctan2(positions[:, :, 1], positions[:, :, 0])
+        angular_vel = np.ascontiguousarray((np.diff(angles, axis=0) / self.dt).T)
+        
+        velocity_stats = self._batched_statistics(velocity_mag)
+        acceleration_stats = self._batched_statistics(acceleration_mag)
+        jerk_stats = self._batched_statistics(jerk_mag)
+        angular_stats = self._batched_statistics(angular_vel)
+        
+        frequency = None
+        if len(positions) > 4:
+            # [parts, axes, time] signals -> [parts, axes] features
+            signals = np.ascontiguousarray(positions.transpose(1, 2, 0))
+            frequency = self._batched_frequency_features(signals)
+        
+        features = {}
+        for p, part_name in enumerate(part_names):
+            features[f'{part_name}_velocity'] = velocity_stats[p]
+            features[f'{part_name}_acceleration'] = acceleration_stats[p]
+            features[f'{part_name}_jerk'] = jerk_stats[p]
+            features[f'{part_name}_angular_velocity'] = angular_stats[p]
+            
+            if frequency is not None:
+                for axis, axis_name in enumerate(['x', 'y', 'z']):
+                    features[f'{part_name}_frequency_{axis_name}'] = frequency[p][axis]
+        
+        return features
+    
+    def _body_part_gather(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Build padded landmark index arrays for all body parts
+        
+        Returns:
+            Tuple of (indices [parts, max_landmarks], 0/1 weights, landmarks per part)
+        """
+        if getattr(self, '_gather_cache', None) is None:
+            index_lists = list(self.body_parts.values())
+            width = max(len(indices) for indices in index_lists)
+            
+            gather_idx = np.zeros((len(index_lists), width), dtype=np.intp)
+            gather_weight = np.zeros((len(index_lists), width))
+            for p, indices in enumerate(index_lists):
+                gather_idx[p, :len(indices)] = indices
+                gather_weight[p, :len(indices)] = 1.0
+            counts = np.array([len(indices) for indices in index_lists], dtype=np.float64)
+            
+            self._gather_cache = (gather_idx, gather_weight, counts)
+        
+        return self._gather_cache
+    
+    def _batched_diff(self, values: np.ndarray) -> np.ndarray:
+        """Time derivative along axis 0, matching compute_velocity's short-input behaviour"""
+        if len(values) < 2:
+            return np.zeros((1,) + values.shape[1:])
+        return np.diff(values, axis=0) / self.dt
+    
+    def _batched_statistics(self, data: np.ndarray) -> List[Dict[str, float]]:
+        """
+        Statistical features for each row of a [rows, time] array
+        
+        Args:
+            data: C-contiguous array, one time series per row
+            
+        Returns:
+            List of feature dictionaries, one per row
+        """
+        mean = np.mean(data, axis=1)
+        std = np.std(data, axis=1)
+        minimum = np.min(data, axis=1)
+        maximum = np.max(data, axis=1)
+        median = np.median(data, axis=1)
+        q25 = np.percentile(data, 25, axis=1)
+        q75 = np.percentile(data, 75, axis=1)
+        
+        return [
+            {
+                'mean': float(mean[i]),
+                'std': float(std[i]),
+                'min': float(minimum[i]),
+                'max': float(maximum[i]),
+                'median': float(median[i]),
+                'q25': float(q25[i]),
+                'q75': float(q75[i]),
+                'range': float(maximum[i] - minimum[i])
+            }
+            for i in range(len(data))
+        ]
+    
+    def _batched_frequency_features(self, signals: np.ndarray) -> List[List[Dict[str, float]]]:
+        """
+        Frequency features for every body part and axis with one FFT
+        
+        Uses the complex FFT rather than rfft: rfft differs from the per-axis
+        np.fft.fft in the last bits, which can flip float32 feature values.
+        
+        Args:
+            signals: Position signals [parts, axes, time]
+            
+        Returns:
+            Nested list [parts][axes] of frequency feature dictionaries
+        """
+        n = signals.shape[-1]
+        
+        # Strictly positive frequency bins: 1 .. (n - 1) // 2
+        positive = slice(1, (n - 1) // 2 + 1)
+        spectrum = np.fft.fft(signals, axis=-1)[..., positive]
+        fft_freq = np.fft.fftfreq(n, self.dt)[positive]
+        
+        fft_power = np.abs(np.ascontiguousarray(spectrum)) ** 2
+        
+        dominant_frequency = fft_freq[np.argmax(fft_power, axis=-1)]
+        total_power = np.sum(fft_power, axis=-1)
+        
+        power_normalized = fft_power / (total_power[..., None] + 1e-10)
+        entropy = -np.sum(power_normalized * np.log2(power_normalized + 1e-10), axis=-1)
+        
+        return [
+            [
+                {
+                    'dominant_frequency': float(dominant_frequency[p, a]),
+                    'frequency_power': float(total_power[p, a]),
+                    'frequency_entropy': float(entropy[p, a])
+                }
+                for a in range(signals.shape[1])
+            ]
+            for p in range(signals.shape[0])
+        ]
+    
+    def extract_all_features_loop(self, landmarks_sequence: List[np.ndarray]) -> Dict[str, any]:
+        """
+        Extract all kinematic features one body part at a time
+        
+        Reference implementation of extract_all_features; also used for
+        sequences too short for the batched path.
+        
         Args:
             landmarks_sequence: List of landmark arrays
             
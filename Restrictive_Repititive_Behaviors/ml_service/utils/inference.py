@@ -1,17 +1,30 @@
 import numpy as np
 import cv2
-import tensorflow as tf
-from tensorflow import keras
 import pickle
-from typing import List, Dict, Tuple, Optional
+import time
+import threading
+from typing import Callable, List, Dict, Tuple, Optional
 import os
 
 from .pose_estimator import PoseEstimator
+from .landmark_cache import LandmarkCache
+from .embedding_cache import FrameEmbeddingCache, embedding_windows
 from .feature_extractor import FeatureExtractor
 from .video_processor import VideoProcessor
+from .batch_scheduler import BatchInferenceScheduler
+from .inference_backends import load_backend
+from .temporal_aggregator import TemporalDetectionAggregator
 
 class RRBInference:
-    """Inference engine for RRB detection"""
+    """
+    Inference engine for RRB detection
+    
+    One engine is shared by the request threads and the detection job
+    threads. Model calls and pose estimation each go through a lock: the
+    TFLite interpreter and MediaPipe Pose (which keeps tracking and
+    smoothing state between frames) are not thread-safe. Decoding, caching
+    and aggregation run concurrently.
+    """
     
     def __init__(self, 
                  model_path: str,
@@ -19,7 +32,15 @@ class RRBInference:
                  sequence_length: int = 30,
                  img_size: Tuple[int, int] = (224, 224),
                  confidence_threshold: float = 0.70,
-                 min_duration: float = 3.0):
+                 min_duration: float = 3.0,
+                 uint8_input: bool = True,
+                 pose_mode: str = 'accurate',
+                 landmark_cache_dir: Optional[str] = None,
+                 backend: str = 'auto',
+                 num_threads: Optional[int] = None,
+                 embedding_cache_dir: Optional[str] = None,
+                 off_threshold: float = 0.50,
+                 max_gap: int = 1):
         """
         Initialize inference engine
         
@@ -28,17 +49,45 @@ class RRBInference:
             label_encoder_path: Path to label encoder
             sequence_length: Number of frames per sequence
             img_size: Image size for model input
-            confidence_threshold: Minimum confidence for detection
-            min_duration: Minimum duration in seconds for valid detection
+            confidence_threshold: Window probability that starts a detection
+            min_duration: Minimum duration in seconds of a merged detection
+            uint8_input: Feed uint8 frames and normalize inside the model graph
+            pose_mode: Pose estimation preset ('accurate', 'balanced' or 'fast')
+            landmark_cache_dir: Directory for cached pose landmarks (None disables caching)
+            backend: Model runtime: 'keras', 'two_stage', 'tflite', 'onnx' or 'auto'
+                (from the model file extension; see export_model.py)
+            num_threads: Threads for the TFLite / ONNX Runtime backends
+            embedding_cache_dir: Directory for cached frame embeddings ('two_stage'
+                backend only; None disables caching)
+            off_threshold: Window probability that keeps a started detection going
+            max_gap: Weaker windows bridged inside one detection
         """
         self.sequence_length = sequence_length
+        self.step = int(sequence_length * 0.5)
         self.img_size = img_size
         self.confidence_threshold = confidence_threshold
         self.min_duration = min_duration
+        self.off_threshold = off_threshold
+        self.max_gap = max_gap
+        self.uint8_input = uint8_input
         
         # Load model
         print(f"Loading model from {model_path}...")
-        self.model = keras.models.load_model(model_path)
+        self.backend = load_backend(model_path, backend=backend, uint8_input=uint8_input,
+                                    num_threads=num_threads)
+        print(f"Inference backend: {self.backend.name}")
+        
+        # Exported and uint8-trained models take raw frames; scaling is in the graph
+        self.uint8_input = self.backend.input_dtype == np.uint8
+        
+        # Two-stage models embed each frame once and classify embedding windows
+        self.two_stage = self.backend.name == 'two_stage'
+        self.embedding_cache = None
+        if self.two_stage and embedding_cache_dir:
+            # Same BGR frames as the single-stage path, so predictions match it
+            self.embedding_cache = FrameEmbeddingCache(
+                embedding_cache_dir, self.backend.encoder, img_size=img_size, color='bgr'
+            )
         
         # Load label encoder
         print(f"Loading label encoder from {label_encoder_path}...")
@@ -47,10 +96,54 @@ class RRBInference:
         
         # Initialize processors
         self.video_processor = VideoProcessor(img_size=img_size)
-        self.pose_estimator = PoseEstimator()
+        self.pose_estimator = PoseEstimator.from_mode(pose_mode)
+        self.landmark_cache = LandmarkCache(landmark_cache_dir) if landmark_cache_dir else None
+        
+        # Serialise the non-thread-safe parts (see class docstring)
+        self._model_lock = threading.RLock()
+        self._pose_lock = threading.Lock()
         
         print("Inference engine initialized successfully")
     
+    def _predict(self, batch: np.ndarray) -> np.ndarray:
+        """Run the model backend on one batch (one call at a time)"""
+        with self._model_lock:
+            return self.backend.predict(batch)
+    
+    def _embed(self, frames) -> np.ndarray:
+        """Run the two-stage frame encoder (one call at a time)"""
+        with self._model_lock:
+            return self.backend.embed(frames)
+    
+    def warm_up(self, batch_sizes: Tuple[int, ...] = (1,)) -> Dict[int, float]:
+        """
+        Run the model on dummy windows so the first request skips graph tracing
+        
+        Args:
+            batch_sizes: Batch shapes to trace (e.g. 1 and the batch_detect size)
+            
+        Returns:
+            Seconds spent per batch size
+        """
+        height, width = self.img_size[1], self.img_size[0]
+        timings = {}
+        
+        for batch_size in batch_sizes:
+            start = time.perf_counter()
+            
+            if self.two_stage:
+                frames = np.zeros((self.sequence_length, height, width, 3), dtype=np.uint8)
+                windows = embedding_windows(self._embed(frames), self.sequence_length)
+                batch = np.repeat(windows, batch_size, axis=0)
+            else:
+                dtype = np.uint8 if self.uint8_input else np.float32
+                batch = np.zeros((batch_size, self.sequence_length, height, width, 3), dtype=dtype)
+            
+            self._predict(batch)
+            timings[batch_size] = time.perf_counter() - start
+        
+        return timings
+    
     def preprocess_video(self, video_path: str) -> Tuple[np.ndarray, Dict]:
         """
         Preprocess video for inference
@@ -64,12 +157,42 @@ class RRBInference:
         # Get video info
         video_info = self.video_processor.get_video_info(video_path)
         
+        if self.embedding_cache is not None:
+            # Frames are only decoded and embedded on a cache miss; decoding runs
+            # outside the model lock, the encoder under it (_build_sequences)
+            embeddings = self.embedding_cache.load(video_path)
+            if embeddings is not None:
+                return embedding_windows(embeddings, self.sequence_length, overlap=0.5), video_info
+        
         # Extract frames
         frames = self.video_processor.extract_frames(video_path)
         
+        return self._build_sequences(frames, video_path), video_info
+    
+    def _build_sequences(self, frames: List[np.ndarray], video_path: Optional[str] = None) -> np.ndarray:
+        """
+        Turn resized frames into the model's input windows
+        
+        Args:
+            frames: Frames already resized to img_size
+            video_path: Source video, used as the embedding cache key
+            
+        Returns:
+            Array of sequences ready for model.predict (embedding windows
+            for the two-stage backend)
+        """
         if len(frames) == 0:
             raise ValueError("No frames extracted from video")
         
+        if self.two_stage:
+            # Each frame goes through the backbone once, not once per window
+            if self.embedding_cache is not None and video_path is not None:
+                with self._model_lock:
+                    embeddings = self.embedding_cache.get_or_compute(video_path, frames)
+            else:
+                embeddings = self._embed(frames)
+            return embedding_windows(embeddings, self.sequence_length, overlap=0.5)
+        
         # Create sequences
         sequences = self.video_processor.create_sequences(
             frames, 
@@ -77,11 +200,12 @@ class RRBInference:
             overlap=0.5
         )
         
-        # Normalize
-        sequences = [self.video_processor.normalize_frames(seq) for seq in sequences]
-        sequences = np.array(sequences)
+        if self.uint8_input:
+            # Scaling to [0, 1] happens in the model's first layer
+            return np.stack(sequences).astype(np.uint8, copy=False)
         
-        return sequences, video_info
+        sequences = [self.video_processor.normalize_frames(seq) for seq in sequences]
+        return np.array(sequences)
     
     def predict_sequences(self, sequences: np.ndarray) -> List[Dict]:
         """
@@ -94,8 +218,20 @@ class RRBInference:
             List of predictions for each sequence
         """
         # Get predictions
-        predictions = self.model.predict(sequences, verbose=0)
+        predictions = self._predict(sequences)
         
+        return self._format_predictions(predictions)
+    
+    def _format_predictions(self, predictions: np.ndarray) -> List[Dict]:
+        """
+        Turn class probabilities into per-sequence prediction dicts
+        
+        Args:
+            predictions: Model output [sequences, classes]
+            
+        Returns:
+            List of predictions for each sequence
+        """
         results = []
         for i, pred in enumerate(predictions):
             class_idx = np.argmax(pred)
@@ -114,46 +250,40 @@ class RRBInference:
         
         return results
     
-    def filter_detections(self, predictions: List[Dict], video_info: Dict, 
-                         fps: int = 30) -> List[Dict]:
+    def _new_aggregator(self, video_info: Dict) -> TemporalDetectionAggregator:
         """
-        Filter detections based on confidence and duration
+        Create the temporal aggregator for one video
         
         Args:
-            predictions: List of predictions
             video_info: Video metadata
-            fps: Frames per second
             
         Returns:
-            Filtered detections
+            Aggregator merging this video's windows into events
         """
-        filtered = []
+        fps = video_info.get('fps') or 30
+        min_duration = self.min_duration
+        if video_info.get('duration'):
+            # A clip shorter than min_duration can still be one long event
+            min_duration = min(min_duration, video_info['duration'])
         
-        for pred in predictions:
-            # Filter by confidence
-            if pred['confidence'] < self.confidence_threshold:
-                continue
-            
-            # Filter out 'normal' class unless it's the only detection
-            if pred['class'] == 'normal' and len(predictions) > 1:
-                continue
-            
-            # Calculate duration of this sequence
-            sequence_duration = self.sequence_length / fps
-            
-            # Filter by minimum duration
-            if sequence_duration >= self.min_duration:
-                pred['duration'] = sequence_duration
-                filtered.append(pred)
-        
-        return filtered
+        return TemporalDetectionAggregator(
+            class_names=self.label_encoder.classes_,
+            fps=fps,
+            sequence_length=self.sequence_length,
+            step=self.step,
+            on_threshold=self.confidence_threshold,
+            off_threshold=self.off_threshold,
+            min_duration=min_duration,
+            max_gap=self.max_gap,
+            total_frames=video_info.get('frame_count') or None
+        )
     
     def aggregate_detections(self, detections: List[Dict]) -> Dict:
         """
         Aggregate multiple detections into final result
         
         Args:
-            detections: List of filtered detections
+            detections: Events from TemporalDetectionAggregator
             
         Returns:
             Aggregated detection result
@@ -200,37 +330,187 @@ class RRBInference:
             'behaviors': behavior_summary
         }
     
-    def detect_rrb(self, video_path: str) -> Dict:
+    def _detect_from_sequences(self, sequences: np.ndarray, video_info: Dict) -> Dict:
+        """
+        Run prediction, temporal aggregation and summary on prepared sequences
+        
+        Args:
+            sequences: Preprocessed video sequences
+            video_info: Video metadata
+            
+        Returns:
+            Detection results
+        """
+        # Predict
+        probabilities = self._predict(sequences)
+        
+        return self._detect_from_predictions(probabilities, video_info)
+    
+    def _detect_from_predictions(self, probabilities: np.ndarray, video_info: Dict) -> Dict:
+        """
+        Merge the per-window probabilities of one video into events and summarize them
+        
+        Args:
+            probabilities: Model output [windows, classes] in window order
+            video_info: Video metadata
+            
+        Returns:
+            Detection results
+        """
+        aggregator = self._new_aggregator(video_info)
+        aggregator.update(probabilities)
+        aggregator.finalize()
+        
+        return self._summarize(aggregator, video_info)
+    
+    def _summarize(self, aggregator: TemporalDetectionAggregator, video_info: Dict) -> Dict:
+        """
+        Build the detection result from a finalized aggregator
+        
+        Args:
+            aggregator: Aggregator that has seen every window of the video
+            video_info: Video metadata
+            
+        Returns:
+            Detection results
+        """
+        events = sorted(aggregator.events, key=lambda e: (e['start_time'], e['class']))
+        
+        # Aggregate results
+        result = self.aggregate_detections(events)
+        
+        # Add metadata
+        result['events'] = events
+        result['video_info'] = video_info
+        result['total_sequences_analyzed'] = aggregator.windows_seen
+        result['sequences_with_detections'] = aggregator.detected_windows()
+        
+        return result
+    
+    def detect_rrb(self, video_path: str, progress_callback: Optional[Callable[[str], None]] = None) -> Dict:
         """
         Main detection pipeline
         
         Args:
             video_path: Path to video file
+            progress_callback: Called with 'decode' and 'predict' as each stage starts
             
         Returns:
             Detection results
         """
         try:
             # Preprocess video
+            if progress_callback:
+                progress_callback('decode')
             sequences, video_info = self.preprocess_video(video_path)
             
-            # Predict
-            predictions = self.predict_sequences(sequences)
+            if progress_callback:
+                progress_callback('predict')
+            return self._detect_from_sequences(sequences, video_info)
             
-            # Filter detections
-            fps = video_info.get('fps', 30)
-            filtered_detections = self.filter_detections(predictions, video_info, fps)
+        except Exception as e:
+            return {
+                'detected': False,
+                'error': str(e),
+                'primary_behavior': 'error',
+                'confidence': 0.0,
+                'behaviors': []
+            }
+    
+    def detect_rrb_streaming(self, video_path: str, batch_size: int = 16,
+                             on_event: Optional[Callable[[Dict], None]] = None,
+                             progress_callback: Optional[Callable[[str], None]] = None) -> Dict:
+        """
+        Detection pipeline that predicts while the video is still decoding
+        
+        Windows are cut from a rolling frame buffer and predicted batch_size
+        at a time; each batch goes straight into the temporal aggregator, so
+        events are reported through on_event as soon as they end instead of
+        after the whole video. Memory stays bounded by one window plus one
+        batch, whatever the video length. The windows are the ones detect_rrb
+        builds, so the result matches it (check_streaming_parity.py); with the
+        two-stage backend frames are embedded in chunks and the embedding cache
+        is not used.
+        
+        Args:
+            video_path: Path to video file
+            batch_size: Windows per model call
+            on_event: Called with each event dict as it closes
+            progress_callback: Called with 'decode' at the start and 'predict'
+                once decoding is done (prediction overlaps decoding until then)
+        
+        Returns:
+            Detection results
+        """
+        try:
+            if progress_callback:
+                progress_callback('decode')
+            
+            video_info = self.video_processor.get_video_info(video_path)
+            aggregator = self._new_aggregator(video_info)
             
-            # Aggregate results
-            result = self.aggregate_detections(filtered_detections)
+            buffer = []   # frames (or frame embeddings) of the windows not cut yet
+            pending = []  # windows waiting for a model call
+            to_embed = []
             
-            # Add metadata
-            result['video_info'] = video_info
-            result['total_sequences_analyzed'] = len(sequences)
-            result['sequences_with_detections'] = len(filtered_detections)
+            def predict_pending():
+                if self.two_stage:
+                    batch = np.stack(pending).astype(np.float32, copy=False)
+                elif self.uint8_input:
+                    batch = np.stack(pending).astype(np.uint8, copy=False)
+                else:
+                    batch = self.video_processor.normalize_frames(np.stack(pending))
+                pending.clear()
+                
+                for event in aggregator.update(self._predict(batch)):
+                    if on_event:
+                        on_event(event)
             
-            return result
+            def push(items):
+                buffer.extend(items)
+                while len(buffer) >= self.sequence_length:
+                    pending.append(np.stack(buffer[:self.sequence_length]))
+                    del buffer[:self.step]
+                    if len(pending) >= batch_size:
+                        predict_pending()
             
+            frames_seen = 0
+            for frame in self.video_processor.iter_frames(video_path):
+                frame = cv2.resize(frame, self.img_size)
+                frames_seen += 1
+                
+                if not self.two_stage:
+                    push([frame])
+                    continue
+                
+                # Embed frames in chunks, each frame once
+                to_embed.append(frame)
+                if len(to_embed) >= batch_size * self.step:
+                    push(list(self._embed(to_embed)))
+                    to_embed.clear()
+            
+            if to_embed:
+                push(list(self._embed(to_embed)))
+            
+            if frames_seen == 0:
+                raise ValueError("No frames extracted from video")
+            
+            if progress_callback:
+                progress_callback('predict')
+            
+            if frames_seen < self.sequence_length:
+                # Pad with the last frame, like create_sequences
+                pending.append(np.stack(buffer + [buffer[-1]] * (self.sequence_length - len(buffer))))
+            
+            if pending:
+                predict_pending()
+            
+            for event in aggregator.finalize():
+                if on_event:
+                    on_event(event)
+            
+            return self._summarize(aggregator, video_info)
+        
         except Exception as e:
             return {
                 'detected': False,
@@ -240,64 +520,198 @@ class RRBInference:
                 'behaviors': []
             }
     
-    def detect_with_pose_analysis(self, video_path: str) -> Dict:
+    def _analyze_pose(self, landmarks_sequence: List[np.ndarray], fps: int,
+                      pose_mask: np.ndarray) -> Dict:
+        """
+        Summarize pose landmarks into kinematic features
+        
+        Args:
+            landmarks_sequence: Landmark arrays, one per frame
+            fps: Frames per second of the video
+            pose_mask: True for frames where a pose was actually detected
+            
+        Returns:
+            Pose analysis section of the detection result
+        """
+        if len(landmarks_sequence) == 0:
+            return {
+                'landmarks_extracted': 0,
+                'error': 'No pose detected in video'
+            }
+        
+        frames_with_pose = int(pose_mask.sum())
+        if frames_with_pose == 0:
+            return {
+                'landmarks_extracted': len(landmarks_sequence),
+                'frames_with_pose': 0,
+                'error': 'No pose detected in video'
+            }
+        
+        feature_extractor = FeatureExtractor(fps=fps)
+        features = feature_extractor.extract_all_features(landmarks_sequence)
+        
+        # Per body part headline numbers for reviewers; the full set stays in 'features'
+        movement_summary = {}
+        for part_name in feature_extractor.body_parts:
+            frequency = [features[f'{part_name}_frequency_{axis}']
+                         for axis in ['x', 'y', 'z']
+                         if f'{part_name}_frequency_{axis}' in features]
+            strongest = max(frequency, key=lambda f: f['frequency_power']) if frequency else None
+            
+            movement_summary[part_name] = {
+                'mean_velocity': features[f'{part_name}_velocity']['mean'],
+                'max_velocity': features[f'{part_name}_velocity']['max'],
+                'dominant_frequency': strongest['dominant_frequency'] if strongest else 0.0
+            }
+        
+        return {
+            'landmarks_extracted': len(landmarks_sequence),
+            'frames_with_pose': frames_with_pose,
+            'pose_coverage': frames_with_pose / len(landmarks_sequence),
+            'pose_mode': {
+                'model_complexity': self.pose_estimator.model_complexity,
+                'frame_stride': self.pose_estimator.frame_stride,
+                'max_input_dim': self.pose_estimator.max_input_dim
+            },
+            'fps': fps,
+            'features_extracted': True,
+            'feature_vector_size': int(len(feature_extractor.features_to_vector(features))),
+            'movement_summary': movement_summary,
+            'features': features
+        }
+    
+    def detect_with_pose_analysis(self, video_path: str, include_pose: bool = True,
+                                  progress_callback: Optional[Callable[[str], None]] = None) -> Dict:
         """
         Enhanced detection with pose analysis
         
+        The video is decoded once: each frame is resized for the CNN-LSTM
+        windows and handed to the pose estimator at full resolution in the
+        same pass. When a landmark cache is configured and already holds this
+        video, pose estimation is skipped and only the CNN decode runs.
+        
         Args:
             video_path: Path to video file
+            include_pose: Run pose estimation and add kinematic features
+            progress_callback: Called with 'decode' (decode and pose) and 'predict'
+                as each stage starts
             
         Returns:
             Detection results with pose features
         """
-        # Standard detection
-        result = self.detect_rrb(video_path)
-        
         try:
-            # Extract pose landmarks
-            landmarks_sequence, fps = self.pose_estimator.process_video(video_path)
+            if progress_callback:
+                progress_callback('decode')
+            
+            video_info = self.video_processor.get_video_info(video_path)
+            fps = video_info.get('fps') or 30
+            
+            cnn_frames = []
+            
+            def shared_frames():
+                for frame in self.video_processor.iter_frames(video_path):
+                    cnn_frames.append(cv2.resize(frame, self.img_size))
+                    yield frame
+            
+            frame_stream = shared_frames()
+            pose_analysis = None
+            
+            cached = None
+            if include_pose and self.landmark_cache is not None:
+                cached = self.landmark_cache.load(video_path, self.pose_estimator.settings())
+            
+            if cached is not None:
+                landmarks, pose_mask, _ = cached
+                pose_analysis = self._analyze_pose(LandmarkCache.to_sequence(landmarks), fps, pose_mask)
+                pose_analysis['landmark_cache_hit'] = True
+            elif include_pose:
+                try:
+                    # MediaPipe tracks across frames: one video at a time
+                    with self._pose_lock:
+                        landmarks_sequence, pose_mask = self.pose_estimator.process_frames(
+                            frame_stream, return_mask=True
+                        )
+                    if self.landmark_cache is not None and len(landmarks_sequence) > 0:
+                        # Analyse the stored copy so hits and misses give identical features
+                        landmarks = self.landmark_cache.save(
+                            video_path, self.pose_estimator.settings(),
+                            landmarks_sequence, pose_mask, fps
+                        )
+                        landmarks_sequence = LandmarkCache.to_sequence(landmarks)
+                    pose_analysis = self._analyze_pose(landmarks_sequence, fps, pose_mask)
+                    pose_analysis['landmark_cache_hit'] = False
+                except Exception as e:
+                    pose_analysis = {'error': str(e)}
+            
+            # Finish decoding for the CNN path (everything if pose was skipped or failed)
+            for _ in frame_stream:
+                pass
+            
+            sequences = self._build_sequences(cnn_frames, video_path)
+            
+            if progress_callback:
+                progress_callback('predict')
+            result = self._detect_from_sequences(sequences, video_info)
             
-            if len(landmarks_sequence) > 0:
-                # Extract features
-                feature_extractor = FeatureExtractor(fps=fps)
-                features = feature_extractor.extract_all_features(landmarks_sequence)
-                
-                # Add pose analysis to result
-                result['pose_analysis'] = {
-                    'landmarks_extracted': len(landmarks_sequence),
-                    'fps': fps,
-                    'features_extracted': True
-                }
-            else:
-                result['pose_analysis'] = {
-                    'landmarks_extracted': 0,
-                    'error': 'No pose detected in video'
-                }
-                
         except Exception as e:
-            result['pose_analysis'] = {
-                'error': str(e)
+            return {
+                'detected': False,
+                'error': str(e),
+                'primary_behavior': 'error',
+                'confidence': 0.0,
+                'behaviors': []
             }
         
+        if pose_analysis is not None:
+            result['pose_analysis'] = pose_analysis
+        
         return result
     
-    def batch_detect(self, video_paths: List[str]) -> List[Dict]:
+    def batch_detect(self, video_paths: List[str], batch_size: int = 16, num_workers: int = 2,
+                     return_metrics: bool = False):
         """
         Batch detection for multiple videos
         
+        Videos are decoded concurrently and their sequences are packed into
+        fixed-size model batches across videos (see BatchInferenceScheduler).
+        
         Args:
             video_paths: List of video paths
+            batch_size: Sequences per model call
+            num_workers: Threads decoding videos
+            return_metrics: Also return the scheduler's throughput metrics
             
         Returns:
-            List of detection results
+            List of detection results in input order, plus the metrics dict
+            if return_metrics is True
         """
-        results = []
+        print(f"Processing {len(video_paths)} videos (batch size {batch_size}, {num_workers} decode workers)")
+        
+        scheduler = BatchInferenceScheduler(
+            prepare_fn=self.preprocess_video,
+            predict_fn=self._predict,
+            batch_size=batch_size,
+            num_workers=num_workers
+        )
+        entries, metrics = scheduler.run(video_paths)
         
-        for i, video_path in enumerate(video_paths):
-            print(f"Processing video {i+1}/{len(video_paths)}: {video_path}")
-            result = self.detect_rrb(video_path)
-            result['video_path'] = video_path
+        results = []
+        for entry in entries:
+            if entry['error'] is not None:
+                result = {
+                    'detected': False,
+                    'error': entry['error'],
+                    'primary_behavior': 'error',
+                    'confidence': 0.0,
+                    'behaviors': []
+                }
+            else:
+                result = self._detect_from_predictions(entry['probabilities'], entry['video_info'])
+            
+            result['video_path'] = entry['video_path']
             results.append(result)
         
+        if return_metrics:
+            return results, metrics
         return results
 
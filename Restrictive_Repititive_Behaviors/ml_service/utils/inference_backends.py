@@ -0,0 +1,278 @@
+"""
+Pluggable model backends for RRB inference: Keras, TFLite and ONNX Runtime
+"""
+
+import os
+import threading
+import numpy as np
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('keras', 'two_stage', 'tflite', 'onnx')
+
+
+class KerasBackend:
+    """Full TensorFlow/Keras model (.h5 / SavedModel)"""
+
+    name = 'keras'
+
+    def __init__(self, model_path: str, uint8_input: bool = True):
+        """
+        Load a Keras model
+
+        Args:
+            model_path: Path to .h5 or SavedModel
+            uint8_input: Wrap float-input models so they accept uint8 frames
+        """
+        import tensorflow as tf
+        from tensorflow import keras
+        from models.rrb_model import build_uint8_serving_model
+
+        self.model = keras.models.load_model(model_path)
+
+        if self.model.inputs[0].dtype == tf.uint8:
+            # Model was trained with in-graph normalization
+            self.input_dtype = np.uint8
+        elif uint8_input:
+            # Float-input models get a uint8 front end so frames skip the float copy
+            self.model = build_uint8_serving_model(self.model)
+            self.input_dtype = np.uint8
+        else:
+            self.input_dtype = np.float32
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities for a batch of sequences
+
+        Args:
+            batch: Sequences [batch, frames, height, width, 3]
+
+        Returns:
+            Probabilities [batch, classes]
+        """
+        if len(batch) <= 32:
+            return np.asarray(self.model.predict_on_batch(batch))
+        return self.model.predict(batch, verbose=0)
+
+
+class TwoStageKerasBackend:
+    """
+    Keras CNN-LSTM split into a per-frame encoder and a temporal head
+
+    The engine embeds each decoded frame once (optionally through a
+    FrameEmbeddingCache) and feeds embedding windows to predict(), so frames
+    shared by overlapping windows go through the backbone only once.
+    """
+
+    name = 'two_stage'
+
+    def __init__(self, model_path: str, uint8_input: bool = True):
+        """
+        Load a Keras CNN-LSTM and split it at the backbone
+
+        Args:
+            model_path: Path to .h5 or SavedModel (build_cnn_lstm_model or
+                compose_two_stage_model architecture)
+            uint8_input: Wrap float-input encoders so they accept uint8 frames
+        """
+        from tensorflow import keras
+        from models.rrb_model import build_uint8_serving_model, split_two_stage_model
+
+        self.encoder, self.head = split_two_stage_model(keras.models.load_model(model_path))
+
+        if uint8_input:
+            self.encoder = build_uint8_serving_model(self.encoder)
+
+        # Frames go to the encoder; predict() takes float embedding windows
+        self.input_dtype = np.float32
+
+    def embed(self, frames) -> np.ndarray:
+        """
+        Per-frame embeddings of one video
+
+        Args:
+            frames: Frames resized to the model input [frames, height, width, 3]
+
+        Returns:
+            Embeddings [frames, embedding_dim]
+        """
+        from .embedding_cache import embed_frames
+        return embed_frames(self.encoder, frames)
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities for a batch of embedding windows
+
+        Args:
+            batch: Embedding windows [batch, frames, embedding_dim]
+
+        Returns:
+            Probabilities [batch, classes]
+        """
+        if len(batch) <= 32:
+            return np.asarray(self.head.predict_on_batch(batch))
+        return self.head.predict(batch, verbose=0)
+
+
+class TFLiteBackend:
+    """TFLite interpreter (float16 or int8 models from export_model.py)"""
+
+    name = 'tflite'
+
+    def __init__(self, model_path: str, num_threads: Optional[int] = None):
+        """
+        Load a TFLite model
+
+        Uses the standalone tflite_runtime package when it is installed and
+        falls back to tf.lite otherwise (needed for models with Select TF ops).
+
+        Args:
+            model_path: Path to .tflite file
+            num_threads: Interpreter threads (None lets TFLite decide)
+        """
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+
+        self.interpreter = Interpreter(model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self.input_dtype = self._input['dtype']
+
+        # Models exported with a fixed batch size are fed in chunks of that size
+        signature = self._input.get('shape_signature', self._input['shape'])
+        self.fixed_batch = int(signature[0]) if signature[0] > 0 else None
+        self._batch = int(self._input['shape'][0])
+
+        # The interpreter is stateful, so calls from request threads are serialized
+        self._lock = threading.Lock()
+
+    def _resize(self, batch_size: int):
+        """Reallocate tensors for a new batch size"""
+        shape = list(self._input['shape'])
+        shape[0] = batch_size
+        self.interpreter.resize_tensor_input(self._input['index'], shape)
+        self.interpreter.allocate_tensors()
+        self._batch = batch_size
+
+    def _invoke(self, batch: np.ndarray) -> np.ndarray:
+        """Run one batch whose size the interpreter accepts"""
+        if len(batch) != self._batch:
+            self._resize(len(batch))
+
+        scale, zero_point = self._input['quantization']
+        if scale and np.issubdtype(self.input_dtype, np.integer) and batch.dtype != self.input_dtype:
+            batch = np.round(batch / scale + zero_point)
+        self.interpreter.set_tensor(self._input['index'], batch.astype(self.input_dtype, copy=False))
+        self.interpreter.invoke()
+
+        output = self.interpreter.get_tensor(self._output['index'])
+        scale, zero_point = self._output['quantization']
+        if scale and np.issubdtype(output.dtype, np.integer):
+            output = (output.astype(np.float32) - zero_point) * scale
+        return np.array(output, dtype=np.float32)
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities for a batch of sequences
+
+        Args:
+            batch: Sequences [batch, frames, height, width, 3]
+
+        Returns:
+            Probabilities [batch, classes]
+        """
+        with self._lock:
+            if self.fixed_batch is None:
+                return self._invoke(batch)
+
+            outputs = []
+            for start in range(0, len(batch), self.fixed_batch):
+                chunk = batch[start:start + self.fixed_batch]
+                count = len(chunk)
+                if count < self.fixed_batch:
+                    padding = np.zeros((self.fixed_batch - count,) + chunk.shape[1:], dtype=chunk.dtype)
+                    chunk = np.concatenate([chunk, padding])
+                outputs.append(self._invoke(chunk)[:count])
+            return np.concatenate(outputs)
+
+
+class ONNXBackend:
+    """ONNX Runtime session (model converted with export_model.py --formats onnx)"""
+
+    name = 'onnx'
+
+    _DTYPES = {
+        'tensor(uint8)': np.uint8,
+        'tensor(float)': np.float32,
+        'tensor(float16)': np.float16
+    }
+
+    def __init__(self, model_path: str, num_threads: Optional[int] = None):
+        """
+        Load an ONNX model
+
+        Args:
+            model_path: Path to .onnx file
+            num_threads: Intra-op threads (None lets ONNX Runtime decide)
+        """
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        self.session = ort.InferenceSession(model_path, sess_options=options,
+                                            providers=['CPUExecutionProvider'])
+        self._input = self.session.get_inputs()[0]
+        self.input_dtype = self._DTYPES.get(self._input.type, np.float32)
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities for a batch of sequences
+
+        Args:
+            batch: Sequences [batch, frames, height, width, 3]
+
+        Returns:
+            Probabilities [batch, classes]
+        """
+        batch = batch.astype(self.input_dtype, copy=False)
+        return self.session.run(None, {self._input.name: batch})[0]
+
+
+def load_backend(model_path: str, backend: str = 'auto', uint8_input: bool = True,
+                 num_threads: Optional[int] = None):
+    """
+    Load a model with the matching backend
+
+    Args:
+        model_path: Path to .h5 / SavedModel, .tflite or .onnx
+        backend: 'keras', 'two_stage', 'tflite', 'onnx' or 'auto' (chosen from the
+            file extension; 'two_stage' is only picked explicitly)
+        uint8_input: Serve Keras float-input models through a uint8 wrapper
+        num_threads: Threads for the TFLite / ONNX Runtime backends
+
+    Returns:
+        Backend with predict(batch) and input_dtype
+    """
+    if backend == 'auto':
+        extension = os.path.splitext(model_path)[1].lower()
+        backend = {'.tflite': 'tflite', '.onnx': 'onnx'}.get(extension, 'keras')
+
+    if backend == 'keras':
+        return KerasBackend(model_path, uint8_input=uint8_input)
+    if backend == 'two_stage':
+        return TwoStageKerasBackend(model_path, uint8_input=uint8_input)
+    if backend == 'tflite':
+        return TFLiteBackend(model_path, num_threads=num_threads)
+    if backend == 'onnx':
+        return ONNXBackend(model_path, num_threads=num_threads)
+
+    raise ValueError(f"Unknown inference backend '{backend}'. Choose from: {', '.join(BACKENDS)}, auto")
@@ -0,0 +1,222 @@
+"""
+Background detection jobs: bounded worker pool, per-stage progress and TTL-expired results
+"""
+
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages in order, with the progress reported when each one starts
+STAGES = {
+    'queued': 0.0,
+    'validate': 0.05,
+    'repair': 0.15,
+    'decode': 0.4,
+    'predict': 0.8,
+    'done': 1.0
+}
+
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while max_pending jobs are already queued or running"""
+
+
+class DetectionJobManager:
+    """
+    Run detection requests outside the request thread
+
+    submit() registers a job and hands it to a fixed-size thread pool, so a
+    slow video (validation, an ffmpeg repair, decoding, prediction) only ties
+    up one pool worker instead of a Flask worker. Job functions report the
+    stage they are in, and detection events as they close, through the
+    callbacks they receive; get() returns the job's status, stage, progress,
+    the events so far and, once finished, its result or error.
+    Finished jobs are kept for result_ttl seconds after completion.
+    """
+
+    def __init__(self, num_workers: int = 2, max_pending: int = 20, result_ttl: float = 3600):
+        """
+        Initialize job manager
+
+        Args:
+            num_workers: Jobs processed concurrently
+            max_pending: Queued plus running jobs accepted before submit() refuses
+            result_ttl: Seconds a finished job's result is kept
+        """
+        if num_workers < 1:
+            raise ValueError(f"num_workers must be >= 1, got {num_workers}")
+
+        self.num_workers = num_workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+
+        self._executor = ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix='detect-job')
+        self._jobs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def _pending_count(self) -> int:
+        """Queued and running jobs (caller holds the lock)"""
+        return sum(1 for job in self._jobs.values() if job['status'] in ('queued', 'running'))
+
+    def _expire(self):
+        """Drop finished jobs older than result_ttl (caller holds the lock)"""
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job['finished_at'] is not None and now - job['finished_at'] > self.result_ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def submit(self, job_fn: Callable, *args, on_discard: Optional[Callable] = None, **kwargs) -> str:
+        """
+        Queue a job
+
+        Args:
+            job_fn: Called as job_fn(report_stage, report_event, *args, **kwargs); its return
+                value becomes the job result, an exception marks the job failed
+            on_discard: Called if the job cannot be queued (e.g. to delete its upload)
+
+        Returns:
+            Job id
+
+        Raises:
+            JobQueueFull: If max_pending jobs are already queued or running
+        """
+        with self._lock:
+            self._expire()
+            if self._pending_count() >= self.max_pending:
+                if on_discard is not None:
+                    on_discard()
+                raise JobQueueFull(f"{self.max_pending} jobs already queued or running")
+
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                'job_id': job_id,
+                'status': 'queued',
+                'stage': 'queued',
+                'progress': STAGES['queued'],
+                'stage_times': {},
+                'created_at': time.time(),
+                'started_at': None,
+                'finished_at': None,
+                'result': None,
+                'error': None,
+                'events': []
+            }
+
+        self._executor.submit(self._run, job_id, job_fn, args, kwargs)
+        return job_id
+
+    def _set_stage(self, job_id: str, stage: str):
+        """Record the stage a job has entered"""
+        if stage not in STAGES:
+            raise ValueError(f"Unknown job stage '{stage}'. Choose from: {', '.join(STAGES)}")
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+
+            now = time.time()
+            self._close_stage(job, now)
+
+            job['stage'] = stage
+            job['progress'] = STAGES[stage]
+            if stage != 'done':
+                job['stage_times'][stage] = {'started_at': now, 'seconds': None}
+
+    def _add_event(self, job_id: str, event: Dict):
+        """Record a detection event reported while the job runs"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job['events'].append(dict(event))
+
+    @staticmethod
+    def _close_stage(job: Dict, now: float):
+        """Store the duration of the job's current stage (caller holds the lock)"""
+        times = job['stage_times'].get(job['stage'])
+        if times is not None and times['seconds'] is None:
+            times['seconds'] = now - times['started_at']
+
+    def _run(self, job_id: str, job_fn: Callable, args, kwargs):
+        """Worker body: run one job and store its outcome"""
+        with self._lock:
+            self._jobs[job_id]['status'] = 'running'
+            self._jobs[job_id]['started_at'] = time.time()
+
+        try:
+            result = job_fn(lambda stage: self._set_stage(job_id, stage),
+                            lambda event: self._add_event(job_id, event),
+                            *args, **kwargs)
+            status, error = 'completed', None
+        except Exception as e:
+            logger.error(f"Detection job {job_id} failed: {e}", exc_info=True)
+            result, status, error = None, 'failed', str(e)
+
+        if status == 'completed':
+            self._set_stage(job_id, 'done')
+
+        with self._lock:
+            job = self._jobs[job_id]
+            # Failed jobs keep the stage they failed in
+            self._close_stage(job, time.time())
+            job['status'] = status
+            job['result'] = result
+            job['error'] = error
+            job['finished_at'] = time.time()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """
+        Get a job's status
+
+        Args:
+            job_id: Id returned by submit()
+
+        Returns:
+            JSON-serializable job dict, or None if unknown or expired
+        """
+        with self._lock:
+            self._expire()
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+
+            status = {
+                'job_id': job_id,
+                'status': job['status'],
+                'stage': job['stage'],
+                'progress': job['progress'],
+                'stage_seconds': {stage: times['seconds'] for stage, times in job['stage_times'].items()},
+                'events': list(job['events']),
+                'created_at': datetime.fromtimestamp(job['created_at']).isoformat()
+            }
+
+            if job['status'] == 'queued':
+                status['queue_position'] = sum(
+                    1 for other in self._jobs.values()
+                    if other['status'] == 'queued' and other['created_at'] <= job['created_at']
+                )
+
+            if job['finished_at'] is not None:
+                status['finished_at'] = datetime.fromtimestamp(job['finished_at']).isoformat()
+                status['expires_at'] = datetime.fromtimestamp(job['finished_at'] + self.result_ttl).isoformat()
+                status['result'] = job['result']
+                status['error'] = job['error']
+
+            return status
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get job counts by status"""
+        with self._lock:
+            self._expire()
+            counts = {'queued': 0, 'running': 0, 'completed': 0, 'failed': 0}
+            for job in self._jobs.values():
+                counts[job['status']] += 1
+            counts['workers'] = self.num_workers
+            return counts
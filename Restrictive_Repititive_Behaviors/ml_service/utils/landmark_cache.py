@@ -0,0 +1,168 @@
+"""
+On-disk cache of MediaPipe pose landmarks keyed by video content and estimator settings
+"""
+
+import os
+import json
+import numpy as np
+from typing import List, Dict, Tuple, Optional
+import logging
+
+from .cache_utils import file_digest, settings_digest, atomic_save_npy, atomic_save_json
+
+logger = logging.getLogger(__name__)
+
+
+class LandmarkCache:
+    """
+    Store per-video pose landmarks so pose inference runs once per video
+
+    Each entry is three files named after the SHA-256 of the video bytes and
+    a digest of the estimator settings:
+        <key>_landmarks.npy  (frames, 33, 4) landmarks, float16 by default
+        <key>_mask.npy       (frames,) bool, True where a pose was detected
+        <key>.json           metadata, written last so it marks a complete entry
+    The .npy files are opened with mmap_mode='r', so a hit costs a file open
+    rather than a full read.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, cache_dir: str, dtype=np.float16):
+        """
+        Initialize landmark cache
+
+        Args:
+            cache_dir: Directory for cache entries
+            dtype: Storage dtype for landmarks
+        """
+        self.cache_dir = cache_dir
+        self.dtype = np.dtype(dtype)
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_paths(self, video_path: str, settings: Dict) -> Dict[str, str]:
+        """Build the file paths of the cache entry for a video and settings"""
+        key_settings = dict(settings, format_version=self.FORMAT_VERSION, dtype=self.dtype.name)
+        key = f"{file_digest(video_path)}_{settings_digest(key_settings)}"
+        base = os.path.join(self.cache_dir, key[:2], key)
+
+        return {
+            'landmarks': f"{base}_landmarks.npy",
+            'mask': f"{base}_mask.npy",
+            'meta': f"{base}.json"
+        }
+
+    def load(self, video_path: str, settings: Dict) -> Optional[Tuple[np.ndarray, np.ndarray, Dict]]:
+        """
+        Load cached landmarks for a video
+
+        Args:
+            video_path: Path to video file
+            settings: Pose estimator settings (see PoseEstimator.settings)
+
+        Returns:
+            Tuple of (landmarks [frames, 33, 4], pose mask [frames], metadata),
+            or None on a cache miss
+        """
+        paths = self._entry_paths(video_path, settings)
+
+        if not os.path.exists(paths['meta']):
+            self.misses += 1
+            return None
+
+        try:
+            with open(paths['meta'], 'r') as f:
+                meta = json.load(f)
+            landmarks = np.load(paths['landmarks'], mmap_mode='r')
+            pose_mask = np.load(paths['mask'], mmap_mode='r')
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable landmark cache entry for {video_path}: {e}")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return landmarks, pose_mask, meta
+
+    def save(self, video_path: str, settings: Dict, landmarks_sequence: List[np.ndarray],
+             pose_mask: np.ndarray, fps: int) -> np.ndarray:
+        """
+        Store landmarks for a video
+
+        Args:
+            video_path: Path to video file
+            settings: Pose estimator settings used to compute the landmarks
+            landmarks_sequence: Landmark arrays, one per frame
+            pose_mask: True where a pose was detected
+            fps: Frames per second of the video
+
+        Returns:
+            The landmarks as stored [frames, 33, 4], so fresh and cached
+            results go through the same dtype
+        """
+        paths = self._entry_paths(video_path, settings)
+        landmarks = np.asarray(landmarks_sequence).reshape(-1, 33, 4).astype(self.dtype)
+
+        atomic_save_npy(paths['landmarks'], landmarks)
+        atomic_save_npy(paths['mask'], np.asarray(pose_mask, dtype=bool))
+        atomic_save_json(paths['meta'], {
+            'format_version': self.FORMAT_VERSION,
+            'source': os.path.basename(video_path),
+            'frames': int(len(landmarks)),
+            'frames_with_pose': int(np.sum(pose_mask)),
+            'fps': int(fps),
+            'dtype': self.dtype.name,
+            'settings': settings
+        })
+
+        return landmarks
+
+    def get_or_compute(self, video_path: str, pose_estimator,
+                       max_frames: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, int]:
+        """
+        Return cached landmarks, running the pose estimator only on a miss
+
+        Args:
+            video_path: Path to video file
+            pose_estimator: PoseEstimator used on a cache miss
+            max_frames: Maximum number of frames to process (None for all)
+
+        Returns:
+            Tuple of (landmarks [frames, 33, 4], pose mask [frames], fps)
+        """
+        settings = pose_estimator.settings()
+        if max_frames:
+            settings['max_frames'] = max_frames
+
+        cached = self.load(video_path, settings)
+        if cached is not None:
+            landmarks, pose_mask, meta = cached
+            return landmarks, pose_mask, meta['fps']
+
+        landmarks_sequence, fps, pose_mask = pose_estimator.process_video(
+            video_path, max_frames=max_frames, return_mask=True
+        )
+        if len(landmarks_sequence) == 0:
+            raise ValueError(f"No frames decoded from {video_path}")
+
+        landmarks = self.save(video_path, settings, landmarks_sequence, pose_mask, fps)
+        return landmarks, pose_mask, fps
+
+    @staticmethod
+    def to_sequence(landmarks: np.ndarray) -> List[np.ndarray]:
+        """
+        Convert stored landmarks to the per-frame format used by FeatureExtractor
+
+        Args:
+            landmarks: Landmarks [frames, 33, 4]
+
+        Returns:
+            List of float32 arrays of length 132
+        """
+        return list(np.asarray(landmarks, dtype=np.float32).reshape(len(landmarks), 132))
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache hit/miss counters"""
+        return {'hits': self.hits, 'misses': self.misses}
@@ -1,25 +1,51 @@
 import cv2
 import mediapipe as mp
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Iterable
+
+# Pose estimation presets: MediaPipe model complexity, process every Nth
+# frame (landmarks are interpolated in between) and longest input side
+POSE_MODES = {
+    'accurate': {'model_complexity': 2, 'frame_stride': 1, 'max_input_dim': None},
+    'balanced': {'model_complexity': 1, 'frame_stride': 2, 'max_input_dim': 640},
+    'fast': {'model_complexity': 0, 'frame_stride': 3, 'max_input_dim': 480},
+}
 
 class PoseEstimator:
     """Pose estimation using MediaPipe for RRB detection"""
     
-    def __init__(self, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+    def __init__(self, min_detection_confidence=0.5, min_tracking_confidence=0.5,
+                 model_complexity=2, frame_stride=1, max_input_dim=None,
+                 interpolate_missing=True):
         """
         Initialize MediaPipe Pose estimator
         
         Args:
             min_detection_confidence: Minimum confidence for pose detection
             min_tracking_confidence: Minimum confidence for pose tracking
+            model_complexity: MediaPipe Pose model complexity (0, 1 or 2)
+            frame_stride: Run pose on every Nth frame of a sequence
+            max_input_dim: Downscale frames so the longest side is at most this (None keeps size)
+            interpolate_missing: Fill skipped or undetected frames by interpolating landmarks
         """
+        if model_complexity not in (0, 1, 2):
+            raise ValueError(f"model_complexity must be 0, 1 or 2, got {model_complexity}")
+        if frame_stride < 1:
+            raise ValueError(f"frame_stride must be >= 1, got {frame_stride}")
+        
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self.model_complexity = model_complexity
+        self.frame_stride = frame_stride
+        self.max_input_dim = max_input_dim
+        self.interpolate_missing = interpolate_missing
+        
         self.mp_pose = mp.solutions.pose
         self.mp_drawing = mp.solutions.drawing_utils
         self.pose = self.mp_pose.Pose(
             min_detection_confidence=min_detection_confidence,
             min_tracking_confidence=min_tracking_confidence,
-            model_complexity=2,
+            model_complexity=model_complexity,
             enable_segmentation=False,
             smooth_landmarks=True
         )
@@ -56,7 +82,7 @@ class PoseEstimator:
             Array of normalized landmarks [x, y, z, visibility] or None if no pose detected
         """
         # Convert BGR to RGB
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        frame_rgb = cv2.cvtColor(self._prepare_frame(frame), cv2.COLOR_BGR2RGB)
         
         # Process the frame
         results = self.pose.process(frame_rgb)
@@ -70,6 +96,55 @@ class PoseEstimator:
         
         return None
     
+    @classmethod
+    def from_mode(cls, mode: str = 'accurate', **kwargs) -> 'PoseEstimator':
+        """
+        Create an estimator from one of the POSE_MODES presets
+        
+        Args:
+            mode: 'accurate', 'balanced' or 'fast'
+            **kwargs: Overrides for individual constructor arguments
+            
+        Returns:
+            Configured PoseEstimator
+        """
+        if mode not in POSE_MODES:
+            raise ValueError(f"Unknown pose mode '{mode}'. Available: {list(POSE_MODES)}")
+        
+        settings = dict(POSE_MODES[mode])
+        settings.update(kwargs)
+        return cls(**settings)
+    
+    def settings(self) -> Dict:
+        """
+        Settings that change the extracted landmarks (used as a cache key)
+        
+        Returns:
+            Dictionary of estimator settings
+        """
+        return {
+            'min_detection_confidence': self.min_detection_confidence,
+            'min_tracking_confidence': self.min_tracking_confidence,
+            'model_complexity': self.model_complexity,
+            'frame_stride': self.frame_stride,
+            'max_input_dim': self.max_input_dim,
+            'interpolate_missing': self.interpolate_missing
+        }
+    
+    def _prepare_frame(self, frame: np.ndarray) -> np.ndarray:
+        """Downscale a frame to max_input_dim (landmarks are normalized, so coordinates are unaffected)"""
+        if self.max_input_dim is None:
+            return frame
+        
+        height, width = frame.shape[:2]
+        longest = max(height, width)
+        if longest <= self.max_input_dim:
+            return frame
+        
+        scale = self.max_input_dim / longest
+        return cv2.resize(frame, (int(round(width * scale)), int(round(height * scale))),
+                          interpolation=cv2.INTER_AREA)
+    
     def extract_key_landmarks(self, frame: np.ndarray) -> Optional[Dict[str, np.ndarray]]:
         """
         Extract only key landmarks relevant for RRB detection
@@ -80,7 +155,7 @@ class PoseEstimator:
         Returns:
             Dictionary of key landmarks with their coordinates
         """
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        frame_rgb = cv2.cvtColor(self._prepare_frame(frame), cv2.COLOR_BGR2RGB)
         results = self.pose.process(frame_rgb)
         
         if results.pose_landmarks:
@@ -92,41 +167,112 @@ class PoseEstimator:
         
         return None
     
-    def process_video(self, video_path: str, max_frames: Optional[int] = None) -> Tuple[List[np.ndarray], int]:
+    def process_video(self, video_path: str, max_frames: Optional[int] = None,
+                      return_mask: bool = False) -> Tuple:
         """
         Process entire video and extract landmarks from all frames
         
         Args:
             video_path: Path to video file
             max_frames: Maximum number of frames to process (None for all)
+            return_mask: Also return the per-frame pose mask
             
         Returns:
-            Tuple of (list of landmark arrays, fps of video)
+            Tuple of (list of landmark arrays, fps of video), plus the pose
+            mask when return_mask is set
         """
         cap = cv2.VideoCapture(video_path)
         fps = int(cap.get(cv2.CAP_PROP_FPS))
         
+        def frames():
+            frame_count = 0
+            while cap.isOpened():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                
+                yield frame
+                
+                frame_count += 1
+                if max_frames and frame_count >= max_frames:
+                    break
+        
+        try:
+            landmarks_sequence, pose_mask = self.process_frames(frames(), return_mask=True)
+        finally:
+            cap.release()
+        
+        if return_mask:
+            return landmarks_sequence, fps, pose_mask
+        return landmarks_sequence, fps
+    
+    def process_frames(self, frames: Iterable[np.ndarray], return_mask: bool = False):
+        """
+        Extract landmarks from an already-decoded stream of frames
+        
+        Lets callers that decode the video for other purposes (e.g. the
+        CNN-LSTM windows) run pose estimation in the same pass. Only every
+        frame_stride-th frame goes through MediaPipe; frames that were
+        skipped or had no person detected are filled by linear
+        interpolation between observed frames (held at the ends) unless
+        interpolate_missing is off, in which case they stay zero.
+        
+        Args:
+            frames: Iterable of BGR frames
+            return_mask: Also return the per-frame pose mask
+            
+        Returns:
+            List of landmark arrays, one per frame. With return_mask, a tuple
+            of (landmarks, mask) where mask[i] is True only for frames whose
+            landmarks were actually detected rather than filled in.
+        """
         landmarks_sequence = []
-        frame_count = 0
+        observed = []
         
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
+        for frame_idx, frame in enumerate(frames):
+            landmarks = None
+            if frame_idx % self.frame_stride == 0:
+                landmarks = self.extract_landmarks(frame)
             
-            landmarks = self.extract_landmarks(frame)
             if landmarks is not None:
                 landmarks_sequence.append(landmarks)
+                observed.append(True)
             else:
-                # If no pose detected, use zeros (will be handled in preprocessing)
                 landmarks_sequence.append(np.zeros(132))  # 33 landmarks * 4 values
+                observed.append(False)
+        
+        pose_mask = np.array(observed, dtype=bool)
+        
+        if self.interpolate_missing and pose_mask.any() and not pose_mask.all():
+            landmarks_array = self.fill_missing_landmarks(np.stack(landmarks_sequence), pose_mask)
+            landmarks_sequence = list(landmarks_array)
+        
+        if return_mask:
+            return landmarks_sequence, pose_mask
+        return landmarks_sequence
+    
+    @staticmethod
+    def fill_missing_landmarks(landmarks: np.ndarray, pose_mask: np.ndarray) -> np.ndarray:
+        """
+        Linearly interpolate landmarks over frames without a detected pose
+        
+        Args:
+            landmarks: Landmark array [frames, 132]
+            pose_mask: Boolean array [frames], True where the pose was detected
             
-            frame_count += 1
-            if max_frames and frame_count >= max_frames:
-                break
+        Returns:
+            Landmark array with the missing frames filled in
+        """
+        observed_idx = np.flatnonzero(pose_mask)
+        if len(observed_idx) == 0:
+            return landmarks
         
-        cap.release()
-        return landmarks_sequence, fps
+        filled = landmarks.copy()
+        missing_idx = np.flatnonzero(~pose_mask)
+        for col in range(landmarks.shape[1]):
+            filled[missing_idx, col] = np.interp(missing_idx, observed_idx, landmarks[observed_idx, col])
+        
+        return filled
     
     def draw_landmarks(self, frame: np.ndarray, landmarks) -> np.ndarray:
         """
@@ -0,0 +1,165 @@
+"""
+Streaming temporal aggregation of per-window predictions into behavior events
+"""
+
+import numpy as np
+from typing import List, Dict, Optional, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TemporalDetectionAggregator:
+    """
+    Merge consecutive window predictions into timed behavior events
+
+    A window is about one second of video, far shorter than the minimum
+    behavior duration, so windows are never judged on their own. Per class,
+    an event opens when a window's probability reaches on_threshold and stays
+    open while it stays at or above off_threshold (hysteresis), tolerating up
+    to max_gap weaker windows in between. When it closes, the event spans from
+    the first to the last supporting window and is kept only if it lasts at
+    least min_duration seconds.
+
+    Predictions can be fed in batches as they are computed; update() returns
+    the events that closed within the batch, so long videos report events
+    while they are still being processed. finalize() closes the rest.
+    """
+
+    def __init__(self,
+                 class_names: Sequence[str],
+                 fps: float,
+                 sequence_length: int = 30,
+                 step: int = 15,
+                 on_threshold: float = 0.70,
+                 off_threshold: float = 0.50,
+                 min_duration: float = 3.0,
+                 max_gap: int = 1,
+                 ignore_classes: Sequence[str] = ('normal',),
+                 total_frames: Optional[int] = None):
+        """
+        Initialize aggregator
+
+        Args:
+            class_names: Class name of each probability column
+            fps: Frames per second of the video
+            sequence_length: Frames per window
+            step: Frames between consecutive window starts
+            on_threshold: Probability that opens an event
+            off_threshold: Probability that keeps an open event going
+            min_duration: Minimum event duration in seconds
+            max_gap: Windows below off_threshold bridged inside one event
+            ignore_classes: Classes that never produce events
+            total_frames: Frame count, used to clip the last window's end
+        """
+        if off_threshold > on_threshold:
+            raise ValueError(f"off_threshold ({off_threshold}) must not exceed on_threshold ({on_threshold})")
+
+        self.class_names = list(class_names)
+        self.fps = fps if fps and fps > 0 else 30
+        self.sequence_length = sequence_length
+        self.step = max(1, step)
+        self.on_threshold = on_threshold
+        self.off_threshold = off_threshold
+        self.min_duration = min_duration
+        self.max_gap = max_gap
+        self.total_frames = total_frames
+
+        self._tracked = [i for i, name in enumerate(self.class_names) if name not in set(ignore_classes)]
+        self._open: Dict[int, Dict] = {}  # class index -> open segment
+        self.windows_seen = 0
+        self.events: List[Dict] = []
+
+    def _window_end_frame(self, window_index: int) -> int:
+        """Exclusive end frame of a window"""
+        end = window_index * self.step + self.sequence_length
+        return min(end, self.total_frames) if self.total_frames else end
+
+    def _close(self, class_idx: int) -> Optional[Dict]:
+        """Close the open segment of a class and return it if it is long enough"""
+        segment = self._open.pop(class_idx)
+
+        start_frame = segment['first_window'] * self.step
+        end_frame = self._window_end_frame(segment['last_window'])
+        duration = (end_frame - start_frame) / self.fps
+
+        if duration < self.min_duration:
+            return None
+
+        confidences = segment['confidences']
+        event = {
+            'class': self.class_names[class_idx],
+            'confidence': float(np.mean(confidences)),
+            'peak_confidence': float(np.max(confidences)),
+            'start_time': start_frame / self.fps,
+            'end_time': end_frame / self.fps,
+            'duration': duration,
+            'start_window': segment['first_window'],
+            'end_window': segment['last_window'],
+            'windows': len(confidences)
+        }
+        self.events.append(event)
+        return event
+
+    def update(self, probabilities: np.ndarray) -> List[Dict]:
+        """
+        Feed the next windows' class probabilities, in window order
+
+        Args:
+            probabilities: Model output [windows, classes]
+
+        Returns:
+            Events that closed within these windows
+        """
+        closed = []
+        probabilities = np.asarray(probabilities, dtype=np.float32)
+
+        for row in probabilities:
+            window_index = self.windows_seen
+            self.windows_seen += 1
+
+            for class_idx in self._tracked:
+                prob = float(row[class_idx])
+                segment = self._open.get(class_idx)
+
+                if segment is None:
+                    if prob >= self.on_threshold:
+                        self._open[class_idx] = {
+                            'first_window': window_index,
+                            'last_window': window_index,
+                            'gap': 0,
+                            'confidences': [prob]
+                        }
+                    continue
+
+                if prob >= self.off_threshold:
+                    segment['last_window'] = window_index
+                    segment['gap'] = 0
+                    segment['confidences'].append(prob)
+                    continue
+
+                segment['gap'] += 1
+                if segment['gap'] > self.max_gap:
+                    event = self._close(class_idx)
+                    if event is not None:
+                        closed.append(event)
+
+        return closed
+
+    def finalize(self) -> List[Dict]:
+        """
+        Close all open events at the end of the video
+
+        Returns:
+            Events closed by this call
+        """
+        closed = []
+        for class_idx in sorted(self._open):
+            event = self._close(class_idx)
+            if event is not None:
+                closed.append(event)
+        return closed
+
+    def detected_windows(self) -> int:
+        """Number of windows supporting the events found so far"""
+        return sum(event['windows'] for event in self.events)
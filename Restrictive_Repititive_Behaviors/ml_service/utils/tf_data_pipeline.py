@@ -0,0 +1,304 @@
+"""
+tf.data input pipeline for RRB training built from data_loader_efficient sequence metadata
+"""
+
+import os
+import math
+import cv2
+import numpy as np
+import tensorflow as tf
+from typing import List, Dict, Tuple, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+AUTOTUNE = tf.data.AUTOTUNE
+
+
+def group_metadata_by_video(metadata: List[Dict]) -> Tuple[List[str], List[int], Dict[str, List[int]]]:
+    """
+    Collapse per-sequence metadata into one record per video
+
+    Args:
+        metadata: List of sequence metadata dicts with 'video_path', 'label', 'seq_idx'
+
+    Returns:
+        Tuple of (sorted video paths, labels, mapping of video path to its seq_idx list)
+    """
+    labels = {}
+    seq_indices = {}
+    for item in metadata:
+        labels[item['video_path']] = int(item['label'])
+        seq_indices.setdefault(item['video_path'], []).append(int(item['seq_idx']))
+
+    # Sorted so sharding is the same on every worker and every run
+    video_paths = sorted(seq_indices)
+    return video_paths, [labels[p] for p in video_paths], seq_indices
+
+
+def _window_starts(seq_indices: List[int], total_frames: int, sequence_length: int) -> np.ndarray:
+    """Start frame of each window, with the same 50% overlap and end clamping as RRBDataGenerator"""
+    stride = sequence_length // 2
+    starts = []
+    for seq_idx in seq_indices:
+        start = seq_idx * stride
+        if start + sequence_length > total_frames:
+            start = max(0, total_frames - sequence_length)
+        starts.append(start)
+    return np.array(starts, dtype=np.int32)
+
+
+def _rotation_transforms(angles: tf.Tensor, height: int, width: int) -> tf.Tensor:
+    """Projective transforms rotating images about their centre (one row per angle)"""
+    cx = (width - 1) / 2.0
+    cy = (height - 1) / 2.0
+    cos = tf.cos(angles)
+    sin = tf.sin(angles)
+    zeros = tf.zeros_like(angles)
+
+    return tf.stack([
+        cos, -sin, cx - cos * cx + sin * cy,
+        sin, cos, cy - sin * cx - cos * cy,
+        zeros, zeros
+    ], axis=1)
+
+
+class RRBTFDataPipeline:
+    """
+    Build tf.data datasets of RRB video sequences
+
+    One element per video is sharded deterministically, optionally shuffled,
+    and decoded in parallel with interleave; each decoded video expands to
+    its windows. Augmentation and normalization run in map, and batches are
+    prefetched. Only the videos in flight are held in memory.
+    """
+
+    def __init__(self,
+                 sequence_length: int = 30,
+                 img_size: Tuple[int, int] = (224, 224),
+                 batch_size: int = 8,
+                 uint8_input: bool = False,
+                 video_cache=None,
+                 cycle_length: Optional[int] = None,
+                 shuffle_buffer: int = 32,
+                 seed: int = 42):
+        """
+        Initialize pipeline builder
+
+        Args:
+            sequence_length: Number of frames per sequence
+            img_size: Target image size (height, width)
+            batch_size: Number of sequences per batch
+            uint8_input: Yield raw uint8 frames for models that normalize in-graph
+            video_cache: Optional DecodedVideoCache to read frames from
+            cycle_length: Videos decoded concurrently (defaults to the CPU count)
+            shuffle_buffer: Window-level shuffle buffer (each window is a full sequence)
+            seed: Seed for the shuffles
+        """
+        self.sequence_length = sequence_length
+        self.img_size = tuple(img_size)
+        self.batch_size = batch_size
+        self.uint8_input = uint8_input
+        self.video_cache = video_cache
+        self.cycle_length = cycle_length
+        self.shuffle_buffer = shuffle_buffer
+        self.seed = seed
+
+    def _decode_video(self, video_path: str) -> np.ndarray:
+        """Decode and resize all frames of a video (uint8 RGB), matching RRBDataGenerator"""
+        if self.video_cache is not None:
+            return np.asarray(self.video_cache.get(video_path))
+
+        frames = []
+        cap = cv2.VideoCapture(video_path)
+
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+
+            frame = cv2.resize(frame, self.img_size)
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            frames.append(frame)
+
+        cap.release()
+
+        if len(frames) == 0:
+            raise ValueError(f"No frames loaded from {video_path}")
+
+        return np.stack(frames).astype(np.uint8, copy=False)
+
+    def _make_loader(self, seq_indices: Dict[str, List[int]]):
+        """numpy_function body: decode one video and return its frames and window starts"""
+        height, width = self.img_size[1], self.img_size[0]
+
+        def load(video_path):
+            video_path = video_path.decode('utf-8')
+            indices = seq_indices[video_path]
+
+            try:
+                frames = self._decode_video(video_path)
+            except Exception as e:
+                logger.warning(f"Error loading sequence from {video_path}: {e}")
+                # Zero windows keep the element count (and cardinality) intact
+                frames = np.zeros((self.sequence_length, height, width, 3), dtype=np.uint8)
+
+            starts = _window_starts(indices, len(frames), self.sequence_length)
+
+            if len(frames) < self.sequence_length:
+                padding = np.zeros((self.sequence_length - len(frames), height, width, 3), dtype=np.uint8)
+                frames = np.concatenate([frames, padding], axis=0)
+
+            return frames, starts
+
+        return load
+
+    def _augment(self, sequence: tf.Tensor) -> tf.Tensor:
+        """Random flip, brightness and small rotation, one draw per sequence (returns float32 in [0, 255])"""
+        sequence = tf.cast(sequence, tf.float32)
+
+        flip = tf.random.uniform([]) > 0.5
+        sequence = tf.cond(flip, lambda: tf.reverse(sequence, axis=[2]), lambda: sequence)
+
+        brighten = tf.random.uniform([]) > 0.5
+        factor = tf.random.uniform([], 0.8, 1.2)
+        sequence = tf.cond(brighten,
+                           lambda: tf.clip_by_value(sequence * factor, 0.0, 255.0),
+                           lambda: sequence)
+
+        rotate = tf.random.uniform([]) > 0.5
+        angle = tf.random.uniform([], -10.0, 10.0) * math.pi / 180.0
+        height, width = self.img_size[1], self.img_size[0]
+
+        def rotated():
+            transforms = _rotation_transforms(tf.fill([self.sequence_length], angle), height, width)
+            return tf.raw_ops.ImageProjectiveTransformV3(
+                images=sequence,
+                transforms=transforms,
+                output_shape=tf.constant([height, width], dtype=tf.int32),
+                fill_value=0.0,
+                interpolation='BILINEAR',
+                fill_mode='CONSTANT'
+            )
+
+        return tf.cond(rotate, rotated, lambda: sequence)
+
+    def build(self,
+              metadata: List[Dict],
+              shuffle: bool = True,
+              augment: bool = False,
+              num_shards: int = 1,
+              shard_index: int = 0,
+              cache_path: Optional[str] = None) -> tf.data.Dataset:
+        """
+        Build a batched dataset for one split
+
+        Args:
+            metadata: Sequence metadata of the split
+            shuffle: Shuffle videos and windows every epoch
+            augment: Apply data augmentation
+            num_shards: Number of workers splitting the data
+            shard_index: Index of this worker
+            cache_path: Cache decoded windows to this file prefix ('' caches in memory)
+
+        Returns:
+            tf.data.Dataset yielding (sequences, labels) batches
+        """
+        video_paths, labels, seq_indices = group_metadata_by_video(metadata)
+        height, width = self.img_size[1], self.img_size[0]
+
+        # Window count per shard, for cardinality (progress bars, evaluate)
+        shard_paths = video_paths[shard_index::num_shards]
+        num_windows = sum(len(seq_indices[p]) for p in shard_paths)
+
+        dataset = tf.data.Dataset.from_tensor_slices((video_paths, labels))
+        dataset = dataset.shard(num_shards, shard_index)
+
+        if shuffle and cache_path is None:
+            dataset = dataset.shuffle(len(video_paths), seed=self.seed, reshuffle_each_iteration=True)
+
+        load = self._make_loader(seq_indices)
+        sequence_length = self.sequence_length
+
+        def expand_video(video_path, label):
+            frames, starts = tf.numpy_function(load, [video_path], [tf.uint8, tf.int32])
+            frames.set_shape([None, height, width, 3])
+            starts.set_shape([None])
+
+            windows = tf.data.Dataset.from_tensor_slices(starts)
+            return windows.map(lambda start: (frames[start:start + sequence_length], label))
+
+        dataset = dataset.interleave(
+            expand_video,
+            cycle_length=self.cycle_length,
+            block_length=1,
+            num_parallel_calls=AUTOTUNE,
+            deterministic=not shuffle
+        )
+
+        if cache_path is not None:
+            dataset = dataset.cache(cache_path)
+
+        if shuffle:
+            dataset = dataset.shuffle(self.shuffle_buffer, seed=self.seed, reshuffle_each_iteration=True)
+
+        def prepare(sequence, label):
+            sequence.set_shape([sequence_length, height, width, 3])
+            if augment:
+                sequence = self._augment(sequence)
+            if self.uint8_input:
+                # Truncates like the generator's astype(np.uint8)
+                sequence = tf.cast(sequence, tf.uint8)
+            else:
+                sequence = tf.cast(sequence, tf.float32) / 255.0
+            return sequence, tf.cast(label, tf.int32)
+
+        dataset = dataset.map(prepare, num_parallel_calls=AUTOTUNE, deterministic=not shuffle)
+        dataset = dataset.batch(self.batch_size)
+        dataset = dataset.apply(tf.data.experimental.assert_cardinality(
+            math.ceil(num_windows / self.batch_size)
+        ))
+
+        return dataset.prefetch(AUTOTUNE)
+
+
+def create_tf_datasets(data_loader, batch_size=8, augment_train=True, uint8_input=False,
+                       video_cache=None, cache_dir=None, num_shards=1, shard_index=0):
+    """
+    Create train, validation, and test tf.data datasets
+
+    Args:
+        data_loader: RRBDataLoaderEfficient instance with prepared metadata
+        batch_size: Batch size
+        augment_train: Whether to augment training data
+        uint8_input: Yield uint8 frames for models built with uint8_input=True
+        video_cache: Optional DecodedVideoCache to read frames from
+        cache_dir: Directory for tf.data cache files (None disables dataset caching)
+        num_shards: Number of workers splitting the training data
+        shard_index: Index of this worker
+
+    Returns:
+        Tuple of (train_ds, val_ds, test_ds)
+    """
+    pipeline = RRBTFDataPipeline(
+        sequence_length=data_loader.sequence_length,
+        img_size=data_loader.img_size,
+        batch_size=batch_size,
+        uint8_input=uint8_input,
+        video_cache=video_cache
+    )
+
+    def cache_path(split):
+        if cache_dir is None:
+            return None
+        os.makedirs(cache_dir, exist_ok=True)
+        return os.path.join(cache_dir, f"{split}_shard{shard_index}of{num_shards}")
+
+    train_ds = pipeline.build(data_loader.train_metadata, shuffle=True, augment=augment_train,
+                              num_shards=num_shards, shard_index=shard_index,
+                              cache_path=cache_path('train'))
+    val_ds = pipeline.build(data_loader.val_metadata, shuffle=False, augment=False,
+                            cache_path=cache_path('val'))
+    test_ds = pipeline.build(data_loader.test_metadata, shuffle=False, augment=False)
+
+    return train_ds, val_ds, test_ds
@@ -0,0 +1,177 @@
+"""
+Pre-decoded video cache: uint8 frames at model resolution stored as memory-mapped .npy files
+"""
+
+import os
+import threading
+from collections import OrderedDict
+import cv2
+import numpy as np
+from typing import List, Dict, Tuple
+import logging
+
+from .cache_utils import file_digest, settings_digest, atomic_save_npy
+
+logger = logging.getLogger(__name__)
+
+
+class DecodedVideoCache:
+    """
+    Decode each video once and serve its frames from a memory-mapped file
+
+    Frames are resized to img_size and converted to RGB exactly like
+    RRBDataGenerator does, then stored as (frames, height, width, 3) uint8
+    .npy files named after the SHA-256 of the video bytes. Open mmaps are
+    kept in an LRU bounded by max_bytes; evicted videos are simply re-opened
+    from disk, never re-decoded.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, cache_dir: str, img_size: Tuple[int, int] = (224, 224),
+                 max_bytes: int = 2 * 1024 ** 3):
+        """
+        Initialize decoded video cache
+
+        Args:
+            cache_dir: Directory for decoded videos
+            img_size: Target image size passed to cv2.resize
+            max_bytes: Budget for the LRU of open memory-mapped videos
+        """
+        self.cache_dir = cache_dir
+        self.img_size = tuple(img_size)
+        self.max_bytes = max_bytes
+
+        self._settings_key = settings_digest({
+            'img_size': list(self.img_size),
+            'color': 'rgb',
+            'format_version': self.FORMAT_VERSION
+        })
+        self._open = OrderedDict()  # cache path -> memmap
+        self._open_bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0         # served from an open mmap
+        self.disk_hits = 0    # re-opened from an existing cache file
+        self.misses = 0       # decoded from the source video
+        self.evictions = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_path(self, video_path: str) -> str:
+        """Cache file path for a video"""
+        digest = file_digest(video_path)
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}_{self._settings_key}.npy")
+
+    def _decode(self, video_path: str) -> np.ndarray:
+        """
+        Decode and resize all frames of a video
+
+        Args:
+            video_path: Path to video file
+
+        Returns:
+            Array of frames (num_frames, height, width, 3) as uint8 RGB
+        """
+        frames = []
+        cap = cv2.VideoCapture(video_path)
+
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+
+            frame = cv2.resize(frame, self.img_size)
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            frames.append(frame)
+
+        cap.release()
+
+        if len(frames) == 0:
+            raise ValueError(f"No frames loaded from {video_path}")
+
+        return np.stack(frames).astype(np.uint8, copy=False)
+
+    def get(self, video_path: str) -> np.ndarray:
+        """
+        Get the frames of a video, decoding it only if it is not cached yet
+
+        Args:
+            video_path: Path to video file
+
+        Returns:
+            Read-only memory-mapped array (num_frames, height, width, 3) uint8
+        """
+        path = self._entry_path(video_path)
+
+        with self._lock:
+            if path in self._open:
+                self._open.move_to_end(path)
+                self.hits += 1
+                return self._open[path]
+
+        if os.path.exists(path):
+            with self._lock:
+                self.disk_hits += 1
+        else:
+            frames = self._decode(video_path)
+            atomic_save_npy(path, frames)
+            del frames
+            with self._lock:
+                self.misses += 1
+
+        frames = np.load(path, mmap_mode='r')
+
+        with self._lock:
+            if path not in self._open:
+                self._open[path] = frames
+                self._open_bytes += frames.nbytes
+                self._evict()
+            return self._open.get(path, frames)
+
+    def _evict(self):
+        """Drop least recently used mmaps until the byte budget is met (caller holds the lock)"""
+        while self._open_bytes > self.max_bytes and len(self._open) > 1:
+            _, frames = self._open.popitem(last=False)
+            self._open_bytes -= frames.nbytes
+            self.evictions += 1
+
+    def warm(self, video_paths: List[str]) -> int:
+        """
+        Decode every video that is not cached yet
+
+        Args:
+            video_paths: Videos to pre-decode
+
+        Returns:
+            Number of videos that had to be decoded
+        """
+        unique_paths = list(dict.fromkeys(video_paths))
+        decoded = 0
+
+        for i, video_path in enumerate(unique_paths):
+            if os.path.exists(self._entry_path(video_path)):
+                continue
+
+            try:
+                atomic_save_npy(self._entry_path(video_path), self._decode(video_path))
+                decoded += 1
+            except Exception as e:
+                logger.warning(f"Could not pre-decode {video_path}: {e}")
+
+            if (i + 1) % 10 == 0:
+                logger.info(f"Pre-decoded {i + 1}/{len(unique_paths)} videos...")
+
+        return decoded
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache counters"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'open_videos': len(self._open),
+                'open_bytes': self._open_bytes
+            }
@@ -0,0 +1,183 @@
+"""
+Resumable video metadata index with parallel probing
+"""
+
+import os
+import json
+import cv2
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def probe_video(video_path: str) -> Dict:
+    """
+    Read container metadata of a video without decoding frames
+
+    Top-level function so it can run in a worker process.
+
+    Args:
+        video_path: Path to video file
+
+    Returns:
+        Dictionary with fps, frame_count, width, height, duration, file size and mtime
+    """
+    stat = os.stat(video_path)
+    record = {
+        'path': video_path,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'opened': False,
+        'fps': 0,
+        'frame_count': 0,
+        'width': 0,
+        'height': 0,
+        'duration': 0.0
+    }
+
+    try:
+        cap = cv2.VideoCapture(video_path)
+        if cap.isOpened():
+            record.update({
+                'opened': True,
+                'fps': int(cap.get(cv2.CAP_PROP_FPS)),
+                'frame_count': int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+                'width': int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            })
+            if record['fps'] > 0:
+                record['duration'] = record['frame_count'] / record['fps']
+        cap.release()
+    except Exception as e:
+        record['error'] = str(e)
+
+    return record
+
+
+class VideoIndex:
+    """
+    Cache of probe_video results persisted as JSON lines
+
+    Every probe is appended to the index file as soon as it finishes, so an
+    interrupted scan resumes where it stopped. A video is probed again only
+    when its size or modification time changed.
+    """
+
+    def __init__(self, index_path: Optional[str] = None, max_workers: Optional[int] = None):
+        """
+        Initialize video index
+
+        Args:
+            index_path: JSON-lines index file (None keeps the index in memory only)
+            max_workers: Worker processes for probing (defaults to the CPU count)
+        """
+        self.index_path = index_path
+        self.max_workers = max_workers
+        self.records = {}
+        self._stored_lines = 0
+        self.probed = 0
+        self.reused = 0
+
+        if index_path and os.path.exists(index_path):
+            self._load()
+
+    def _load(self):
+        """Read the index file; later lines override earlier ones"""
+        with open(self.index_path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut short by an interrupted run
+                    continue
+                self.records[os.path.abspath(record['path'])] = record
+                self._stored_lines += 1
+
+        logger.info(f"Loaded {len(self.records)} entries from video index {self.index_path}")
+
+    def _is_current(self, video_path: str) -> bool:
+        """Whether the stored record still matches the file on disk"""
+        record = self.records.get(os.path.abspath(video_path))
+        if record is None or not os.path.exists(video_path):
+            return False
+
+        stat = os.stat(video_path)
+        return record['size'] == stat.st_size and record['mtime_ns'] == stat.st_mtime_ns
+
+    def update(self, video_paths: List[str]) -> Dict[str, Dict]:
+        """
+        Probe new or changed videos and return records for all requested paths
+
+        Args:
+            video_paths: Videos to index
+
+        Returns:
+            Mapping of each requested path to its metadata record (paths that
+            could not be probed at all are left out)
+        """
+        stale = [p for p in dict.fromkeys(video_paths) if not self._is_current(p)]
+        self.reused = len(set(video_paths)) - len(stale)
+        self.probed = 0
+
+        if stale:
+            logger.info(f"Probing {len(stale)} videos ({self.reused} unchanged in index)...")
+
+            index_file = None
+            if self.index_path:
+                os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+                index_file = open(self.index_path, 'a')
+
+            try:
+                for record in self._probe_all(stale):
+                    self.records[os.path.abspath(record['path'])] = record
+                    self.probed += 1
+
+                    if index_file is not None:
+                        index_file.write(json.dumps(record) + '\n')
+                        index_file.flush()
+                        self._stored_lines += 1
+
+                    if self.probed % 50 == 0:
+                        logger.info(f"Probed {self.probed}/{len(stale)} videos...")
+            finally:
+                if index_file is not None:
+                    index_file.close()
+
+            # Re-probed files leave superseded lines behind
+            if self.index_path and self._stored_lines > len(self.records):
+                self._compact()
+
+        return {p: self.records[os.path.abspath(p)] for p in video_paths
+                if os.path.abspath(p) in self.records}
+
+    def _probe_all(self, video_paths: List[str]):
+        """Yield probe results as they complete"""
+        if len(video_paths) == 1 or self.max_workers == 1:
+            for video_path in video_paths:
+                try:
+                    yield probe_video(video_path)
+                except Exception as e:
+                    logger.error(f"Error probing {video_path}: {e}")
+            return
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(probe_video, p): p for p in video_paths}
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as e:
+                    logger.error(f"Error probing {futures[future]}: {e}")
+
+    def _compact(self):
+        """Rewrite the index file with one line per video"""
+        tmp_path = f"{self.index_path}.compact"
+        with open(tmp_path, 'w') as f:
+            for record in self.records.values():
+                f.write(json.dumps(record) + '\n')
+        os.replace(tmp_path, self.index_path)
+        self._stored_lines = len(self.records)
@@ -1,6 +1,6 @@
 import cv2
 import numpy as np
-from typing import List, Tuple, Optional, Dict
+from typing import List, Tuple, Optional, Dict, Iterator
 import os
 
 class VideoProcessor:
@@ -43,6 +43,34 @@ class VideoProcessor:
         cap.release()
         return info
     
+    def iter_frames(self, video_path: str, max_frames: Optional[int] = None) -> Iterator[np.ndarray]:
+        """
+        Decode video frames one at a time at their original resolution
+        
+        Args:
+            video_path: Path to video file
+            max_frames: Maximum number of frames to decode
+            
+        Yields:
+            Frames in BGR format
+        """
+        cap = cv2.VideoCapture(video_path)
+        frame_count = 0
+        
+        try:
+            while cap.isOpened():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                
+                yield frame
+                
+                frame_count += 1
+                if max_frames and frame_count >= max_frames:
+                    break
+        finally:
+            cap.release()
+    
     def extract_frames(self, video_path: str, max_frames: Optional[int] = None) -> List[np.ndarray]:
         """
         Extract frames from video
@@ -54,25 +82,7 @@ class VideoProcessor:
         Returns:
             List of frames as numpy arrays
         """
-        cap = cv2.VideoCapture(video_path)
-        frames = []
-        frame_count = 0
-        
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            # Resize frame
-            frame_resized = cv2.resize(frame, self.img_size)
-            frames.append(frame_resized)
-            
-            frame_count += 1
-            if max_frames and frame_count >= max_frames:
-                break
-        
-        cap.release()
-        return frames
+        return [cv2.resize(frame, self.img_size) for frame in self.iter_frames(video_path, max_frames)]
     
     def sample_frames(self, video_path: str, num_frames: int) -> List[np.ndarray]:
         """
@@ -1,19 +1,62 @@
 import cv2
 import os
+import json
+import time
+import shutil
 import subprocess
 import tempfile
-from typing import Dict, Tuple, Optional
+import threading
+from typing import List, Dict, Tuple, Optional
 import logging
 
+from .cache_utils import file_digest, settings_digest, atomic_save_json
+
 logger = logging.getLogger(__name__)
 
 class VideoValidator:
     """Validate and repair video files before processing"""
     
-    def __init__(self):
-        """Initialize video validator"""
+    # Repair tiers, cheapest first; each runs only if the previous ones failed
+    REPAIR_TIERS = ('remux', 'keyframe_fix', 'reencode')
+    REPAIR_FORMAT_VERSION = 1
+    
+    def __init__(self,
+                 repair_cache_dir: Optional[str] = None,
+                 repair_cache_max_bytes: int = 1024 ** 3,
+                 repair_cache_ttl: float = 24 * 3600,
+                 target_fps: int = 30,
+                 max_repair_dim: int = 640,
+                 copy_timeout: int = 60,
+                 reencode_timeout: int = 300):
+        """
+        Initialize video validator
+        
+        Args:
+            repair_cache_dir: Directory for repaired videos keyed by input hash
+                (None disables the cache)
+            repair_cache_max_bytes: Budget for cached repairs; least recently
+                used entries are deleted beyond it
+            repair_cache_ttl: Seconds a cached repair is kept after its last use
+            target_fps: Frame rate of re-encoded videos (the model's processing fps)
+            max_repair_dim: Longest side of re-encoded videos; smaller videos keep
+                their size (pose estimation still needs more than the CNN input size)
+            copy_timeout: Timeout in seconds for the stream-copy tiers
+            reencode_timeout: Timeout in seconds for the re-encode tier
+        """
         self.supported_codecs = ['h264', 'mpeg4', 'vp8', 'vp9', 'av1']
         self.max_validation_frames = 10  # Number of frames to test-read
+        
+        self.repair_cache_dir = repair_cache_dir
+        self.repair_cache_max_bytes = repair_cache_max_bytes
+        self.repair_cache_ttl = repair_cache_ttl
+        self._evict_lock = threading.Lock()
+        self.target_fps = target_fps
+        self.max_repair_dim = max_repair_dim
+        self.copy_timeout = copy_timeout
+        self.reencode_timeout = reencode_timeout
+        
+        if repair_cache_dir:
+            os.makedirs(repair_cache_dir, exist_ok=True)
     
     def validate_video(self, video_path: str) -> Tuple[bool, str, Optional[Dict]]:
         """
@@ -96,16 +139,157 @@ class VideoValidator:
         
         return True, "Video is valid", video_info
     
-    def repair_video(self, video_path: str, output_path: Optional[str] = None) -> Tuple[bool, str, Optional[str]]:
+    def probe_video(self, video_path: str) -> Optional[Dict]:
         """
-        Attempt to repair/re-encode video to a compatible format
+        Read stream metadata with ffprobe
+        
+        Args:
+            video_path: Path to video file
+            
+        Returns:
+            Dictionary with 'codec', 'width', 'height', 'fps', 'duration' and
+            'container' of the first video stream ('codec' is None if there is
+            no video stream), or None if ffprobe is missing or cannot parse the file
+        """
+        if shutil.which('ffprobe') is None:
+            return None
+        
+        cmd = [
+            'ffprobe', '-v', 'error',
+            '-show_entries', 'format=format_name,duration:stream=codec_type,codec_name,width,height,avg_frame_rate',
+            '-of', 'json',
+            video_path
+        ]
+        
+        try:
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=30)
+            metadata = json.loads(result.stdout.decode('utf-8', errors='ignore') or '{}')
+        except (subprocess.TimeoutExpired, ValueError):
+            return None
+        
+        if 'format' not in metadata:
+            return None
+        
+        info = {
+            'container': metadata['format'].get('format_name'),
+            'duration': float(metadata['format'].get('duration') or 0),
+            'codec': None,
+            'width': 0,
+            'height': 0,
+            'fps': 0.0
+        }
+        
+        video_streams = [st for st in metadata.get('streams', []) if st.get('codec_type') == 'video']
+        if video_streams:
+            stream = video_streams[0]
+            numerator, _, denominator = (stream.get('avg_frame_rate') or '0/1').partition('/')
+            info.update({
+                'codec': stream.get('codec_name'),
+                'width': int(stream.get('width') or 0),
+                'height': int(stream.get('height') or 0),
+                'fps': float(numerator) / float(denominator) if float(denominator or 0) else 0.0
+            })
+        
+        return info
+    
+    def _repair_command(self, tier: str, video_path: str, output_path: str) -> List[str]:
+        """
+        Build the ffmpeg command of one repair tier
+        
+        Args:
+            tier: 'remux', 'keyframe_fix' or 'reencode'
+            video_path: Path to input video
+            output_path: Path for the repaired .mp4
+            
+        Returns:
+            ffmpeg argument list
+        """
+        if tier == 'remux':
+            # Rebuild the container and index around the untouched video stream
+            return [
+                'ffmpeg', '-fflags', '+genpts',
+                '-i', video_path,
+                '-map', '0:v:0', '-c', 'copy',
+                '-movflags', '+faststart',
+                '-y', output_path
+            ]
+        
+        if tier == 'keyframe_fix':
+            # Still a stream copy, but drop corrupt packets and resync timestamps
+            # so decoding restarts cleanly at the next keyframe
+            return [
+                'ffmpeg', '-err_detect', 'ignore_err',
+                '-fflags', '+genpts+discardcorrupt',
+                '-i', video_path,
+                '-map', '0:v:0', '-c', 'copy',
+                '-avoid_negative_ts', 'make_zero',
+                '-movflags', '+faststart',
+                '-y', output_path
+            ]
+        
+        if tier == 'reencode':
+            # Decode what is decodable; fit within max_repair_dim, never upscale, even sides for x264
+            max_dim = self.max_repair_dim
+            scale = (f"scale='min({max_dim},iw)':'min({max_dim},ih)':force_original_aspect_ratio=decrease,"
+                     f"scale=trunc(iw/2)*2:trunc(ih/2)*2")
+            return [
+                'ffmpeg', '-err_detect', 'ignore_err',
+                '-fflags', '+genpts',
+                '-i', video_path,
+                '-map', '0:v:0',
+                '-vf', scale, '-r', str(self.target_fps),
+                '-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '23',
+                '-pix_fmt', 'yuv420p', '-an',
+                '-movflags', '+faststart',
+                '-max_muxing_queue_size', '1024',
+                '-y', output_path
+            ]
+        
+        raise ValueError(f"Unknown repair tier '{tier}'. Choose from: {', '.join(self.REPAIR_TIERS)}")
+    
+    def _cache_paths(self, video_path: str) -> Dict[str, str]:
+        """Build the repaired video and metadata paths of the repair cache entry"""
+        key_settings = {
+            'target_fps': self.target_fps,
+            'max_repair_dim': self.max_repair_dim,
+            'format_version': self.REPAIR_FORMAT_VERSION
+        }
+        key = f"{file_digest(video_path)}_{settings_digest(key_settings)}"
+        base = os.path.join(self.repair_cache_dir, key[:2], key)
+        
+        return {'video': f"{base}.mp4", 'meta': f"{base}.json"}
+    
+    @staticmethod
+    def _place(source_path: str, output_path: str):
+        """Give the caller its own copy of a cached repair (hard link when possible)"""
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        try:
+            os.link(source_path, output_path)
+        except OSError:
+            shutil.copyfile(source_path, output_path)
+    
+    def repair_video(self, video_path: str, output_path: Optional[str] = None,
+                     return_report: bool = False):
+        """
+        Attempt to repair a video, trying cheap fixes before a full re-encode
+        
+        The input is probed with ffprobe first. Videos with a supported codec
+        then get a stream-copy remux (broken container or index) and a
+        keyframe fix (stream copy that drops corrupt packets). Only if both
+        fail, or the codec is not decodable, is the video re-encoded to H.264
+        at target_fps within max_repair_dim. Every tier's output must pass
+        validate_video. Successful repairs are cached by input hash, and
+        a hit is served without running ffmpeg.
         
         Args:
             video_path: Path to input video
             output_path: Path for repaired video (optional)
+            return_report: Also return a per-tier timing report
             
         Returns:
-            Tuple of (success, message, repaired_video_path)
+            Tuple of (success, message, repaired_video_path), plus the report
+            dict if return_report is True. The caller owns the returned file.
         """
         if output_path is None:
             # Create temporary file
@@ -113,86 +297,188 @@ class VideoValidator:
             base_name = os.path.splitext(os.path.basename(video_path))[0]
             output_path = os.path.join(temp_dir, f"{base_name}_repaired.mp4")
         
+        start = time.perf_counter()
+        report = {'tiers': [], 'tier_used': None, 'cache_hit': False, 'probe': None}
+        
+        def finish(success, message, path):
+            report['total_seconds'] = time.perf_counter() - start
+            summary = ', '.join(f"{t['tier']} {t['seconds']:.2f}s ({'ok' if t['success'] else 'failed'})"
+                                for t in report['tiers'])
+            logger.info(f"Video repair {'succeeded' if success else 'failed'} in "
+                        f"{report['total_seconds']:.2f}s: {summary or 'no tiers run'}")
+            if return_report:
+                return success, message, path, report
+            return success, message, path
+        
         try:
+            cache_paths = None
+            if self.repair_cache_dir and os.path.exists(video_path):
+                cache_paths = self._cache_paths(video_path)
+                if self._cache_entry_fresh(cache_paths):
+                    with open(cache_paths['meta'], 'r') as f:
+                        cached_tier = json.load(f).get('tier')
+                    self._place(cache_paths['video'], output_path)
+                    # The metadata mtime records the last use, for TTL and LRU eviction
+                    os.utime(cache_paths['meta'])
+                    report.update({'cache_hit': True, 'tier_used': cached_tier})
+                    return finish(True, f"Video repaired successfully (cached {cached_tier} repair)", output_path)
+            
             # Check if ffmpeg is available
-            try:
-                subprocess.run(['ffmpeg', '-version'], 
-                             stdout=subprocess.PIPE, 
-                             stderr=subprocess.PIPE, 
-                             check=True)
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                return False, "FFmpeg not available for video repair", None
-            
-            # Try aggressive repair first (for severely corrupted videos)
-            cmd_aggressive = [
-                'ffmpeg',
-                '-err_detect', 'ignore_err',  # Ignore errors
-                '-i', video_path,
-                '-c:v', 'libx264',
-                '-preset', 'ultrafast',  # Fast encoding
-                '-crf', '28',  # Lower quality for speed
-                '-c:a', 'aac',
-                '-b:a', '128k',
-                '-movflags', '+faststart',
-                '-max_muxing_queue_size', '1024',  # Handle sync issues
-                '-fflags', '+genpts',  # Generate presentation timestamps
-                '-y',
-                output_path
-            ]
-
-            logger.info("Attempting aggressive video repair...")
-            result = subprocess.run(
-                cmd_aggressive,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                timeout=300
-            )
-
-            # If aggressive repair failed, try standard repair
-            if result.returncode != 0 or not os.path.exists(output_path):
-                logger.info("Aggressive repair failed, trying standard repair...")
-
-                cmd_standard = [
-                    'ffmpeg',
-                    '-i', video_path,
-                    '-c:v', 'libx264',
-                    '-preset', 'fast',
-                    '-crf', '23',
-                    '-c:a', 'aac',
-                    '-b:a', '128k',
-                    '-movflags', '+faststart',
-                    '-y',
-                    output_path
-                ]
-
-                result = subprocess.run(
-                    cmd_standard,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    timeout=300
-                )
-
-            if result.returncode == 0 and os.path.exists(output_path):
-                # Validate repaired video
-                is_valid, msg, _ = self.validate_video(output_path)
-                if is_valid:
-                    logger.info("Video repaired successfully")
-                    return True, "Video repaired successfully", output_path
-                else:
-                    logger.warning(f"Repaired video still invalid: {msg}")
-                    return False, f"Repaired video is still invalid: {msg}", None
-            else:
-                error_msg = result.stderr.decode('utf-8', errors='ignore')
-                logger.error(f"FFmpeg repair failed: {error_msg[:500]}")
-
-                # Return a user-friendly message
-                if "Invalid NAL unit" in error_msg or "moov atom" in error_msg:
-                    return False, "Video is too corrupted to repair automatically. Please re-encode the video manually using a video converter.", None
-                else:
-                    return False, f"Video repair failed. The video may be too corrupted or in an unsupported format.", None
+            if shutil.which('ffmpeg') is None:
+                return finish(False, "FFmpeg not available for video repair", None)
+            
+            # Tier 0: probe stream metadata to choose the tiers worth running
+            probe_start = time.perf_counter()
+            probe = self.probe_video(video_path)
+            report['probe'] = probe
+            report['tiers'].append({
+                'tier': 'probe',
+                'seconds': time.perf_counter() - probe_start,
+                'success': probe is not None and probe['codec'] is not None,
+                'detail': f"{probe['codec']} in {probe['container']}" if probe else 'ffprobe could not read the file'
+            })
+            
+            if probe is not None and probe['codec'] is None:
+                return finish(False, "Video file contains no video stream", None)
+            
+            tiers = list(self.REPAIR_TIERS)
+            if probe is None or probe['codec'] not in self.supported_codecs:
+                # Copying an unknown or undecodable stream cannot fix it
+                tiers = ['reencode']
+            
+            last_error = ''
+            for tier in tiers:
+                tier_start = time.perf_counter()
+                timeout = self.reencode_timeout if tier == 'reencode' else self.copy_timeout
+                tier_output = f"{os.path.splitext(output_path)[0]}_{tier}.mp4"
+                
+                try:
+                    result = subprocess.run(
+                        self._repair_command(tier, video_path, tier_output),
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                        timeout=timeout
+                    )
+                    produced = result.returncode == 0 and os.path.exists(tier_output)
+                    if produced:
+                        is_valid, detail, _ = self.validate_video(tier_output)
+                    else:
+                        is_valid = False
+                        last_error = result.stderr.decode('utf-8', errors='ignore')
+                        detail = f"ffmpeg exited with code {result.returncode}"
+                except subprocess.TimeoutExpired:
+                    is_valid, detail = False, f"timed out after {timeout}s"
                 
-        except subprocess.TimeoutExpired:
-            return False, "Video repair timed out", None
+                report['tiers'].append({
+                    'tier': tier,
+                    'seconds': time.perf_counter() - tier_start,
+                    'success': is_valid,
+                    'detail': detail
+                })
+                
+                if not is_valid:
+                    logger.info(f"Repair tier '{tier}' failed: {detail}")
+                    if os.path.exists(tier_output):
+                        os.remove(tier_output)
+                    continue
+                
+                os.replace(tier_output, output_path)
+                report['tier_used'] = tier
+                
+                if cache_paths is not None:
+                    self._store_repair(cache_paths, output_path, video_path, tier, report)
+                
+                return finish(True, f"Video repaired successfully ({tier})", output_path)
+            
+            logger.error(f"FFmpeg repair failed: {last_error[:500]}")
+            
+            # Return a user-friendly message
+            if "Invalid NAL unit" in last_error or "moov atom" in last_error:
+                return finish(False, "Video is too corrupted to repair automatically. Please re-encode the video manually using a video converter.", None)
+            return finish(False, "Video repair failed. The video may be too corrupted or in an unsupported format.", None)
+            
         except Exception as e:
-            return False, f"Error during video repair: {str(e)}", None
-
+            return finish(False, f"Error during video repair: {str(e)}", None)
+    
+    def _store_repair(self, cache_paths: Dict[str, str], repaired_path: str, video_path: str,
+                      tier: str, report: Dict):
+        """Copy a successful repair into the cache; the metadata file marks a complete entry"""
+        tmp_path = None
+        try:
+            os.makedirs(os.path.dirname(cache_paths['video']), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_paths['video']), suffix='.tmp')
+            os.close(fd)
+            shutil.copyfile(repaired_path, tmp_path)
+            os.replace(tmp_path, cache_paths['video'])
+            tmp_path = None
+            
+            atomic_save_json(cache_paths['meta'], {
+                'format_version': self.REPAIR_FORMAT_VERSION,
+                'source': os.path.basename(video_path),
+                'tier': tier,
+                'tiers': report['tiers'],
+                'target_fps': self.target_fps,
+                'max_repair_dim': self.max_repair_dim
+            })
+        except OSError as e:
+            logger.warning(f"Could not cache repaired video for {video_path}: {e}")
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        
+        self.evict_repairs()
+    
+    def _cache_entry_fresh(self, cache_paths: Dict[str, str]) -> bool:
+        """Whether a complete cache entry exists and was used within repair_cache_ttl"""
+        try:
+            last_used = os.path.getmtime(cache_paths['meta'])
+        except OSError:
+            return False
+        if not os.path.exists(cache_paths['video']):
+            return False
+        return time.time() - last_used <= self.repair_cache_ttl
+    
+    def evict_repairs(self) -> int:
+        """
+        Delete cached repairs unused for repair_cache_ttl seconds, then the least
+        recently used ones until the cache fits repair_cache_max_bytes
+        
+        Returns:
+            Number of entries deleted
+        """
+        if not self.repair_cache_dir or not os.path.isdir(self.repair_cache_dir):
+            return 0
+        
+        with self._evict_lock:
+            entries = []  # (last used, bytes, metadata path, video path)
+            for root, _, files in os.walk(self.repair_cache_dir):
+                for name in files:
+                    if not name.endswith('.json'):
+                        continue
+                    meta_path = os.path.join(root, name)
+                    video_path = f"{os.path.splitext(meta_path)[0]}.mp4"
+                    try:
+                        size = os.path.getsize(video_path) if os.path.exists(video_path) else 0
+                        entries.append((os.path.getmtime(meta_path), size, meta_path, video_path))
+                    except OSError:
+                        continue
+            
+            entries.sort()
+            now = time.time()
+            total = sum(size for _, size, _, _ in entries)
+            removed = 0
+            for last_used, size, meta_path, video_path in entries:
+                if now - last_used <= self.repair_cache_ttl and total <= self.repair_cache_max_bytes:
+                    break
+                # Metadata first: an entry without it is never served
+                for path in (meta_path, video_path):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total -= size
+                removed += 1
+        
+        if removed:
+            logger.info(f"Evicted {removed} cached repairs ({total / 1024 ** 2:.1f} MB kept)")
+        return removed
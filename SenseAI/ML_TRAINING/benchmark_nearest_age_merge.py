@@ -0,0 +1,123 @@
+"""
+Benchmark: vectorised nearest-age merge vs the per-row combine_features loop
+
+Builds synthetic game / auxiliary tables (integer ages in months, so many rows tie
+on distance), times DataPreprocessor.nearest_age_merge on the full game table and
+the old iterrows + argsort loop on a subset (it scans the whole auxiliary table per
+row), and checks both pick the same auxiliary rows.
+
+The loop sorted with argsort's default quicksort, which is only stable for small
+tables; parity is checked against the loop with a stable sort (first auxiliary row
+wins ties, the order the merge keeps), and agreement with the default sort is
+reported alongside.
+
+Usage:
+  python benchmark_nearest_age_merge.py --rows 100000 --aux-rows 100000 --loop-rows 2000
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent))
+
+from utils.preprocessing import DataPreprocessor
+
+AUX_FEATURES = ['questionnaire_score', 'critical_items_failed', 'social_responsiveness_score']
+
+
+def make_tables(n_rows, n_aux, seed=42):
+    """Synthetic game rows (some without a usable age) and questionnaire rows"""
+    rng = np.random.default_rng(seed)
+    game_ages = rng.integers(36, 90, size=n_rows).astype(float)
+    game_ages[rng.random(n_rows) < 0.02] = 0
+    game_ages[rng.random(n_rows) < 0.02] = np.nan
+    game_df = pd.DataFrame({
+        'age_months': game_ages,
+        'accuracy': rng.uniform(0, 1, size=n_rows)
+    })
+    aux_df = pd.DataFrame({
+        # Odd-valued ages leave even game ages equidistant from two aux ages
+        'age_months': (rng.integers(18, 45, size=n_aux) * 2 + 1).astype(float),
+        'questionnaire_score': rng.integers(0, 40, size=n_aux),
+        'critical_items_failed': rng.integers(0, 7, size=n_aux),
+        'social_responsiveness_score': rng.uniform(0, 100, size=n_aux)
+    })
+    return game_df, aux_df
+
+
+def loop_merge(game_df, aux_df, kind='quicksort'):
+    """The per-row loop combine_features used (argsort kind made explicit)"""
+    combined_df = game_df.copy()
+    for idx, row in combined_df.iterrows():
+        age = row.get('age_months', 0)
+        if age > 0:
+            closest_aux = aux_df.iloc[(aux_df['age_months'] - age).abs().argsort(kind=kind)[:1]]
+            if len(closest_aux) > 0:
+                for col in AUX_FEATURES:
+                    combined_df.loc[idx, col] = closest_aux.iloc[0][col]
+    return combined_df
+
+
+def same_values(a, b):
+    """Equal auxiliary columns (dtype aside; unmatched rows are NaN in both)"""
+    return all(
+        np.array_equal(a[col].to_numpy(dtype=float), b[col].to_numpy(dtype=float), equal_nan=True)
+        for col in AUX_FEATURES
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorised nearest-age merge")
+    parser.add_argument('--rows', type=int, default=100000, help='Game rows')
+    parser.add_argument('--aux-rows', type=int, default=100000, help='Auxiliary questionnaire rows')
+    parser.add_argument('--loop-rows', type=int, default=2000, help='Game rows run through the old loop')
+    parser.add_argument('--repeats', type=int, default=5, help='Timed repetitions of the merge (best is reported)')
+    args = parser.parse_args()
+
+    game_df, aux_df = make_tables(args.rows, args.aux_rows)
+    preprocessor = DataPreprocessor()
+
+    best = float('inf')
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        merged = preprocessor.nearest_age_merge(game_df, aux_df, AUX_FEATURES)
+        best = min(best, time.perf_counter() - start)
+
+    subset = game_df.iloc[:args.loop_rows]
+    start = time.perf_counter()
+    reference = loop_merge(subset, aux_df, kind='stable')
+    loop_time = time.perf_counter() - start
+    default_sort = loop_merge(subset, aux_df)
+
+    merged_subset = merged.iloc[:args.loop_rows]
+    matches_stable = same_values(reference, merged_subset)
+    agreement = np.mean([
+        np.array_equal(
+            default_sort[AUX_FEATURES].iloc[i].to_numpy(dtype=float),
+            merged_subset[AUX_FEATURES].iloc[i].to_numpy(dtype=float),
+            equal_nan=True
+        )
+        for i in range(len(subset))
+    ])
+
+    per_row_loop = loop_time / max(len(subset), 1)
+    print(f"[BENCH] {args.rows} game rows x {args.aux_rows} auxiliary rows")
+    print(f"   nearest_age_merge: {best:.3f}s ({best / args.rows * 1e6:.2f} us/row)")
+    print(f"   Old loop:          {loop_time:.3f}s for {len(subset)} rows "
+          f"(~{per_row_loop * args.rows:.0f}s extrapolated to {args.rows}, "
+          f"{per_row_loop * args.rows / best:.0f}x)")
+    print(f"   Identical to loop (stable argsort): {matches_stable}")
+    print(f"   Agreement with loop (default argsort): {agreement:.2%}")
+
+    if not matches_stable:
+        sys.exit(1)
+    print("[OK] Merge matches the loop")
+
+
+if __name__ == '__main__':
+    main()
@@ -9,7 +9,9 @@ Copies:
 And their scalers.
 
 Also generates features_*.json from scaler.feature_names_in_ so the backend can
-prepare features in the exact training order.
+prepare features in the exact training order, and records a version and the
+SHA-256 of every copied file in model_metadata.json. The running ML engine
+hot-reloads the new models once the files match those checksums.
 
 Run from project root:
   python ML_TRAINING/sync_models_to_backend.py
@@ -17,8 +19,11 @@ Run from project root:
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 import shutil
+from datetime import datetime
 from pathlib import Path
 
 import joblib
@@ -27,11 +32,14 @@ import joblib
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 SRC_DIR = PROJECT_ROOT / "ML_TRAINING" / "models"
 DEST_DIR = PROJECT_ROOT / "senseai_backend" / "ml_engine" / "models"
+MANIFEST_PATH = DEST_DIR / "model_metadata.json"
 
 
 MODELS = [
     {
         "model": "model_age_2_3_5_questionnaire.pkl",
+        # Model registry group served by the ML engine (None: not served)
+        "group": None,
         "scaler_candidates": [
             "scaler_age_2_3_5_questionnaire.pkl",
             "scaler_model_age_2_3_5_questionnaire.pkl",
@@ -40,6 +48,8 @@ MODELS = [
     },
     {
         "model": "model_age_3_5_5_5_frog_jump.pkl",
+        # Model registry group served by the ML engine (None: not served)
+        "group": "3.5-5.5",
         "scaler_candidates": [
             "scaler_age_3_5_5_5_frog_jump.pkl",
             "scaler_model_age_3_5_5_5_frog_jump.pkl",
@@ -48,6 +58,8 @@ MODELS = [
     },
     {
         "model": "model_age_5_5_6_9_color_shape.pkl",
+        # Model registry group served by the ML engine (None: not served)
+        "group": "5.5-6.9",
         "scaler_candidates": [
             "scaler_age_5_5_6_9_color_shape.pkl",
             "scaler_model_age_5_5_6_9_color_shape.pkl",
@@ -65,12 +77,43 @@ def _find_first_existing(dir_path: Path, candidates: list[str]) -> Path:
     raise FileNotFoundError(f"None of these files exist in {dir_path}: {candidates}")
 
 
+def _sha256(path: Path) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _update_manifest(synced: dict[str, list[Path]]) -> None:
+    """Record a version and checksums per group; written last and atomically"""
+    manifest = {}
+    if MANIFEST_PATH.exists():
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    version = datetime.now().strftime("%Y.%m.%d-%H%M%S")
+    models = manifest.setdefault("models", {})
+    for group, paths in synced.items():
+        models[group] = {
+            "version": version,
+            "checksums": {p.name: _sha256(p) for p in paths},
+        }
+
+    tmp_path = MANIFEST_PATH.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, MANIFEST_PATH)
+    print(f"\n[MANIFEST] {MANIFEST_PATH} -> version {version} for {', '.join(synced)}")
+
+
 def main() -> None:
     print(f"[INFO] PROJECT_ROOT: {PROJECT_ROOT}")
     print(f"[INFO] SRC_DIR: {SRC_DIR}")
     print(f"[INFO] DEST_DIR: {DEST_DIR}")
     DEST_DIR.mkdir(parents=True, exist_ok=True)
 
+    synced: dict[str, list[Path]] = {}
     for spec in MODELS:
         model_name = spec["model"]
         features_name = spec["features"]
@@ -107,7 +150,11 @@ def main() -> None:
             json.dump(feature_names, f, indent=2)
         print(f"  - features -> {dest_features} ({len(feature_names)} features)")
 
-    print("\n[OK] Sync complete. Restart the backend + ML engine.")
+        if spec["group"]:
+            synced[spec["group"]] = [dest_model, dest_scaler, dest_features]
+
+    _update_manifest(synced)
+    print("\n[OK] Sync complete. A running ML engine picks up the new models without a restart.")
 
 
 if __name__ == "__main__":
@@ -32,6 +32,9 @@ from utils.evaluation import ModelEvaluator
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 MODELS_DIR.mkdir(parents=True, exist_ok=True)
 
+# Questionnaire features copied onto game rows by nearest age
+AUX_FEATURES = ['questionnaire_score', 'critical_items_failed', 'social_responsiveness_score']
+
 
 def load_data():
     """Load game data and auxiliary questionnaire data"""
@@ -68,17 +71,11 @@ def combine_features(game_df, aux_df):
     
     # Add auxiliary features if available
     if len(aux_df) > 0:
-        # Match by age (approximate matching)
-        # This is simplified - adapt based on your data structure
-        for idx, row in combined_df.iterrows():
-            age = row.get('age_months', 0)
-            # Find closest age match in auxiliary data
-            if age > 0:
-                closest_aux = aux_df.iloc[(aux_df['age_months'] - age).abs().argsort()[:1]]
-                if len(closest_aux) > 0:
-                    combined_df.loc[idx, 'questionnaire_score'] = closest_aux.iloc[0]['questionnaire_score']
-                    combined_df.loc[idx, 'critical_items_failed'] = closest_aux.iloc[0]['critical_items_failed']
-                    combined_df.loc[idx, 'social_responsiveness_score'] = closest_aux.iloc[0]['social_responsiveness_score']
+        # Match by age: each game row takes the auxiliary row closest in age
+        preprocessor = DataPreprocessor(random_state=AGE_3_5_5_5_CONFIG['random_state'])
+        combined_df = preprocessor.nearest_age_merge(
+            combined_df, aux_df, AUX_FEATURES, age_col='age_months'
+        )
     
     print(f"   [OK] Combined: {len(combined_df)} samples")
     return combined_df
@@ -175,3 +175,67 @@ class DataPreprocessor:
     def get_scaler(self):
         """Get fitted scaler"""
         return self.scaler
+    
+    def nearest_age_merge(
+        self,
+        df: pd.DataFrame,
+        aux_df: pd.DataFrame,
+        columns: List[str],
+        age_col: str = "age_months"
+    ) -> pd.DataFrame:
+        """
+        Copy columns from the auxiliary row closest in age onto each row
+        
+        Sorts the auxiliary ages once and binary-searches every row's age, so the
+        join is O((n + m) log m) instead of a scan of aux_df per row.
+        
+        Matching rules:
+        - Only rows with age > 0 are matched; other rows are left unchanged
+        - The match minimises |aux age - age|; on equal distance the row that
+          comes first in aux_df wins (also between an older and a younger match)
+        - Auxiliary rows with a missing age are never matched
+        
+        Args:
+            df: DataFrame to add columns to
+            aux_df: Auxiliary DataFrame with age_col and columns
+            columns: Columns to copy from aux_df
+            age_col: Age column (months) in both DataFrames
+        
+        Returns:
+            Copy of df with columns filled from the nearest-age auxiliary rows
+        """
+        merged = df.copy()
+        if len(merged) == 0 or age_col not in merged.columns:
+            return merged
+        
+        aux_ages = aux_df[age_col].to_numpy(dtype=float)
+        candidates = np.flatnonzero(~np.isnan(aux_ages))
+        if len(candidates) == 0:
+            return merged
+        
+        # Stable sort: equal ages keep their aux_df order
+        order = candidates[np.argsort(aux_ages[candidates], kind="mergesort")]
+        sorted_ages = aux_ages[order]
+        # First sorted slot of each age value (the earliest aux_df row with that age)
+        run_start = np.searchsorted(sorted_ages, sorted_ages, side="left")
+        
+        ages = merged[age_col].to_numpy(dtype=float)
+        mask = ages > 0
+        if not mask.any():
+            return merged
+        ages = ages[mask]
+        
+        # Nearest age at or above (right) and below (left) each row's age
+        pos = np.searchsorted(sorted_ages, ages, side="left")
+        right = np.minimum(pos, len(order) - 1)
+        left = run_start[np.maximum(pos - 1, 0)]
+        dist_right = np.where(pos < len(order), np.abs(sorted_ages[right] - ages), np.inf)
+        dist_left = np.where(pos > 0, np.abs(sorted_ages[left] - ages), np.inf)
+        
+        use_right = (dist_right < dist_left) | ((dist_right == dist_left) & (order[right] < order[left]))
+        matched = np.where(use_right, order[right], order[left])
+        
+        for col in columns:
+            merged.loc[mask, col] = aux_df[col].to_numpy()[matched]
+        
+        return merged
@@ -6,6 +6,9 @@ from fastapi import APIRouter
 from app.core.logger import logger
 from app.ml.model_loader import check_models_loaded
 from app.ml.age_specific_loader import check_age_specific_models
+from app.ml.model_registry import get_registry
+from app.ml.serving import get_inference_service
+from app.ml.prediction_cache import get_prediction_cache
 
 router = APIRouter()
 
@@ -28,7 +31,10 @@ def health_check():
         "status": overall_status,
         "service": "SenseAI ML Engine",
         "age_specific_models": age_specific_status,
-        "legacy_model": legacy_status
+        "legacy_model": legacy_status,
+        "model_versions": get_registry().status(),
+        "serving": get_inference_service().stats(),
+        "prediction_cache": get_prediction_cache().stats()
     }
     
     if not (age_models_ready or legacy_ready):
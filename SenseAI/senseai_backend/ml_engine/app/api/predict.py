@@ -5,17 +5,34 @@ This module exposes the POST `/predict` route. It receives JSON payloads matchin
 the `PredictionRequest` schema (containing age and feature metrics), validates them, 
 and hands them off to the asynchronous ML inference engine `predict_asd`. It handles 
 exceptions gracefully, ensuring HTTP 400s or 503s are returned instead of crashing.
+
+POST `/predict/batch` scores many requests in one call (`predict_asd_batch`) and 
+reports a result or an error per item, so one bad item does not fail the batch.
+
+Both routes run the model through the `InferenceService` (app/ml/serving.py), which 
+executes it off the event loop (threadpool or process pool) and answers HTTP 503 
+with Retry-After when too many predictions are already pending. Responses are cached 
+by request fingerprint and model version (app/ml/prediction_cache.py), so repeated 
+requests skip inference.
 """
 from fastapi import APIRouter, HTTPException
+from pydantic import ValidationError
 from app.core.logger import logger
-from app.schemas.request import PredictionRequest
-from app.schemas.response import PredictionResponse
-from app.ml.predictor import predict_asd
+from app.schemas.request import PredictionRequest, BatchPredictionRequest
+from app.schemas.response import PredictionResponse, BatchPredictionResponse, BatchItemResult
+from app.ml.predictor import predict_asd, predict_asd_batch
+from app.ml.serving import get_inference_service, ServingUnavailable
+from app.ml.prediction_cache import get_prediction_cache
 
 router = APIRouter()
 
+def _unavailable(error: ServingUnavailable) -> HTTPException:
+    """HTTP 503 for a request the inference service cannot take right now"""
+    logger.warning(f"Prediction rejected: {error}")
+    return HTTPException(status_code=503, detail=str(error), headers={"Retry-After": "1"})
+
 @router.post("/", response_model=PredictionResponse)
-def predict_endpoint(request: PredictionRequest):
+async def predict_endpoint(request: PredictionRequest):
     """
     Predict ASD risk from ML features
     
@@ -26,9 +43,23 @@ def predict_endpoint(request: PredictionRequest):
     
     Returns prediction with risk score, level, and probabilities.
     """
+    cache = get_prediction_cache()
+    key = cache.key(request)
+    cached = cache.get(key)
+    if cached is not None:
+        logger.info(f"Prediction served from cache: child_id={request.child_id or 'N/A'}")
+        return cached
+    
     try:
-        result = predict_asd(request)
+        result, generation = await get_inference_service().run_versioned(predict_asd, request)
+        cache.put(key, result, generation)
         return result
+    except ServingUnavailable as e:
+        raise _unavailable(e)
+    except ValidationError as e:
+        # Raised while building the response (a ValueError subclass, but not the client's fault)
+        logger.error(f"Response validation failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
     except ValueError as e:
         logger.error(f"Validation error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -42,3 +73,71 @@ def predict_endpoint(request: PredictionRequest):
         logger.error(f"Prediction failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
+def _error_status(error: Exception) -> int:
+    """HTTP status /predict returns for a prediction error"""
+    if isinstance(error, ValidationError):
+        # Server-side schema error (pydantic's ValidationError subclasses ValueError)
+        return 500
+    if isinstance(error, ValueError):
+        return 400
+    if isinstance(error, FileNotFoundError):
+        return 503
+    return 500
+
+@router.post("/batch", response_model=BatchPredictionResponse)
+async def predict_batch_endpoint(request: BatchPredictionRequest):
+    """
+    Predict ASD risk for many children in one call
+    
+    - **items**: List of prediction requests (same fields as `/predict`)
+    
+    Items are grouped by age group and each group is scored with one model call.
+    Returns one result per item, in order; failed items carry an error and the
+    status code `/predict` would have returned instead of failing the batch.
+    """
+    # Serve cached items directly and score only the rest
+    cache = get_prediction_cache()
+    keys = [cache.key(item) for item in request.items]
+    outcomes = [cache.get(key) for key in keys]
+    misses = [i for i, outcome in enumerate(outcomes) if outcome is None]
+    
+    try:
+        if misses:
+            scored, generation = await get_inference_service().run_versioned(
+                predict_asd_batch, [request.items[i] for i in misses]
+            )
+            for i, outcome in zip(misses, scored):
+                outcomes[i] = outcome
+                if not isinstance(outcome, Exception):
+                    cache.put(keys[i], outcome, generation)
+    except ServingUnavailable as e:
+        raise _unavailable(e)
+    except Exception as e:
+        logger.error(f"Batch prediction failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
+    
+    results = []
+    for index, (item, outcome) in enumerate(zip(request.items, outcomes)):
+        if isinstance(outcome, Exception):
+            logger.warning(f"Batch item {index} failed: {outcome}")
+            results.append(BatchItemResult(
+                index=index,
+                child_id=item.child_id,
+                status_code=_error_status(outcome),
+                error=str(outcome)
+            ))
+        else:
+            results.append(BatchItemResult(
+                index=index,
+                child_id=item.child_id,
+                status_code=200,
+                result=outcome
+            ))
+    
+    failed = sum(1 for r in results if r.error is not None)
+    return BatchPredictionResponse(
+        total=len(results),
+        succeeded=len(results) - failed,
+        failed=failed,
+        results=results
+    )
@@ -12,6 +12,7 @@ Key Structures:
 - FEATURES_TO_NORMALIZE: Lists all specific metrics requiring Z-score normalization.
 """
 
+import os
 from pathlib import Path
 from typing import Dict
 
@@ -49,7 +50,16 @@ MODEL_PATH_ALT = MODEL_DIR / "asd_screening_model_calibrated.pkl"
 SCALER_PATH = MODEL_DIR / "feature_scaler.pkl"
 FEATURES_PATH = MODEL_DIR / "feature_names.json"
 AGE_NORMS_PATH = MODEL_DIR / "age_norms.json"
-MODEL_METADATA_PATH = MODEL_DIR / "model_metadata.json"
+MODEL_METADATA_PATH = MODEL_DIR / "model_metadata.json"  # Also the model registry manifest
+
+# ONNX exports shipped with the mobile app (SenseAI/assets/onnx_model)
+ONNX_MODEL_DIR = Path(os.getenv("ONNX_MODEL_DIR", BASE_DIR.parent.parent / "assets" / "onnx_model"))
+
+# Backend for the age-banded models: 'sklearn' (pickled) or 'onnx' (ONNX Runtime, see app/ml/onnx_backend.py)
+ML_INFERENCE_BACKEND = os.getenv("ML_INFERENCE_BACKEND", "sklearn").lower()
+
+# Seconds between checks for newly deployed model files (0 = no hot reload)
+MODEL_RELOAD_INTERVAL = float(os.getenv("MODEL_RELOAD_INTERVAL", 30))
 
 # Risk score thresholds
 RISK_THRESHOLDS: Dict[str, float] = {
@@ -114,5 +124,15 @@ API_VERSION = "1.0.0"
 # Service Configuration
 DEFAULT_PORT = 8002  # Changed from 8001 due to port conflict
 DEFAULT_HOST = "0.0.0.0"
+MAX_BATCH_SIZE = 1000  # Items accepted per /predict/batch request
+
+# Serving mode: 'inline' (request threadpool) or 'process' (one process per core, see app/ml/serving.py)
+ML_SERVING_MODE = os.getenv("ML_SERVING_MODE", "inline").lower()
+ML_WORKERS = int(os.getenv("ML_WORKERS", os.cpu_count() or 1))
+ML_MAX_PENDING = int(os.getenv("ML_MAX_PENDING", 64))  # Queued + running predictions before 503
+
+# Prediction result cache (see app/ml/prediction_cache.py); size 0 disables it
+ML_PREDICTION_CACHE_SIZE = int(os.getenv("ML_PREDICTION_CACHE_SIZE", 10000))
+ML_PREDICTION_CACHE_PATH = os.getenv("ML_PREDICTION_CACHE_PATH") or None  # JSON file kept across restarts
 
 
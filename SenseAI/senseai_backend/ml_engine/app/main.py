@@ -8,15 +8,18 @@ and model inference.
 
 Key Responsibilities:
 1. Application Initialization: Configures FastAPI with metadata and CORS rules.
-2. Startup Event Handling: Upon service start, it proactively calls `load_models()` 
-   and `check_age_specific_models()` to cache the ML models (unified and age-banded) 
-   into memory. This ensures minimal latency during actual inference requests.
+2. Startup Event Handling: Upon service start, the model registry loads every model 
+   group (v3, age-banded and unified) into memory once and starts watching for new 
+   versions, which are swapped in without a restart. This ensures minimal latency 
+   during actual inference requests. In `ML_SERVING_MODE=process` the inference 
+   worker pool is started here too; each worker loads the models once, while this 
+   process only tracks model versions (for /health and the prediction cache).
 3. Route Registration: Mounts the `/health` and `/predict` endpoints.
 """
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.core.config import API_TITLE, API_DESCRIPTION, API_VERSION
+from app.core.config import API_TITLE, API_DESCRIPTION, API_VERSION, ML_SERVING_MODE
 from app.core.logger import logger
 from app.api import predict, health
 
@@ -36,18 +39,38 @@ async def startup_event():
     logger.info(f"Starting {API_TITLE} v{API_VERSION}")
     logger.info("=" * 50)
     try:
-        from app.ml.model_loader import load_models
-        load_models()
-        logger.info("[OK] ML Engine ready")
-        
-        # Check age-specific models
-        from app.ml.age_specific_loader import check_age_specific_models
-        age_models_status = check_age_specific_models()
-        ready_count = sum(1 for status in age_models_status.values() if status['ready'])
-        logger.info(f"Age-specific models: {ready_count}/3 ready")
+        from app.ml.model_registry import get_registry
+        registry = get_registry()
+        if ML_SERVING_MODE == "process":
+            # Workers serve predictions; here only versions and checksums are needed
+            registry.load_payloads = False
+        loaded = registry.load_all()
+        logger.info(f"[OK] ML Engine ready: {sum(loaded.values())}/{len(loaded)} model groups "
+                    f"{'loaded' if registry.load_payloads else 'found (versions only)'}")
+        if not all(loaded.values()):
+            logger.warning("Missing model groups are picked up once their files are deployed")
+        registry.start_watcher()
     except Exception as e:
         logger.error(f"[ERROR] Failed to load models: {e}")
         logger.warning("Service will start but predictions will fail until models are available")
+    
+    from app.ml.prediction_cache import get_prediction_cache
+    get_prediction_cache().load()
+    
+    from app.ml.serving import get_inference_service
+    service = get_inference_service()
+    logger.info(f"Serving mode: {service.mode} (max pending {service.max_pending})")
+    service.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the model registry watcher and inference workers, save the prediction cache"""
+    from app.ml.model_registry import get_registry
+    from app.ml.serving import get_inference_service
+    from app.ml.prediction_cache import get_prediction_cache
+    get_registry().stop_watcher()
+    get_inference_service().shutdown()
+    get_prediction_cache().save()
 
 # CORS middleware (allow backend to call this service)
 app.add_middleware(
@@ -6,8 +6,12 @@ Because developmental milestones vary drastically across ages, SenseAI uses
 distinct models for different age silos.
 
 Key Features:
-- Caching System (`_model_cache`): Once a model/scaler pair is loaded for an age 
-  group, it remains in memory to eliminate future disk I/O bottlenecks.
+- Caching System (`model_registry`): Once a model/scaler pair is loaded for an age 
+  group, it is served from memory; the registry swaps in a new version when the 
+  files on disk change, without a restart.
+- ONNX backend: with ML_INFERENCE_BACKEND=onnx the group's ONNX export (scaler fused 
+  in, see `onnx_backend`) is served instead, falling back to the pickled model if it 
+  cannot be loaded or does not match it.
 - Graceful Degradation: Implements comprehensive fallback logic (e.g., alternative 
   naming structures, inferring missing feature names directly from the scaler object).
 """
@@ -15,16 +19,58 @@ Key Features:
 import joblib
 import json
 from pathlib import Path
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Tuple
 from app.core.config import (
     AGE_3_5_5_5_MODEL_PATH, AGE_3_5_5_5_SCALER_PATH, AGE_3_5_5_5_FEATURES_PATH, AGE_3_5_5_5_METADATA_PATH,
     AGE_5_5_6_9_MODEL_PATH, AGE_5_5_6_9_SCALER_PATH, AGE_5_5_6_9_FEATURES_PATH, AGE_5_5_6_9_METADATA_PATH,
-    get_age_group
+    get_age_group, ML_INFERENCE_BACKEND
 )
 from app.core.logger import logger
 
-# Cache for loaded models (age_group -> (model, scaler, features, metadata))
-_model_cache: Dict[str, Tuple[Any, Any, list, Optional[Dict]]] = {}
+# Artifact paths per age-banded group
+AGE_GROUP_PATHS = {
+    "3.5-5.5": {
+        "model": AGE_3_5_5_5_MODEL_PATH,
+        "scaler": AGE_3_5_5_5_SCALER_PATH,
+        "features": AGE_3_5_5_5_FEATURES_PATH,
+        "metadata": AGE_3_5_5_5_METADATA_PATH,
+    },
+    "5.5-6.9": {
+        "model": AGE_5_5_6_9_MODEL_PATH,
+        "scaler": AGE_5_5_6_9_SCALER_PATH,
+        "features": AGE_5_5_6_9_FEATURES_PATH,
+        "metadata": AGE_5_5_6_9_METADATA_PATH,
+    },
+}
+
+# Last ONNX load error logged per age group, so a failed export warns once, not per request
+_onnx_failures: Dict[str, str] = {}
+
+def _resolve_scaler_path(model_path: Path, scaler_path: Path) -> Path:
+    """Scaler path, or the alternate notebook naming scaler_model_<model_name>.pkl if only that exists"""
+    if not scaler_path.exists():
+        alt_scaler_path = scaler_path.parent / f"scaler_model_{model_path.stem}.pkl"
+        if alt_scaler_path.exists():
+            return alt_scaler_path
+    return scaler_path
+
+def age_group_artifacts(age_group: str) -> List[Path]:
+    """
+    Files an age group's model is read from (used for versioning and change detection)
+    
+    Args:
+        age_group: '3.5-5.5' or '5.5-6.9'
+        
+    Returns:
+        List of artifact paths (existing or not)
+    """
+    paths = AGE_GROUP_PATHS[age_group]
+    return [
+        paths["model"],
+        _resolve_scaler_path(paths["model"], paths["scaler"]),
+        paths["features"],
+        paths["metadata"],
+    ]
 
 def load_age_specific_model(age_months: int) -> Tuple[Any, Any, list, Optional[Dict]]:
     """
@@ -47,33 +93,51 @@ def load_age_specific_model(age_months: int) -> Tuple[Any, Any, list, Optional[D
             f"Supported age groups: 2-3.5 (24-42), 3.5-5.5 (42-66), 5.5-6.9 (66-83)"
         )
     
-    # Check cache first
-    if age_group in _model_cache:
-        logger.debug(f"Using cached model for age group: {age_group}")
-        return _model_cache[age_group]
-    
-    # Load model based on age group
-    logger.info(f"Loading model for age group: {age_group} (age: {age_months} months)")
-    
     if age_group == "2-3.5":
         # Note: 2-3.5 is now handled exclusively by the v3 Hybrid Engine in predictor.py
         raise ValueError(
             "Age group 2-3.5 is now managed by the SenseAI v3 Hybrid Inference Engine. "
             "Please call predict_asd_v3_hybrid() or use the routed predict_asd() instead."
         )
-    elif age_group == "3.5-5.5":
-        model_path = AGE_3_5_5_5_MODEL_PATH
-        scaler_path = AGE_3_5_5_5_SCALER_PATH
-        features_path = AGE_3_5_5_5_FEATURES_PATH
-        metadata_path = AGE_3_5_5_5_METADATA_PATH
-    elif age_group == "5.5-6.9":
-        model_path = AGE_5_5_6_9_MODEL_PATH
-        scaler_path = AGE_5_5_6_9_SCALER_PATH
-        features_path = AGE_5_5_6_9_FEATURES_PATH
-        metadata_path = AGE_5_5_6_9_METADATA_PATH
-    else:
+    if age_group not in AGE_GROUP_PATHS:
         raise ValueError(f"Unknown age group: {age_group}")
     
+    # Served from the registry (loaded on first use, hot-swapped on deployment)
+    from app.ml.model_registry import get_registry
+    registry = get_registry()
+    if ML_INFERENCE_BACKEND == "onnx":
+        try:
+            payload = registry.get(f"{age_group}/onnx").payload
+            _onnx_failures.pop(age_group, None)
+            return payload
+        except Exception as e:
+            signature = f"{type(e).__name__}: {e}"
+            if _onnx_failures.get(age_group) != signature:
+                _onnx_failures[age_group] = signature
+                logger.warning(f"ONNX backend unavailable for {age_group}, using pickled model: {e}")
+    return registry.get(age_group).payload
+
+def read_age_specific_model(age_group: str) -> Tuple[Any, Any, list, Optional[Dict]]:
+    """
+    Read an age group's model files from disk (uncached; see load_age_specific_model)
+    
+    Args:
+        age_group: '3.5-5.5' or '5.5-6.9'
+        
+    Returns:
+        Tuple of (model, scaler, feature_names, metadata)
+        
+    Raises:
+        FileNotFoundError: If model files are not found
+    """
+    logger.info(f"Loading model for age group: {age_group}")
+    
+    paths = AGE_GROUP_PATHS[age_group]
+    model_path = paths["model"]
+    scaler_path = paths["scaler"]
+    features_path = paths["features"]
+    metadata_path = paths["metadata"]
+    
     # Load model
     if not model_path.exists():
         raise FileNotFoundError(
@@ -86,7 +150,7 @@ def load_age_specific_model(age_months: int) -> Tuple[Any, Any, list, Optional[D
     # Load scaler
     if not scaler_path.exists():
         # Support alternate naming used by some notebooks: scaler_model_<model_name>.pkl
-        alt_scaler_path = scaler_path.parent / f"scaler_model_{model_path.stem}.pkl"
+        alt_scaler_path = _resolve_scaler_path(model_path, scaler_path)
         if alt_scaler_path.exists():
             logger.warning(f"Scaler not found at expected path, using alternate: {alt_scaler_path.name}")
             scaler_path = alt_scaler_path
@@ -131,9 +195,6 @@ def load_age_specific_model(age_months: int) -> Tuple[Any, Any, list, Optional[D
         except Exception as e:
             logger.warning(f"Could not load metadata: {e}")
     
-    # Cache the loaded model
-    _model_cache[age_group] = (model, scaler, feature_names, metadata)
-    
     logger.info(f"[OK] Model loaded successfully for age group: {age_group}")
     return model, scaler, feature_names, metadata
 
@@ -159,14 +220,10 @@ def check_age_specific_models() -> Dict[str, Any]:
             }
             continue
 
-        if age_group == "3.5-5.5":
-            model_path = AGE_3_5_5_5_MODEL_PATH
-            scaler_path = AGE_3_5_5_5_SCALER_PATH
-            features_path = AGE_3_5_5_5_FEATURES_PATH
-        else:  # 5.5-6.9
-            model_path = AGE_5_5_6_9_MODEL_PATH
-            scaler_path = AGE_5_5_6_9_SCALER_PATH
-            features_path = AGE_5_5_6_9_FEATURES_PATH
+        paths = AGE_GROUP_PATHS[age_group]
+        model_path = paths["model"]
+        scaler_path = paths["scaler"]
+        features_path = paths["features"]
         
         status[age_group] = {
             "model_exists": model_path.exists(),
@@ -0,0 +1,183 @@
+"""
+Compiled feature plans for age-group models.
+
+A `FeaturePlan` is built once per loaded model and holds everything the
+per-request feature loop (`prepare_features`), missing-feature check and
+explanation builder would otherwise recompute on every request:
+
+- Column index: feature name -> column in the training order, so a request only
+  touches the features it actually provides.
+- Default vector: the row every request starts from (missing features are 0).
+- Coefficient vector: `coef_[0]` of linear models, so explanations are one
+  element-wise product on the scaled row.
+- Classes: `model.classes_`, so the predicted label is `argmax(predict_proba)`
+  and the model runs once per request instead of twice (`predict` + `predict_proba`).
+"""
+
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app.core.logger import logger
+
+# Plans by model object; entries go away with the model (e.g. after a hot reload)
+_plan_cache: "weakref.WeakKeyDictionary[Any, FeaturePlan]" = weakref.WeakKeyDictionary()
+
+
+def _to_float(value: Any) -> float:
+    """Convert a feature value like prepare_features does (None / invalid -> 0.0)"""
+    if value is None:
+        return 0.0
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+class FeaturePlan:
+    """Precomputed feature layout and model constants for one age-group model"""
+
+    def __init__(self, model: Any, feature_names: list, expected_n_features: int):
+        """
+        Compile a plan
+
+        Args:
+            model: Fitted classifier
+            feature_names: Feature names in training order
+            expected_n_features: Number of features the scaler expects
+
+        Raises:
+            ValueError: If fewer feature names than expected features are known
+        """
+        # Use only first N features that match model, like prepare_features
+        feature_names = list(feature_names)[:expected_n_features]
+        if len(feature_names) != expected_n_features:
+            raise ValueError(
+                f"Feature count mismatch: Expected {expected_n_features} features, "
+                f"but got {len(feature_names)}"
+            )
+
+        self.feature_names = feature_names
+        self.n_features = expected_n_features
+        self.column_index = {name: i for i, name in enumerate(feature_names)}
+        self.defaults = np.zeros(expected_n_features, dtype=float)
+        self.critical_features = tuple(f for f in feature_names if not f.endswith('_zscore'))
+        self.classes = np.asarray(model.classes_)
+
+        self.coef = None
+        coefs = getattr(model, "coef_", None)
+        if coefs is not None and len(coefs) > 0:
+            coef_vec = np.asarray(coefs[0], dtype=float)
+            n = min(len(coef_vec), expected_n_features)
+            if n > 0:
+                self.coef = np.zeros(expected_n_features, dtype=float)
+                self.coef[:n] = coef_vec[:n]
+                self._n_coef = n
+
+    def missing_features(self, features_dict: Dict[str, Any]) -> List[str]:
+        """Critical (non Z-score) features the request does not provide"""
+        return [f for f in self.critical_features if f not in features_dict]
+
+    def vector(self, features_dict: Dict[str, Any]) -> np.ndarray:
+        """
+        Build the model input for one request
+
+        Args:
+            features_dict: Dictionary of feature values
+
+        Returns:
+            Feature array (1 x n_features) in training order
+        """
+        row = self.defaults.copy()
+        index = self.column_index
+        for name, value in features_dict.items():
+            col = index.get(name)
+            if col is not None:
+                row[col] = _to_float(value)
+        return row.reshape(1, -1)
+
+    def matrix(self, features_list: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Build the model input for many requests
+
+        Args:
+            features_list: Feature dictionaries, one per request
+
+        Returns:
+            Feature matrix (n_requests x n_features) in training order
+        """
+        X = np.tile(self.defaults, (len(features_list), 1))
+        index = self.column_index
+        for r, features_dict in enumerate(features_list):
+            for name, value in features_dict.items():
+                col = index.get(name)
+                if col is not None:
+                    X[r, col] = _to_float(value)
+        return X
+
+    def predict(self, model: Any, features_scaled: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run the model once and derive labels from the probabilities
+
+        Args:
+            model: The classifier this plan was compiled for
+            features_scaled: Scaled feature matrix
+
+        Returns:
+            Tuple of (predicted labels, class probabilities)
+        """
+        probabilities = model.predict_proba(features_scaled)
+        return self.classes[np.argmax(probabilities, axis=1)], probabilities
+
+    def explain(self, features_scaled_row: np.ndarray, features_row: np.ndarray,
+                top_k: int = 6) -> Optional[List[Dict[str, Any]]]:
+        """
+        Top signed contributions (coef_i * x_i on scaled features) for linear models
+
+        Args:
+            features_scaled_row: Scaled features of one request
+            features_row: Unscaled features of the same request (reported values)
+            top_k: Number of features to return
+
+        Returns:
+            Explanation dicts, or None if the model has no coefficients
+        """
+        if self.coef is None:
+            return None
+
+        n = self._n_coef
+        contrib = self.coef[:n] * np.asarray(features_scaled_row, dtype=float)[:n]
+        # Rank by absolute contribution
+        idx_sorted = np.argsort(np.abs(contrib))[::-1][:top_k]
+
+        return [
+            {
+                "feature": str(self.feature_names[i]),
+                "value": float(features_row[i]),
+                "contribution": round(float(contrib[i]), 4),
+                "direction": "increases_risk" if contrib[i] >= 0 else "decreases_risk",
+            }
+            for i in idx_sorted
+        ]
+
+
+def get_feature_plan(model: Any, feature_names: list, expected_n_features: int) -> FeaturePlan:
+    """
+    Get the compiled plan for a model, compiling it on first use
+
+    Args:
+        model: Fitted classifier
+        feature_names: Feature names in training order
+        expected_n_features: Number of features the scaler expects
+
+    Returns:
+        FeaturePlan
+    """
+    plan = _plan_cache.get(model)
+    if plan is not None:
+        return plan
+
+    plan = FeaturePlan(model, feature_names, expected_n_features)
+    _plan_cache[model] = plan
+    logger.info(f"Compiled feature plan: {plan.n_features} features, "
+                f"explanations {'on' if plan.coef is not None else 'off'}")
+    return plan
@@ -11,12 +11,16 @@ Key Responsibilities:
 - Parses `feature_names.json` to guarantee features are supplied to the model in the exact 
   order they were trained on.
 - Loads `age_norms.json` if available for Z-score normalization of developmental metrics.
+
+`read_*` functions read files from disk; `load_*` functions serve the current version
+from the model registry (`model_registry.py`), which loads each group once and
+hot-swaps it when a new version is deployed.
 """
 
 import joblib
 import json
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from app.core.config import (
     MODEL_DIR, MODEL_PATH, MODEL_PATH_ALT, SCALER_PATH,
     FEATURES_PATH, AGE_NORMS_PATH, MODEL_METADATA_PATH,
@@ -27,38 +31,38 @@ from app.core.config import (
 )
 from app.core.logger import logger
 
-# Global variables (loaded once at startup)
-_model = None
-_scaler = None
-_feature_names = None
-_age_norms = None
+def legacy_artifacts() -> List[Path]:
+    """Files the legacy unified model is read from (used for versioning and change detection)"""
+    model_path = MODEL_PATH if MODEL_PATH.exists() or not MODEL_PATH_ALT.exists() else MODEL_PATH_ALT
+    return [model_path, SCALER_PATH, FEATURES_PATH, AGE_NORMS_PATH]
 
-# v3 Hybrid Model Cache
-_v3_binary_model = None
-_v3_severity_model = None
-_v3_scaler = None
-_v3_le_gender = None
-_v3_le_lang = None
-_v3_config = None
+def v3_artifacts() -> List[Path]:
+    """Files the v3 hybrid ensemble is read from (used for versioning and change detection)"""
+    return [
+        AGE_2_V3_BINARY_MODEL_PATH, AGE_2_V3_SEVERITY_MODEL_PATH, AGE_2_V3_SCALER_PATH,
+        AGE_2_V3_LE_GENDER_PATH, AGE_2_V3_LE_LANG_PATH, AGE_2_V3_CONFIG_PATH
+    ]
 
 def load_models():
-    """Load all model files (called once at startup)"""
-    global _model, _scaler, _feature_names, _age_norms
-    
-    if _model is not None:
-        # Already loaded
-        return _model, _scaler, _feature_names, _age_norms
-    
+    """Get the legacy model files (loaded once, hot-swapped by the model registry)"""
+    from app.ml.model_registry import get_registry
+    try:
+        return get_registry().get("legacy").payload
+    except FileNotFoundError:
+        raise
+    except Exception as e:
+        raise FileNotFoundError(f"Error loading models: {str(e)}")
+
+def read_legacy_models():
+    """Read the legacy model files from disk (uncached; see load_models)"""
     logger.info("Loading ML models...")
     try:
         # Load model
         if MODEL_PATH.exists():
-            _model = joblib.load(MODEL_PATH)
-            model_path_used = str(MODEL_PATH)
+            model = joblib.load(MODEL_PATH)
             logger.info(f"Model loaded from: {MODEL_PATH.name}")
         elif MODEL_PATH_ALT.exists():
-            _model = joblib.load(MODEL_PATH_ALT)
-            model_path_used = str(MODEL_PATH_ALT)
+            model = joblib.load(MODEL_PATH_ALT)
             logger.info(f"Model loaded from: {MODEL_PATH_ALT.name}")
         else:
             raise FileNotFoundError(
@@ -68,32 +72,32 @@ def load_models():
         # Load scaler
         if not SCALER_PATH.exists():
             raise FileNotFoundError(f"Scaler not found: {SCALER_PATH}")
-        _scaler = joblib.load(SCALER_PATH)
-        logger.info(f"Scaler loaded: {SCALER_PATH.name} (expects {_scaler.n_features_in_} features)")
+        scaler = joblib.load(SCALER_PATH)
+        logger.info(f"Scaler loaded: {SCALER_PATH.name} (expects {scaler.n_features_in_} features)")
         
         # Load feature names
-        _feature_names = None
+        feature_names = None
         if FEATURES_PATH.exists():
             with open(FEATURES_PATH, 'r') as f:
                 feature_data = json.load(f)
                 if isinstance(feature_data, list):
-                    _feature_names = feature_data
+                    feature_names = feature_data
                 elif isinstance(feature_data, dict) and 'feature_names' in feature_data:
-                    _feature_names = feature_data['feature_names']
+                    feature_names = feature_data['feature_names']
                 else:
-                    _feature_names = feature_data
+                    feature_names = feature_data
         
         # Load age norms (optional)
-        _age_norms = None
+        age_norms = None
         if AGE_NORMS_PATH.exists():
             with open(AGE_NORMS_PATH, 'r') as f:
-                _age_norms = json.load(f)
+                age_norms = json.load(f)
             logger.info(f"Age norms loaded: {AGE_NORMS_PATH.name}")
         else:
             logger.warning(f"Age norms not found: {AGE_NORMS_PATH.name} (age normalization disabled)")
         
         logger.info("[OK] All models loaded successfully")
-        return _model, _scaler, _feature_names, _age_norms
+        return model, scaler, feature_names, age_norms
         
     except Exception as e:
         logger.error(f"[ERROR] Error loading models: {str(e)}")
@@ -101,51 +105,51 @@ def load_models():
 
 def load_v3_models():
     """
-    Load all v3 hybrid model components for the 2-3.5 age group.
-    Uses singleton pattern to cache models in memory.
+    Get all v3 hybrid model components for the 2-3.5 age group.
+    Served from the model registry (loaded once, hot-swapped on deployment).
     """
-    global _v3_binary_model, _v3_severity_model, _v3_scaler, _v3_le_gender, _v3_le_lang, _v3_config
-    
-    if _v3_binary_model is not None:
-        return _v3_binary_model, _v3_severity_model, _v3_scaler, _v3_le_gender, _v3_le_lang, _v3_config
-        
-    logger.info("Loading SenseAI Cognitive Flexibility v3 Model Ensemble...")
-    
+    from app.ml.model_registry import get_registry
     try:
-        # Load specific pkl files
-        if not AGE_2_V3_BINARY_MODEL_PATH.exists():
-            raise FileNotFoundError(f"v3 Binary model not found: {AGE_2_V3_BINARY_MODEL_PATH}")
-        _v3_binary_model = joblib.load(AGE_2_V3_BINARY_MODEL_PATH)
-        
-        if not AGE_2_V3_SEVERITY_MODEL_PATH.exists():
-            raise FileNotFoundError(f"v3 Severity model not found: {AGE_2_V3_SEVERITY_MODEL_PATH}")
-        _v3_severity_model = joblib.load(AGE_2_V3_SEVERITY_MODEL_PATH)
-        
-        if not AGE_2_V3_SCALER_PATH.exists():
-            raise FileNotFoundError(f"v3 Scaler not found: {AGE_2_V3_SCALER_PATH}")
-        _v3_scaler = joblib.load(AGE_2_V3_SCALER_PATH)
-        
-        if not AGE_2_V3_LE_GENDER_PATH.exists():
-            raise FileNotFoundError(f"v3 Gender Encoder not found: {AGE_2_V3_LE_GENDER_PATH}")
-        _v3_le_gender = joblib.load(AGE_2_V3_LE_GENDER_PATH)
-        
-        if not AGE_2_V3_LE_LANG_PATH.exists():
-            raise FileNotFoundError(f"v3 Language Encoder not found: {AGE_2_V3_LE_LANG_PATH}")
-        _v3_le_lang = joblib.load(AGE_2_V3_LE_LANG_PATH)
-        
-        # Load config if available
-        if AGE_2_V3_CONFIG_PATH.exists():
-            with open(AGE_2_V3_CONFIG_PATH, 'r') as f:
-                _v3_config = json.load(f)
-        
-        logger.info("[OK] v3 Model Ensemble loaded successfully")
-        return _v3_binary_model, _v3_severity_model, _v3_scaler, _v3_le_gender, _v3_le_lang, _v3_config
-        
+        return get_registry().get("2-3.5").payload
     except Exception as e:
         logger.error(f"[ERROR] Failed to load v3 models: {str(e)}")
         # Don't raise here, allow the app to boot even if v3 fails (it will error on use)
         return None, None, None, None, None, None
 
+def read_v3_models():
+    """Read the v3 hybrid model components from disk (uncached; see load_v3_models)"""
+    logger.info("Loading SenseAI Cognitive Flexibility v3 Model Ensemble...")
+    
+    # Load specific pkl files
+    if not AGE_2_V3_BINARY_MODEL_PATH.exists():
+        raise FileNotFoundError(f"v3 Binary model not found: {AGE_2_V3_BINARY_MODEL_PATH}")
+    binary_model = joblib.load(AGE_2_V3_BINARY_MODEL_PATH)
+    
+    if not AGE_2_V3_SEVERITY_MODEL_PATH.exists():
+        raise FileNotFoundError(f"v3 Severity model not found: {AGE_2_V3_SEVERITY_MODEL_PATH}")
+    severity_model = joblib.load(AGE_2_V3_SEVERITY_MODEL_PATH)
+    
+    if not AGE_2_V3_SCALER_PATH.exists():
+        raise FileNotFoundError(f"v3 Scaler not found: {AGE_2_V3_SCALER_PATH}")
+    scaler = joblib.load(AGE_2_V3_SCALER_PATH)
+    
+    if not AGE_2_V3_LE_GENDER_PATH.exists():
+        raise FileNotFoundError(f"v3 Gender Encoder not found: {AGE_2_V3_LE_GENDER_PATH}")
+    le_gender = joblib.load(AGE_2_V3_LE_GENDER_PATH)
+    
+    if not AGE_2_V3_LE_LANG_PATH.exists():
+        raise FileNotFoundError(f"v3 Language Encoder not found: {AGE_2_V3_LE_LANG_PATH}")
+    le_lang = joblib.load(AGE_2_V3_LE_LANG_PATH)
+    
+    # Load config if available
+    config = None
+    if AGE_2_V3_CONFIG_PATH.exists():
+        with open(AGE_2_V3_CONFIG_PATH, 'r') as f:
+            config = json.load(f)
+    
+    logger.info("[OK] v3 Model Ensemble loaded successfully")
+    return binary_model, severity_model, scaler, le_gender, le_lang, config
+
 def load_model_metadata() -> Optional[Dict[str, Any]]:
     """Load model metadata if available"""
     if MODEL_METADATA_PATH.exists():
@@ -159,11 +163,14 @@ def load_model_metadata() -> Optional[Dict[str, Any]]:
 def check_models_loaded() -> Dict[str, Any]:
     """Check if models are loaded and return status"""
     try:
+        from app.ml.model_registry import get_registry
+        registry = get_registry()
+        
         # Check legacy models
-        model_loaded = _model is not None
+        model_loaded = registry.is_loaded("legacy")
         
         # Check v3 models
-        v3_loaded = _v3_binary_model is not None
+        v3_loaded = registry.is_loaded("2-3.5")
         
         status = {
             "legacy": {
@@ -174,7 +181,7 @@ def check_models_loaded() -> Dict[str, Any]:
             "v3_cogflex": {
                 "loaded": v3_loaded,
                 "age_group": "2-3.5",
-                "ready": v3_loaded and _v3_scaler is not None
+                "ready": v3_loaded
             }
         }
         
@@ -184,11 +191,3 @@ def check_models_loaded() -> Dict[str, Any]:
             "loaded": False,
             "error": str(e)
         }
-
-# Load models at module import
-try:
-    load_models()
-    load_v3_models()
-except Exception:
-    pass
-
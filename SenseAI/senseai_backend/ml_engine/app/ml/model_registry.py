@@ -0,0 +1,389 @@
+"""
+Versioned model registry with hot reload.
+
+Every model family the engine serves (the v3 ensemble, the two age-banded models
+and the legacy unified model) is registered under a group name together with a
+reader that loads it from disk and the list of artifact files it is built from.
+
+Key Features:
+- Versions: each loaded group is a `ModelVersion` holding the payload, the SHA-256
+  of every artifact, a combined checksum, the version string from the manifest
+  (`model_metadata.json`) and when / how fast it was loaded.
+- Hot reload: a background watcher polls artifact and manifest stats. When a
+  deployment (e.g. `sync_models_to_backend.py`) changes files, the new version is
+  loaded off the request path and swapped in with a single reference assignment.
+  Requests that already fetched the old version finish on it.
+- Manifest checksums: if the manifest lists `checksums` for a group, a version is
+  only swapped in once the files on disk match them, so a half-copied deployment
+  keeps serving the previous version.
+- Failures are sticky per artifact state: a group whose files are missing is not
+  re-read from disk on every request, only after its files change.
+- Versions only: with `load_payloads=False` the registry tracks versions and
+  checksums without reading the models (payload is None). The parent process uses
+  this in ML_SERVING_MODE=process, where only the workers serve predictions.
+
+Manifest format (all keys optional):
+{
+  "version": "1.0.0",
+  "models": {
+    "3.5-5.5": {
+      "version": "2026.02.1",
+      "checksums": {"model_age_3_5_5_5_frog_jump.pkl": "<sha256>"}
+    }
+  }
+}
+"""
+
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.core.logger import logger
+
+# (path, mtime_ns, size) per artifact; None fields for missing files
+Signature = Tuple[Tuple[str, Optional[int], Optional[int]], ...]
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file's contents"""
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def combined_checksum(artifacts: Dict[str, str]) -> str:
+    """One digest over the name and SHA-256 of every artifact"""
+    return hashlib.sha256(
+        "".join(f"{name}:{sha}" for name, sha in sorted(artifacts.items())).encode('utf-8')
+    ).hexdigest()
+
+
+def _signature(paths: List[Path]) -> Signature:
+    """Cheap change detector: stat of every artifact"""
+    entries = []
+    for path in paths:
+        try:
+            stat = path.stat()
+            entries.append((str(path), stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            entries.append((str(path), None, None))
+    return tuple(entries)
+
+
+class ModelVersion:
+    """One loaded version of a model group"""
+
+    def __init__(self, group: str, payload: Any, version: str, artifacts: Dict[str, str],
+                 signature: Signature, load_seconds: float):
+        self.group = group
+        self.payload = payload
+        self.version = version
+        self.artifacts = artifacts
+        self.checksum = combined_checksum(artifacts)
+        self.signature = signature
+        self.loaded_at = time.time()
+        self.load_seconds = load_seconds
+
+    def describe(self) -> Dict[str, Any]:
+        """JSON-serializable summary for /health"""
+        return {
+            "version": self.version,
+            "checksum": self.checksum[:12],
+            "loaded_at": datetime.fromtimestamp(self.loaded_at).isoformat(),
+            "load_seconds": round(self.load_seconds, 4),
+            "artifacts": {name: sha[:12] for name, sha in self.artifacts.items()}
+        }
+
+
+class ModelRegistry:
+    """Load, version and hot-swap model groups"""
+
+    def __init__(self, manifest_path: Path, poll_interval: float = 30.0, load_payloads: bool = True):
+        """
+        Initialize registry
+
+        Args:
+            manifest_path: Path to model_metadata.json
+            poll_interval: Seconds between change checks of the watcher (0 disables it)
+            load_payloads: Read the models; False tracks versions and checksums only
+        """
+        self.manifest_path = Path(manifest_path)
+        self.poll_interval = poll_interval
+        self.load_payloads = load_payloads
+
+        self._readers: Dict[str, Tuple[Callable[[], Any], Callable[[], List[Path]]]] = {}
+        self._versions: Dict[str, ModelVersion] = {}
+        self._failures: Dict[str, Tuple[Signature, Exception]] = {}
+        self._lock = threading.Lock()          # guards _versions / _failures
+        self._load_lock = threading.Lock()     # one disk load at a time
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self.reloads = 0
+
+    def register(self, group: str, reader: Callable[[], Any], artifacts: Callable[[], List[Path]]):
+        """
+        Register a model group
+
+        Args:
+            group: Group name (e.g. '3.5-5.5', '2-3.5', 'legacy')
+            reader: Loads the group from disk and returns its payload
+            artifacts: Returns the artifact paths the payload is read from
+        """
+        self._readers[group] = (reader, artifacts)
+
+    def _manifest(self) -> Dict[str, Any]:
+        """Read the manifest, or {} if it is missing or unreadable"""
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read model manifest {self.manifest_path.name}: {e}")
+            return {}
+
+    def _group_manifest(self, group: str) -> Dict[str, Any]:
+        """Manifest entry of a group"""
+        manifest = self._manifest()
+        entry = dict(manifest.get("models", {}).get(group, {}))
+        entry.setdefault("version", manifest.get("version"))
+        return entry
+
+    def _load(self, group: str) -> ModelVersion:
+        """Read a group from disk and build its version (does not publish it)"""
+        reader, artifacts_fn = self._readers[group]
+        paths = [p for p in artifacts_fn() if p is not None]
+        # Stat before reading, so a change during the read is picked up next poll
+        signature = _signature(paths + [self.manifest_path])
+
+        start = time.perf_counter()
+        payload = reader() if self.load_payloads else None
+        load_seconds = time.perf_counter() - start
+
+        artifacts = {path.name: file_sha256(path) for path in paths if path.exists()}
+
+        entry = self._group_manifest(group)
+        expected = entry.get("checksums", {})
+        mismatched = [name for name, sha in expected.items() if artifacts.get(name) != sha]
+        if mismatched:
+            raise RuntimeError(
+                f"Artifacts do not match the manifest checksums for {group}: {mismatched}"
+            )
+
+        version = entry.get("version") or f"sha-{combined_checksum(artifacts)[:12]}"
+        return ModelVersion(group, payload, str(version), artifacts, signature, load_seconds)
+
+    def _current_signature(self, group: str) -> Signature:
+        """Stat signature of a group's artifacts and the manifest as they are now"""
+        _, artifacts_fn = self._readers[group]
+        return _signature([p for p in artifacts_fn() if p is not None] + [self.manifest_path])
+
+    def get(self, group: str) -> ModelVersion:
+        """
+        Get the current version of a group, loading it on first use
+
+        Callers should fetch the version once per request and use its payload
+        throughout, so a concurrent swap never mixes two versions.
+
+        Raises:
+            KeyError: If the group is not registered
+            Exception: The load error, if the group has never loaded successfully
+        """
+        current = self._versions.get(group)
+        if current is not None:
+            return current
+
+        if group not in self._readers:
+            raise KeyError(f"Unknown model group: {group}")
+
+        with self._load_lock:
+            current = self._versions.get(group)
+            if current is not None:
+                return current
+
+            signature = self._current_signature(group)
+            failure = self._failures.get(group)
+            if failure is not None and failure[0] == signature:
+                # Files unchanged since the last failed load
+                raise failure[1]
+
+            try:
+                version = self._load(group)
+            except Exception as e:
+                with self._lock:
+                    self._failures[group] = (signature, e)
+                raise
+
+            with self._lock:
+                self._versions[group] = version
+                self._failures.pop(group, None)
+            logger.info(f"[OK] Model group {group} loaded: version {version.version} "
+                        f"({version.checksum[:12]}, {version.load_seconds:.2f}s)")
+            return version
+
+    def load_all(self) -> Dict[str, bool]:
+        """
+        Load every registered group
+
+        Returns:
+            Dictionary of group -> loaded successfully
+        """
+        loaded = {}
+        for group in self._readers:
+            try:
+                self.get(group)
+                loaded[group] = True
+            except Exception as e:
+                logger.warning(f"Model group {group} not available: {e}")
+                loaded[group] = False
+        return loaded
+
+    def refresh(self) -> List[str]:
+        """
+        Reload every group whose artifacts or manifest changed
+
+        Returns:
+            Groups that were swapped to a new version
+        """
+        swapped = []
+        for group in list(self._readers):
+            current = self._versions.get(group)
+            signature = self._current_signature(group)
+
+            if current is None:
+                failure = self._failures.get(group)
+                if failure is not None and failure[0] != signature:
+                    # Files changed since the last failure: try again
+                    try:
+                        self.get(group)
+                        swapped.append(group)
+                    except Exception as e:
+                        logger.warning(f"Model group {group} still not available: {e}")
+                continue
+
+            if signature == current.signature:
+                continue
+
+            with self._load_lock:
+                try:
+                    candidate = self._load(group)
+                except Exception as e:
+                    logger.warning(f"Keeping {group} version {current.version}: new version failed to load: {e}")
+                    continue
+
+            if candidate.checksum == current.checksum and candidate.version == current.version:
+                # Touched but identical: remember the new stats only
+                current.signature = candidate.signature
+                continue
+
+            with self._lock:
+                self._versions[group] = candidate
+                self.reloads += 1
+            swapped.append(group)
+            logger.info(f"[OK] Model group {group} swapped: {current.version} ({current.checksum[:12]}) -> "
+                        f"{candidate.version} ({candidate.checksum[:12]})")
+
+        return swapped
+
+    def _watch(self):
+        """Watcher thread body"""
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Model registry refresh failed: {e}", exc_info=True)
+
+    def start_watcher(self):
+        """Start polling for new model versions in the background"""
+        if self.poll_interval <= 0 or (self._watcher is not None and self._watcher.is_alive()):
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name="model-registry-watcher", daemon=True)
+        self._watcher.start()
+        logger.info(f"Model registry watching for new versions every {self.poll_interval:g}s")
+
+    def stop_watcher(self):
+        """Stop the watcher thread"""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+    def is_loaded(self, group: str) -> bool:
+        """Whether a version of the group is being served"""
+        return group in self._versions
+
+    def generation(self) -> str:
+        """
+        Digest over the checksum of every loaded group
+
+        Changes whenever a group is loaded or swapped, so anything derived from
+        model output (e.g. cached predictions) can be keyed on it.
+        """
+        versions = dict(self._versions)
+        return combined_checksum({group: version.checksum for group, version in versions.items()})
+
+    def versions(self) -> Dict[str, str]:
+        """Group -> loaded version string"""
+        return {group: version.version for group, version in self._versions.items()}
+
+    def status(self) -> Dict[str, Any]:
+        """Loaded versions, load times and load errors for /health"""
+        groups = {}
+        for group in self._readers:
+            version = self._versions.get(group)
+            if version is not None:
+                groups[group] = {"loaded": True, **version.describe()}
+            else:
+                failure = self._failures.get(group)
+                groups[group] = {"loaded": False, "error": str(failure[1]) if failure else None}
+
+        return {
+            "manifest": self.manifest_path.name if self.manifest_path.exists() else None,
+            "watching": self._watcher is not None and self._watcher.is_alive(),
+            "poll_interval": self.poll_interval,
+            "reloads": self.reloads,
+            "groups": groups
+        }
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ModelRegistry:
+    """The process-wide registry with all model groups registered"""
+    global _registry
+    if _registry is not None:
+        return _registry
+
+    with _registry_lock:
+        if _registry is None:
+            from app.core.config import MODEL_METADATA_PATH, MODEL_RELOAD_INTERVAL, ML_INFERENCE_BACKEND
+            from app.ml import model_loader, age_specific_loader
+
+            registry = ModelRegistry(MODEL_METADATA_PATH, poll_interval=MODEL_RELOAD_INTERVAL)
+            registry.register("2-3.5", model_loader.read_v3_models, model_loader.v3_artifacts)
+            for age_group in ("3.5-5.5", "5.5-6.9"):
+                registry.register(
+                    age_group,
+                    lambda g=age_group: age_specific_loader.read_age_specific_model(g),
+                    lambda g=age_group: age_specific_loader.age_group_artifacts(g)
+                )
+            registry.register("legacy", model_loader.read_legacy_models, model_loader.legacy_artifacts)
+            if ML_INFERENCE_BACKEND == "onnx":
+                from app.ml import onnx_backend
+                for age_group in onnx_backend.ONNX_ASSETS:
+                    registry.register(
+                        f"{age_group}/onnx",
+                        lambda g=age_group: onnx_backend.read_onnx_age_model(g),
+                        lambda g=age_group: onnx_backend.onnx_artifacts(g)
+                    )
+            _registry = registry
+
+    return _registry
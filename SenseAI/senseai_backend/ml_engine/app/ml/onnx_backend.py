@@ -0,0 +1,264 @@
+"""
+ONNX Runtime backend for the age-banded models (3.5-5.5, 5.5-6.9).
+
+The mobile app ships skl2onnx exports of these models in `SenseAI/assets/onnx_model`:
+a `LinearClassifier` node (LOGISTIC post transform) followed by a `ZipMap` that turns
+probabilities into a list of dicts. The exports expect already scaled input. With
+ML_INFERENCE_BACKEND=onnx the engine serves them instead of the pickled classifiers:
+
+- Scaler fusion: the group's pickled scaler is affine (x * mul + add), so it is folded
+  into the LinearClassifier weights (W' = W * mul, b' = b + W @ add). The graph then
+  takes raw features and scaling costs nothing extra. Explanations need scaled values;
+  they come from the same affine form (`OnnxLinearModel.scale`), not scaler.transform.
+- ZipMap removal: the graph returns the probability tensor directly.
+- Parity check: before a graph is served it is run next to the pickled scaler + model
+  on probe inputs; if probabilities differ by more than PARITY_TOLERANCE (e.g. the
+  export is from another training run) the group fails to load and requests fall
+  back to the pickled model.
+
+Requires the optional `onnx` and `onnxruntime` packages.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app.core.config import ONNX_MODEL_DIR
+from app.core.logger import logger
+from app.ml.age_specific_loader import age_group_artifacts, read_age_specific_model
+
+# Shipped ONNX export per age-banded group
+ONNX_ASSETS = {
+    "3.5-5.5": ONNX_MODEL_DIR / "model_age_3_5_5_5_frog_jump.onnx",
+    "5.5-6.9": ONNX_MODEL_DIR / "model_age_5_5_6_9_color_shape.onnx",
+}
+
+# Max absolute probability difference to the pickled model (graph runs in float32)
+PARITY_TOLERANCE = 1e-4
+PARITY_PROBES = 256
+
+
+def scaler_affine(scaler: Any, n_features: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Express a fitted scaler as x_scaled = x * mul + add
+
+    Args:
+        scaler: Fitted StandardScaler, RobustScaler or MinMaxScaler
+        n_features: Number of input features
+
+    Returns:
+        Tuple of (mul, add) arrays
+
+    Raises:
+        ValueError: For scalers that are not per-feature affine
+    """
+    mul = np.ones(n_features, dtype=float)
+    add = np.zeros(n_features, dtype=float)
+
+    if hasattr(scaler, "min_") and hasattr(scaler, "scale_") and not getattr(scaler, "clip", False):
+        # MinMaxScaler: x * scale_ + min_
+        return mul * scaler.scale_, add + scaler.min_
+
+    if not any(hasattr(scaler, attr) for attr in ("mean_", "center_", "scale_")) or hasattr(scaler, "min_"):
+        raise ValueError(f"Cannot fuse scaler of type {type(scaler).__name__}")
+
+    center = getattr(scaler, "mean_", None)
+    if center is None:
+        center = getattr(scaler, "center_", None)
+    scale = getattr(scaler, "scale_", None)
+
+    # StandardScaler / RobustScaler: (x - center) / scale
+    if scale is not None:
+        mul = mul / np.asarray(scale, dtype=float)
+    if center is not None:
+        add = add - np.asarray(center, dtype=float) * mul
+    return mul, add
+
+
+def fuse_scaler_into_graph(graph_model: Any, mul: np.ndarray, add: np.ndarray) -> Any:
+    """
+    Fold an affine scaler into the LinearClassifier of an skl2onnx export and drop ZipMap
+
+    Args:
+        graph_model: onnx.ModelProto (modified in place)
+        mul: Per-feature multiplier of the scaler
+        add: Per-feature offset of the scaler
+
+    Returns:
+        The modified ModelProto (inputs: raw features, declared as [batch, len(mul)];
+        outputs: label, probabilities)
+
+    Raises:
+        ValueError: If the graph has no LinearClassifier or its width does not match
+    """
+    from onnx import helper, TensorProto
+
+    graph = graph_model.graph
+    linear = next((n for n in graph.node if n.op_type == "LinearClassifier"), None)
+    if linear is None:
+        raise ValueError("ONNX graph has no LinearClassifier node to fuse the scaler into")
+
+    attrs = {a.name: a for a in linear.attribute}
+    intercepts = np.asarray(attrs["intercepts"].floats, dtype=float)
+    coefficients = np.asarray(attrs["coefficients"].floats, dtype=float)
+    weights = coefficients.reshape(len(intercepts), -1)
+    if weights.shape[1] != len(mul):
+        raise ValueError(f"ONNX graph expects {weights.shape[1]} features, scaler has {len(mul)}")
+
+    fused_weights = weights * mul[None, :]
+    fused_intercepts = intercepts + weights @ add
+    attrs["coefficients"].floats[:] = fused_weights.astype(np.float32).ravel().tolist()
+    attrs["intercepts"].floats[:] = fused_intercepts.astype(np.float32).tolist()
+
+    # The exports may declare a narrower input than the classifier has weights for;
+    # declare the width the weights (and the scaler) actually use, batch size free
+    graph_input = next(i for i in graph.input if i.name == linear.input[0])
+    dims = graph_input.type.tensor_type.shape.dim
+    del dims[:]
+    dims.add().dim_param = "N"
+    dims.add().dim_value = len(mul)
+
+    # Return the probability tensor instead of ZipMap's list of dicts
+    zipmap = next((n for n in graph.node if n.op_type == "ZipMap"), None)
+    if zipmap is not None:
+        probabilities = helper.make_tensor_value_info(zipmap.input[0], TensorProto.FLOAT, [None, None])
+        outputs = [probabilities if o.name == zipmap.output[0] else o for o in graph.output]
+        graph.node.remove(zipmap)
+        del graph.output[:]
+        graph.output.extend(outputs)
+    return graph_model
+
+
+class OnnxLinearModel:
+    """Fused scaler + linear classifier served by ONNX Runtime"""
+
+    # predict_proba takes unscaled features (the scaler is inside the graph)
+    takes_raw_features = True
+
+    def __init__(self, graph_bytes: bytes, reference_model: Any, source: Path,
+                 affine: Tuple[np.ndarray, np.ndarray], num_threads: int = 1):
+        """
+        Create an inference session
+
+        Args:
+            graph_bytes: Serialized fused graph
+            reference_model: Pickled classifier the graph was exported from
+                (classes_ / coef_ are kept for labels and explanations)
+            source: Path of the shipped export (for logging / status)
+            affine: (mul, add) of the fused scaler, see scaler_affine
+            num_threads: Intra-op threads (small graphs run fastest on one)
+        """
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(graph_bytes, sess_options=options,
+                                            providers=['CPUExecutionProvider'])
+        self._input = self.session.get_inputs()[0].name
+        self._probabilities = self.session.get_outputs()[-1].name
+        self.classes_ = np.asarray(reference_model.classes_)
+        coef = getattr(reference_model, "coef_", None)
+        if coef is not None:
+            self.coef_ = coef
+        self.mul, self.add = affine
+        self.source = source
+        self.graph_size = len(graph_bytes)
+
+    def scale(self, X: np.ndarray) -> np.ndarray:
+        """
+        Scaled features for explanations, from the fused scaler's affine form
+
+        Args:
+            X: Raw feature matrix (n_requests x n_features)
+
+        Returns:
+            X * mul + add (what the pickled scaler's transform returns)
+        """
+        return X * self.mul + self.add
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities for unscaled features
+
+        Args:
+            X: Raw feature matrix (n_requests x n_features)
+
+        Returns:
+            Probabilities (n_requests x n_classes), float64 like sklearn
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        return self.session.run([self._probabilities], {self._input: X})[0].astype(np.float64)
+
+
+def parity_probes(scaler: Any, n_features: int, n: int = PARITY_PROBES, seed: int = 0) -> np.ndarray:
+    """Raw inputs spread around the training distribution the scaler was fitted on"""
+    mul, add = scaler_affine(scaler, n_features)
+    rng = np.random.default_rng(seed)
+    # Scaled space ~ N(0, 1.5) mapped back to raw feature units
+    scaled = rng.normal(0.0, 1.5, size=(n, n_features))
+    return (scaled - add) / mul
+
+
+def parity_report(onnx_model: OnnxLinearModel, model: Any, scaler: Any, X: np.ndarray) -> Dict[str, Any]:
+    """
+    Compare the fused graph with the pickled scaler + model
+
+    Returns:
+        Dictionary with max_abs_diff of the probabilities and label agreement
+    """
+    expected = model.predict_proba(scaler.transform(X))
+    actual = onnx_model.predict_proba(X)
+    return {
+        "max_abs_diff": float(np.max(np.abs(expected - actual))),
+        "label_agreement": float(np.mean(np.argmax(expected, axis=1) == np.argmax(actual, axis=1))),
+        "probes": len(X)
+    }
+
+
+def onnx_artifacts(age_group: str) -> List[Path]:
+    """Files the ONNX backend of an age group is built from (export + pickled scaler / model)"""
+    return [ONNX_ASSETS[age_group]] + age_group_artifacts(age_group)
+
+
+def read_onnx_age_model(age_group: str) -> Tuple[OnnxLinearModel, Any, list, Optional[Dict]]:
+    """
+    Build the fused ONNX model of an age group (uncached; served through the registry)
+
+    Args:
+        age_group: '3.5-5.5' or '5.5-6.9'
+
+    Returns:
+        Tuple of (OnnxLinearModel, scaler, feature_names, metadata), like
+        read_age_specific_model
+
+    Raises:
+        FileNotFoundError: If the export or the pickled model is missing
+        ImportError: If onnx / onnxruntime are not installed
+        ValueError: If the graph does not match the pickled model
+    """
+    try:
+        import onnx
+    except ImportError:
+        raise ImportError("ONNX backend requires onnx and onnxruntime (pip install onnx onnxruntime)")
+
+    path = ONNX_ASSETS[age_group]
+    if not path.exists():
+        raise FileNotFoundError(f"ONNX export not found for age group {age_group}: {path}")
+
+    model, scaler, feature_names, metadata = read_age_specific_model(age_group)
+    n_features = scaler.n_features_in_
+
+    mul, add = scaler_affine(scaler, n_features)
+    graph = fuse_scaler_into_graph(onnx.load(str(path)), mul, add)
+    onnx_model = OnnxLinearModel(graph.SerializeToString(), model, path, (mul, add))
+
+    report = parity_report(onnx_model, model, scaler, parity_probes(scaler, n_features))
+    if report["max_abs_diff"] > PARITY_TOLERANCE:
+        raise ValueError(
+            f"ONNX export {path.name} does not match the pickled model for {age_group}: "
+            f"max probability difference {report['max_abs_diff']:.2e} "
+            f"(label agreement {report['label_agreement']:.1%})"
+        )
+
+    logger.info(f"[OK] ONNX backend ready for {age_group}: {path.name} with fused scaler "
+                f"(max probability difference {report['max_abs_diff']:.1e})")
+    return onnx_model, scaler, feature_names, metadata
@@ -0,0 +1,227 @@
+"""
+Prediction result cache.
+
+Clients re-request the same prediction for a session (report re-render, retries).
+The response only depends on the model that serves the request and on what the
+request feeds it, so it is cached under a fingerprint of:
+
+- the resolved age group (routing),
+- the feature dictionary (canonical JSON: sorted keys, no whitespace),
+- the session type,
+- the model registry generation (`ModelRegistry.generation()`).
+
+When the registry generation changes (a model group is loaded or hot-swapped) the
+cache is cleared, so no entry computed by a previous model version is served.
+
+Entries live in an in-process LRU (ML_PREDICTION_CACHE_SIZE, 0 disables it). If
+ML_PREDICTION_CACHE_PATH is set, the cache is written there on shutdown and read
+back on startup, as long as the same models are loaded.
+
+In ML_SERVING_MODE=process the workers reload models on their own watcher poll,
+so for up to one poll interval after a deployment a miss may still be computed
+by the previous model version. Such a response is returned but not cached: every
+key starts with the generation it was built for, and `put` only stores responses
+computed under that generation (as reported by the inference service).
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+from app.core.config import get_age_group
+from app.core.logger import logger
+from app.ml.model_registry import get_registry
+from app.ml.predictor import _resolve_age_months
+from app.schemas.request import PredictionRequest
+from app.schemas.response import PredictionResponse
+
+
+def fingerprint(age_group: Optional[str], features: Dict[str, Any],
+                session_type: Optional[str], model_version: str) -> str:
+    """
+    Canonical hash of everything a prediction depends on
+
+    Args:
+        age_group: Resolved age group
+        features: Feature dictionary
+        session_type: Session type
+        model_version: Registry generation
+
+    Returns:
+        SHA-256 hex digest
+    """
+    payload = json.dumps(
+        [age_group, features, session_type, model_version],
+        sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PredictionCache:
+    """LRU cache of prediction responses, invalidated on model changes"""
+
+    def __init__(self, max_entries: int = 10000, persist_path: Optional[Path] = None):
+        """
+        Initialize cache
+
+        Args:
+            max_entries: Maximum cached responses (0 disables caching)
+            persist_path: JSON file to save to / load from (None: memory only)
+        """
+        self.max_entries = max_entries
+        self.persist_path = Path(persist_path) if persist_path else None
+
+        self._entries: "OrderedDict[str, PredictionResponse]" = OrderedDict()
+        self._generation: Optional[str] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_skips = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether caching is switched on"""
+        return self.max_entries > 0
+
+    def _sync_generation(self, generation: str):
+        """Drop every entry if the loaded models changed (caller holds the lock)"""
+        if generation != self._generation:
+            if self._entries:
+                logger.info(f"Model versions changed: dropping {len(self._entries)} cached predictions")
+                self._entries.clear()
+                self.invalidations += 1
+            self._generation = generation
+
+    def key(self, request: PredictionRequest) -> str:
+        """
+        Cache key of a request under the currently loaded models
+
+        Args:
+            request: PredictionRequest
+
+        Returns:
+            '<generation>:<request fingerprint>'
+        """
+        generation = get_registry().generation()
+        with self._lock:
+            self._sync_generation(generation)
+        age_group = get_age_group(_resolve_age_months(request))
+        return f"{generation}:{fingerprint(age_group, request.features, request.session_type, generation)}"
+
+    def get(self, key: str) -> Optional[PredictionResponse]:
+        """Cached response for a key (a copy), or None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            response = self._entries.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return response.model_copy(deep=True)
+
+    def put(self, key: str, response: PredictionResponse, generation: Optional[str]):
+        """
+        Cache a response, evicting the least recently used entries if full
+
+        Args:
+            key: Key from `key()`
+            response: Response computed for the request
+            generation: Registry generation the response was computed under
+                (None if unknown); the response is only cached if it is the
+                generation the key was built for
+        """
+        if not self.enabled:
+            return
+        if generation is None or key.split(":", 1)[0] != generation:
+            self.stale_skips += 1
+            return
+        with self._lock:
+            self._entries[key] = response.model_copy(deep=True)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def save(self):
+        """Write the cache to persist_path (atomically), if configured"""
+        if not self.enabled or self.persist_path is None:
+            return
+        with self._lock:
+            data = {
+                "generation": self._generation,
+                "entries": [[key, response.model_dump()] for key, response in self._entries.items()]
+            }
+        try:
+            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.persist_path.with_suffix(self.persist_path.suffix + ".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.persist_path)
+            logger.info(f"Saved {len(data['entries'])} cached predictions to {self.persist_path.name}")
+        except OSError as e:
+            logger.warning(f"Could not save prediction cache: {e}")
+
+    def load(self):
+        """Read the cache from persist_path, if configured and saved under the loaded models"""
+        if not self.enabled or self.persist_path is None or not self.persist_path.exists():
+            return
+        try:
+            with open(self.persist_path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read prediction cache {self.persist_path.name}: {e}")
+            return
+
+        generation = get_registry().generation()
+        if data.get("generation") != generation:
+            logger.info("Saved prediction cache was built with other model versions; starting empty")
+            return
+
+        with self._lock:
+            self._sync_generation(generation)
+            for key, response in data.get("entries", [])[-self.max_entries:]:
+                try:
+                    self._entries[key] = PredictionResponse(**response)
+                except Exception:
+                    continue
+        logger.info(f"Loaded {len(self._entries)} cached predictions from {self.persist_path.name}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit / miss counters for /health"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "stale_skips": self.stale_skips,
+            "persist_path": str(self.persist_path) if self.persist_path else None
+        }
+
+
+_cache: Optional[PredictionCache] = None
+
+
+def get_prediction_cache() -> PredictionCache:
+    """The process-wide prediction cache, configured from app.core.config"""
+    global _cache
+    if _cache is None:
+        from app.core.config import ML_PREDICTION_CACHE_SIZE, ML_PREDICTION_CACHE_PATH
+        _cache = PredictionCache(ML_PREDICTION_CACHE_SIZE, ML_PREDICTION_CACHE_PATH)
+    return _cache
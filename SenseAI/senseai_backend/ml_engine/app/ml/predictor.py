@@ -8,110 +8,34 @@ Workflow:
 1. Extracts age information to determine the correct age band (e.g., 2-3.5, 3.5-5.5).
 2. Dynamically routes to the appropriate model and scaler loaded via `age_specific_loader`.
    If the specific model isn't available, falls back to the legacy unified model.
-3. Validates and prepares the incoming feature dictionary against expected `feature_names`.
+3. Validates and prepares the incoming feature dictionary through the model's compiled
+   `FeaturePlan` (column index, default vector and coefficients built once per model).
 4. Scales the raw features using the cached `StandardScaler`.
-5. Executes the inference to get absolute prediction and probabilistic confidence.
+5. Executes the inference once (`predict_proba`); the label is the most probable class.
 6. Maps the output probability to Risk Thresholds (LOW, MODERATE, HIGH).
-7. Invokes `_build_explanations` to compute feature contributions (SHAP-like linear weighting)
-   for clinical transparency.
+7. Computes feature contributions (SHAP-like linear weighting, coef * x) from the plan's
+   coefficient vector for clinical transparency.
+
+Age 2-3.5 requests go to the v3 hybrid model, scored by the compiled `V3Scorer`
+(app/ml/v3_scorer.py). The dict-based v3 functions below are its reference
+implementation, kept for scripts/check_v3_parity.py.
 """
 
 import numpy as np
 from app.ml.age_specific_loader import load_age_specific_model
 from app.ml.model_loader import load_models, load_v3_models  # Updated with v3 loader
-from app.ml.preprocessing import normalize_features, prepare_features
+from app.ml.feature_plan import FeaturePlan, get_feature_plan
+from app.ml.v3_scorer import EXPLANATION_TEXT, DEFAULT_TOP_FEATURES, get_v3_scorer
 from app.core.config import RISK_THRESHOLDS, get_age_group
 from app.core.logger import logger
 from app.schemas.request import PredictionRequest
 from app.schemas.response import PredictionResponse, ExplanationItem
 
-# --- Multi-lingual Explanation Dictionary ---
-EXPLANATION_TEXT = {
-    "en": {
-        "low_eye_contact": "Reduced eye contact was observed during the assessment.",
-        "poor_imitation": "Social imitation skills are below the expected developmental level.",
-        "difficulty_with_change": "Child showed difficulty adapting to changes in routine or tasks.",
-        "low_joint_attention": "Reduced joint attention (sharing focus with others) was observed.",
-        "low_name_response": "Reduced responsiveness to their name being called.",
-        "sensory_sensitivity": "Signs of sensory sensitivity or unusual reactions were noted.",
-        "peer_play_delay": "Social interaction and peer play skills are still developing.",
-        "low_risk_positive": "Good social interaction and rule switching skills were observed."
-    },
-    "si": {
-        "low_eye_contact": "පරීක්ෂණයේදී ඇස් සම්බන්ධතාවය (eye contact) අඩු බව නිරීක්ෂණය විය.",
-        "poor_imitation": "සමාජීය අනුකරණ හැකියාව බලාපොරොත්තු වන මට්ටමට වඩා අඩුය.",
-        "difficulty_with_change": "දෛනික රටාවේ හෝ කාර්යයන්හි වෙනස්වීම් වලට අනුගත වීමට දරුවා අපහසුවක් පෙන්වීය.",
-        "low_joint_attention": "අන් අය සමඟ අවධානය බෙදාගැනීමේ (joint attention) හැකියාව අඩු බව පෙනේ.",
-        "low_name_response": "නම කතා කළ විට දක්වන ප්‍රතිචාරය අඩු මට්ටමක පවතී.",
-        "sensory_sensitivity": "ඉන්ද්‍රිය සංවේදීතාවයේ හෝ අසාමාන්‍ය ප්‍රතික්‍රියාවල ලක්ෂණ දක්නට ලැබුණි.",
-        "peer_play_delay": "සමාජීය අන්තර්ක්‍රියා සහ සම වයසේ දරුවන් සමඟ සෙල්ලම් කිරීමේ හැකියාව තවමත් වර්ධනය වෙමින් පවතී.",
-        "low_risk_positive": "හොඳ සමාජීය අන්තර්ක්‍රියා සහ නීති වෙනස් කිරීමට අනුගත වීමේ හැකියාව නිරීක්ෂණය විය."
-    },
-    "ta": {
-        "low_eye_contact": "மதிப்பீட்டின் போது கண் தொடர்பு குறைவாக இருப்பது அவதானிக்கப்பட்டது.",
-        "poor_imitation": "சமூகப் பின்பற்றுதல் திறன்கள் எதிர்பார்க்கப்படும் வளர்ச்சி நிலைக்குக் குறைவாக உள்ளன.",
-        "difficulty_with_change": "வழக்கமான நடைமுறைகள் அல்லது பணிகளில் ஏற்படும் மாற்றங்களுக்குத் தலைகொடுப்பதில் குழந்தை சிரமத்தை வெளிப்படுத்தியது.",
-        "low_joint_attention": "மற்றவர்களுடன் கவனத்தைப் பகிர்ந்து கொள்ளும் திறன் குறைவாக இருப்பது அவதானிக்கப்பட்டது.",
-        "low_name_response": "பெயர் சொல்லி அழைக்கும்போது எதிர்வினை குறைவாக உள்ளது.",
-        "sensory_sensitivity": "புலன் உணர்வு உணர்திறன் அல்லது அசாதாரண எதிர்வினைகளின் அறிகுறிகள் காணப்பட்டன.",
-        "peer_play_delay": "சமூக தொடர்பு மற்றும் சக நண்பர்களுடன் விளையாடும் திறன்கள் இன்னும் வளர்ச்சியடைந்து வருகின்றன.",
-        "low_risk_positive": "நல்ல சமூக தொடர்பு மற்றும் விதிமுறை மாற்றங்களுக்கு ஏற்ப மாறும் திறன்கள் அவதானிக்கப்பட்டன."
-    }
-}
-
-
-def _build_explanations(
-    model: any,
-    feature_names: list,
-    features_scaled: np.ndarray,
-    features_dict: dict,
-    top_k: int = 6,
-) -> list | None:
-    """
-    Build a simple explanation list for linear models (e.g. LogisticRegression).
-    Uses signed contribution ~= coef_i * x_i (on scaled features).
-    """
-    try:
-        coefs = getattr(model, "coef_", None)
-        if coefs is None or len(coefs) == 0:
-            return None
-
-        coef_vec = np.array(coefs[0], dtype=float)
-        x = np.array(features_scaled[0], dtype=float)
-        n = min(len(coef_vec), len(x), len(feature_names))
-        if n <= 0:
-            return None
-
-        contrib = coef_vec[:n] * x[:n]
-        # Rank by absolute contribution
-        idx_sorted = np.argsort(np.abs(contrib))[::-1][:top_k]
-
-        explanations = []
-        for i in idx_sorted:
-            fname = str(feature_names[i])
-            val = features_dict.get(fname, 0)
-            try:
-                val_f = float(val) if val is not None else 0.0
-            except Exception:
-                val_f = 0.0
-            c = float(contrib[i])
-            explanations.append(
-                {
-                    "feature": fname,
-                    "value": val_f,
-                    "contribution": round(c, 4),
-                    "direction": "increases_risk" if c >= 0 else "decreases_risk",
-                }
-            )
-
-        return explanations
-    except Exception as e:
-        logger.warning(f"Could not build explanations: {e}")
-        return None
 
 def _engineer_features_v3(X_dict):
     """
     Apply v3 specific feature engineering (matching the notebook logic).
+    Reference for `v3_scorer.engineer_columns`.
     """
     eng = {}
     
@@ -175,6 +99,7 @@ def _get_clinical_rule_score(d):
     """
     Calculate clinical rule score (30% weight in v3 hybrid model).
     Based on key ASD markers specifically for age 2-3.5.
+    Reference for `v3_scorer.rule_score_columns`.
     """
     score = 0.0
     flags = []
@@ -226,35 +151,43 @@ def generate_v3_explanations(d, hybrid_score, lang="en"):
     lang_dict = EXPLANATION_TEXT.get(lang, EXPLANATION_TEXT["en"])
     return [lang_dict.get(k, k) for k in keys[:3]] # Return top 3 explanations
 
-def predict_asd_v3_hybrid(request: PredictionRequest) -> PredictionResponse:
-    """
-    v3 Hybrid Inference Engine for Age 2-3.5.
-    70% ML Probability + 30% Clinical Rules.
+def _v3_top_features(config: dict) -> list:
+    """Features the v3 models were trained on, in training order"""
+    return config.get("top_features", []) or DEFAULT_TOP_FEATURES
+
+def _v3_feature_matrix(features_list: list, config: dict) -> np.ndarray:
     """
-    # 1. Load v3 Ensemble
-    (bin_model, sev_model, scaler, le_gender, le_lang, config) = load_v3_models()
-    if bin_model is None:
-        raise FileNotFoundError("v3 Cognitive Flexibility models could not be loaded.")
-        
-    # 2. Feature Engineering
-    raw_features = request.features.copy()
-    # Support both "en"/"si" and full labels if encoded
-    eng_features = _engineer_features_v3(raw_features)
-    
-    # 3. Prepare for ML Model
-    top_features = config.get("top_features", [])
-    if not top_features:
-        # Fallback to common top features if config missing
-        top_features = ['total_q_score', 'social_comm_combined', 'social_attention_idx', 
-                        'imitation_comm_score', 'critical_items_fail_rate']
+    Engineer v3 features for one or more requests
     
-    # Construct vector in correct order
-    X_vec = np.array([eng_features.get(f, 0.0) for f in top_features]).reshape(1, -1)
-    X_scaled = scaler.transform(X_vec)
-    
-    # 4. ML Prediction
-    ml_prob_asd = float(bin_model.predict_proba(X_scaled)[0][1])
+    Args:
+        features_list: Raw feature dictionaries, one per request
+        config: v3 model config
+        
+    Returns:
+        Feature matrix (n_requests x n_top_features) in training order
+    """
+    top_features = _v3_top_features(config)
+    rows = []
+    for raw_features in features_list:
+        # Support both "en"/"si" and full labels if encoded
+        eng_features = _engineer_features_v3(raw_features)
+        rows.append([eng_features.get(f, 0.0) for f in top_features])
+    return np.array(rows, dtype=float).reshape(len(features_list), len(top_features))
+
+def _v3_response(raw_features: dict, ml_prob_asd: float, sev_probs: np.ndarray, config: dict) -> PredictionResponse:
+    """
+    Combine the v3 model outputs with the clinical rules into a response
+    (reference for `V3Scorer.score`)
     
+    Args:
+        raw_features: Request features
+        ml_prob_asd: Binary model ASD probability
+        sev_probs: Severity model class probabilities
+        config: v3 model config
+        
+    Returns:
+        PredictionResponse
+    """
     # 5. Clinical Rules Component
     rule_score, rule_flags = _get_clinical_rule_score(raw_features)
     
@@ -263,9 +196,6 @@ def predict_asd_v3_hybrid(request: PredictionRequest) -> PredictionResponse:
     RULE_WEIGHT = config.get("rule_weight", 0.3)
     hybrid_score = (ML_WEIGHT * ml_prob_asd) + (RULE_WEIGHT * rule_score)
     
-    # 7. Severity & Multi-class
-    sev_probs = sev_model.predict_proba(X_scaled)[0]
-    
     # Thresholding & Result Mapping
     if hybrid_score < 0.25:
         severity = "No ASD Risk (Typically Developing)"
@@ -299,63 +229,61 @@ def predict_asd_v3_hybrid(request: PredictionRequest) -> PredictionResponse:
         result_summary=f"Cognitive flexibility assessment: {severity}",
         severity=severity,
         hybrid_score=round(hybrid_score, 4),
-        explanations=explanations
+        explanation_texts=explanations
     )
 
-def validate_features(features_dict: dict, feature_names: list) -> None:
+def _load_v3_or_raise():
+    """Load the v3 ensemble, raising if it is unavailable"""
+    (bin_model, sev_model, scaler, le_gender, le_lang, config) = load_v3_models()
+    if bin_model is None:
+        raise FileNotFoundError("v3 Cognitive Flexibility models could not be loaded.")
+    return bin_model, sev_model, scaler, config or {}
+
+def predict_asd_v3_hybrid(request: PredictionRequest) -> PredictionResponse:
     """
-    Validate that required features are present
-    
-    Args:
-        features_dict: Dictionary of provided features
-        feature_names: List of expected feature names
-        
-    Raises:
-        ValueError: If critical features are missing
+    v3 Hybrid Inference Engine for Age 2-3.5.
+    70% ML Probability + 30% Clinical Rules.
     """
-    if feature_names is None:
-        return  # Cannot validate without feature names
+    # 1. Load v3 Ensemble
+    bin_model, sev_model, scaler, config = _load_v3_or_raise()
     
-    # Check for missing features (warn but don't fail - missing features default to 0)
-    missing = set(feature_names) - set(features_dict.keys())
-    if missing:
-        # Only warn about critical features (non-Z-score features)
-        critical_missing = [f for f in missing if not f.endswith('_zscore')]
-        if critical_missing:
-            logger.warning(f"Missing features (will use 0): {critical_missing[:5]}...")  # Log first 5
+    # 2-8. Feature engineering, models, rules, hybrid score and explanations
+    result = get_v3_scorer(bin_model, sev_model, scaler, config).score([request.features])[0]
+    if isinstance(result, Exception):
+        raise result
+    return result
 
-def predict_asd(request: PredictionRequest) -> PredictionResponse:
+def _warn_missing_features(plan: FeaturePlan, features_dict: dict) -> None:
     """
-    Predict ASD risk from ML features using age-specific models
+    Warn about missing critical features (they default to 0 rather than failing)
     
     Args:
-        request: PredictionRequest with age_months and features
-        
-    Returns:
-        PredictionResponse with risk score, level, and probabilities
+        plan: Compiled feature plan of the model
+        features_dict: Dictionary of provided features
     """
-    logger.info(f"Prediction requested: age={request.age_months}, child_id={request.child_id or 'N/A'}")
-    
-    # Extract age_months
+    critical_missing = plan.missing_features(features_dict)
+    if critical_missing:
+        logger.warning(f"Missing features (will use 0): {critical_missing[:5]}...")  # Log first 5
+
+def _resolve_age_months(request: PredictionRequest) -> int:
+    """Age in months from the request, falling back to the features and then 36"""
     age_months = request.age_months
     if age_months is None:
         age_months = request.features.get('age_months', 36)
     
     # Normalize age_months to int
     try:
-        age_months = int(float(age_months))
+        return int(float(age_months))
     except (ValueError, TypeError):
-        age_months = 36  # Default
-    
-    # Determine age group
-    age_group = get_age_group(age_months)
-    
-    # EXCLUSIVE ROUTING: Check if this is the v3 target group (2-3.5 years)
-    if age_group == "2-3.5":
-        logger.info("Routing to v3 Cognitive Flexibility Hybrid Engine")
-        return predict_asd_v3_hybrid(request)
+        return 36  # Default
 
-    # Try to load age-specific model (Legacy Age-banded)
+def _load_model_for_age(age_months: int, age_group: str):
+    """
+    Load the age-specific model for an age, falling back to the legacy model
+    
+    Returns:
+        Tuple of (model, scaler, compiled FeaturePlan)
+    """
     try:
         model, scaler, feature_names, metadata = load_age_specific_model(age_months)
         logger.info(f"Using age-specific model for age group: {age_group}")
@@ -372,31 +300,57 @@ def predict_asd(request: PredictionRequest) -> PredictionResponse:
                 f"Error: {str(e)}"
             )
     
-    # Validate features
-    validate_features(request.features, feature_names)
-    
-    # Prepare features (skip age normalization for age-specific models as they're already age-normalized)
-    features_dict = request.features.copy()
-    
-    # Get expected number of features from scaler
-    expected_n_features = scaler.n_features_in_
-    
-    # Prepare features in correct order
     if feature_names is None:
         raise ValueError(
             "feature_names.json not found. Cannot determine which features the model expects."
         )
     
-    features = prepare_features(features_dict, feature_names, expected_n_features)
-    logger.debug(f"Prepared {expected_n_features} features for prediction")
+    return model, scaler, get_feature_plan(model, feature_names, scaler.n_features_in_)
+
+def _scale_features(model, scaler, plan, features: np.ndarray) -> np.ndarray | None:
+    """
+    Scaled features, if the model or its explanations need them
     
-    # Scale features (using the same scaler from training)
-    features_scaled = scaler.transform(features)
+    Models with the scaler built in (ONNX backend) take raw features, so the
+    scaler only runs for explanations, through the fused affine form.
     
-    # Predict
-    prediction = model.predict(features_scaled)[0]
-    probabilities = model.predict_proba(features_scaled)[0]
+    Returns:
+        Scaled feature matrix, or None if nothing uses it
+    """
+    if not getattr(model, "takes_raw_features", False):
+        return scaler.transform(features)
+    if plan.coef is None:
+        return None
+    return model.scale(features)
+
+def _model_input(model, features: np.ndarray, features_scaled: np.ndarray | None) -> np.ndarray:
+    """Scaled features, or raw ones for models with the scaler built in (ONNX backend)"""
+    return features if getattr(model, "takes_raw_features", False) else features_scaled
+
+def _explain(plan, features_scaled: np.ndarray | None, features: np.ndarray, row: int):
+    """Top feature contributions of one row (None without coefficients)"""
+    if features_scaled is None:
+        return None
+    return plan.explain(features_scaled[row], features[row], top_k=6)
+
+def _risk_response(
+    prediction: int,
+    probabilities: np.ndarray,
+    explanations: list | None,
+    age_group: str,
+) -> PredictionResponse:
+    """
+    Map one row of model output to risk level and response
     
+    Args:
+        prediction: Predicted class
+        probabilities: [control_prob, asd_prob]
+        explanations: Top feature contributions (None for non-linear models)
+        age_group: Age group of the model used
+        
+    Returns:
+        PredictionResponse
+    """
     # Calculate risk score and level
     asd_probability = float(probabilities[1])  # Probability of ASD
     control_probability = float(probabilities[0])  # Probability of Control
@@ -416,14 +370,6 @@ def predict_asd(request: PredictionRequest) -> PredictionResponse:
         f"(score={risk_score:.1f}%, prob={asd_probability:.3f})"
     )
 
-    explanations = _build_explanations(
-        model=model,
-        feature_names=feature_names,
-        features_scaled=features_scaled,
-        features_dict=features_dict,
-        top_k=6,
-    )
-    
     return PredictionResponse(
         prediction=int(prediction),
         probability=[control_probability, asd_probability],
@@ -435,3 +381,126 @@ def predict_asd(request: PredictionRequest) -> PredictionResponse:
         explanations=explanations,
     )
 
+def predict_asd(request: PredictionRequest) -> PredictionResponse:
+    """
+    Predict ASD risk from ML features using age-specific models
+    
+    Args:
+        request: PredictionRequest with age_months and features
+        
+    Returns:
+        PredictionResponse with risk score, level, and probabilities
+    """
+    logger.info(f"Prediction requested: age={request.age_months}, child_id={request.child_id or 'N/A'}")
+    
+    # Extract age_months
+    age_months = _resolve_age_months(request)
+    
+    # Determine age group
+    age_group = get_age_group(age_months)
+    
+    # EXCLUSIVE ROUTING: Check if this is the v3 target group (2-3.5 years)
+    if age_group == "2-3.5":
+        logger.info("Routing to v3 Cognitive Flexibility Hybrid Engine")
+        return predict_asd_v3_hybrid(request)
+
+    # Try to load age-specific model (Legacy Age-banded)
+    model, scaler, plan = _load_model_for_age(age_months, age_group)
+    
+    # Validate features
+    _warn_missing_features(plan, request.features)
+    
+    # Prepare features in correct order (skip age normalization for age-specific
+    # models as they're already age-normalized)
+    features = plan.vector(request.features)
+    logger.debug(f"Prepared {plan.n_features} features for prediction")
+    
+    # Scale features (using the same scaler from training)
+    features_scaled = _scale_features(model, scaler, plan, features)
+    
+    # Predict (one model pass gives both label and probabilities)
+    predictions, probabilities = plan.predict(model, _model_input(model, features, features_scaled))
+    
+    explanations = _explain(plan, features_scaled, features, 0)
+    
+    return _risk_response(predictions[0], probabilities[0], explanations, age_group)
+
+def _predict_v3_group(requests: list) -> list:
+    """
+    Score a group of 2-3.5 requests with one v3 model call per model
+    
+    Returns:
+        List of PredictionResponse or Exception, one per request
+    """
+    bin_model, sev_model, scaler, config = _load_v3_or_raise()
+    scorer = get_v3_scorer(bin_model, sev_model, scaler, config)
+    return scorer.score([request.features for request in requests])
+
+def _predict_age_group(requests: list, age_months: int, age_group: str) -> list:
+    """
+    Score a group of requests routed to the same age-specific (or legacy) model
+    
+    Returns:
+        List of PredictionResponse or Exception, one per request
+    """
+    model, scaler, plan = _load_model_for_age(age_months, age_group)
+    
+    for request in requests:
+        _warn_missing_features(plan, request.features)
+    
+    # One feature matrix, one scaler and one model call for the whole group
+    features = plan.matrix([request.features for request in requests])
+    features_scaled = _scale_features(model, scaler, plan, features)
+    predictions, probabilities = plan.predict(model, _model_input(model, features, features_scaled))
+    
+    results = []
+    for row in range(len(requests)):
+        try:
+            explanations = _explain(plan, features_scaled, features, row)
+            results.append(_risk_response(predictions[row], probabilities[row], explanations, age_group))
+        except Exception as e:
+            results.append(e)
+    return results
+
+def predict_asd_batch(requests: list) -> list:
+    """
+    Predict ASD risk for many requests at once
+    
+    Requests are grouped by age group (the model they route to) and each
+    group is scaled and scored with a single transform / predict_proba call
+    instead of one 1xN call per request.
+    
+    Args:
+        requests: List of PredictionRequest
+        
+    Returns:
+        List with a PredictionResponse or the raised Exception for each
+        request, in input order
+    """
+    logger.info(f"Batch prediction requested: {len(requests)} items")
+    
+    # Group request indices by age group
+    groups = {}
+    for i, request in enumerate(requests):
+        age_months = _resolve_age_months(request)
+        age_group = get_age_group(age_months)
+        groups.setdefault(age_group, []).append((i, age_months))
+    
+    results = [None] * len(requests)
+    for age_group, members in groups.items():
+        indices = [i for i, _ in members]
+        group_requests = [requests[i] for i in indices]
+        try:
+            if age_group == "2-3.5":
+                group_results = _predict_v3_group(group_requests)
+            else:
+                # Routing only depends on the age group, so any member's age works
+                group_results = _predict_age_group(group_requests, members[0][1], age_group)
+        except Exception as e:
+            # Model unavailable: every item of the group fails the same way
+            group_results = [e] * len(indices)
+        
+        for i, result in zip(indices, group_results):
+            results[i] = result
+    
+    return results
\ No newline at end of file
@@ -8,13 +8,17 @@ based on age.
 Key Operations:
 1. Z-Score Normalization: Converts raw cognitive scores into age-relative standard 
    deviations using norms mapped in `age_norms.json`. This ensures an 18-month-old 
-   and a 5-year-old are judged on age-appropriate baselines.
+   and a 5-year-old are judged on age-appropriate baselines. The norms are compiled
+   once into an `AgeNormTable` with the 'overall' fallback already resolved: per-band
+   (feature, mean, std) lists that normalize feature dictionaries in plain Python
+   (single requests and batches), and mean / std arrays (age band x feature) that
+   normalize an already numeric matrix with one gather and vector arithmetic.
 2. Feature Sorting/Alignment (`prepare_features`): Scikit-learn requires 2D numpy 
    arrays where columns exactly match the features seen during `.fit()`. This function 
    safely extracts dictionary values (filling missing ones with zeros) into a 1xN NumPy array.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Sequence
 import numpy as np
 from app.core.config import AGE_BANDS, FEATURES_TO_NORMALIZE
 from app.core.logger import logger
@@ -34,6 +38,167 @@ def get_age_band(age_months: int) -> str:
             return band_name
     return "72+"  # Fallback for older children
 
+class AgeNormTable:
+    """Age norms compiled into per-band lookups and mean / std arrays (age band x feature)"""
+    
+    def __init__(self, age_norms: Dict[str, Any]):
+        """
+        Compile norms
+        
+        Every (band, feature) cell holds the statistics `calculate_zscore` would
+        pick: the band's own if its std is positive, else the 'overall' ones if
+        their std is positive, else none (value passes through; mean 0 / std 1
+        in the arrays).
+        
+        Args:
+            age_norms: Dictionary with control group norms by age band
+        """
+        self.source = age_norms
+        self.bands = list(AGE_BANDS) + ["72+"]
+        self.band_index = {band: i for i, band in enumerate(self.bands)}
+        # Whole-month ages up to the last band edge; other ages go through get_age_band
+        top = int(max(high for _, high in AGE_BANDS.values())) if AGE_BANDS else 0
+        self.age_band = {age: get_age_band(age) for age in range(top + 1)}
+        
+        features = list(FEATURES_TO_NORMALIZE)
+        for band_norms in age_norms.values():
+            if isinstance(band_norms, dict):
+                features.extend(f for f in band_norms if f not in features)
+        self.features = features
+        self.feature_index = {feature: j for j, feature in enumerate(features)}
+        
+        # Single requests: feature -> {band: (mean, std)}, and per band the
+        # (feature, output key, mean, std) of every feature to normalize
+        self.stats: Dict[str, Dict[str, tuple]] = {feature: {} for feature in features}
+        self.mean = np.zeros((len(self.bands), len(features)), dtype=float)
+        self.std = np.ones((len(self.bands), len(features)), dtype=float)
+        for i, band in enumerate(self.bands):
+            for j, feature in enumerate(features):
+                stats = self._resolve(age_norms, band, feature)
+                if stats is not None:
+                    self.stats[feature][band] = stats
+                    self.mean[i, j], self.std[i, j] = stats
+        self.band_plans = {
+            band: [
+                (feature, f'{feature}_zscore', *self.stats[feature].get(band, (0.0, 1.0)))
+                for feature in FEATURES_TO_NORMALIZE
+            ]
+            for band in self.bands
+        }
+        
+        # Gather index of the normalized features, in FEATURES_TO_NORMALIZE order
+        self.normalize_columns = np.array(
+            [self.feature_index[f] for f in FEATURES_TO_NORMALIZE], dtype=int
+        )
+    
+    @staticmethod
+    def _resolve(age_norms: Dict[str, Any], band: str, feature: str):
+        """(mean, std) used for a band and feature, or None for pass-through"""
+        for source in (band, 'overall'):
+            if isinstance(age_norms.get(source), dict) and feature in age_norms[source]:
+                stats = age_norms[source][feature]
+                mean_val = stats.get('mean', 0)
+                std_val = stats.get('std', 1)
+                if std_val > 0:
+                    return float(mean_val), float(std_val)
+        return None
+    
+    def band_of(self, age_months: int) -> str:
+        """Age band of one age (same as get_age_band)"""
+        return self.age_band.get(age_months) or get_age_band(age_months)
+    
+    def band_indices(self, ages: Sequence[int]) -> np.ndarray:
+        """
+        Row of each age (same bands as `get_age_band`)
+        
+        Args:
+            ages: Ages in months
+            
+        Returns:
+            Band row per age
+        """
+        ages = np.asarray(ages, dtype=float)
+        rows = np.full(ages.shape, self.band_index["72+"], dtype=int)
+        # Reverse order so the first matching band wins, like get_age_band
+        for band_name, (low, high) in reversed(list(AGE_BANDS.items())):
+            rows[(ages >= low) & (ages < high)] = self.band_index[band_name]
+        return rows
+    
+    def zscore(self, value: float, age_months: int, feature_name: str) -> float:
+        """Z-score of one value (the value itself if no norms apply)"""
+        stats = self.stats.get(feature_name)
+        if not stats:
+            return value
+        cell = stats.get(self.band_of(age_months))
+        if cell is None:
+            return value
+        return (value - cell[0]) / cell[1]
+    
+    def normalize(self, features_dict: Dict[str, Any], age_months: int):
+        """
+        Z-scores of FEATURES_TO_NORMALIZE for one request, without numpy
+        
+        Args:
+            features_dict: Raw feature values
+            age_months: Child's age in months
+            
+        Returns:
+            Tuple of (copy of features_dict with '<feature>_zscore' keys added,
+            number of Z-scores calculated)
+        """
+        row = features_dict.copy()
+        count = 0
+        for feature, key, mean_val, std_val in self.band_plans[self.band_of(age_months)]:
+            raw_value = features_dict.get(feature)
+            if raw_value is None:
+                continue
+            try:
+                value = float(raw_value)
+            except (ValueError, TypeError):
+                row[key] = 0.0
+                continue
+            row[key] = (value - mean_val) / std_val
+            count += 1
+        return row, count
+    
+    def zscores(self, values: np.ndarray, ages: Sequence[int]) -> np.ndarray:
+        """
+        Z-scores of FEATURES_TO_NORMALIZE for a numeric matrix
+        
+        Feature dictionaries go through `normalize` instead: gathering them into
+        an array and writing the results back costs more than the arithmetic.
+        
+        Args:
+            values: Raw values (n_requests x len(FEATURES_TO_NORMALIZE))
+            ages: Age in months per request
+            
+        Returns:
+            Z-score matrix of the same shape
+        """
+        rows = self.band_indices(ages)[:, None]
+        cols = self.normalize_columns[None, :]
+        return (values - self.mean[rows, cols]) / self.std[rows, cols]
+
+_compiled_norms: Optional[AgeNormTable] = None
+
+def get_age_norm_table(age_norms: Dict[str, Any]) -> AgeNormTable:
+    """
+    Get the compiled table for a norms dictionary, compiling it on first use
+    
+    Args:
+        age_norms: Dictionary with control group norms by age band
+        
+    Returns:
+        AgeNormTable
+    """
+    global _compiled_norms
+    table = _compiled_norms
+    if table is None or table.source is not age_norms:
+        # One slot: the loaded norms only change on a model reload
+        table = AgeNormTable(age_norms)
+        _compiled_norms = table
+    return table
+
 def calculate_zscore(
     value: float,
     age_months: int,
@@ -55,26 +220,8 @@ def calculate_zscore(
     if age_norms is None:
         return value  # No normalization available, return raw value
     
-    # Get age band
-    age_band = get_age_band(age_months)
-    
-    # Try to get stats for this age band
-    if age_band in age_norms and feature_name in age_norms[age_band]:
-        stats = age_norms[age_band][feature_name]
-        mean_val = stats.get('mean', 0)
-        std_val = stats.get('std', 1)
-        if std_val > 0:
-            return (value - mean_val) / std_val
-    
-    # Fallback to overall stats
-    if 'overall' in age_norms and feature_name in age_norms['overall']:
-        stats = age_norms['overall'][feature_name]
-        mean_val = stats.get('mean', 0)
-        std_val = stats.get('std', 1)
-        if std_val > 0:
-            return (value - mean_val) / std_val
-    
-    return value  # No normalization available
+    # Age band stats, falling back to overall stats, then to the raw value
+    return get_age_norm_table(age_norms).zscore(value, age_months, feature_name)
 
 def normalize_features(
     features_dict: Dict[str, Any],
@@ -94,31 +241,46 @@ def normalize_features(
     Returns:
         Dictionary with both raw and normalized (Z-score) features
     """
-    normalized = features_dict.copy()
-    
     if age_norms is None:
         # No age norms available, return features as-is
-        return normalized
+        return features_dict.copy()
     
-    # Calculate Z-scores for features that need normalization
-    normalized_count = 0
-    for feature in FEATURES_TO_NORMALIZE:
-        if feature in features_dict:
-            raw_value = features_dict[feature]
-            if raw_value is not None:
-                try:
-                    zscore = calculate_zscore(float(raw_value), age_months, feature, age_norms)
-                    normalized[f'{feature}_zscore'] = zscore
-                    normalized_count += 1
-                except (ValueError, TypeError):
-                    # Skip if value can't be converted to float
-                    normalized[f'{feature}_zscore'] = 0.0
+    normalized, normalized_count = get_age_norm_table(age_norms).normalize(features_dict, age_months)
     
     if normalized_count > 0:
         logger.debug(f"Age-normalized {normalized_count} features for age {age_months} months")
     
     return normalized
 
+def normalize_features_batch(
+    features_list: List[Dict[str, Any]],
+    ages_months: Sequence[int],
+    age_norms: Optional[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Normalize the features of many requests (see normalize_features)
+    
+    Args:
+        features_list: Raw feature dictionaries, one per request
+        ages_months: Child's age in months, one per request
+        age_norms: Age normalization norms (optional)
+        
+    Returns:
+        Dictionaries with both raw and normalized (Z-score) features
+    """
+    if age_norms is None:
+        return [features_dict.copy() for features_dict in features_list]
+    
+    table = get_age_norm_table(age_norms)
+    normalized = []
+    normalized_count = 0
+    for features_dict, age_months in zip(features_list, ages_months):
+        row, count = table.normalize(features_dict, age_months)
+        normalized.append(row)
+        normalized_count += count
+    logger.debug(f"Age-normalized {normalized_count} features over {len(features_list)} requests")
+    return normalized
+
 def prepare_features(
     features_dict: Dict[str, Any],
     feature_names: list,
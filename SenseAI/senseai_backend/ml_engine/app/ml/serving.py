@@ -0,0 +1,304 @@
+"""
+Inference serving: execution mode, admission control and latency histograms.
+
+Prediction endpoints hand their work to the `InferenceService` instead of running
+sklearn code directly in the request handler.
+
+Modes (ML_SERVING_MODE):
+- inline: run in FastAPI's threadpool, as before. Simple, but CPU-bound sklearn
+  code holds the GIL, so throughput tops out at about one core.
+- process: run in a pool of ML_WORKERS processes (default: CPU count). Each worker
+  loads the model registry once when it starts and keeps it warm (including hot
+  reload), so requests only pay for pickling the request and response.
+
+Both modes share:
+- Admission control: at most ML_MAX_PENDING requests are queued or running;
+  further requests are rejected straight away with `Overloaded` (HTTP 503 with
+  Retry-After) instead of piling up behind a saturated pool.
+- Per-stage latency histograms: `queue` (admitted -> started on a worker),
+  `inference` (work inside the worker), `overhead` (hand-off and result transfer)
+  and `total`, reported on /health.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+from app.core.logger import logger
+
+
+class ServingUnavailable(Exception):
+    """Raised when a request cannot be served right now (HTTP 503)"""
+
+
+class Overloaded(ServingUnavailable):
+    """Raised when max_pending requests are already queued or running"""
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)"""
+
+    BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        """Record one latency"""
+        ms = seconds * 1000
+        index = next((i for i, bound in enumerate(self.BUCKETS_MS) if ms <= bound), len(self.BUCKETS_MS))
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total_ms += ms
+            self.max_ms = max(self.max_ms, ms)
+
+    def _percentile(self, q: float) -> Optional[float]:
+        """Upper bucket bound below which q of the observations fall"""
+        if self.count == 0:
+            return None
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return float(self.BUCKETS_MS[i]) if i < len(self.BUCKETS_MS) else round(self.max_ms, 2)
+        return round(self.max_ms, 2)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable summary"""
+        with self._lock:
+            buckets = {f"<={bound}ms": n for bound, n in zip(self.BUCKETS_MS, self.counts)}
+            buckets[f">{self.BUCKETS_MS[-1]}ms"] = self.counts[-1]
+            return {
+                "count": self.count,
+                "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+                "max_ms": round(self.max_ms, 3),
+                "p50_ms": self._percentile(0.50),
+                "p95_ms": self._percentile(0.95),
+                "p99_ms": self._percentile(0.99),
+                "buckets": buckets
+            }
+
+
+def _worker_init():
+    """Process pool initializer: load every model group once per worker"""
+    from app.ml.model_registry import get_registry
+    registry = get_registry()
+    loaded = registry.load_all()
+    registry.start_watcher()
+    logger.info(f"Inference worker ready: {sum(loaded.values())}/{len(loaded)} model groups loaded")
+
+
+def _worker_call(fn: Callable, payload: Any):
+    """
+    Run one request and report when it started, how long it took and the model
+    registry generation it ran under (None if a hot swap happened during the call)
+    """
+    from app.ml.model_registry import get_registry
+    registry = get_registry()
+    generation = registry.generation()
+    started_at = time.time()
+    start = time.perf_counter()
+    result = fn(payload)
+    elapsed = time.perf_counter() - start
+    if registry.generation() != generation:
+        generation = None
+    return result, started_at, elapsed, generation
+
+
+def _worker_ping(delay: float) -> int:
+    """No-op task used to bring all pool workers up before traffic arrives"""
+    time.sleep(delay)
+    return multiprocessing.current_process().pid
+
+
+class InferenceService:
+    """Run prediction functions under admission control, inline or in a process pool"""
+
+    STAGES = ("queue", "inference", "overhead", "total")
+
+    def __init__(self, mode: str = "inline", workers: int = 1, max_pending: int = 64):
+        """
+        Initialize inference service
+
+        Args:
+            mode: 'inline' (threadpool) or 'process' (process pool)
+            workers: Process pool size ('process' mode)
+            max_pending: Requests queued or running before new ones get 503
+        """
+        if mode not in ("inline", "process"):
+            raise ValueError(f"Unknown serving mode '{mode}'. Choose from: inline, process")
+
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_generation = 0   # bumped whenever the pool is replaced
+        self._start_lock = asyncio.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.histograms = {stage: LatencyHistogram() for stage in self.STAGES}
+
+    def _create_pool(self) -> ProcessPoolExecutor:
+        # spawn: workers must not inherit the parent's threads (watcher, logging locks)
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_worker_init
+        )
+
+    def start(self):
+        """Start the worker processes and wait until each has loaded the models"""
+        if self.mode != "process" or self._pool is not None:
+            return
+
+        start = time.perf_counter()
+        self._pool = self._create_pool()
+        # Keep every worker busy for a moment so each one gets spawned and initialised
+        pids = set(self._pool.map(_worker_ping, [0.2] * self.workers))
+        logger.info(f"[OK] Inference pool started: {len(pids)} worker processes "
+                    f"in {time.perf_counter() - start:.1f}s (max pending {self.max_pending})")
+
+    async def _start_async(self):
+        """
+        Start the pool from a request if startup did not (or it was shut down)
+
+        Spawning workers and loading their models takes seconds, so it runs in
+        a thread; the lock makes concurrent first requests share one pool.
+        """
+        async with self._start_lock:
+            if self._pool is None:
+                await asyncio.to_thread(self.start)
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._pool_generation += 1
+
+    def _restart_pool(self, generation: int):
+        """
+        Replace a broken pool, unless it was already replaced
+
+        Every request in flight on a broken pool fails with BrokenProcessPool;
+        only the first one for that pool generation restarts it, so later ones
+        do not shut down the pool that replaced it.
+
+        Args:
+            generation: Pool generation the failed request was submitted to
+        """
+        if generation != self._pool_generation:
+            return
+        logger.error("Inference worker died, restarting pool")
+        self.shutdown()
+        self._pool = self._create_pool()
+
+    async def run(self, fn: Callable, payload: Any) -> Any:
+        """
+        Run fn(payload) in the configured mode (see run_versioned)
+
+        Returns:
+            fn's return value
+        """
+        result, _ = await self.run_versioned(fn, payload)
+        return result
+
+    async def run_versioned(self, fn: Callable, payload: Any) -> Tuple[Any, Optional[str]]:
+        """
+        Run fn(payload) in the configured mode
+
+        In process mode a worker's models can lag the parent's by up to one
+        watcher poll, so the generation the work actually ran under is returned
+        with the result (e.g. to decide whether it may be cached).
+
+        Args:
+            fn: Module-level prediction function (picklable by reference)
+            payload: Its argument (e.g. a PredictionRequest)
+
+        Returns:
+            Tuple of (fn's return value, registry generation it ran under, or
+            None if the models were swapped while it ran)
+
+        Raises:
+            Overloaded: If max_pending requests are already in flight
+            ServingUnavailable: If a worker process died
+            Exception: Whatever fn raised
+        """
+        # Only touched from the event loop thread, so no lock is needed
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise Overloaded(f"Too many pending predictions ({self.max_pending}); retry shortly")
+
+        self._pending += 1
+        submitted_at = time.time()
+        start = time.perf_counter()
+        try:
+            if self.mode == "process":
+                if self._pool is None:
+                    await self._start_async()
+                pool_generation = self._pool_generation
+                future = self._pool.submit(_worker_call, fn, payload)
+                result, started_at, inference, model_generation = await asyncio.wrap_future(future)
+            else:
+                from starlette.concurrency import run_in_threadpool
+                result, started_at, inference, model_generation = await run_in_threadpool(
+                    _worker_call, fn, payload
+                )
+        except BrokenProcessPool as e:
+            self.failed += 1
+            logger.warning(f"Inference request lost to a dead worker: {e}")
+            self._restart_pool(pool_generation)
+            raise ServingUnavailable("Inference worker crashed; retry shortly")
+        except Exception:
+            self.failed += 1
+            self.histograms["total"].observe(time.perf_counter() - start)
+            raise
+        finally:
+            self._pending -= 1
+
+        total = time.perf_counter() - start
+        queue = max(0.0, started_at - submitted_at)
+        self.histograms["queue"].observe(queue)
+        self.histograms["inference"].observe(inference)
+        self.histograms["overhead"].observe(max(0.0, total - queue - inference))
+        self.histograms["total"].observe(total)
+        self.completed += 1
+        return result, model_generation
+
+    def stats(self) -> Dict[str, Any]:
+        """Mode, load and latency histograms for /health"""
+        return {
+            "mode": self.mode,
+            "workers": self.workers if self.mode == "process" else None,
+            "pool_running": self._pool is not None,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "latency": {stage: hist.snapshot() for stage, hist in self.histograms.items()}
+        }
+
+
+_service: Optional[InferenceService] = None
+
+
+def get_inference_service() -> InferenceService:
+    """The process-wide inference service, configured from app.core.config"""
+    global _service
+    if _service is None:
+        from app.core.config import ML_SERVING_MODE, ML_WORKERS, ML_MAX_PENDING
+        _service = InferenceService(mode=ML_SERVING_MODE, workers=ML_WORKERS, max_pending=ML_MAX_PENDING)
+    return _service
@@ -0,0 +1,361 @@
+"""
+Compiled v3 hybrid scorer for age 2-3.5 predictions.
+
+The reference implementation in predictor.py (`_engineer_features_v3`,
+`_get_clinical_rule_score`, `generate_v3_explanations`) works on one feature
+dictionary at a time with dict arithmetic and branching Python. `V3Scorer` does
+the same maths as column expressions over all requests of a call:
+
+- Columns: every raw feature the engineering, rules and explanations read is
+  pulled out of the request dictionaries once, into one array per feature.
+- Feature engineering, clinical rule score, hybrid score and severity band are
+  NumPy expressions over those columns (same operation order, so the floats are
+  bit-identical to the reference).
+- Binary model, severity model and scaler run once per call for all requests.
+- Explanations are kept as concern flags and rendered only for the language a
+  request asks for, when its response is built.
+
+Parity with the reference is checked by scripts/check_v3_parity.py.
+"""
+
+import weakref
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+import numpy as np
+from app.schemas.response import PredictionResponse
+
+# --- Multi-lingual Explanation Dictionary ---
+EXPLANATION_TEXT = {
+    "en": {
+        "low_eye_contact": "Reduced eye contact was observed during the assessment.",
+        "poor_imitation": "Social imitation skills are below the expected developmental level.",
+        "difficulty_with_change": "Child showed difficulty adapting to changes in routine or tasks.",
+        "low_joint_attention": "Reduced joint attention (sharing focus with others) was observed.",
+        "low_name_response": "Reduced responsiveness to their name being called.",
+        "sensory_sensitivity": "Signs of sensory sensitivity or unusual reactions were noted.",
+        "peer_play_delay": "Social interaction and peer play skills are still developing.",
+        "low_risk_positive": "Good social interaction and rule switching skills were observed."
+    },
+    "si": {
+        "low_eye_contact": "පරීක්ෂණයේදී ඇස් සම්බන්ධතාවය (eye contact) අඩු බව නිරීක්ෂණය විය.",
+        "poor_imitation": "සමාජීය අනුකරණ හැකියාව බලාපොරොත්තු වන මට්ටමට වඩා අඩුය.",
+        "difficulty_with_change": "දෛනික රටාවේ හෝ කාර්යයන්හි වෙනස්වීම් වලට අනුගත වීමට දරුවා අපහසුවක් පෙන්වීය.",
+        "low_joint_attention": "අන් අය සමඟ අවධානය බෙදාගැනීමේ (joint attention) හැකියාව අඩු බව පෙනේ.",
+        "low_name_response": "නම කතා කළ විට දක්වන ප්‍රතිචාරය අඩු මට්ටමක පවතී.",
+        "sensory_sensitivity": "ඉන්ද්‍රිය සංවේදීතාවයේ හෝ අසාමාන්‍ය ප්‍රතික්‍රියාවල ලක්ෂණ දක්නට ලැබුණි.",
+        "peer_play_delay": "සමාජීය අන්තර්ක්‍රියා සහ සම වයසේ දරුවන් සමඟ සෙල්ලම් කිරීමේ හැකියාව තවමත් වර්ධනය වෙමින් පවතී.",
+        "low_risk_positive": "හොඳ සමාජීය අන්තර්ක්‍රියා සහ නීති වෙනස් කිරීමට අනුගත වීමේ හැකියාව නිරීක්ෂණය විය."
+    },
+    "ta": {
+        "low_eye_contact": "மதிப்பீட்டின் போது கண் தொடர்பு குறைவாக இருப்பது அவதானிக்கப்பட்டது.",
+        "poor_imitation": "சமூகப் பின்பற்றுதல் திறன்கள் எதிர்பார்க்கப்படும் வளர்ச்சி நிலைக்குக் குறைவாக உள்ளன.",
+        "difficulty_with_change": "வழக்கமான நடைமுறைகள் அல்லது பணிகளில் ஏற்படும் மாற்றங்களுக்குத் தலைகொடுப்பதில் குழந்தை சிரமத்தை வெளிப்படுத்தியது.",
+        "low_joint_attention": "மற்றவர்களுடன் கவனத்தைப் பகிர்ந்து கொள்ளும் திறன் குறைவாக இருப்பது அவதானிக்கப்பட்டது.",
+        "low_name_response": "பெயர் சொல்லி அழைக்கும்போது எதிர்வினை குறைவாக உள்ளது.",
+        "sensory_sensitivity": "புலன் உணர்வு உணர்திறன் அல்லது அசாதாரண எதிர்வினைகளின் அறிகுறிகள் காணப்பட்டன.",
+        "peer_play_delay": "சமூக தொடர்பு மற்றும் சக நண்பர்களுடன் விளையாடும் திறன்கள் இன்னும் வளர்ச்சியடைந்து வருகின்றன.",
+        "low_risk_positive": "நல்ல சமூக தொடர்பு மற்றும் விதிமுறை மாற்றங்களுக்கு ஏற்ப மாறும் திறன்கள் அவதானிக்கப்பட்டன."
+    }
+}
+
+# Fallback to common top features if config missing
+DEFAULT_TOP_FEATURES = ['total_q_score', 'social_comm_combined', 'social_attention_idx',
+                        'imitation_comm_score', 'critical_items_fail_rate']
+
+# Concern explanations in priority order: (text key, feature flagged when <= 2, default 5)
+CONCERNS = (
+    ("low_eye_contact", "q4_eye_contact"),
+    ("poor_imitation", "q7_imitation"),
+    ("difficulty_with_change", "q2_routine_change"),
+    ("low_joint_attention", "q9_joint_attention"),
+    ("sensory_sensitivity", "q6_sensory_reaction"),
+)
+
+# Hybrid score bands: upper bounds, then (severity, risk level, prediction) per band
+SEVERITY_BOUNDS = np.array([0.25, 0.45, 0.70])
+SEVERITY_BANDS = (
+    ("No ASD Risk (Typically Developing)", "low", 0),
+    ("Low ASD Risk", "low", 1),
+    ("Moderate ASD Risk", "moderate", 1),
+    ("High ASD Risk", "high", 1),
+)
+
+_MISSING = object()
+
+# Scorers by binary model; entries go away with the model (e.g. after a hot reload)
+_scorer_cache: "weakref.WeakKeyDictionary[Any, V3Scorer]" = weakref.WeakKeyDictionary()
+
+
+@lru_cache(maxsize=256)
+def render_explanations(lang: str, keys: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Explanation texts for the given keys in one language (English if unknown)"""
+    lang_dict = EXPLANATION_TEXT.get(lang, EXPLANATION_TEXT["en"])
+    return tuple(lang_dict.get(k, k) for k in keys)
+
+
+class _Columns:
+    """Per-feature columns pulled out of a list of request dictionaries"""
+
+    def __init__(self, features_list: List[Dict[str, Any]]):
+        self.rows = features_list
+        self.n = len(features_list)
+        self.errors: Dict[int, Exception] = {}
+        self._lenient: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._strict: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def _extract(self, name: str):
+        """Raw values of one feature plus presence mask"""
+        values = [row.get(name, _MISSING) for row in self.rows]
+        present = np.fromiter((v is not _MISSING for v in values), dtype=bool, count=self.n)
+        return values, present
+
+    def has(self, name: str) -> np.ndarray:
+        """Rows that provide the feature"""
+        if name in self._strict:
+            return self._strict[name][1]
+        if name in self._lenient:
+            return self._lenient[name][1]
+        return self._extract(name)[1]
+
+    def get(self, name: str, default: float = 0.0) -> np.ndarray:
+        """
+        Feature as converted by the engineering step: float(value), 0.0 if that
+        fails, `default` if missing
+        """
+        if name not in self._lenient:
+            values, present = self._extract(name)
+            column = np.empty(self.n, dtype=float)
+            for i, v in enumerate(values):
+                if v is _MISSING:
+                    column[i] = 0.0
+                    continue
+                try:
+                    column[i] = float(v)
+                except (ValueError, TypeError, OverflowError):
+                    column[i] = 0.0
+            self._lenient[name] = (column, present)
+
+        column, present = self._lenient[name]
+        return column if present.all() else np.where(present, column, default)
+
+    def raw(self, name: str, default: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Feature compared as given (rules / explanations): numbers only
+
+        Returns:
+            Tuple of (values with `default` where missing, mask of rows whose value
+            is present but not a number)
+        """
+        if name not in self._strict:
+            values, present = self._extract(name)
+            column = np.zeros(self.n, dtype=float)
+            invalid = np.zeros(self.n, dtype=bool)
+            for i, v in enumerate(values):
+                if v is _MISSING:
+                    continue
+                if isinstance(v, (int, float, np.number)):
+                    column[i] = float(v)
+                else:
+                    invalid[i] = True
+            self._strict[name] = (column, present, invalid)
+
+        column, present, invalid = self._strict[name]
+        return (column if present.all() else np.where(present, column, default)), invalid
+
+    def require_numeric(self, name: str, invalid: np.ndarray, rows: np.ndarray = None):
+        """Record a TypeError for rows whose value of `name` is not a number"""
+        mask = invalid if rows is None else invalid & rows
+        for i in np.flatnonzero(mask):
+            self.errors.setdefault(int(i), TypeError(
+                f"Feature '{name}' must be numeric, got {type(self.rows[i][name]).__name__}"
+            ))
+
+
+def engineer_columns(cols: _Columns) -> Dict[str, np.ndarray]:
+    """
+    v3 engineered features as columns (same formulas as `_engineer_features_v3`)
+
+    Args:
+        cols: Request columns
+
+    Returns:
+        Dictionary of engineered feature name -> column
+    """
+    g = cols.get
+    eng = {}
+
+    eng['social_attention_idx'] = (g('q9_joint_attention') + g('q4_eye_contact') + g('q1_name_response')) / 3
+    eng['imitation_comm_score'] = (g('q7_imitation') + g('q10_communication') + g('q5_pointing')) / 3
+    eng['rigidity_index'] = (g('q2_routine_change') + g('q3_toy_switching')) / 2
+    eng['behavioral_regulation'] = (
+        g('attention_level') + g('engagement_level') +
+        g('frustration_tolerance') + g('instruction_following')
+    ) / 4
+
+    q_sum = np.zeros(cols.n, dtype=float)
+    for i in range(1, 11):
+        q_sum = q_sum + g(f'q{i}')
+    # Fallback to provided total if available (used as given, so it must be a number)
+    total, invalid = cols.raw('total_q_score', 0.0)
+    cols.require_numeric('total_q_score', invalid)
+    eng['total_q_score'] = np.where(cols.has('total_q_score'), total, q_sum)
+
+    eng['failed_x_sensory'] = g('failed_items_rate') * g('q6_sensory_reaction')
+
+    efficiency_denominator = g('completion_time_sec', 300) / 60 + 1
+    age_denominator = g('age_months', 24) + 1
+    for i in np.flatnonzero((efficiency_denominator == 0) | (age_denominator == 0)):
+        cols.errors.setdefault(int(i), ZeroDivisionError("float division by zero"))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        eng['processing_efficiency'] = eng['total_q_score'] / efficiency_denominator
+        eng['critical_fail_per_age'] = g('critical_items_failed') / age_denominator
+
+    eng['social_comm_combined'] = (
+        g('q1_name_response') + g('q4_eye_contact') +
+        g('q7_imitation') + g('q10_communication')
+    ) / 4
+
+    return eng
+
+
+def rule_score_columns(cols: _Columns) -> np.ndarray:
+    """
+    Clinical rule score per request (same rules as `_get_clinical_rule_score`)
+
+    Args:
+        cols: Request columns
+
+    Returns:
+        Rule scores in [0, 1]
+    """
+    rules = {}
+    for name, default in (('q7_imitation', 5), ('q1_name_response', 5), ('joint_attention_score', 100),
+                          ('q9_joint_attention', 5), ('critical_items_failed', 0)):
+        rules[name], invalid = cols.raw(name, default)
+        cols.require_numeric(name, invalid)
+
+    score = np.zeros(cols.n, dtype=float)
+    score = score + 0.25 * (rules['q7_imitation'] <= 2)          # Social imitation
+    score = score + 0.25 * (rules['q1_name_response'] <= 2)      # Name response
+    score = score + 0.25 * ((rules['joint_attention_score'] < 40) | (rules['q9_joint_attention'] <= 2))
+    score = score + 0.25 * (rules['critical_items_failed'] >= 3)  # Critical items failure
+    return np.minimum(score, 1.0)
+
+
+class V3Scorer:
+    """v3 hybrid ensemble (binary + severity model, scaler, config) compiled for batched scoring"""
+
+    def __init__(self, bin_model: Any, sev_model: Any, scaler: Any, config: dict):
+        """
+        Compile a scorer
+
+        Args:
+            bin_model: Binary ASD classifier
+            sev_model: Severity classifier
+            scaler: Scaler fitted on the top features
+            config: v3 model config
+        """
+        self.bin_model = bin_model
+        self.sev_model = sev_model
+        self.scaler = scaler
+        self.top_features = list(config.get("top_features", []) or DEFAULT_TOP_FEATURES)
+        self.ml_weight = config.get("ml_weight", 0.7)
+        self.rule_weight = config.get("rule_weight", 0.3)
+
+    def feature_matrix(self, cols: _Columns) -> np.ndarray:
+        """
+        Model input for all requests (same as `_v3_feature_matrix`)
+
+        Args:
+            cols: Request columns
+
+        Returns:
+            Feature matrix (n_requests x n_top_features) in training order
+        """
+        eng = engineer_columns(cols)
+        X = np.empty((cols.n, len(self.top_features)), dtype=float)
+        for j, name in enumerate(self.top_features):
+            X[:, j] = eng[name] if name in eng else cols.get(name, 0.0)
+        return X
+
+    def score(self, features_list: List[Dict[str, Any]]) -> list:
+        """
+        Score requests with the v3 hybrid model
+
+        Args:
+            features_list: Raw feature dictionaries, one per request
+
+        Returns:
+            List of PredictionResponse or Exception, one per request
+        """
+        cols = _Columns(features_list)
+        X = self.feature_matrix(cols)
+        rule_scores = rule_score_columns(cols)
+
+        # The models reject non-finite input; fail those rows only and score the rest
+        for i in np.flatnonzero(~np.isfinite(X).all(axis=1)):
+            cols.errors.setdefault(int(i), ValueError("Input contains infinity or NaN"))
+        X_scaled = self.scaler.transform(np.nan_to_num(X, nan=0.0, posinf=0.0, neginf=0.0))
+        ml_probs = self.bin_model.predict_proba(X_scaled)[:, 1]
+        confidences = self.sev_model.predict_proba(X_scaled).max(axis=1)
+
+        hybrid = (self.ml_weight * ml_probs) + (self.rule_weight * rule_scores)
+        bands = np.searchsorted(SEVERITY_BOUNDS, hybrid, side='right')
+
+        # Explanations: positive note for low scores, otherwise up to 3 concerns
+        concern_rows = ~(hybrid < 0.3)
+        concerns = np.zeros((cols.n, len(CONCERNS)), dtype=bool)
+        for j, (_, name) in enumerate(CONCERNS):
+            values, invalid = cols.raw(name, 5)
+            cols.require_numeric(name, invalid, rows=concern_rows)
+            concerns[:, j] = concern_rows & (values <= 2)
+
+        results = []
+        for i, raw_features in enumerate(features_list):
+            if i in cols.errors:
+                results.append(cols.errors[i])
+                continue
+
+            if concern_rows[i]:
+                keys = tuple(CONCERNS[j][0] for j in np.flatnonzero(concerns[i])[:3])
+            else:
+                keys = ("low_risk_positive",)
+            explanations = list(render_explanations(raw_features.get('language', 'en'), keys))
+
+            hybrid_score = float(hybrid[i])
+            severity, risk_level, prediction = SEVERITY_BANDS[bands[i]]
+            ml_prob_asd = float(ml_probs[i])
+            results.append(PredictionResponse(
+                prediction=prediction,
+                probability=[1 - hybrid_score, hybrid_score],
+                confidence=float(confidences[i]),
+                risk_level=risk_level,
+                risk_score=round(hybrid_score * 100, 1),
+                asd_probability=round(ml_prob_asd, 3),
+                model_age_group="2-3.5 (v3 Hybrid)",
+                result_summary=f"Cognitive flexibility assessment: {severity}",
+                severity=severity,
+                hybrid_score=round(hybrid_score, 4),
+                explanation_texts=explanations
+            ))
+        return results
+
+
+def get_v3_scorer(bin_model: Any, sev_model: Any, scaler: Any, config: dict) -> V3Scorer:
+    """
+    Get the compiled scorer for a v3 ensemble, compiling it on first use
+
+    Args:
+        bin_model: Binary ASD classifier
+        sev_model: Severity classifier
+        scaler: Scaler fitted on the top features
+        config: v3 model config
+
+    Returns:
+        V3Scorer
+    """
+    scorer = _scorer_cache.get(bin_model)
+    if scorer is None or scorer.sev_model is not sev_model or scorer.scaler is not scaler:
+        scorer = V3Scorer(bin_model, sev_model, scaler, config)
+        _scorer_cache[bin_model] = scorer
+    return scorer
@@ -3,7 +3,8 @@ Request schemas for API endpoints
 """
 
 from pydantic import BaseModel, Field
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+from app.core.config import MAX_BATCH_SIZE
 
 class PredictionRequest(BaseModel):
     """Request schema for ASD prediction"""
@@ -52,3 +53,13 @@ class PredictionRequest(BaseModel):
             }
         }
 
+
+class BatchPredictionRequest(BaseModel):
+    """Request schema for batch ASD prediction"""
+    
+    items: List[PredictionRequest] = Field(
+        ...,
+        description="Prediction requests, scored together and returned in the same order",
+        min_length=1,
+        max_length=MAX_BATCH_SIZE
+    )
@@ -77,15 +77,14 @@ class PredictionResponse(BaseModel):
         description="The combined score (ML + Clinical Rules)"
     )
 
-    explanations: Optional[List[str]] = Field(
+    explanations: Optional[List[ExplanationItem]] = Field(
         default=None,
-        description="List of localized explanations (XAI)"
+        description="Optional simple explanation of top factors affecting the prediction (linear age-group models)"
     )
 
-    explanations_legacy: Optional[List[ExplanationItem]] = Field(
+    explanation_texts: Optional[List[str]] = Field(
         default=None,
-        alias="explanations",
-        description="Optional simple explanation of top factors affecting the prediction (Legacy SHAP-based)"
+        description="List of localized explanations (XAI) of the v3 hybrid model"
     )
     
     class Config:
@@ -101,3 +100,20 @@ class PredictionResponse(BaseModel):
         }
 
 
+class BatchItemResult(BaseModel):
+    """Outcome of one item of a batch prediction"""
+
+    index: int = Field(..., description="Position of the item in the request")
+    child_id: Optional[str] = Field(default=None, description="Child ID from the item, if given")
+    status_code: int = Field(..., description="HTTP status the item would have had on /predict")
+    result: Optional[PredictionResponse] = Field(default=None, description="Prediction, if successful")
+    error: Optional[str] = Field(default=None, description="Error message, if the item failed")
+
+
+class BatchPredictionResponse(BaseModel):
+    """Response schema for batch ASD prediction"""
+
+    total: int = Field(..., description="Number of items in the request")
+    succeeded: int = Field(..., description="Items with a prediction")
+    failed: int = Field(..., description="Items with an error")
+    results: List[BatchItemResult] = Field(..., description="Per-item results in request order")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: compiled age-norm table vs nested dict lookups
+Times Z-score normalization of single requests, of a batch of feature dictionaries
+and of a numeric matrix (AgeNormTable.zscores) on synthetic norms (some band /
+feature cells missing or with std 0, so the 'overall' fallback and pass-through
+paths are exercised) and checks all give identical Z-scores.
+
+Usage:
+  python scripts/benchmark_age_norms.py --requests 10000
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.ml.preprocessing import (
+    get_age_band, calculate_zscore, normalize_features, normalize_features_batch, get_age_norm_table
+)
+from app.core.config import AGE_BANDS, FEATURES_TO_NORMALIZE
+
+
+def dict_zscore(value, age_months, feature_name, age_norms):
+    """Nested dict lookup per call (the implementation the table replaces)"""
+    age_band = get_age_band(age_months)
+    for source in (age_band, 'overall'):
+        if source in age_norms and feature_name in age_norms[source]:
+            stats = age_norms[source][feature_name]
+            mean_val = stats.get('mean', 0)
+            std_val = stats.get('std', 1)
+            if std_val > 0:
+                return (value - mean_val) / std_val
+    return value
+
+
+def dict_normalize(features_dict, age_months, age_norms):
+    """Per-feature Python loop over dict_zscore"""
+    normalized = features_dict.copy()
+    for feature in FEATURES_TO_NORMALIZE:
+        raw_value = features_dict.get(feature)
+        if raw_value is not None:
+            try:
+                normalized[f'{feature}_zscore'] = dict_zscore(float(raw_value), age_months, feature, age_norms)
+            except (ValueError, TypeError):
+                normalized[f'{feature}_zscore'] = 0.0
+    return normalized
+
+
+def make_norms(rng):
+    """Synthetic norms with gaps: missing cells, std 0 cells, an 'overall' band"""
+    norms = {}
+    for band in list(AGE_BANDS) + ['overall']:
+        norms[band] = {}
+        for feature in FEATURES_TO_NORMALIZE:
+            roll = rng.random()
+            if roll < 0.15 and band != 'overall':
+                continue  # Missing: falls back to overall
+            std = 0.0 if roll < 0.2 else float(rng.uniform(1, 50))
+            norms[band][feature] = {'mean': float(rng.uniform(0, 500)), 'std': std}
+    return norms
+
+
+def make_requests(rng, n):
+    """Synthetic requests over ages 18-84 months (includes the 72+ fallback band)"""
+    requests = []
+    for _ in range(n):
+        features = {f: float(rng.uniform(0, 600)) for f in FEATURES_TO_NORMALIZE if rng.random() < 0.9}
+        if rng.random() < 0.05:
+            features[FEATURES_TO_NORMALIZE[0]] = 'n/a'
+        requests.append((features, int(rng.integers(18, 85))))
+    return requests
+
+
+def timed(fn, repeats):
+    """Best wall time of fn() over repeats"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compiled age-norm Z-scores against dict lookups")
+    parser.add_argument('--requests', type=int, default=10000, help='Requests per run')
+    parser.add_argument('--repeats', type=int, default=5, help='Timed repetitions (best is reported)')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    norms = make_norms(rng)
+    requests = make_requests(rng, args.requests)
+    features_list = [f for f, _ in requests]
+    ages = [a for _, a in requests]
+
+    # Identical results first
+    reference = [dict_normalize(f, a, norms) for f, a in requests]
+    single = [normalize_features(f, a, norms) for f, a in requests]
+    batch = normalize_features_batch(features_list, ages, norms)
+    mismatches = sum(1 for r, s, b in zip(reference, single, batch) if not (r == s == b))
+
+    feature = FEATURES_TO_NORMALIZE[1]
+    zscore_calls = [(float(rng.uniform(0, 600)), a) for a in ages]
+    zscore_mismatches = sum(
+        1 for v, a in zscore_calls
+        if dict_zscore(v, a, feature, norms) != calculate_zscore(v, a, feature, norms)
+    )
+
+    # Numeric matrix: every value present (missing ones filled with 0)
+    matrix = np.array([[float(rng.uniform(0, 600)) for _ in FEATURES_TO_NORMALIZE] for _ in ages])
+    table = get_age_norm_table(norms)
+    matrix_reference = np.array([
+        [dict_zscore(v, a, f, norms) for v, f in zip(row, FEATURES_TO_NORMALIZE)]
+        for row, a in zip(matrix, ages)
+    ])
+    matrix_mismatches = int(np.count_nonzero(table.zscores(matrix, ages) != matrix_reference))
+
+    n = args.requests
+    t_dict_zscore = timed(lambda: [dict_zscore(v, a, feature, norms) for v, a in zscore_calls], args.repeats)
+    t_table_zscore = timed(lambda: [calculate_zscore(v, a, feature, norms) for v, a in zscore_calls], args.repeats)
+    t_dict_single = timed(lambda: [dict_normalize(f, a, norms) for f, a in requests], args.repeats)
+    t_table_single = timed(lambda: [normalize_features(f, a, norms) for f, a in requests], args.repeats)
+    t_table_batch = timed(lambda: normalize_features_batch(features_list, ages, norms), args.repeats)
+    t_dict_matrix = timed(lambda: [
+        [dict_zscore(v, a, f, norms) for v, f in zip(row, FEATURES_TO_NORMALIZE)]
+        for row, a in zip(matrix.tolist(), ages)
+    ], args.repeats)
+    t_table_matrix = timed(lambda: table.zscores(matrix, ages), args.repeats)
+
+    print(f"📊 {n} requests x {len(FEATURES_TO_NORMALIZE)} features (best of {args.repeats})")
+    print(f"   calculate_zscore      dict: {t_dict_zscore / n * 1e6:7.2f} µs/call   "
+          f"table: {t_table_zscore / n * 1e6:7.2f} µs/call")
+    print(f"   normalize_features    dict: {t_dict_single / n * 1e6:7.2f} µs/req    "
+          f"table: {t_table_single / n * 1e6:7.2f} µs/req")
+    print(f"   normalize_features_batch    table: {t_table_batch / n * 1e6:7.2f} µs/req "
+          f"({t_dict_single / t_table_batch:.1f}x vs dict loop)")
+    print(f"   AgeNormTable.zscores  dict: {t_dict_matrix / n * 1e6:7.2f} µs/row    "
+          f"table: {t_table_matrix / n * 1e6:7.2f} µs/row")
+    print(f"   Mismatches: {mismatches} requests, {zscore_mismatches + matrix_mismatches} Z-scores")
+
+    if mismatches or zscore_mismatches or matrix_mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark batch vs single-item prediction
+Runs in-process (no server needed) on synthetic requests spread over the age groups.
+Only requests that succeed are timed; any failing request is reported and makes the
+script exit non-zero, so a run that only exercises the error path is never reported
+as a speed-up.
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.ml.predictor import predict_asd, predict_asd_batch
+from app.ml.age_specific_loader import load_age_specific_model
+from app.core.config import FEATURES_TO_NORMALIZE
+from app.schemas.request import PredictionRequest
+
+# One age per model route: v3 hybrid, frog jump, color-shape
+AGES = [30, 48, 72]
+
+V3_FEATURES = [
+    'q1_name_response', 'q2_routine_change', 'q3_toy_switching', 'q4_eye_contact',
+    'q5_pointing', 'q6_sensory_reaction', 'q7_imitation', 'q9_joint_attention',
+    'q10_communication', 'critical_items_failed', 'failed_items_rate', 'completion_time_sec'
+]
+
+
+def feature_names_for(age_months):
+    """Feature names the model for this age expects"""
+    if age_months < 42:
+        return V3_FEATURES
+    try:
+        _, _, feature_names, _ = load_age_specific_model(age_months)
+        return feature_names or FEATURES_TO_NORMALIZE
+    except (FileNotFoundError, ValueError):
+        return FEATURES_TO_NORMALIZE
+
+
+def make_requests(n, seed=42):
+    """Synthetic requests cycling through the age groups"""
+    rng = np.random.default_rng(seed)
+    names = {age: feature_names_for(age) for age in AGES}
+
+    requests = []
+    for i in range(n):
+        age = AGES[i % len(AGES)]
+        features = {name: float(rng.uniform(0, 5)) for name in names[age]}
+        features['age_months'] = age
+        requests.append(PredictionRequest(child_id=f"bench-{i}", age_months=age, features=features))
+    return requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /predict/batch against per-item /predict")
+    parser.add_argument('--items', type=int, default=1000, help='Requests per run')
+    parser.add_argument('--repeats', type=int, default=3, help='Timed repetitions')
+    args = parser.parse_args()
+
+    requests = make_requests(args.items)
+
+    # Warm-up pass (model loading is not timed) that also finds the failing requests
+    outcomes = predict_asd_batch(requests)
+    failures = [(request, outcome) for request, outcome in zip(requests, outcomes)
+                if isinstance(outcome, Exception)]
+    requests = [request for request, outcome in zip(requests, outcomes)
+                if not isinstance(outcome, Exception)]
+
+    if failures:
+        print(f"❌ {len(failures)} of {args.items} requests failed:")
+        messages = {}
+        for request, error in failures:
+            messages.setdefault(f"age {request.age_months}: {type(error).__name__}: {error}", 0)
+            messages[f"age {request.age_months}: {type(error).__name__}: {error}"] += 1
+        for message, count in list(messages.items())[:5]:
+            print(f"   {count}x {message.splitlines()[0][:200]}")
+    if not requests:
+        print("❌ No request succeeded; nothing to time")
+        sys.exit(1)
+
+    single_times, batch_times = [], []
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        single = []
+        for request in requests:
+            try:
+                single.append(predict_asd(request))
+            except Exception as e:
+                single.append(e)
+        single_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        batch = predict_asd_batch(requests)
+        batch_times.append(time.perf_counter() - start)
+
+    # Both paths must agree item by item
+    mismatches = 0
+    for a, b in zip(single, batch):
+        if isinstance(a, Exception) or isinstance(b, Exception):
+            mismatches += type(a) is not type(b)
+        elif abs(a.risk_score - b.risk_score) > 1e-6 or a.prediction != b.prediction:
+            mismatches += 1
+
+    single_time = float(np.mean(single_times))
+    batch_time = float(np.mean(batch_times))
+    n = len(requests)
+    ages = sorted({request.age_months for request in requests})
+
+    print(f"📊 {n} successful requests over ages {ages} (of {args.items})")
+    print(f"   Single-item: {single_time:.3f}s ({n / single_time:.0f} req/s)")
+    print(f"   Batch:       {batch_time:.3f}s ({n / batch_time:.0f} req/s)")
+    print(f"   Speed-up:    {single_time / batch_time:.1f}x")
+    print(f"   Mismatches:  {mismatches}")
+
+    if failures or mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pickled sklearn models vs fused ONNX Runtime graphs (age-banded models)
+For each age group reports numerical parity, per-request and batch latency, and the
+memory footprint of each backend (measured in a fresh subprocess per backend, so
+library imports and model loading are counted separately). The ONNX backend also
+unpickles each model once to check parity, so its footprint includes scikit-learn.
+
+Usage:
+  python scripts/benchmark_onnx_backend.py --requests 2000 --batch 1000
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.ml.age_specific_loader import read_age_specific_model
+from app.ml.onnx_backend import ONNX_ASSETS, read_onnx_age_model, parity_probes, parity_report
+
+
+def rss_mb():
+    """Resident set size of this process in MB"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def memory_probe(backend, batch):
+    """Subprocess body: load every group with one backend and run one batch"""
+    baseline = rss_mb()
+    reader = read_onnx_age_model if backend == 'onnx' else read_age_specific_model
+    loaded = {}
+    for age_group in ONNX_ASSETS:
+        try:
+            loaded[age_group] = reader(age_group)
+        except Exception as e:
+            print(f"{age_group}: {e}", file=sys.stderr)
+    after_load = rss_mb()
+
+    for model, scaler, _, _ in loaded.values():
+        X = parity_probes(scaler, scaler.n_features_in_, n=batch)
+        if backend == 'onnx':
+            model.predict_proba(X)
+        else:
+            model.predict_proba(scaler.transform(X))
+    print(json.dumps({
+        "groups": len(loaded),
+        "load_mb": after_load - baseline,
+        "total_mb": rss_mb() - baseline
+    }))
+
+
+def measure_memory(backend, batch):
+    """Run memory_probe in a fresh interpreter"""
+    proc = subprocess.run(
+        [sys.executable, __file__, '--memory-probe', backend, '--batch', str(batch)],
+        capture_output=True, text=True, cwd=str(Path(__file__).resolve().parent.parent)
+    )
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def latency(fn, inputs):
+    """Per-call latencies in ms"""
+    times = []
+    for x in inputs:
+        start = time.perf_counter()
+        fn(x)
+        times.append((time.perf_counter() - start) * 1000)
+    return np.array(times)
+
+
+def benchmark_group(age_group, n_requests, batch, repeats):
+    """Parity and latency of one age group"""
+    model, scaler, _, _ = read_age_specific_model(age_group)
+    onnx_model, _, _, _ = read_onnx_age_model(age_group)
+    n_features = scaler.n_features_in_
+
+    X = parity_probes(scaler, n_features, n=max(n_requests, batch), seed=1)
+    report = parity_report(onnx_model, model, scaler, X)
+
+    rows = [X[i:i + 1] for i in range(n_requests)]
+    sk_single = latency(lambda x: model.predict_proba(scaler.transform(x)), rows)
+    ox_single = latency(onnx_model.predict_proba, rows)
+
+    batches = [X[:batch]] * repeats
+    sk_batch = latency(lambda x: model.predict_proba(scaler.transform(x)), batches)
+    ox_batch = latency(onnx_model.predict_proba, batches)
+
+    print(f"\n{age_group} ({n_features} features, graph {onnx_model.graph_size} bytes)")
+    print("-" * 64)
+    print(f"  Parity: max |Δp| = {report['max_abs_diff']:.2e}, "
+          f"label agreement {report['label_agreement']:.2%} over {len(X)} inputs")
+    print(f"  {'':18}{'sklearn':>14}{'onnxruntime':>16}")
+    print(f"  {'single p50 (ms)':18}{np.percentile(sk_single, 50):14.4f}{np.percentile(ox_single, 50):16.4f}")
+    print(f"  {'single p95 (ms)':18}{np.percentile(sk_single, 95):14.4f}{np.percentile(ox_single, 95):16.4f}")
+    print(f"  {f'batch {batch} (ms)':18}{np.median(sk_batch):14.3f}{np.median(ox_batch):16.3f}")
+    return report['max_abs_diff']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the pickled and ONNX Runtime backends")
+    parser.add_argument('--requests', type=int, default=2000, help='Single-row calls per backend')
+    parser.add_argument('--batch', type=int, default=1000, help='Rows per batch call')
+    parser.add_argument('--repeats', type=int, default=20, help='Batch calls per backend')
+    parser.add_argument('--memory-probe', choices=['sklearn', 'onnx'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.memory_probe:
+        memory_probe(args.memory_probe, args.batch)
+        return
+
+    print(f"📊 sklearn vs ONNX Runtime (pid {os.getpid()})")
+    differences = {}
+    skipped = []
+    for age_group in ONNX_ASSETS:
+        try:
+            differences[age_group] = benchmark_group(age_group, args.requests, args.batch, args.repeats)
+        except Exception as e:
+            print(f"\n{age_group}: skipped ({e})")
+            skipped.append(age_group)
+
+    print("\nMemory (RSS growth in a fresh process: load / load + one batch per group)")
+    for backend in ('sklearn', 'onnx'):
+        result = measure_memory(backend, args.batch)
+        if "error" in result:
+            print(f"  {backend:12} error: {result['error']}")
+        else:
+            print(f"  {backend:12} {result['load_mb']:7.1f} MB / {result['total_mb']:7.1f} MB "
+                  f"({result['groups']} groups)")
+
+    if skipped or not differences:
+        print(f"\n❌ {len(differences)}/{len(ONNX_ASSETS)} groups benchmarked"
+              + (f"; skipped: {', '.join(skipped)}" if skipped else ""))
+        sys.exit(1)
+    print(f"\n✅ Worst probability difference: {max(differences.values()):.2e} "
+          f"({len(differences)} groups)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Check: the shipped ONNX exports are served, not silently replaced by sklearn
+Runs with ML_INFERENCE_BACKEND=onnx, loads every age-banded group the way requests
+do (load_age_specific_model) and requires the fused ONNX model for each, then
+compares it with the pickled scaler + model on probe inputs.
+
+Fails if any group falls back to the pickled model (missing / mismatched export,
+onnx or onnxruntime not installed) or exceeds PARITY_TOLERANCE.
+
+Usage:
+  python scripts/check_onnx_backend.py --probes 2000
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+os.environ["ML_INFERENCE_BACKEND"] = "onnx"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.config import AGE_GROUPS
+from app.ml.age_specific_loader import load_age_specific_model, read_age_specific_model
+from app.ml.onnx_backend import (
+    ONNX_ASSETS, PARITY_TOLERANCE, OnnxLinearModel, parity_probes, parity_report
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that the ONNX backend serves the shipped exports")
+    parser.add_argument('--probes', type=int, default=2000, help='Probe inputs per group')
+    args = parser.parse_args()
+
+    failures = []
+    print(f"📊 ONNX backend: {len(ONNX_ASSETS)} shipped exports")
+    for age_group, path in ONNX_ASSETS.items():
+        low, high = AGE_GROUPS[age_group]
+        model, scaler, _, _ = load_age_specific_model(int((low + high) / 2))
+        if not isinstance(model, OnnxLinearModel):
+            print(f"   {age_group}: fell back to {type(model).__name__} ({path.name})")
+            failures.append(age_group)
+            continue
+
+        reference, _, _, _ = read_age_specific_model(age_group)
+        report = parity_report(model, reference, scaler,
+                               parity_probes(scaler, scaler.n_features_in_, n=args.probes, seed=1))
+        ok = report["max_abs_diff"] <= PARITY_TOLERANCE
+        print(f"   {age_group}: {path.name} served, max |Δp| = {report['max_abs_diff']:.2e}, "
+              f"label agreement {report['label_agreement']:.2%}")
+        if not ok:
+            failures.append(age_group)
+
+    if failures:
+        print(f"❌ ONNX backend not served for: {', '.join(failures)}")
+        sys.exit(1)
+    print("✅ Every shipped ONNX export is served")
+
+
+if __name__ == "__main__":
+    main()
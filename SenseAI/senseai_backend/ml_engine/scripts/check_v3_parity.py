@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Parity check: compiled v3 scorer vs the reference v3 implementation
+Scores random age 2-3.5 feature dictionaries through both and requires identical
+feature matrices and matching responses: labels, bands and explanation texts exactly,
+floats within FLOAT_RTOL (the batched numpy math may differ in the last bit).
+
+Uses the deployed v3 ensemble from models/age_2_v3; with --stand-in (or if the
+ensemble is missing) deterministic stand-in models are used, which still covers
+feature engineering, rules, banding and explanations.
+
+Usage:
+  python scripts/check_v3_parity.py --samples 5000
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.ml.predictor import _v3_feature_matrix, _v3_response, _load_v3_or_raise
+from app.ml.v3_scorer import V3Scorer, DEFAULT_TOP_FEATURES, _Columns
+
+Q_FEATURES = [
+    'q1_name_response', 'q2_routine_change', 'q3_toy_switching', 'q4_eye_contact',
+    'q5_pointing', 'q6_sensory_reaction', 'q7_imitation', 'q9_joint_attention',
+    'q10_communication'
+]
+# Only read through float() by the feature engineering, so odd values are allowed
+LENIENT_FEATURES = [
+    'attention_level', 'engagement_level', 'frustration_tolerance', 'instruction_following',
+    'failed_items_rate', 'completion_time_sec', 'age_months', 'critical_items_fail_rate',
+    'q1', 'q2', 'q5', 'q10', 'q5_pointing', 'q10_communication', 'q3_toy_switching'
+]
+LANGUAGES = ['en', 'si', 'ta', 'fr']
+# Relative tolerance for float fields (probability, confidence, scores)
+FLOAT_RTOL = 1e-12
+FLOAT_ATOL = 1e-15
+
+
+class StandInScaler:
+    """Deterministic affine scaler"""
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=float) - 2.0) / 3.0
+
+
+class StandInClassifier:
+    """Deterministic softmax over fixed linear scores"""
+
+    def __init__(self, n_classes, n_features, seed):
+        self.weights = np.random.default_rng(seed).normal(size=(n_classes, n_features))
+
+    def predict_proba(self, X):
+        logits = np.asarray(X, dtype=float) @ self.weights.T
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+
+def random_features(rng):
+    """One random request, with missing keys and the odd non-numeric value"""
+    features = {}
+    for name in Q_FEATURES:
+        if rng.random() < 0.9:
+            features[name] = int(rng.integers(0, 6)) if rng.random() < 0.7 else float(rng.uniform(0, 5))
+    for name in LENIENT_FEATURES:
+        roll = rng.random()
+        if roll < 0.5:
+            features[name] = float(rng.uniform(0, 400))
+        elif roll < 0.55:
+            features[name] = str(int(rng.integers(0, 10)))
+        elif roll < 0.58:
+            features[name] = None
+    if rng.random() < 0.8:
+        features['critical_items_failed'] = int(rng.integers(0, 6))
+    if rng.random() < 0.3:
+        features['joint_attention_score'] = float(rng.uniform(0, 100))
+    if rng.random() < 0.3:
+        features['total_q_score'] = int(rng.integers(0, 50))
+    if rng.random() < 0.9:
+        features['language'] = LANGUAGES[int(rng.integers(0, len(LANGUAGES)))]
+    return features
+
+
+def same_value(a, b):
+    """Floats (and lists of floats) within FLOAT_RTOL, everything else exactly"""
+    if isinstance(a, float) or isinstance(b, float):
+        return (a is not None and b is not None and
+                bool(np.isclose(a, b, rtol=FLOAT_RTOL, atol=FLOAT_ATOL)))
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(same_value(x, y) for x, y in zip(a, b))
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(same_value(a[k], b[k]) for k in a)
+    return a == b
+
+
+def reference_score(raw_features, bin_model, sev_model, scaler, config):
+    """Original single-request v3 path"""
+    try:
+        X_scaled = scaler.transform(_v3_feature_matrix([raw_features], config))
+        ml_prob_asd = float(bin_model.predict_proba(X_scaled)[0][1])
+        sev_probs = sev_model.predict_proba(X_scaled)[0]
+        return _v3_response(raw_features, ml_prob_asd, sev_probs, config)
+    except Exception as e:
+        return e
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the compiled v3 scorer against the reference implementation")
+    parser.add_argument('--samples', type=int, default=5000, help='Random requests to compare')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--stand-in', action='store_true', help='Use stand-in models instead of models/age_2_v3')
+    args = parser.parse_args()
+
+    if args.stand_in:
+        models = None
+    else:
+        try:
+            models = _load_v3_or_raise()
+        except Exception as e:
+            print(f"⚠️  v3 ensemble not available ({e}); using stand-in models")
+            models = None
+    if models is not None:
+        expected = getattr(models[2], 'n_features_in_', None)
+        top_features = models[3].get("top_features") or DEFAULT_TOP_FEATURES
+        if expected is not None and expected != len(top_features):
+            # Both paths would reject every request; nothing to compare
+            print(f"⚠️  v3 scaler expects {expected} features but the config lists {len(top_features)} "
+                  f"(no top_features in models/age_2_v3/config.json?); using stand-in models")
+            models = None
+    if models is None:
+        n = len(DEFAULT_TOP_FEATURES)
+        models = (StandInClassifier(2, n, 1), StandInClassifier(3, n, 2), StandInScaler(), {})
+    bin_model, sev_model, scaler, config = models
+
+    rng = np.random.default_rng(args.seed)
+    features_list = [random_features(rng) for _ in range(args.samples)]
+    scorer = V3Scorer(bin_model, sev_model, scaler, config)
+
+    # Feature matrices must be bit-identical
+    X_reference = _v3_feature_matrix(features_list, config)
+    X_compiled = scorer.feature_matrix(_Columns(features_list))
+    matrix_ok = np.array_equal(X_reference, X_compiled, equal_nan=True)
+
+    start = time.perf_counter()
+    reference = [reference_score(f, bin_model, sev_model, scaler, config) for f in features_list]
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = scorer.score(features_list)
+    compiled_time = time.perf_counter() - start
+
+    mismatches = []
+    for i, (a, b) in enumerate(zip(reference, compiled)):
+        if isinstance(a, Exception) or isinstance(b, Exception):
+            if type(a) is not type(b):
+                mismatches.append((i, repr(a), repr(b)))
+        elif not same_value(a.model_dump(), b.model_dump()):
+            mismatches.append((i, a.model_dump(), b.model_dump()))
+
+    errors = sum(isinstance(r, Exception) for r in reference)
+    print(f"📊 {args.samples} random requests ({errors} rejected by both)")
+    print(f"   Feature matrix identical: {matrix_ok}")
+    print(f"   Reference (per request): {reference_time:.3f}s")
+    print(f"   Compiled (one batch):    {compiled_time:.3f}s ({reference_time / compiled_time:.1f}x)")
+    print(f"   Response mismatches:     {len(mismatches)}")
+    for i, a, b in mismatches[:5]:
+        print(f"   #{i}: features={features_list[i]}\n      reference={a}\n      compiled ={b}")
+
+    if mismatches or not matrix_ok:
+        sys.exit(1)
+    print("✅ Compiled scorer matches the reference")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Load test: one predict.py process per request vs one persistent worker
+
+Per-spawn mode is what routes/ml_predictions_old.js does today: every request
+starts Python, imports NumPy/sklearn and loads the model. Worker mode starts
+`predict.py --worker` once and streams newline-delimited JSON requests to it.
+
+Any failed request (e.g. model files missing) fails the run with a non-zero exit
+and no throughput is reported, since it would only time the error path.
+
+Usage:
+  python load_test_predict.py --requests 50
+"""
+
+import sys
+import json
+import time
+import argparse
+import subprocess
+from pathlib import Path
+
+import numpy as np
+
+SCRIPT_DIR = Path(__file__).parent
+PREDICT_SCRIPT = SCRIPT_DIR / 'predict.py'
+FEATURES_PATH = SCRIPT_DIR.parent / 'models' / 'feature_names.json'
+
+
+def make_requests(n, seed=42):
+    """Synthetic requests over the model's feature names"""
+    feature_names = ['post_switch_accuracy', 'switch_cost_ms', 'perseverative_error_rate_post_switch']
+    if FEATURES_PATH.exists():
+        with open(FEATURES_PATH, 'r') as f:
+            data = json.load(f)
+            feature_names = data['feature_names'] if isinstance(data, dict) else data
+
+    rng = np.random.default_rng(seed)
+    requests = []
+    for i in range(n):
+        features = {name: float(rng.uniform(0, 100)) for name in feature_names}
+        requests.append({'id': i, 'age_months': int(rng.integers(24, 84)), 'features': features})
+    return requests
+
+
+def run_per_spawn(requests):
+    """One Python process per request"""
+    results, latencies = [], []
+    for request in requests:
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, str(PREDICT_SCRIPT), json.dumps(request)],
+            capture_output=True, text=True
+        )
+        latencies.append(time.perf_counter() - start)
+        if proc.returncode != 0:
+            results.append({'id': request['id'], 'error': proc.stderr.strip()})
+        else:
+            results.append({'id': request['id'], **json.loads(proc.stdout)})
+    return results, latencies
+
+
+def run_worker(requests):
+    """One persistent worker for all requests (sequential round trips)"""
+    start = time.perf_counter()
+    worker = subprocess.Popen(
+        [sys.executable, str(PREDICT_SCRIPT), '--worker'],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        text=True, bufsize=1
+    )
+
+    results, latencies = [], []
+    try:
+        for request in requests:
+            request_start = time.perf_counter()
+            worker.stdin.write(json.dumps(request) + '\n')
+            worker.stdin.flush()
+            line = worker.stdout.readline()
+            if not line:
+                raise RuntimeError('Worker exited (are the model files in models/?)')
+            latencies.append(time.perf_counter() - request_start)
+            results.append(json.loads(line))
+        startup = latencies[0] if latencies else 0.0
+    finally:
+        worker.stdin.close()
+        worker.wait(timeout=30)
+
+    total = time.perf_counter() - start
+    return results, latencies, total, startup
+
+
+def first_error(results):
+    """(number of failed requests, first error message)"""
+    errors = [r['error'] for r in results if r.get('error')]
+    if not errors:
+        return 0, None
+    message = (errors[0].strip().splitlines() or [''])[-1]
+    try:
+        # predict.py reports errors as a JSON object on stderr
+        message = json.loads(message).get('error', message)
+    except (ValueError, AttributeError):
+        pass
+    return len(errors), message
+
+
+def report(name, latencies, total):
+    """Print throughput and latency percentiles"""
+    latencies_ms = np.array(latencies) * 1000
+    print(f"\n{name}")
+    print("-" * 60)
+    print(f"  Total time:   {total:.2f}s")
+    print(f"  Throughput:   {len(latencies) / total:.1f} predictions/s")
+    print(f"  Latency p50:  {np.percentile(latencies_ms, 50):.1f} ms")
+    print(f"  Latency p95:  {np.percentile(latencies_ms, 95):.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare per-spawn and persistent-worker prediction throughput')
+    parser.add_argument('--requests', type=int, default=50, help='Number of predictions per mode')
+    args = parser.parse_args()
+
+    requests = make_requests(args.requests)
+    print(f"📊 {args.requests} predictions with {len(requests[0]['features'])} features each")
+
+    start = time.perf_counter()
+    spawn_results, spawn_latencies = run_per_spawn(requests)
+    spawn_total = time.perf_counter() - start
+
+    try:
+        worker_results, worker_latencies, worker_total, first_latency = run_worker(requests)
+    except RuntimeError as e:
+        worker_results = [{'id': r['id'], 'error': str(e)} for r in requests]
+
+    failed = False
+    for name, results in (('per-spawn', spawn_results), ('worker', worker_results)):
+        count, message = first_error(results)
+        if count:
+            failed = True
+            print(f"\n❌ {count} of {len(requests)} {name} requests failed: {message}")
+    if failed:
+        print("\nNo throughput reported: the run did not produce predictions "
+              f"(check the model files next to {FEATURES_PATH.name} in {FEATURES_PATH.parent})")
+        sys.exit(1)
+
+    report('Per-spawn (python predict.py per request)', spawn_latencies, spawn_total)
+    report('Persistent worker (python predict.py --worker)', worker_latencies, worker_total)
+    print(f"  First request (incl. model load): {first_latency * 1000:.1f} ms")
+
+    mismatches = sum(
+        1 for a, b in zip(spawn_results, worker_results)
+        if abs(a['risk_score'] - b['risk_score']) > 1e-9
+    )
+    print(f"\n{'✅' if not mismatches else '❌'} Speed-up: {spawn_total / worker_total:.1f}x, "
+          f"result mismatches: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
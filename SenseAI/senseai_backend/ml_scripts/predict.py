@@ -9,6 +9,18 @@ This script:
 3. Orders features correctly
 4. Scales features
 5. Makes predictions
+
+Usage:
+  python predict.py '{"features": {...}}'   # one prediction, then exit
+  python predict.py --worker                # persistent worker
+
+Worker mode loads the models once and then answers newline-delimited JSON
+requests on stdin with one JSON line each on stdout, in order, so callers
+pay the interpreter start, NumPy/sklearn import and model load only once:
+  stdin:  {"id": 1, "features": {...}, "age_months": 48}
+  stdout: {"id": 1, "prediction": 1, "risk_score": 78.9, ...}
+          {"id": 1, "error": "...", "type": "ValueError"}   (on failure)
+The worker exits when stdin is closed. Diagnostics go to stderr.
 """
 
 import sys
@@ -28,6 +40,16 @@ SCALER_PATH = MODEL_DIR / 'feature_scaler.pkl'
 FEATURES_PATH = MODEL_DIR / 'feature_names.json'
 AGE_NORMS_PATH = MODEL_DIR / 'age_norms.json'  # Optional: control group norms for age normalization
 
+# Models loaded by get_models() (kept for the lifetime of a worker)
+_models = None
+
+def get_models():
+    """Load the models on first use and reuse them afterwards"""
+    global _models
+    if _models is None:
+        _models = load_models()
+    return _models
+
 def load_models():
     """Load trained model, scaler, feature names, and age norms"""
     try:
@@ -172,7 +194,7 @@ def predict(features_dict, age_months=None, age_group=None, session_type=None):
     Returns:
         Dictionary with prediction results
     """
-    model, scaler, feature_names, age_norms = load_models()
+    model, scaler, feature_names, age_norms = get_models()
     
     # Extract age_months from features if not provided
     if age_months is None:
@@ -272,7 +294,63 @@ def predict(features_dict, age_months=None, age_group=None, session_type=None):
         'asd_probability': float(asd_probability),
     }
 
+def handle_request(input_data):
+    """
+    Run one prediction request
+    
+    Args:
+        input_data: Parsed request ({"features": {...}, "age_months", "age_group", "session_type"})
+    
+    Returns:
+        Dictionary with prediction results
+    """
+    # Extract age_months if provided
+    age_months = input_data.get('age_months')
+    if age_months is None:
+        # Try to get from features
+        age_months = input_data.get('features', {}).get('age_months')
+    
+    return predict(
+        input_data.get('features', {}),
+        age_months=age_months,
+        age_group=input_data.get('age_group', 'unknown'),
+        session_type=input_data.get('session_type', 'unknown')
+    )
+
+def serve(instream=sys.stdin, outstream=sys.stdout):
+    """
+    Persistent worker: answer newline-delimited JSON requests until EOF
+    
+    Args:
+        instream: Stream of JSON requests, one per line
+        outstream: Stream for JSON responses, one line per request
+    """
+    get_models()  # Load once, before the first request arrives
+    print("Prediction worker ready", file=sys.stderr, flush=True)
+    
+    for line in instream:
+        line = line.strip()
+        if not line:
+            continue
+        
+        request_id = None
+        try:
+            input_data = json.loads(line)
+            request_id = input_data.get('id')
+            response = handle_request(input_data)
+        except json.JSONDecodeError as e:
+            response = {'error': f'Invalid JSON: {str(e)}', 'type': 'JSONDecodeError'}
+        except Exception as e:
+            response = {'error': str(e), 'type': type(e).__name__}
+        
+        outstream.write(json.dumps({'id': request_id, **response}) + '\n')
+        outstream.flush()
+
 if __name__ == '__main__':
+    if '--worker' in sys.argv[1:]:
+        serve()
+        sys.exit(0)
+    
     try:
         # Read input from command line or stdin
         input_str = None
@@ -302,18 +380,7 @@ if __name__ == '__main__':
             }), file=sys.stderr)
             sys.exit(1)
         
-        # Extract age_months if provided
-        age_months = input_data.get('age_months')
-        if age_months is None:
-            # Try to get from features
-            age_months = input_data.get('features', {}).get('age_months')
-        
-        result = predict(
-            input_data.get('features', {}),
-            age_months=age_months,
-            age_group=input_data.get('age_group', 'unknown'),
-            session_type=input_data.get('session_type', 'unknown')
-        )
+        result = handle_request(input_data)
         
         # Output JSON result
         print(json.dumps(result))